@@ -1,8 +1,21 @@
 from fastapi import FastAPI, BackgroundTasks, HTTPException
 from celery import Celery
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+
+from packages.agents.job_matcher.incremental_matcher import IncrementalMatcher
+from packages.agents.job_matcher.job_index import load_job_listings
+from packages.agents.job_matcher.recommendation_store import get_recommendation_store
+from packages.agents.job_processor.job_processor_agent import JobProcessorAgent
+from packages.database.config import SessionLocal
+from packages.database.job_data_model import JobDatabase
+from packages.database.models import User
+from packages.utilities.skill_vocabulary import get_skill_vocabulary, load_skill_vocabulary
+
+logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -27,12 +40,14 @@ class UserPreferences(BaseModel):
 class JobPosting(BaseModel):
     job_id: str
     title: str
+    company: str = ""
     description: str
     skills: List[str]
     location: str
     salary: Optional[str] = None
     source: str
-    posted_date: datetime = datetime.now()
+    url: Optional[str] = None
+    posted_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class MatchedJob(BaseModel):
     job_id: str
@@ -50,6 +65,125 @@ class JobProcessingMetrics(BaseModel):
 # In-memory store for simplicity. Replace with Supabase/DB in production.
 job_processing_metrics: JobProcessingMetrics = JobProcessingMetrics()
 
+# Users and jobs indexed for incremental matching: a new job is scored only against
+# the users it can match, and each user's top matches are kept up to date in the
+# recommendation store (Redis sorted sets when REDIS_URL is set), which serves reads.
+# The index lives in worker memory; ensure_matcher_loaded rebuilds it from the
+# database before a worker's first task, so re-matching never starts from no jobs.
+recommendation_store = get_recommendation_store()
+incremental_matcher = IncrementalMatcher(store=recommendation_store)
+user_profiles: Dict[str, Dict[str, Any]] = {}
+_matcher_loaded = False
+_matcher_load_lock = threading.Lock()
+
+def _split_list(text: Optional[str]) -> List[str]:
+    # Job titles, locations and posting skills are stored as comma-separated text
+    return [item.strip() for item in (text or "").split(",") if item.strip()]
+
+def user_to_profile(user: User) -> Dict[str, Any]:
+    """A user's skills, experience, education and job preferences in JobMatcherAgent profile format."""
+    preferences: Dict[str, Any] = {}
+    job_preferences = user.job_preferences
+    if job_preferences is not None:
+        if _split_list(job_preferences.job_titles):
+            preferences["job_titles"] = _split_list(job_preferences.job_titles)
+        locations = _split_list(job_preferences.locations) or _split_list(job_preferences.location)
+        if locations:
+            preferences["job_locations"] = locations
+        if job_preferences.job_type:
+            preferences["job_types"] = [job_preferences.job_type]
+        if job_preferences.remote:
+            preferences["remote"] = True
+    return {
+        "skills": [skill.name for skill in user.skills],
+        "experience": [
+            {"title": exp.title,
+             "years": int(((exp.end_date or datetime.utcnow()) - exp.start_date).days / 365) if exp.start_date else 0}
+            for exp in user.experience
+        ],
+        "education": [{"degree": edu.degree} for edu in user.education],
+        "preferences": preferences,
+    }
+
+def load_active_user_profiles(db=None) -> Dict[str, Dict[str, Any]]:
+    """Profiles of all active users, keyed by user id; loaded from the database on first use."""
+    if not user_profiles:
+        session = db or SessionLocal()
+        try:
+            for user in session.query(User).filter(User.is_active.is_(True)):
+                user_profiles[str(user.id)] = user_to_profile(user)
+        finally:
+            if db is None:
+                session.close()
+    return user_profiles
+
+def ensure_matcher_loaded() -> None:
+    """Indexes the stored job listings and active users once per worker process."""
+    global _matcher_loaded
+    if _matcher_loaded:
+        return
+    with _matcher_load_lock:
+        if _matcher_loaded:
+            return
+        db = SessionLocal()
+        try:
+            load_skill_vocabulary(db)
+            jobs = JobProcessorAgent().process_records(listing_to_job(listing) for listing in load_job_listings(db).values())
+            delta = incremental_matcher.apply_delta(load_active_user_profiles(db), jobs=jobs)
+        finally:
+            db.close()
+        _matcher_loaded = True
+        logger.info(f"Incremental matcher loaded: {delta}")
+
+def job_posting_to_job(job: JobPosting) -> Dict[str, Any]:
+    return {
+        "id": job.job_id,
+        "title": job.title,
+        "description": job.description,
+        "required_skills": job.skills,
+        "location": job.location,
+        "source": job.source,
+        "posted_date": job.posted_date.isoformat(),
+    }
+
+def job_posting_to_listing(job: JobPosting) -> Dict[str, Any]:
+    """A posting in JobDatabase.add_job_listing format; its skills are kept as the listing's requirements."""
+    return {
+        "id": job.job_id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "description": job.description,
+        "requirements": ", ".join(job.skills),
+        "salary": job.salary,
+        "posting_date": job.posted_date,
+        "url": job.url or f"{job.source}:{job.job_id}",  # listings need a unique URL
+        "source": job.source,
+    }
+
+def listing_to_job(listing: Dict[str, Any]) -> Dict[str, Any]:
+    """A stored job listing in the format job_posting_to_job gives new postings, so both match alike."""
+    posting_date = listing.get("posting_date")
+    return {
+        **listing,
+        "required_skills": _split_list(listing.get("requirements")),
+        "posted_date": posting_date.isoformat() if posting_date else None,
+    }
+
+def as_utc(value: datetime) -> datetime:
+    """Timezone-aware UTC datetime; naive values are taken to be UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def preferences_to_matching(preferences: Dict[str, Any]) -> Dict[str, Any]:
+    matching = {}
+    if preferences.get("location"):
+        matching["job_locations"] = [preferences["location"]]
+    if preferences.get("role"):
+        matching["job_titles"] = [preferences["role"]]
+    if preferences.get("work_mode"):
+        matching["remote"] = preferences["work_mode"].lower() == "remote"
+    return matching
+
 # Celery task for processing new jobs
 @celery_app.task
 def process_new_job_posting(job_data: Dict[str, Any]):
@@ -59,27 +193,30 @@ def process_new_job_posting(job_data: Dict[str, Any]):
     job = JobPosting(**job_data)
     print(f"Processing new job: {job.title} from {job.source}")
 
-    # TODO: Implement duplicate job detection
-    # For now, assume no duplicates
-    if False: # Placeholder for duplicate detection logic
-        job_processing_metrics.duplicate_jobs_detected += 1
-        print(f"Duplicate job detected: {job.job_id}")
-        return {"status": "duplicate", "job_id": job.job_id}
+    # Store the posting before indexing it, so workers that load the matcher later index it too
+    jobs_db = JobDatabase()
+    db = SessionLocal()
+    try:
+        if jobs_db.get_job_listing(db, job.job_id) is not None or jobs_db.add_job_listing(db, job_posting_to_listing(job)).id != job.job_id:
+            job_processing_metrics.duplicate_jobs_detected += 1
+            print(f"Duplicate job detected: {job.job_id}")
+            return {"status": "duplicate", "job_id": job.job_id}
 
-    # TODO: Fetch all active users
-    active_users = [{"user_id": "user123", "preferences": {"location": "New York", "role": "Software Engineer"}}]
+        ensure_matcher_loaded()
 
-    for user in active_users:
-        user_id = user["user_id"]
-        user_preferences = user["preferences"]
+        # Fan out to the users the job can match; returns those whose top matches now include it
+        matched_users = incremental_matcher.add_job(job_posting_to_job(job))
+        vocabulary = get_skill_vocabulary()
+        if vocabulary.pending:  # skills first seen in this posting
+            vocabulary.save(db)
+    finally:
+        db.close()
 
-        # TODO: Calculate ATS scores for user against new job posting
-        ats_score = 0.0 # Placeholder
-        print(f"Calculated ATS score for {user_id} on {job.title}: {ats_score}")
-
-        # TODO: Filter and rank jobs based on user preferences
-        # For now, a simple score based on ATS
-        match_score = ats_score # Placeholder
+    for user_id in matched_users:
+        match_score = next((m["compatibility_score"] for m in incremental_matcher.top_matches(user_id) if m["id"] == job.job_id), None)
+        if match_score is None:  # pushed out again by a concurrent update
+            continue
+        print(f"Matched {user_id} on {job.title}: {match_score}")
 
         if match_score > 80.0:
             # TODO: Store matching results in Supabase
@@ -95,11 +232,25 @@ def process_new_job_posting(job_data: Dict[str, Any]):
 @celery_app.task
 def perform_daily_job_matching():
     print("Performing daily job matching for active users...")
-    # TODO: Fetch all active users
-    active_users = [{"user_id": "user123", "preferences": {"location": "New York", "role": "Software Engineer"}}]
-    for user in active_users:
-        perform_job_matching.delay(user["user_id"], user["preferences"])
-    return {"status": "daily_matching_initiated", "users_count": len(active_users)}
+    # New jobs were matched on arrival; only new or changed profiles are re-matched here
+    ensure_matcher_loaded()
+    user_profiles.clear()
+    active_users = load_active_user_profiles()
+    removed_users = [user_id for user_id in incremental_matcher.user_ids() if user_id not in active_users]
+    delta = incremental_matcher.apply_delta(active_users, removed_user_ids=removed_users)
+    return {"status": "daily_matching_complete", "users_count": len(active_users), **delta}
+
+# Celery task for (re-)matching one user after a preference change
+@celery_app.task
+def perform_job_matching(user_id: str, preferences: Dict[str, Any]):
+    ensure_matcher_loaded()
+    profile = dict(load_active_user_profiles().get(user_id, {}))
+    profile["preferences"] = {**profile.get("preferences", {}), **preferences_to_matching(preferences)}
+    user_profiles[user_id] = profile
+    incremental_matcher.upsert_user(user_id, profile)
+    matches = incremental_matcher.top_matches(user_id)
+    return {"status": "matched", "user_id": user_id,
+            "matches": [{"job_id": m["id"], "score": m["compatibility_score"]} for m in matches]}
 
 # Celery task for job expiry handling and cleanup
 @celery_app.task
@@ -108,12 +259,12 @@ def cleanup_old_job_postings():
     print("Cleaning up old job postings...")
     # TODO: Implement job expiry logic and cleanup
     # Example: Remove jobs older than 30 days
-    threshold_date = datetime.now() - timedelta(days=30)
-    cleaned_count = 0 # Placeholder
-    # For job in all_jobs:
-    #   if job.posted_date < threshold_date:
-    #       delete job
-    #       cleaned_count += 1
+    threshold_date = datetime.now(timezone.utc) - timedelta(days=30)
+    cleaned_count = 0
+    for job in incremental_matcher.jobs():
+        if job.get("posted_date") and as_utc(datetime.fromisoformat(job["posted_date"])) < threshold_date:
+            incremental_matcher.remove_job(job["id"])
+            cleaned_count += 1
     job_processing_metrics.old_jobs_cleaned += cleaned_count
     return {"status": "cleanup_complete", "cleaned_count": cleaned_count}
 
@@ -136,10 +287,14 @@ async def match_jobs(user_id: str, preferences: UserPreferences, background_task
 
 @app.get("/recommendations/{user_id}")
 async def get_recommendations(user_id: str):
-    # TODO: Implement personalized job recommendations using collaborative filtering
-    # - Fetch matching results from Supabase
-    # - Apply collaborative filtering
-    return {"message": "Recommendations for user", "user_id": user_id, "recommendations": []}
+    # Top matches as last written by incremental matching: O(k), no re-scoring
+    # TODO: Apply collaborative filtering
+    recommendations = [
+        {"job_id": m.get("id"), "title": m.get("title"), "location": m.get("location"),
+         "score": m["compatibility_score"], "match_details": m.get("match_details", {})}
+        for m in recommendation_store.top(user_id)
+    ]
+    return {"message": "Recommendations for user", "user_id": user_id, "recommendations": recommendations}
 
 @app.get("/job_trends")
 async def get_job_trends():
@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from packages.database.config import SessionLocal
 from packages.agents.agent_manager import AgentManager
+from packages.agents.job_matcher.job_index import get_job_index_sync, load_job_listings
+from packages.agents.job_processor.job_processor_agent import JobProcessorAgent
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
 from pydantic import BaseModel
 from typing import Dict, Any, Generator
 from packages.schemas.applications import ApplicationSubmissionResponse
@@ -74,7 +77,8 @@ async def match_jobs_endpoint(
     """Match jobs based on user profile.
 
     This endpoint uses the `JobMatcherAgent` to find suitable job listings
-    based on the provided user profile.
+    based on the provided user profile. The job vector index retrieves the
+    closest listings first; only those are loaded, processed and scored.
 
     Args:
         user_profile (Dict[str, Any]): A dictionary containing the user's profile information.
@@ -90,8 +94,23 @@ async def match_jobs_endpoint(
     # [CONTEXT] Endpoint to match jobs using the JobMatcherAgent.
     try:
         agent_manager = AgentManager(db)
-        job_matcher_agent = agent_manager.get_job_matcher_agent()
-        matched_jobs = job_matcher_agent.match_jobs([user_profile])
+        job_matcher_agent = agent_manager.get_job_matcher_agent(user_id=current_user.id)
+        job_matcher_agent.user_profile = user_profile
+        processor = JobProcessorAgent()
+        vocabulary = get_skill_vocabulary()
+
+        def load_jobs(job_ids=None):
+            listings = load_job_listings(db, job_ids)
+            records = processor.process_records(listings.values())
+            if vocabulary.pending:  # skills first seen in these listings
+                vocabulary.save(db)
+            return {record.id: record for record in records}
+
+        job_index = get_job_index_sync(db)
+        if job_index is None:  # no embeddings: score every listing
+            matched_jobs = job_matcher_agent.match_job_records(load_jobs().values())
+        else:
+            matched_jobs = job_matcher_agent.match_indexed_jobs(job_index.index, load_jobs)
         logger.info(f"User {current_user.username} successfully matched jobs.")
         return {"message": "Jobs matched successfully", "matched_jobs": matched_jobs}
     except SQLAlchemyError as e:
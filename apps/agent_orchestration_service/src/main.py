@@ -7,6 +7,7 @@ from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST, Gau
 from fastapi import APIRouter
 from fastapi import Response as FastAPIResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 import json
@@ -14,6 +15,8 @@ import json
 from packages.errors.custom_exceptions import JobApplierException
 from pydantic import BaseModel
 from packages.utilities.logging_utils import setup_logging
+from packages.utilities.skill_vocabulary import load_skill_vocabulary
+from packages.database.config import SessionLocal
 
 from .agent_api import router as agent_router
 
@@ -35,10 +38,19 @@ workflow_status = {
     "last_state_change": time.time()
 }
 
+def _load_skill_vocabulary():
+    db = SessionLocal()
+    try:
+        load_skill_vocabulary(db)
+    finally:
+        db.close()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global startup_time
     startup_time = time.time()
+    # Shared skill ids, loaded before any job or profile is encoded
+    await asyncio.to_thread(_load_skill_vocabulary)
     yield
 
 app = FastAPI(
@@ -6,7 +6,6 @@ import google.generativeai as genai
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 import google.api_core.exceptions
 import json
-import spacy
 import jwt
 from datetime import datetime, timedelta
 
@@ -14,14 +13,6 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key") # TODO: Replace with
 ALGORITHM = "HS256"
 
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logging.warning("spaCy model 'en_core_web_sm' not found. Downloading...")
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
-
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-1.5-flash"
 
@@ -89,6 +80,11 @@ from packages.database.config import SessionLocal
 
 
 from packages.errors.custom_exceptions import JobApplierException
+from packages.agents.ats_scorer.ats_scorer_agent import ATSScorerAgent
+from packages.agents.ats_scorer.ats_cache import ats_cache_key, get_ats_result_cache, invalidate_ats_result_cache
+from packages.common_types.common_types import ResumeData
+from packages.utilities.nlp_models import get_spacy_model
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
 from pydantic import BaseModel
 import tempfile
 import os
@@ -107,6 +103,15 @@ class ATSScoreRequest(BaseModel):
     tone: str | None = None
     domain: str | None = None
 
+# Upper bound on job descriptions per batch request, which is scored on one worker thread
+MAX_BATCH_JOB_DESCRIPTIONS = 100
+
+class ATSBatchScoreRequest(BaseModel):
+    resume_text: str
+    job_descriptions: List[str]
+    industry: str | None = None
+    top_k: int | None = None
+
 class JobSearchRequest(BaseModel):
     query: str
     location: str | None = None
@@ -149,11 +154,9 @@ class ATSScorer:
         return {"text": text, "tokens": [token.text for token in doc]}
 
     def score_skills(self, job_skills: List[str], resume_skills: List[str]) -> float:
-        job_skills_lower = {s.lower() for s in job_skills}
-        resume_skills_lower = {s.lower() for s in resume_skills}
-        matched = len(job_skills_lower.intersection(resume_skills_lower))
-        if not job_skills_lower: return 100.0
-        return (matched / len(job_skills_lower)) * 100
+        if not job_skills: return 100.0
+        coverage, _ = get_skill_vocabulary().match(job_skills, resume_skills)  # request skills are never registered
+        return coverage * 100
 
     def score_experience(self, job_exp: str, resume_exp: str) -> float:
         # Simple keyword matching for demonstration
@@ -308,11 +311,23 @@ async def score_ats_endpoint(
         HTTPException: If the resume parsing fails, or if an internal server error occurs.
     """
     # [CONTEXT] Endpoint to score ATS compatibility using the ATSScorerAgent.
+    # Identical requests (same resume, job description, tone and domain) are served from the
+    # result cache, including the Gemini cover letter.
+    result_cache = get_ats_result_cache()
+    cache_key = ats_cache_key(
+        result_cache, "ats_service", request.resume_text, request.job_description,
+        tone=request.tone, domain=request.domain,
+    )
+    cached_response = result_cache.get(cache_key)
+    if cached_response is not None:
+        ats_score_counter.inc()
+        return cached_response
+
     try:
         # First, parse the resume text into ResumeData
 
 
-        ats_scorer = ATSScorer(nlp)
+        ats_scorer = ATSScorer(get_spacy_model())
         ats_result = ats_scorer.calculate_ats_score(request.job_description, request.resume_text)
 
         # Initialize response variables with defaults for graceful degradation
@@ -379,7 +394,7 @@ User Preferences: {user_preferences}"""
         ats_score_counter.inc()
         # You can use token_data.username for user-specific logic if needed
 
-        return {
+        response = {
             "message": "ATS score calculated successfully",
             "job_match_score": job_match_score,
             "ats_score": ats_score,
@@ -391,6 +406,10 @@ User Preferences: {user_preferences}"""
             "score_breakdown": ats_result.get("score_breakdown", {}),
             "improvement_suggestions": ats_result.get("improvement_suggestions", []),
         }
+        # Do not cache degraded responses so a later request can retry Gemini
+        if not error_handling["fallback_used"]:
+            result_cache.set(cache_key, response)
+        return response
     except SQLAlchemyError as e:
         logger.error(
             f"Database error during ATS scoring: {e}",
@@ -407,6 +426,75 @@ User Preferences: {user_preferences}"""
 
 
 
+@router.post("/v1/ats-score/batch")
+async def score_ats_batch_endpoint(
+    request: ATSBatchScoreRequest,
+    db: Session = Depends(get_db),
+    token: TokenData = Depends(verify_token),
+) -> dict:
+    """Score one resume against many job descriptions in a single request.
+
+    The resume is tokenized and indexed once by `ATSScorerAgent.score_ats_batch`,
+    so scoring N saved jobs costs one call instead of N `/v1/ats-score` round trips.
+    Scoring runs in a worker thread, and at most `MAX_BATCH_JOB_DESCRIPTIONS` job
+    descriptions are accepted per request. Cover letters are not generated in batch mode.
+
+    Args:
+        request (ATSBatchScoreRequest): Resume text, job descriptions, optional industry and top-k cutoff.
+        db (Session): Database session dependency.
+        token (TokenData): Authentication token data.
+
+    Returns:
+        Dict[str, Any]: A success message and one ATS report per job description, in request order.
+            Each report carries the `job_index` of the job description it scores.
+
+    Raises:
+        HTTPException: If the request is invalid or has too many job descriptions.
+    """
+    if request.top_k is not None and request.top_k < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="top_k must be a positive integer")
+    if len(request.job_descriptions) > MAX_BATCH_JOB_DESCRIPTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_JOB_DESCRIPTIONS} job descriptions can be scored per request",
+        )
+    try:
+        agent = ATSScorerAgent(db)
+        results = await asyncio.to_thread(
+            agent.score_ats_batch,
+            ResumeData(raw_text=request.resume_text),
+            request.job_descriptions,
+            industry=request.industry,
+            top_k=request.top_k,
+        )
+        ats_score_counter.inc(len(request.job_descriptions))
+        return {
+            "message": "ATS scores calculated successfully",
+            "results": results,
+        }
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during batch ATS scoring: {e}", exc_info=True)
+        raise JobApplierException(
+            message="An unexpected error occurred during batch ATS scoring.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            details={"error": str(e)}
+        )
+
+
+@router.delete("/v1/ats-score/cache")
+async def invalidate_ats_cache_endpoint(
+    token: TokenData = Depends(verify_token),
+) -> dict:
+    """Drop every cached ATS result from the in-process and Redis tiers.
+
+    Cached entries are also invalidated automatically when `ATS_SCORER_VERSION` changes;
+    use this after changing scoring inputs that are not versioned (e.g. benchmark data).
+    """
+    result = invalidate_ats_result_cache()
+    logger.info(f"ATS result cache invalidated by {token.username}: {result}")
+    return {"message": "ATS result cache invalidated", **result}
+
+
 @router.post("/v1/ats-score-file")
 async def score_ats_file_endpoint(
     resume_file: UploadFile = File(...),
@@ -454,7 +542,7 @@ async def score_ats_file_endpoint(
         # Read the content of the uploaded resume file
         resume_text = (await resume_file.read()).decode("utf-8")
 
-        ats_scorer = ATSScorer(nlp)
+        ats_scorer = ATSScorer(get_spacy_model())
         ats_result = ats_scorer.calculate_ats_score(job_description, resume_text)
 
         # Initialize response variables with defaults for graceful degradation
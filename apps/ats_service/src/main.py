@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST, Gauge, Histogram
 from fastapi import Response as FastAPIResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 import json
@@ -17,6 +18,7 @@ load_dotenv()
 
 from packages.errors.custom_exceptions import JobApplierException
 from packages.utilities.logging_utils import setup_logging
+from packages.utilities.nlp_models import SPACY_MODEL, WARMUP_ENABLED, warmup
 
 from apps.ats_service.src.ats_api import router as ats_router
 from apps.ats_service.src.metrics import ats_score_counter, job_search_counter, error_counter, uptime_gauge, startup_time, request_count, request_latency
@@ -27,6 +29,8 @@ setup_logging()
 async def lifespan(app: FastAPI):
     global startup_time
     startup_time = time.time()
+    if WARMUP_ENABLED:
+        await asyncio.to_thread(warmup, [f"spacy:{SPACY_MODEL}"])
     yield
 
 app = FastAPI(
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import shutil
 import io
@@ -194,6 +195,11 @@ redis_cache = Redis(
         ssl=True
     )
 
+# Synchronous client on the same Redis, used as the shared tier of the ATS result cache
+from redis import Redis as SyncRedis
+from packages.agents.ats_scorer.ats_cache import configure_ats_result_cache
+from packages.agents.job_matcher.job_index import close_job_index_sync, get_job_index_sync
+
 CACHE_TTL = 60  # seconds
 
 def cache_key_builder(prefix: str, *args):
@@ -209,12 +215,37 @@ async def get_or_set_cache(key: str, fetch_func, ttl: int = CACHE_TTL):
 
 logger = logging.getLogger(__name__)
 
+def _open_job_index():
+    db = SessionLocal()
+    try:
+        get_job_index_sync(db)
+    finally:
+        db.close()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis_instance = Redis.from_url(REDIS_URL, decode_responses=True)
     await FastAPILimiter.init(redis_instance)
+    # ATS result cache on the same Redis; its version check does blocking I/O, so it runs in a thread
+    await asyncio.to_thread(
+        configure_ats_result_cache,
+        redis_client=SyncRedis(
+            host=redis_host,
+            port=redis_port,
+            password=redis_password,
+            ssl=True,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        ),
+    )
+    # Job vector index, updated in the background from the job listings this service commits
+    await asyncio.to_thread(_open_job_index)
+    # Job boards' robots.txt, loaded in the background so startup does not wait for slow hosts
+    robots_prefetch = asyncio.create_task(job_scraper_agent.prefetch_robots())
     yield  # Startup complete, app runs here
-    # (Optional) Add any cleanup code after yield
+    robots_prefetch.cancel()
+    await job_scraper_agent.aclose()  # pooled job board connections
+    await asyncio.to_thread(close_job_index_sync)  # applies and saves pending index changes
 
 app = FastAPI(lifespan=lifespan)
 
@@ -931,6 +962,9 @@ async def apply_for_job(
         )
 
 
+# Shared so that job board connections are pooled across requests (closed in lifespan)
+job_scraper_agent = JobScraperAgent()
+
 class JobSearchRequest(BaseModel):
     query: str
     location: str = ""
@@ -958,22 +992,11 @@ class JobSearchResponse(BaseModel):
     },
 )
 async def job_search(request: JobSearchRequest):
-    agent = JobScraperAgent()
-    jobs = []
-    # Aggregate from all sources
-    jobs += agent.search_indeed(request.query, request.location, request.num_results)
-    jobs += agent.search_linkedin(request.query, request.location, request.num_results)
-    jobs += agent.search_google_jobs(request.query, request.location, request.num_results)
-    if hasattr(agent, 'search_glassdoor'):
-        jobs += agent.search_glassdoor(request.query, request.location, request.num_results)
-    # Remove duplicates by URL
-    seen = set()
-    unique_jobs = []
-    for job in jobs:
-        url = job.get('url')
-        if url and url not in seen:
-            seen.add(url)
-            unique_jobs.append(job)
+    # All sources are scraped concurrently on the event loop; the stream is already deduplicated
+    unique_jobs = [
+        job async for _, job in job_scraper_agent.stream_jobs(request.query, request.location, request.num_results)
+        if job.get('url')
+    ]
     response = JSONResponse(content=JobSearchResponse(jobs=[JobSearchResultItem(**job) for job in unique_jobs]).dict())
     response.headers["Cache-Control"] = "public, max-age=60"
     return response
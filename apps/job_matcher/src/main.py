@@ -1,15 +1,27 @@
 from fastapi import FastAPI, HTTPException, Response as FastAPIResponse
-from sentence_transformers import SentenceTransformer, util
 from typing import List, Dict
+import asyncio
 import httpx
+import numpy as np
 import os
 from tenacity import retry, stop_after_attempt, wait_fixed
 import time
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST, Gauge, Histogram
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
+from packages.utilities.vector_matching.embedding_generator import (
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_MODEL_VERSION,
+    EmbeddingGenerator,
+)
+from packages.utilities.vector_matching.embedding_store import get_embedding_store
+from packages.utilities.vector_matching.micro_batcher import MicroBatchEncoder
+from packages.utilities.nlp_models import WARMUP_ENABLED, warmup
 
 ATS_SERVICE_URL = os.getenv("ATS_SERVICE_URL", "http://localhost:8003/process-application") # Default to localhost for development
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))  # texts per model.encode forward pass
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", "512"))  # texts coalesced across concurrent requests
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", "10"))  # max time a text waits for its batch to fill
 
 # Prometheus Metrics
 job_match_counter = Counter('job_matcher_matches_total', 'Total job matches performed')
@@ -25,7 +37,10 @@ request_latency = Histogram('job_matcher_request_latency_seconds', 'API request
 async def lifespan(app: FastAPI):
     global startup_time
     startup_time = time.time()
+    if WARMUP_ENABLED:
+        await asyncio.to_thread(warmup, ["embeddings"])
     yield
+    await batch_encoder.close()
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -63,8 +78,36 @@ async def _make_api_call(url: str, method: str = "GET", json_data: dict = None):
             print(f"Attempt failed: API error: {exc.response.status_code} - {exc.response.text}")
             raise
 
-# Load a pre-trained SentenceTransformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Shared, lazily loaded SentenceTransformer (see embedding_generator's model registry)
+embedding_generator = EmbeddingGenerator(DEFAULT_EMBEDDING_MODEL, batch_size=EMBED_BATCH_SIZE)
+embedding_store = get_embedding_store(DEFAULT_EMBEDDING_MODEL, DEFAULT_EMBEDDING_MODEL_VERSION)
+
+# Texts from concurrent requests are coalesced into one model.encode call
+batch_encoder = MicroBatchEncoder(
+    embedding_generator.generate_embeddings_batch,
+    max_batch_size=EMBED_MAX_BATCH,
+    max_wait=EMBED_MAX_WAIT_MS / 1000.0,
+)
+
+async def embed_texts(texts: List[str]) -> np.ndarray:
+    """
+    Returns a (len(texts), dim) float32 matrix of embeddings. Texts already in the
+    embedding store are not re-encoded; the rest go through the micro-batching encoder.
+    Store reads and writes (mmap, file lock) run in a thread, off the event loop.
+    """
+    vectors = await asyncio.to_thread(embedding_store.get_many, texts)
+    missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+    if missing:
+        encoded = await batch_encoder.encode_many(missing)
+        await asyncio.to_thread(embedding_store.put_many, missing, encoded)
+        rows = dict(zip(missing, encoded))
+        vectors = [rows[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+    return np.vstack(vectors)
+
+def cosine_scores(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row of ``matrix`` with ``vector``."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    return (matrix @ vector) / np.maximum(norms, 1e-12)
 
 @app.get("/metrics")
 def metrics():
@@ -77,19 +120,18 @@ def metrics():
 @app.post('/match-jobs')
 async def match_jobs(job_descriptions: List[Dict], resume_content: str) -> List[Dict]:
     job_match_counter.inc()
-    resume_embedding = model.encode(resume_content, convert_to_tensor=True)
+    # One embedding pass for the resume and every job description in the request
+    embeddings = await embed_texts([resume_content] + [job.get("description", "") for job in job_descriptions])
+    similarities = cosine_scores(embeddings[1:], embeddings[0])
     resume_keywords = set(word.lower() for word in resume_content.split() if len(word) > 2) # Simple keyword extraction
 
     results = []
-    for job in job_descriptions:
+    for job, cosine_score in zip(job_descriptions, similarities.tolist()):
         job_description = job.get("description", "")
         job_title = job.get("title", "")
         job_company = job.get("company", "")
         job_link = job.get("link", "")
 
-        job_embedding = model.encode(job_description, convert_to_tensor=True)
-        cosine_score = util.pytorch_cos_sim(job_embedding, resume_embedding).item()
-
         job_keywords = set(word.lower() for word in job_description.split() if len(word) > 2) # Simple keyword extraction
 
         matched_keywords = list(resume_keywords.intersection(job_keywords))
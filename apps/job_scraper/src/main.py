@@ -7,6 +7,8 @@ import time
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST, Gauge, Histogram
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
+from packages.agents.job_scraper.http_cache import get_http_cache
+from packages.agents.job_scraper.job_scraper_utils import is_captcha_page
 
 # Prometheus Metrics
 job_scrape_counter = Counter('job_scraper_scrapes_total', 'Total job scrape requests')
@@ -16,6 +18,9 @@ startup_time = time.time()
 request_count = Counter('job_scraper_requests_total', 'Total API requests', ['method', 'endpoint', 'status_code'])
 request_latency = Histogram('job_scraper_request_latency_seconds', 'API request latency in seconds', ['method', 'endpoint'])
 
+# On-disk page cache; its hit/revalidation counters are exported on /metrics
+http_cache = get_http_cache()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global startup_time
@@ -46,6 +51,18 @@ def metrics():
     uptime_gauge.set(time.time() - startup_time)
     return FastAPIResponse(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
+def cached_get(url: str, headers: Dict[str, str], page_type: str) -> requests.Response:
+    """
+    GET through the HTTP cache: a fresh cached page is returned without a request, a stale one
+    is requested with If-None-Match/If-Modified-Since and reused on a 304. CAPTCHA pages are
+    not stored.
+    """
+    if not http_cache:
+        return requests.get(url, headers=headers)
+    page = http_cache.fetch(url, None, page_type, lambda request_headers: requests.get(url, headers=request_headers),
+                            headers=headers, validate=lambda page: not is_captcha_page(page.body))
+    return page.to_response()
+
 @retry(stop=stop_after_attempt(3), wait=wait_fixed(2), retry=retry_if_exception_type(requests.exceptions.RequestException))
 def scrape_indeed(search_term: str = "software engineer", location: str = "remote") -> List[Dict]:
     jobs = []
@@ -53,10 +70,12 @@ def scrape_indeed(search_term: str = "software engineer", location: str = "remot
 
     url = base_url.format(search_term, location)
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-    response = requests.get(url, headers=headers)
+    response = cached_get(url, headers, "search")
     soup = BeautifulSoup(response.content, 'lxml')
 
     job_cards = soup.find_all('div', class_='job_seen_beacon')
+    if not job_cards and http_cache:
+        http_cache.discard(url)  # a blocked or changed page is not served again from the cache
 
     for card in job_cards:
         title_element = card.find('h2', class_='jobTitle')
@@ -78,7 +97,7 @@ def scrape_indeed(search_term: str = "software engineer", location: str = "remot
             job_page_url = link
             @retry(stop=stop_after_attempt(3), wait=wait_fixed(2), retry=retry_if_exception_type(requests.exceptions.RequestException))
             def get_job_page():
-                return requests.get(job_page_url, headers=headers)
+                return cached_get(job_page_url, headers, "detail")
             job_page_response = get_job_page()
             job_page_soup = BeautifulSoup(job_page_response.content, 'lxml')
 
@@ -103,11 +122,13 @@ def scrape_indeed(search_term: str = "software engineer", location: str = "remot
     try:
         url = base_url.format(search_term, location)
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-        response = requests.get(url, headers=headers)
+        response = cached_get(url, headers, "search")
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'lxml')
 
         job_cards = soup.find_all('div', class_='job_seen_beacon')
+        if not job_cards and http_cache:
+            http_cache.discard(url)  # a blocked or changed page is not served again from the cache
 
         for card in job_cards:
             title_element = card.find('h2', class_='jobTitle')
@@ -129,7 +150,7 @@ def scrape_indeed(search_term: str = "software engineer", location: str = "remot
                 job_page_url = link
                 @retry(stop=stop_after_attempt(3), wait=wait_fixed(2), retry=retry_if_exception_type(requests.exceptions.RequestException))
                 def get_job_page():
-                    return requests.get(job_page_url, headers=headers)
+                    return cached_get(job_page_url, headers, "detail")
                 job_page_response = get_job_page()
                 job_page_soup = BeautifulSoup(job_page_response.content, 'lxml')
 
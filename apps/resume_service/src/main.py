@@ -1,12 +1,14 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Response as FastAPIResponse
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 import os
 import time
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST, Gauge, Histogram
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
-from resume_parser import parse_resume
+from concurrent.futures import ProcessPoolExecutor
+from resume_parser import parse_resume, get_spacy_model, extract_text_from_bytes, ResumeTooLargeError, MAX_RESUME_BYTES
 
 # Prometheus Metrics
 resume_parse_counter = Counter('resume_parser_parses_total', 'Total resume parsing requests')
@@ -16,11 +18,22 @@ startup_time = time.time()
 request_count = Counter('resume_parser_requests_total', 'Total API requests', ['method', 'endpoint', 'status_code'])
 request_latency = Histogram('resume_parser_request_latency_seconds', 'API request latency in seconds', ['method', 'endpoint'])
 
+# PDF/DOCX text extraction is CPU-bound; it runs in worker processes so it never blocks the event loop
+EXTRACTION_WORKERS = int(os.getenv("RESUME_INGESTION_WORKERS", "0")) or None
+extraction_pool = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global startup_time
+    global startup_time, extraction_pool
     startup_time = time.time()
+    extraction_pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS)
+    if os.getenv("NLP_WARMUP", "true").lower() in ("1", "true", "yes"):
+        try:
+            await asyncio.to_thread(get_spacy_model)
+        except Exception as e:
+            logging.error(f"spaCy warmup failed: {e}")
     yield
+    extraction_pool.shutdown(wait=False, cancel_futures=True)
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -61,51 +74,33 @@ async def parse_resume_endpoint(file: UploadFile = File(...)):
     Returns:
         JSONResponse: Parsed resume data or error message
     """
+    resume_parse_counter.inc()
     try:
         # Validate file type
         file_ext = os.path.splitext(file.filename)[1].lower()
         if file_ext not in ['.pdf', '.docx', '.doc', '.txt']:
             raise HTTPException(status_code=400, detail="Unsupported file format")
-            
-        # Create temp file path
-        temp_path = f"/tmp/{file.filename}"
-        
-        # Save uploaded file temporarily
-        with open(temp_path, "wb") as f:
-            f.write(await file.read())
-            
-        # Read file content
-        file_content = file.file.read().decode("utf-8")
-        
-        # Parse the file
-        result = parse_resume(file_content)
-        
-        # Clean up temp file
-        os.remove(temp_path)
-        
-        if not result:
-            raise HTTPException(status_code=422, detail="Failed to parse resume")
-            
-        return JSONResponse(content=result)
-        
-    except HTTPException:
-        raise
-        
-    except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}", exc_info=True)
-        resume_parse_counter.inc()
-        # Clean up temp file
-        os.remove(temp_path)
-        
+
+        data = await file.read(MAX_RESUME_BYTES + 1)
+
+        # Extract text in the process pool, then run NLP parsing off the event loop
+        loop = asyncio.get_running_loop()
+        file_content = await loop.run_in_executor(extraction_pool, extract_text_from_bytes, data, file_ext)
+        result = await asyncio.to_thread(parse_resume, file_content) if file_content else None
+
         if not result:
             raise HTTPException(status_code=422, detail="Failed to parse resume")
-            
+
         return JSONResponse(content=result)
-        
+
+    except ResumeTooLargeError as e:
+        error_counter.inc()
+        raise HTTPException(status_code=413, detail=str(e))
+
     except HTTPException:
         error_counter.inc()
         raise
-        
+
     except Exception as e:
         error_counter.inc()
         logger.error(f"Error processing resume: {str(e)}", exc_info=True)
@@ -1,8 +1,47 @@
-import spacy
+import io
+import os
 import re
-from typing import List, Dict, Any
-
-nlp = spacy.load("en_core_web_sm")
+from functools import lru_cache
+from typing import Iterator, List, Dict, Any
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+MAX_RESUME_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_RESUME_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+MAX_RESUME_CHARS = int(os.getenv("RESUME_MAX_CHARS", "200000"))
+
+class ResumeTooLargeError(ValueError):
+    """Raised when an uploaded resume exceeds the size or page limits."""
+
+def iter_pdf_pages(data: bytes, max_pages: int = MAX_RESUME_PAGES) -> Iterator[str]:
+    """Yields the text of each PDF page; pages past ``max_pages`` are rejected."""
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for page_number, page in enumerate(extract_pages(io.BytesIO(data)), start=1):
+        if page_number > max_pages:
+            raise ResumeTooLargeError(f"Resume has more than {max_pages} pages")
+        yield "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+
+def extract_text_from_bytes(data: bytes, file_ext: str, max_pages: int = MAX_RESUME_PAGES, max_chars: int = MAX_RESUME_CHARS) -> str:
+    """
+    Extracts text from an uploaded PDF, DOCX or TXT file. CPU-bound: the API runs it in a
+    process pool. Pages and paragraphs are streamed and joined once.
+    """
+    if len(data) > MAX_RESUME_BYTES:
+        raise ResumeTooLargeError(f"Resume is {len(data)} bytes; the limit is {MAX_RESUME_BYTES} bytes")
+    if file_ext == ".pdf":
+        parts = iter_pdf_pages(data, max_pages)
+    elif file_ext in (".docx", ".doc"):
+        from docx import Document
+        parts = (paragraph.text for paragraph in Document(io.BytesIO(data)).paragraphs)
+    else:
+        return data.decode("utf-8", errors="replace")[:max_chars].strip()
+    return "\n".join(parts)[:max_chars].strip()
+
+@lru_cache(maxsize=1)
+def get_spacy_model():
+    """Loads the spaCy pipeline on first use (spaCy itself is imported lazily too)."""
+    import spacy
+    return spacy.load(SPACY_MODEL)
 
 def extract_contact_info(text: str) -> Dict[str, str]:
     email = re.findall(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", text)
@@ -11,7 +50,7 @@ def extract_contact_info(text: str) -> Dict[str, str]:
 
 def extract_education(text: str) -> List[Dict[str, str]]:
     education = []
-    doc = nlp(text)
+    doc = get_spacy_model()(text)
     for ent in doc.ents:
         if ent.label_ == "ORG" or ent.label_ == "GPE": # Simple heuristic for universities/locations
             # This is a very basic placeholder. More sophisticated NLP/regex needed for robust extraction.
@@ -50,7 +89,7 @@ def parse_resume(text: str) -> Dict[str, Any]:
     # Name extraction is tricky without a pre-trained model or strong heuristics.
     # For now, we'll leave it as None or try a very basic heuristic.
     name = None
-    doc = nlp(text)
+    doc = get_spacy_model()(text)
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             name = ent.text
@@ -18,6 +18,7 @@ load_dotenv()
 
 from packages.errors.custom_exceptions import JobApplierException
 from packages.utilities.logging_utils import setup_logging
+from packages.agents.resume_parser.resume_ingestion import shutdown_ingestion_pool
 
 limiter = RateLimiter(times=10, seconds=1)
 
@@ -45,6 +46,7 @@ async def lifespan(app: FastAPI):
     await FastAPILimiter.init(redis_connection)
     yield
     await FastAPILimiter.close()
+    shutdown_ingestion_pool()
 
 
 app = FastAPI(
@@ -19,6 +19,7 @@ from packages.notifications.notification_service import NotificationService
 from packages.database.config import get_db
 from packages.database.user_data_model import log_audit
 from apps.job_applier_agent.src.main import profile_update_counter
+from packages.agents.resume_parser.resume_ingestion import run_in_ingestion_pool
 from .resume_parser import ResumeParser, ParsedResume
 
 logger = logging.getLogger(__name__)
@@ -356,8 +357,8 @@ async def upload_resume(
         with open(file_location, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
-        resume_parser = ResumeParser()
-        parsed_data = resume_parser.parse_resume(file_location)
+        # PDF parsing is CPU-bound; run it in the shared ingestion process pool
+        parsed_data = await run_in_ingestion_pool(ResumeParser().parse_resume, file_location)
 
         # Update user profile with parsed data
         user = db.query(User).filter(User.id == current_user.id).first()
@@ -12,6 +12,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "../../.."))
 from packages.agents.resume_parser.resume_parser_agent import ResumeParserAgent
 from packages.database.config import SessionLocal
 from packages.agents.agent_manager import AgentManager
+from packages.agents.resume_parser.resume_cache import get_resume_parse_cache
 
 app = FastAPI(
     title="Resume Parser MCP Service",
@@ -195,6 +196,15 @@ async def get_pricing():
         "billing_cycle": "monthly"
     }
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Parsed-resume cache statistics for this process: hits per tier, misses and hit rate.
+    Repeat resumes are served from the cache without NLP; invalidate it with
+    `python -m packages.agents.resume_parser.resume_cache invalidate`.
+    """
+    return get_resume_parse_cache().stats()
+
 @app.get("/health")
 async def health_check():
     """
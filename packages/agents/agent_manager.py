@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from packages.agents.ats_scorer.ats_scorer_agent import ATSScorerAgent
 from packages.agents.application_automation.application_automation_agent import ApplicationAutomationAgent
 from packages.agents.cover_letter_generator.cover_letter_generator_agent import CoverLetterGeneratorAgent
-from packages.agents.job_matcher.job_matcher_agent import JobMatcherAgent
+from packages.agents.job_matcher.job_matcher_agent import DEFAULT_USER_ID, JobMatcherAgent
+from packages.agents.job_matcher.recommendation_store import get_recommendation_store
+from packages.agents.resume_parser.resume_cache import get_resume_parse_cache
 from packages.agents.resume_parser.resume_parser_agent import ResumeParserAgent
 from packages.agents.unicorn_agent.unicorn_agent import UnicornAgent
 
@@ -25,13 +27,13 @@ class AgentManager:
         """Returns an instance of CoverLetterGeneratorAgent."""
         return CoverLetterGeneratorAgent(self.db)
 
-    def get_job_matcher_agent(self) -> JobMatcherAgent:
-        """Returns an instance of JobMatcherAgent."""
-        return JobMatcherAgent(self.db)
+    def get_job_matcher_agent(self, user_id=DEFAULT_USER_ID) -> JobMatcherAgent:
+        """Returns an instance of JobMatcherAgent that stores ``user_id``'s matches in the process-wide recommendation store."""
+        return JobMatcherAgent(self.db, store=get_recommendation_store(), user_id=str(user_id))
 
     def get_resume_parser_agent(self) -> ResumeParserAgent:
-        """Returns an instance of ResumeParserAgent."""
-        return ResumeParserAgent(self.db)
+        """Returns an instance of ResumeParserAgent backed by the process-wide parsed-resume cache."""
+        return ResumeParserAgent(self.db, cache=get_resume_parse_cache())
 
     def get_unicorn_agent(self) -> UnicornAgent:
         """Returns an instance of UnicornAgent with its dependencies."""
@@ -0,0 +1,72 @@
+import logging
+from typing import Any, Dict, Optional
+
+from packages.utilities.cache_utils import TwoTierCache, get_redis_client
+
+# Bump whenever scoring logic, weights or report fields change; older cached
+# results become unreachable and are purged from Redis on the next startup.
+ATS_SCORER_VERSION = "2026.10-1"
+
+ATS_CACHE_NAMESPACE = "ats"
+ATS_CACHE_MAXSIZE = 2048
+ATS_CACHE_TTL = 24 * 3600  # seconds
+
+logger = logging.getLogger(__name__)
+
+_ats_result_cache: Optional[TwoTierCache] = None
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalizes a job description for cache keys. Keyword extraction is
+    case-insensitive, so case and surrounding whitespace do not affect scores.
+    """
+    return (job_description or "").strip().lower()
+
+
+def normalize_industry(industry: Optional[str]) -> str:
+    return (industry or "").strip().lower()
+
+
+def ats_cache_key(cache: TwoTierCache, scorer: str, resume: Any, job_description: str, industry: Optional[str] = None, **extra) -> str:
+    """
+    Builds the content-addressed key sha256(normalized resume, normalized JD, industry, scorer version).
+    ``scorer`` distinguishes the scoring implementation (e.g. the agent or the ATS service);
+    ``extra`` holds any other inputs that change the result (e.g. cover letter tone).
+    The resume is hashed verbatim (dicts with sorted keys) because formatting checks
+    depend on its exact layout.
+    """
+    return cache.make_key(
+        scorer,
+        resume,
+        normalize_job_description(job_description),
+        normalize_industry(industry),
+        extra,
+    )
+
+
+def configure_ats_result_cache(redis_client=None, maxsize: int = ATS_CACHE_MAXSIZE, ttl: int = ATS_CACHE_TTL) -> TwoTierCache:
+    """
+    Replaces the process-wide ATS result cache, e.g. to attach the Redis client a service
+    already configures. Stale Redis entries from older scorer versions are invalidated.
+    """
+    global _ats_result_cache
+    _ats_result_cache = TwoTierCache(
+        ATS_CACHE_NAMESPACE, ATS_SCORER_VERSION, maxsize=maxsize, ttl=ttl, redis_client=redis_client
+    )
+    if _ats_result_cache.ensure_version():
+        logger.info(f"ATS scorer version changed to {ATS_SCORER_VERSION}; cached scores invalidated.")
+    return _ats_result_cache
+
+
+def get_ats_result_cache() -> TwoTierCache:
+    """Returns the process-wide ATS result cache, creating it from the environment on first use."""
+    if _ats_result_cache is None:
+        return configure_ats_result_cache(redis_client=get_redis_client())
+    return _ats_result_cache
+
+
+def invalidate_ats_result_cache() -> Dict[str, Any]:
+    """Drops every cached ATS result (all scorer versions) from both tiers."""
+    deleted = get_ats_result_cache().invalidate()
+    return {"namespace": ATS_CACHE_NAMESPACE, "version": ATS_SCORER_VERSION, "deleted": deleted}
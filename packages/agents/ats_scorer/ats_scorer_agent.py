@@ -1,14 +1,21 @@
+import copy
+import heapq
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from packages.common_types.common_types import ResumeData
+from packages.agents.ats_scorer.ats_cache import ats_cache_key, get_ats_result_cache
 from packages.agents.ats_scorer.ats_utils import (
     extract_keywords,
+    extract_keywords_batch,
+    count_section_keywords,
+    keyword_frequency,
     calculate_keyword_score_and_density,
     identify_optimization_opportunities,
     predict_success_probability,
     check_ats_unfriendly_formatting,
     get_industry_weights,
     benchmark_score,
+    get_keyword_matcher,
 )
 
 
@@ -19,8 +26,10 @@ class ATSScorerAgent:
               identifies optimization opportunities, and predicts application success.
     """
 
-    def __init__(self, db=None):
+    def __init__(self, db=None, cache=None):
         self.db = db # Keep db for consistency, though not directly used in this simplified version
+        # Content-addressed result cache shared by every agent instance in the process
+        self.cache = cache if cache is not None else get_ats_result_cache()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.info("ATSScorerAgent initialized.")
 
@@ -31,21 +40,88 @@ class ATSScorerAgent:
         [CONTEXT] Analyzes the resume and job description to calculate an ATS compatibility score,
                   identify optimization opportunities, and predict success probability.
         [PURPOSE] Returns a comprehensive report including score, opportunities, and prediction.
+                  Scores are deterministic, so repeat requests are served from the result cache.
         """
+        cache_key = ats_cache_key(self.cache, "agent", resume_data, job_description, industry)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.logger.info("ATS score served from cache.")
+            return copy.deepcopy(cached)
+
         self.logger.info("Starting ATS scoring process.")
 
         # 1. Extract keywords from job description
         job_keywords = extract_keywords(job_description)
 
         # 2. Simulate keyword density and matching
-        # Enhanced: Use structured data and get density and underrepresented keywords
-        keyword_score, missing_keywords, keyword_density, underrepresented_keywords = calculate_keyword_score_and_density(
-            resume_data, job_keywords
-        )
+        # Each section is tokenized once; all keyword terms below reuse these counters
+        section_counts = count_section_keywords(resume_data, job_keywords)
 
         # 3. Simulate formatting and structure score
-        # Formatting checks
         formatting_result = check_ats_unfriendly_formatting(resume_data.get('raw_text', ''))
+
+        result = self._score_from_counts(
+            resume_data, job_keywords, section_counts, formatting_result, industry
+        )
+        self.logger.info(f"ATS scoring completed. Overall Score: {result['overall_ats_score']:.2f}")
+        self.cache.set(cache_key, copy.deepcopy(result))
+        return result
+
+    def score_ats_batch(
+        self,
+        resume_data: ResumeData,
+        job_descriptions: List[str],
+        industry: str = None,
+        top_k: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        [CONTEXT] Scores one resume against many job descriptions in a single call.
+        [PURPOSE] Tokenizes and indexes the resume once (keyword counters over the whole
+                  vocabulary plus the formatting check) and only runs keyword extraction
+                  per job description. Returns one report per job, in request order, each
+                  tagged with its ``job_index``; with ``top_k`` only the k best-scoring
+                  reports are kept (still in request order).
+        """
+        self.logger.info(f"Starting batch ATS scoring for {len(job_descriptions)} job descriptions.")
+
+        # Resume-side work is independent of the job: counts cover every vocabulary keyword,
+        # so each job's keyword subset reads straight from the same counters.
+        matcher = get_keyword_matcher()
+        section_counts = count_section_keywords(resume_data, list(matcher.keywords))
+        formatting_result = check_ats_unfriendly_formatting(resume_data.get('raw_text', ''))
+
+        results = []
+        for index, job_keywords in enumerate(extract_keywords_batch(job_descriptions)):
+            result = self._score_from_counts(
+                resume_data, job_keywords, section_counts, formatting_result, industry
+            )
+            result["job_index"] = index
+            results.append(result)
+
+        if top_k is not None and top_k < len(results):
+            best = heapq.nlargest(max(top_k, 0), results, key=lambda r: r["overall_ats_score"])
+            kept = {r["job_index"] for r in best}
+            results = [r for r in results if r["job_index"] in kept]
+
+        self.logger.info(f"Batch ATS scoring completed. Returned {len(results)} results.")
+        return results
+
+    def _score_from_counts(
+        self,
+        resume_data: ResumeData,
+        job_keywords: List[str],
+        section_counts: Dict[str, Any],
+        formatting_result: Dict[str, Any],
+        industry: str = None,
+    ) -> Dict[str, Any]:
+        """
+        [CONTEXT] Builds the ATS report from precomputed keyword counters and formatting checks.
+        [PURPOSE] Shared scoring core for ``score_ats`` and ``score_ats_batch``.
+        """
+        # Enhanced: Use structured data and get density and underrepresented keywords
+        keyword_score, missing_keywords, keyword_density, underrepresented_keywords = calculate_keyword_score_and_density(
+            resume_data, job_keywords, section_counts
+        )
         formatting_score = formatting_result['formatting_score']
 
         # Combine scores (weights can be adjusted)
@@ -57,11 +133,11 @@ class ATSScorerAgent:
             keyword_score * weights.get('keywords', 0.7)
             + formatting_score * weights.get('formatting', 0.3)
             + sum([
-                (sum([resume_data.get('skills', []).count(k) for k in job_keywords]) / max(1, len(job_keywords))) * weights.get('skills', 0)
+                keyword_frequency(section_counts['skill_entries'], job_keywords) * weights.get('skills', 0)
                 if 'skills' in weights else 0,
-                (sum([str(exp.get('description', '')).lower().count(k.lower()) for exp in resume_data.get('experience', []) if isinstance(exp, dict) for k in job_keywords]) / max(1, len(job_keywords))) * weights.get('experience', 0)
+                keyword_frequency(section_counts['experience_descriptions'], job_keywords) * weights.get('experience', 0)
                 if 'experience' in weights else 0,
-                (sum([resume_data.get('summary', '').lower().count(k.lower()) for k in job_keywords]) / max(1, len(job_keywords))) * weights.get('summary', 0)
+                keyword_frequency(section_counts['summary'], job_keywords) * weights.get('summary', 0)
                 if 'summary' in weights else 0,
                 (len(resume_data.get('certifications', [])) / 3.0) * weights.get('certifications', 0)
                 if 'certifications' in weights else 0,
@@ -78,8 +154,6 @@ class ATSScorerAgent:
         success_probability = predict_success_probability(overall_score)
         percentile = benchmark_score(overall_score, industry)
 
-        self.logger.info(f"ATS scoring completed. Overall Score: {overall_score:.2f}")
-
         return {
             "overall_ats_score": overall_score,
             "keyword_score": round(keyword_score * 100, 2),
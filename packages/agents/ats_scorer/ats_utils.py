@@ -1,6 +1,150 @@
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, Any, Tuple
-import re
+
+from packages.utilities.ats_benchmarks.score_distribution import percentile_label
+
+
+COMMON_TECH_KEYWORDS = (
+    "python",
+    "java",
+    "javascript",
+    "c++",
+    "c#",
+    "go",
+    "ruby",
+    "php",
+    "sql",
+    "nosql",
+    "mongodb",
+    "postgresql",
+    "mysql",
+    "aws",
+    "azure",
+    "google cloud",
+    "cloud computing",
+    "data science",
+    "machine learning",
+    "artificial intelligence",
+    "deep learning",
+    "web development",
+    "frontend",
+    "backend",
+    "fullstack",
+    "devops",
+    "agile",
+    "scrum",
+    "project management",
+    "api",
+    "rest",
+    "graphql",
+    "docker",
+    "kubernetes",
+    "ci/cd",
+    "git",
+    "github",
+    "gitlab",
+    "react",
+    "angular",
+    "vue",
+    "node.js",
+    "django",
+    "flask",
+    "spring",
+    "linux",
+    "windows",
+    "macos",
+    "cybersecurity",
+    "networking",
+    "communication",
+    "leadership",
+    "teamwork",
+    "problem-solving",
+    "analytical",
+)
+
+
+class KeywordMatcher:
+    """
+    [CONTEXT] Multi-pattern matcher over a fixed keyword vocabulary.
+    [PURPOSE] Finds every keyword hit in a single scan of the text instead of one
+              regex compile and one full-text search per keyword.
+
+    All keywords are folded into one alternation wrapped in a lookahead, so the
+    regex engine visits each position once and reports overlapping hits (e.g.
+    "google cloud" and "cloud computing" in "google cloud computing"). Longer
+    keywords are tried first; shorter keywords that are prefixes of a longer one
+    and would also match at the same position are checked explicitly.
+    Matching keeps the ``\\b<keyword>\\b`` semantics of the original per-keyword
+    patterns and is case-insensitive (text and keywords are lowercased).
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        alternation = "|".join(re.escape(k) for k in ordered)
+        self._pattern = (
+            re.compile(r"(?=\b(" + alternation + r")\b)") if ordered else None
+        )
+        self._prefix_patterns = {}
+        for keyword in ordered:
+            prefixes = [
+                (other, re.compile(r"\b" + re.escape(other) + r"\b"))
+                for other in ordered
+                if other != keyword and keyword.startswith(other)
+            ]
+            if prefixes:
+                self._prefix_patterns[keyword] = prefixes
+
+    def count(self, text: str) -> Counter:
+        """
+        [CONTEXT] Counts occurrences of every vocabulary keyword in ``text``.
+        [PURPOSE] Term frequencies for matching and density scoring in one pass.
+        """
+        counts = Counter()
+        if not text or self._pattern is None:
+            return counts
+        text_lower = text.lower()
+        for match in self._pattern.finditer(text_lower):
+            keyword = match.group(1)
+            counts[keyword] += 1
+            for other, pattern in self._prefix_patterns.get(keyword, ()):
+                if pattern.match(text_lower, match.start()):
+                    counts[other] += 1
+        return counts
+
+    def find(self, text: str) -> set:
+        """
+        [CONTEXT] Returns the set of vocabulary keywords present in ``text``.
+        [PURPOSE] Presence-only variant of ``count``.
+        """
+        return set(self.count(text))
+
+
+_default_matcher = None
+
+
+def get_keyword_matcher(keywords=None) -> KeywordMatcher:
+    """
+    [CONTEXT] Returns a shared, lazily built ``KeywordMatcher``.
+    [PURPOSE] Compiles the default vocabulary automaton once per process; custom
+              keyword lists that fit inside the vocabulary reuse it as well.
+    """
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = KeywordMatcher(COMMON_TECH_KEYWORDS)
+    if keywords is None:
+        return _default_matcher
+    normalized = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+    if all(k in _default_matcher.keywords for k in normalized):
+        return _default_matcher
+    return _build_keyword_matcher(normalized)
+
+
+@lru_cache(maxsize=256)
+def _build_keyword_matcher(keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
 
 
 def extract_keywords(text: str) -> list:
@@ -8,74 +152,16 @@ def extract_keywords(text: str) -> list:
     [CONTEXT] Extracts potential keywords from a given text.
     [PURPOSE] Identifies important terms for ATS matching.
     """
-    common_tech_keywords = [
-        "python",
-        "java",
-        "javascript",
-        "c++",
-        "c#",
-        "go",
-        "ruby",
-        "php",
-        "sql",
-        "nosql",
-        "mongodb",
-        "postgresql",
-        "mysql",
-        "aws",
-        "azure",
-        "google cloud",
-        "cloud computing",
-        "data science",
-        "machine learning",
-        "artificial intelligence",
-        "deep learning",
-        "web development",
-        "frontend",
-        "backend",
-        "fullstack",
-        "devops",
-        "agile",
-        "scrum",
-        "project management",
-        "api",
-        "rest",
-        "graphql",
-        "docker",
-        "kubernetes",
-        "ci/cd",
-        "git",
-        "github",
-        "gitlab",
-        "react",
-        "angular",
-        "vue",
-        "node.js",
-        "django",
-        "flask",
-        "spring",
-        "linux",
-        "windows",
-        "macos",
-        "cybersecurity",
-        "networking",
-        "communication",
-        "leadership",
-        "teamwork",
-        "problem-solving",
-        "analytical",
-    ]
-    extracted = []
-    text_lower = text.lower()
-    # Pre-compile regex patterns for efficiency
-    compiled_patterns = [
-        re.compile(r"\b" + re.escape(keyword) + r"\b")
-        for keyword in common_tech_keywords
-    ]
-    for i, keyword in enumerate(common_tech_keywords):
-        if compiled_patterns[i].search(text_lower):
-            extracted.append(keyword)
-    return list(set(extracted))
+    return list(get_keyword_matcher().find(text))
+
+
+def extract_keywords_batch(texts: list) -> list:
+    """
+    [CONTEXT] Extracts keywords from many texts with one shared matcher.
+    [PURPOSE] Batch counterpart of ``extract_keywords``; results follow input order.
+    """
+    matcher = get_keyword_matcher()
+    return [list(matcher.find(text)) for text in texts]
 
 
 def calculate_keyword_score(resume_text: str, job_keywords: list) -> Tuple[float, list]:
@@ -86,21 +172,9 @@ def calculate_keyword_score(resume_text: str, job_keywords: list) -> Tuple[float
     if not job_keywords:
         return 0.0, []
 
-    matched_keywords = []
-    missing_keywords = []
-
-    resume_text_lower = resume_text.lower()
-    # Pre-compile regex patterns for efficiency
-    compiled_patterns = [
-        re.compile(r"\b" + re.escape(keyword) + r"\b")
-        for keyword in job_keywords
-    ]
-
-    for i, keyword in enumerate(job_keywords):
-        if compiled_patterns[i].search(resume_text_lower):
-            matched_keywords.append(keyword)
-        else:
-            missing_keywords.append(keyword)
+    found = get_keyword_matcher(job_keywords).find(resume_text)
+    matched_keywords = [k for k in job_keywords if k.lower() in found]
+    missing_keywords = [k for k in job_keywords if k.lower() not in found]
 
     score = len(matched_keywords) / len(job_keywords)
     return score, missing_keywords
@@ -183,43 +257,68 @@ def predict_success_probability(ats_score: float) -> str:
         return "Low (Poor ATS match, significant optimization needed)"
 
 
-def calculate_keyword_score_and_density(resume_data: dict, job_keywords: list) -> tuple:
+def count_section_keywords(resume_data: dict, job_keywords: list) -> Dict[str, Counter]:
+    """
+    Tokenizes each resume section once and returns per-section keyword term frequencies.
+    Sections: 'skills', 'experience_titles', 'experience_descriptions', 'summary',
+    'raw_text', plus the derived 'experience' (titles + descriptions) and 'full' totals.
+    Counters are keyed by lowercased keyword. 'skill_entries' counts whole skill list
+    entries verbatim, for exact skill-to-keyword matches.
+    """
+    matcher = get_keyword_matcher(job_keywords)
+    experience = [exp for exp in resume_data.get('experience', []) if isinstance(exp, dict)]
+    counts = {
+        'skills': matcher.count(' '.join(resume_data.get('skills', []))),
+        'experience_titles': matcher.count(' '.join(str(exp.get('title', '')) for exp in experience)),
+        'experience_descriptions': matcher.count(
+            ' '.join(str(exp.get('description', '')) for exp in experience)
+        ),
+        'summary': matcher.count(resume_data.get('summary', '')),
+        'raw_text': matcher.count(resume_data.get('raw_text', '')),
+        'skill_entries': Counter(resume_data.get('skills', [])),
+    }
+    counts['experience'] = counts['experience_titles'] + counts['experience_descriptions']
+    counts['full'] = counts['skills'] + counts['experience'] + counts['summary'] + counts['raw_text']
+    return counts
+
+
+def keyword_frequency(counts: Counter, job_keywords: list) -> float:
+    """
+    Average occurrences per job keyword within one section counter.
+    """
+    return sum(counts[k.lower()] for k in job_keywords) / max(1, len(job_keywords))
+
+
+def calculate_keyword_score_and_density(
+    resume_data: dict, job_keywords: list, section_counts: Dict[str, Counter] = None
+) -> tuple:
     """
     Calculates keyword matching score, missing keywords, and keyword density.
     Weights skills, experience, and summary separately.
     Also highlights underrepresented keywords (present only once).
+    Pass ``section_counts`` from ``count_section_keywords`` to reuse an existing pass.
     """
     if not job_keywords:
         return 0.0, [], {}, []
 
-    # Gather text from relevant sections
-    skills_text = ' '.join(resume_data.get('skills', []))
-    experience_text = ' '.join([
-        (exp.get('title', '') + ' ' + exp.get('description', ''))
-        for exp in resume_data.get('experience', []) if isinstance(exp, dict)
-    ])
-    summary_text = resume_data.get('summary', '')
-    raw_text = resume_data.get('raw_text', '')
-    full_text = f"{skills_text} {experience_text} {summary_text} {raw_text}"
-    full_text_lower = full_text.lower()
-
-    matched_keywords = []
+    if section_counts is None:
+        section_counts = count_section_keywords(resume_data, job_keywords)
+    full_counts = section_counts['full']
+
     missing_keywords = []
     keyword_density = {}
     underrepresented_keywords = []
     for keyword in job_keywords:
-        count = full_text_lower.count(keyword.lower())
+        count = full_counts[keyword.lower()]
         keyword_density[keyword] = count
-        if count > 0:
-            matched_keywords.append(keyword)
-            if count == 1:
-                underrepresented_keywords.append(keyword)
-        else:
+        if count == 0:
             missing_keywords.append(keyword)
+        elif count == 1:
+            underrepresented_keywords.append(keyword)
     # Weight: skills 0.5, experience 0.3, summary 0.2
-    skills_score = sum([skills_text.lower().count(k.lower()) for k in job_keywords]) / max(1, len(job_keywords))
-    experience_score = sum([experience_text.lower().count(k.lower()) for k in job_keywords]) / max(1, len(job_keywords))
-    summary_score = sum([summary_text.lower().count(k.lower()) for k in job_keywords]) / max(1, len(job_keywords))
+    skills_score = keyword_frequency(section_counts['skills'], job_keywords)
+    experience_score = keyword_frequency(section_counts['experience'], job_keywords)
+    summary_score = keyword_frequency(section_counts['summary'], job_keywords)
     score = 0.5 * skills_score + 0.3 * experience_score + 0.2 * summary_score
     score = min(score, 1.0)
     return score, missing_keywords, keyword_density, underrepresented_keywords
@@ -280,22 +379,7 @@ def get_industry_weights(industry: str) -> dict:
 
 def benchmark_score(score: float, industry: str = None) -> str:
     """
-    Simulate benchmarking by returning a percentile string based on score, with more granularity.
+    Return a benchmark percentile string for the score, ranked against the precomputed
+    per-industry score distribution. Deterministic: identical inputs give identical output.
     """
-    import random
-    # Add a small random noise to simulate real-world variation
-    score = score + random.uniform(-2, 2)
-    if score >= 95:
-        return 'Top 2%'
-    elif score >= 90:
-        return 'Top 5%'
-    elif score >= 80:
-        return 'Top 10%'
-    elif score >= 70:
-        return 'Top 20%'
-    elif score >= 60:
-        return 'Top 30%'
-    elif score >= 50:
-        return 'Top 40%'
-    else:
-        return 'Below 40%'
+    return percentile_label(score, industry)
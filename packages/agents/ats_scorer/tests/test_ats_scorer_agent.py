@@ -1,4 +1,6 @@
 import unittest
+from unittest import mock
+import pytest
 import os
 import sys
 
@@ -11,7 +13,17 @@ print(f"Current Working Directory: {os.getcwd()}")
 print(f"Sys Path: {sys.path}")
 
 from packages.agents.ats_scorer.ats_scorer_agent import ATSScorerAgent
+from packages.agents.ats_scorer.ats_utils import (
+    KeywordMatcher,
+    benchmark_score,
+    calculate_keyword_score,
+    calculate_keyword_score_and_density,
+    count_section_keywords,
+    extract_keywords,
+)
 from packages.common_types.common_types import ResumeData
+from packages.utilities.ats_benchmarks import score_distribution
+from packages.utilities.cache_utils import LRUCache, TwoTierCache
 
 class TestATSScorerAgent(unittest.TestCase):
 
@@ -82,6 +94,164 @@ class TestATSScorerAgent(unittest.TestCase):
         self.assertGreaterEqual(result['keyword_density'].get('python', 0), 1)
         # Check percentile is a known value
         self.assertIn(result['benchmark_percentile'], ['Top 5%', 'Top 10%', 'Top 20%', 'Top 40%', 'Below 40%'])
+    def test_score_ats_batch_matches_single_scoring(self):
+        resume_data = ResumeData(
+            raw_text="Python developer\n- AWS\n- Docker\n- SQL",
+            summary="Python and AWS engineer",
+            skills=["python", "docker"],
+        )
+        job_descriptions = [
+            "Python developer with AWS",
+            "Java and Kubernetes engineer",
+            "Docker, SQL and Python",
+        ]
+        results = self.agent.score_ats_batch(resume_data, job_descriptions, industry="tech")
+        self.assertEqual([r['job_index'] for r in results], [0, 1, 2])
+        for job_description, result in zip(job_descriptions, results):
+            single = self.agent.score_ats(resume_data, job_description, industry="tech")
+            self.assertEqual(result['overall_ats_score'], single['overall_ats_score'])
+            self.assertEqual(result['keyword_density'], single['keyword_density'])
+
+    def test_score_ats_batch_top_k_keeps_request_order(self):
+        resume_data = ResumeData(raw_text="Python, Docker and SQL", summary="Python, Docker and SQL")
+        job_descriptions = ["Java", "Python Docker SQL", "Ruby", "Python"]
+        results = self.agent.score_ats_batch(resume_data, job_descriptions, top_k=2)
+        self.assertEqual([r['job_index'] for r in results], [1, 3])
+
+    def test_score_ats_is_deterministic(self):
+        resume_data = ResumeData(raw_text="Python developer", summary="Python and AWS")
+        first = self.agent.score_ats(resume_data, "Python and AWS developer", industry="tech")
+        second = self.agent.score_ats(resume_data, "Python and AWS developer", industry="tech")
+        self.assertEqual(first, second)
+
+
+@pytest.mark.usefixtures("fake_redis")
+class TestATSResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TwoTierCache("ats-test", "1", maxsize=8, ttl=60)
+        self.agent = ATSScorerAgent(cache=self.cache)
+        self.resume_data = ResumeData(raw_text="Python developer", summary="Python and AWS")
+
+    def test_repeat_scoring_hits_cache(self):
+        first = self.agent.score_ats(self.resume_data, "Python and AWS developer", industry="Tech")
+        first["overall_ats_score"] = -1
+        with mock.patch('packages.agents.ats_scorer.ats_scorer_agent.count_section_keywords') as counter:
+            second = self.agent.score_ats(self.resume_data, "  python and aws developer ", industry="tech")
+            counter.assert_not_called()
+        self.assertNotEqual(second["overall_ats_score"], -1)
+        self.assertEqual(len(self.cache.memory), 1)
+
+    def test_version_change_misses(self):
+        self.agent.score_ats(self.resume_data, "Python developer")
+        newer = ATSScorerAgent(cache=TwoTierCache("ats-test", "2", maxsize=8, ttl=60))
+        self.assertNotEqual(
+            self.cache.make_key("agent", self.resume_data), newer.cache.make_key("agent", self.resume_data)
+        )
+
+    def test_version_change_keeps_previous_version_during_deploy(self):
+        caches = {v: TwoTierCache("ats-test", v, ttl=60, redis_client=self.fake_redis) for v in "123"}
+        key = lambda cache: cache.make_key("resume", "jd")
+        self.assertFalse(caches["1"].ensure_version())
+        for cache in caches.values():
+            cache.set(key(cache), {"version": cache.version})
+            cache.memory.clear()
+        self.assertTrue(caches["2"].ensure_version())
+        self.assertFalse(caches["1"].ensure_version())  # an old worker restarting mid-deploy
+        self.assertEqual([caches[v].get(key(caches[v])) for v in "12"], [{"version": "1"}, {"version": "2"}])
+        caches["1"].memory.clear()
+        self.assertTrue(caches["3"].ensure_version())
+        self.assertIsNone(caches["1"].get(key(caches["1"])))
+        self.assertEqual(caches["2"].get(key(caches["2"])), {"version": "2"})
+
+    def test_invalidate_keeps_registered_versions(self):
+        caches = {v: TwoTierCache("ats-test", v, ttl=60, redis_client=self.fake_redis) for v in "123"}
+        key = lambda cache: cache.make_key("resume", "jd")
+        caches["1"].ensure_version()
+        caches["2"].ensure_version()
+        self.assertEqual(caches["2"].invalidate(), 0)
+        caches["2"].set(key(caches["2"]), {"version": "2"})
+        self.assertFalse(caches["1"].ensure_version())  # still registered, not the newest version
+        caches["3"].ensure_version()
+        caches["2"].memory.clear()
+        self.assertEqual(caches["2"].get(key(caches["2"])), {"version": "2"})
+
+    def test_lru_bounds_and_ttl(self):
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), 1)
+        lru.set("d", 4, ttl=0)
+        self.assertIsNone(lru.get("d"))
+
+
+class TestBenchmarkScore(unittest.TestCase):
+
+    def test_benchmark_score_is_a_pure_function(self):
+        for score in (12.0, 49.99, 50.0, 72.5, 89.0, 96.0):
+            self.assertEqual(benchmark_score(score, "tech"), benchmark_score(score, "tech"))
+
+    def test_fallback_bands_without_distribution(self):
+        with mock.patch.object(score_distribution, 'load_score_distributions', return_value={"default": (10.0, 90.0)}):
+            self.assertEqual(benchmark_score(96.0), 'Top 2%')
+            self.assertEqual(benchmark_score(65.0), 'Top 30%')
+            self.assertEqual(benchmark_score(10.0), 'Below 40%')
+
+    def test_distribution_bisect(self):
+        scores = tuple(float(s) for s in range(100))
+        distributions = {"default": scores, "tech": scores[50:]}
+        with mock.patch.object(score_distribution, 'load_score_distributions', return_value=distributions):
+            self.assertEqual(score_distribution.fraction_above(98.5), 0.01)
+            self.assertEqual(benchmark_score(98.5), 'Top 2%')
+            self.assertEqual(benchmark_score(85.0), 'Top 20%')
+            self.assertEqual(benchmark_score(85.0, "tech"), 'Top 30%')
+            self.assertEqual(benchmark_score(20.0), 'Below 40%')
+
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def test_extract_keywords_respects_word_boundaries(self):
+        keywords = extract_keywords("Go and GitHub experience; good at Javanese and Java.")
+        self.assertIn('go', keywords)
+        self.assertIn('github', keywords)
+        self.assertIn('java', keywords)
+        self.assertNotIn('git', keywords)
+        self.assertNotIn('javascript', keywords)
+
+    def test_overlapping_and_prefix_keywords(self):
+        matcher = KeywordMatcher(["google cloud", "cloud computing", "machine", "machine learning"])
+        counts = matcher.count("Google Cloud computing and machine learning")
+        self.assertEqual(counts['google cloud'], 1)
+        self.assertEqual(counts['cloud computing'], 1)
+        self.assertEqual(counts['machine learning'], 1)
+        self.assertEqual(counts['machine'], 1)
+
+    def test_calculate_keyword_score_is_case_insensitive(self):
+        score, missing = calculate_keyword_score("Python and Docker", ["Python", "docker", "aws"])
+        self.assertAlmostEqual(score, 2 / 3)
+        self.assertEqual(missing, ["aws"])
+
+    def test_section_counts_feed_density(self):
+        resume_data = ResumeData(
+            raw_text="Python developer",
+            summary="Python and AWS",
+            skills=["Python", "Docker"],
+            experience=[{"title": "Python Engineer", "description": "Shipped Docker images on AWS"}],
+        )
+        counts = count_section_keywords(resume_data, ["python", "aws", "docker", "sql"])
+        self.assertEqual(counts['skills']['python'], 1)
+        self.assertEqual(counts['experience']['aws'], 1)
+        self.assertEqual(counts['experience_descriptions']['python'], 0)
+        self.assertEqual(counts['full']['python'], 4)
+        score, missing, density, underrepresented = calculate_keyword_score_and_density(
+            resume_data, ["python", "aws", "docker", "sql"], counts
+        )
+        self.assertEqual(missing, ["sql"])
+        self.assertEqual(density["docker"], 2)
+        self.assertEqual(underrepresented, [])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,370 @@
+import heapq
+import itertools
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from packages.agents.job_matcher.job_matcher_agent import refresh_user_skills, score_job, user_match_context
+from packages.agents.job_matcher.job_matcher_utils import MAX_PREFERENCE_SCORE, parse_salary_range
+from packages.agents.job_matcher.recommendation_store import DEFAULT_TOP_K, RecommendationStore
+from packages.common_types.records import JobRecord
+from packages.utilities.cache_utils import content_hash
+from packages.utilities.location_index import get_location_index
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+MIN_MATCH_SCORE = 50
+
+Key = Tuple[Any, ...]
+
+
+def _details() -> Dict[str, Any]:
+    return {"missing_skills": [], "missing_qualifications": [], "opportunity_score": 0, "culture_score": 0}
+
+
+def _location_keys(place_id: Optional[int], user_side: bool) -> Set[Key]:
+    """
+    Posting keys of a resolved place. A preferred place W and a job place P share a key exactly when
+    LocationIndex.match_level(W, P) is not NO_MATCH: W is P, contains P or is near P (("at", W));
+    P contains W (("in", P)); or both lie in the same region (("region", r)).
+    """
+    if place_id is None:
+        return set()
+    index = get_location_index()
+    place = index.places[place_id]
+    if user_side:
+        keys = {("at", place_id), ("in", place.region_id), ("in", place.country_id), ("region", place.region_id)}
+    else:
+        keys = {("at", place_id), ("at", place.region_id), ("at", place.country_id), ("in", place_id), ("region", place.region_id)}
+        keys.update(("at", nearby) for nearby in index.nearby(place_id))
+    return {key for key in keys if key[1] is not None}
+
+
+def _skill_keys(skill_bits: int) -> Set[Key]:
+    keys = set()
+    while skill_bits:
+        low = skill_bits & -skill_bits
+        keys.add(("skill", low.bit_length() - 1))
+        skill_bits ^= low
+    return keys
+
+
+def user_keys(user: Mapping[str, Any]) -> Set[Key]:
+    """Index keys of a user match context: skills, preferred places and location strings, remote."""
+    keys = _skill_keys(user["skill_bits"])
+    preferences = user["preferences"]
+    locations = preferences.get("job_locations", [])
+    if locations:
+        index = get_location_index()
+        for location in locations:
+            keys.add(("text", location))
+            keys |= _location_keys(index.resolve(location), user_side=True)
+        if preferences.get("remote") or "remote" in [l.lower() for l in locations]:
+            keys.add(("remote",))
+    return keys
+
+
+def job_keys(job: Mapping[str, Any]) -> Set[Key]:
+    """Index keys of a job; a user can only get skill or location points from a job sharing a key."""
+    skill_bits = job.get("skill_bits")
+    if skill_bits is None:
+        skill_bits = get_skill_vocabulary().encode(job.get("required_skills", []), add=True)
+    keys = _skill_keys(skill_bits)
+    location = job.get("location", "")
+    if location:
+        location_id = job.get("location_id")
+        keys.add(("text", location))
+        keys |= _location_keys(location_id if location_id is not None else get_location_index().resolve(location), user_side=False)
+    if job.get("remote") or (location and ("remote" in location.lower() or "hybrid" in location.lower())):
+        keys.add(("remote",))
+    return keys
+
+
+def unindexed_score_bound(user: Mapping[str, Any]) -> int:
+    """
+    Highest score a user can reach on a job sharing no index key (no skill or location points):
+    full experience, education if the user has any, the non-location preference parts the
+    user has set, and culture.
+    """
+    preferences = user["preferences"]
+    preference = (
+        (MAX_PREFERENCE_SCORE * 0.3 if preferences.get("job_types") else 0)
+        + (MAX_PREFERENCE_SCORE * 0.2 if parse_salary_range(preferences.get("salary_range")) is not None else 0)
+        + (MAX_PREFERENCE_SCORE * 0.1 if preferences.get("remote") is not None else 0)
+    )
+    bound = 20 + (15 if user["education"] else 0) + min(preference, MAX_PREFERENCE_SCORE) + (10 if user["culture"] else 0)
+    return round(bound)
+
+
+@dataclass
+class _UserEntry:
+    digest: str
+    context: Dict[str, Any]
+    keys: FrozenSet[Key]
+    bound: int
+    heap: List[Tuple[int, float, int, Any]] = field(default_factory=list)  # (score, opportunity, -seq, job id), worst first
+
+
+@dataclass
+class _JobEntry:
+    digest: str
+    job: Mapping[str, Any]
+    keys: FrozenSet[Key]
+    seq: int
+
+
+class IncrementalMatcher:
+    """
+    [CONTEXT] Incremental many-users x many-jobs matching for the orchestration service.
+    [PURPOSE] Keeps every active user's top-k matches up to date without re-scoring all pairs:
+              users and jobs are indexed by skill, preferred place and remote keys, a new job is
+              scored only against users sharing a key with it (plus the few users whose
+              non-key score bound could still enter their top-k), and per-user heaps are updated
+              in place. Results equal JobMatcherAgent.match_jobs over all stored jobs. Every heap
+              change is written through to a RecommendationStore, which serves top_matches.
+
+    Args:
+        top_k: Matches kept per user.
+        min_score: Minimum compatibility score of a match (as in match_jobs).
+        store: Where each user's top-k matches are persisted (default: an in-process store).
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K, min_score: int = MIN_MATCH_SCORE,
+                 store: Optional[RecommendationStore] = None):
+        self.top_k = top_k
+        self.min_score = min_score
+        self.store = store or RecommendationStore(top_k)
+        self._users: Dict[str, _UserEntry] = {}
+        self._jobs: Dict[Any, _JobEntry] = {}
+        self._users_by_key: Dict[Key, Set[str]] = {}
+        self._jobs_by_key: Dict[Key, Set[Any]] = {}
+        self._holders: Dict[Any, Set[str]] = {}  # job id -> users whose heap holds it
+        self._open_users: Set[str] = set()  # users a job sharing no key could still enter the top-k of
+        self._users_with_unknown_skills: Set[str] = set()  # profile skills not (yet) in the skill vocabulary
+        self._vocabulary_size = 0
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self.stats: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def user_count(self) -> int:
+        return len(self._users)
+
+    def user_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._users)
+
+    # Users --------------------------------------------------------------
+
+    def upsert_user(self, user_id: str, profile: Dict[str, Any]) -> bool:
+        """Adds or updates a user and rebuilds their top-k; returns False if the profile is unchanged."""
+        digest = content_hash(profile)
+        with self._lock:
+            current = self._users.get(user_id)
+            if current is not None and current.digest == digest:
+                return False
+            if current is not None:
+                self.remove_user(user_id)
+            context = user_match_context(profile)
+            entry = _UserEntry(digest, context, frozenset(user_keys(context)), unindexed_score_bound(context))
+            self._users[user_id] = entry
+            for key in entry.keys:
+                self._users_by_key.setdefault(key, set()).add(user_id)
+            if context["unknown_skills"]:
+                self._users_with_unknown_skills.add(user_id)
+            # With no jobs indexed yet (a fresh worker), keep the stored matches instead of wiping them
+            self._rematch_user(user_id, write=bool(self._jobs) or current is not None)
+            return True
+
+    def remove_user(self, user_id: str) -> None:
+        with self._lock:
+            entry = self._users.pop(user_id, None)
+            if entry is None:
+                return
+            for key in entry.keys:
+                self._discard(self._users_by_key, key, user_id)
+            for _, _, _, job_id in entry.heap:
+                self._discard(self._holders, job_id, user_id)
+            self._open_users.discard(user_id)
+            self._users_with_unknown_skills.discard(user_id)
+            self.store.clear(user_id)
+
+    def _rematch_user(self, user_id: str, write: bool = True) -> None:
+        """Rebuilds one user's heap from the stored jobs that can reach it (and, with ``write``, their stored matches)."""
+        entry = self._users[user_id]
+        for _, _, _, job_id in entry.heap:
+            self._discard(self._holders, job_id, user_id)
+        entry.heap = []
+        if entry.bound >= self.min_score:
+            candidates = self._jobs.keys()
+        else:
+            candidates = set().union(*(self._jobs_by_key.get(key, ()) for key in entry.keys))
+        matches: Dict[Any, Dict[str, Any]] = {}
+        for job_id in candidates:
+            self._offer(user_id, entry, job_id, self._jobs[job_id], matches)
+        self._update_open(user_id, entry)
+        if write:
+            self.store.replace(user_id, [(item[:3], item[3], matches[item[3]]) for item in entry.heap])
+
+    # Jobs ---------------------------------------------------------------
+
+    def add_job(self, job: Mapping[str, Any]) -> List[str]:
+        """
+        Adds or updates a processed job (dict or JobRecord with an ``id``) and fans it out to the
+        users it can match. Returns the ids of users whose top-k now contains the job.
+        """
+        job_id = job.get("id")
+        if job_id is None:
+            raise ValueError("Jobs need an 'id' for incremental matching")
+        digest = content_hash(job.to_dict() if isinstance(job, JobRecord) else dict(job))
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if current is not None and current.digest == digest:
+                return []
+            seq = current.seq if current is not None else next(self._seq)
+            if current is not None:
+                self.remove_job(job_id)
+            try:
+                keys = frozenset(job_keys(job))
+            except Exception as e:  # unscorable jobs are stored but never match, like in match_jobs
+                logger.warning(f"Job {job_id} cannot be indexed: {e}")
+                keys = frozenset()
+            entry = _JobEntry(digest, job, keys, seq)
+            self._jobs[job_id] = entry
+            for key in keys:
+                self._jobs_by_key.setdefault(key, set()).add(job_id)
+            self._refresh_user_skills()
+
+            candidates = set(self._open_users)
+            for key in keys:
+                candidates |= self._users_by_key.get(key, set())
+            self.stats["jobs_indexed"] += 1
+            matched = []
+            for user_id in candidates:
+                user = self._users[user_id]
+                if self._offer(user_id, user, job_id, entry):
+                    matched.append(user_id)
+                    self._update_open(user_id, user)
+            return matched
+
+    def _refresh_user_skills(self) -> None:
+        """Re-indexes users whose profile skills were registered by jobs ingested since the last call."""
+        size = len(get_skill_vocabulary())
+        if size == self._vocabulary_size:
+            return
+        self._vocabulary_size = size
+        for user_id in list(self._users_with_unknown_skills):
+            entry = self._users[user_id]
+            refresh_user_skills(entry.context)
+            keys = frozenset(user_keys(entry.context))
+            for key in entry.keys - keys:
+                self._discard(self._users_by_key, key, user_id)
+            for key in keys - entry.keys:
+                self._users_by_key.setdefault(key, set()).add(user_id)
+            entry.keys = keys
+            if not entry.context["unknown_skills"]:
+                self._users_with_unknown_skills.discard(user_id)
+
+    def remove_job(self, job_id: Any) -> None:
+        """Removes a job; users that held it in their top-k are re-matched to refill the slot."""
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry is None:
+                return
+            for key in entry.keys:
+                self._discard(self._jobs_by_key, key, job_id)
+            for user_id in self._holders.pop(job_id, set()):
+                self._rematch_user(user_id)
+            self.stats["jobs_removed"] += 1
+
+    def _offer(self, user_id: str, user: _UserEntry, job_id: Any, job: _JobEntry,
+               matches: Optional[Dict[Any, Dict[str, Any]]] = None) -> bool:
+        """
+        Scores one pair and pushes it into the user's heap; True if it entered the top-k.
+        The match is written to the store, or collected in ``matches`` during a re-match.
+        """
+        self.stats["pairs_scored"] += 1
+        details = _details()
+        try:
+            score = score_job(job.job, user.context, details)
+        except Exception:
+            return False
+        if score < self.min_score:
+            return False
+        item = (score, details["opportunity_score"], -job.seq, job_id)
+        heap = user.heap
+        evicted = ()
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, item)
+        elif item[:3] > heap[0][:3]:
+            evicted = (heapq.heapreplace(heap, item)[3],)
+            self._discard(self._holders, evicted[0], user_id)
+        else:
+            return False
+        self._holders.setdefault(job_id, set()).add(user_id)
+        job_dict = job.job.to_dict() if isinstance(job.job, JobRecord) else dict(job.job)
+        match = {**job_dict, "match_details": details, "compatibility_score": score}
+        if matches is not None:
+            matches[job_id] = match
+        else:
+            self.store.add(user_id, item[:3], job_id, match, evict=evicted)
+        return True
+
+    def _update_open(self, user_id: str, user: _UserEntry) -> None:
+        threshold = user.heap[0][0] if len(user.heap) >= self.top_k else self.min_score
+        if user.bound >= max(threshold, self.min_score):
+            self._open_users.add(user_id)
+        else:
+            self._open_users.discard(user_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[Any]], key: Any, value: Any) -> None:
+        values = index.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del index[key]
+
+    # Results ------------------------------------------------------------
+
+    def jobs(self) -> List[Mapping[str, Any]]:
+        """Stored jobs in arrival order."""
+        with self._lock:
+            return [entry.job for entry in sorted(self._jobs.values(), key=lambda entry: entry.seq)]
+
+    def top_matches(self, user_id: str) -> List[Dict[str, Any]]:
+        """The user's top-k jobs, best first, as match_jobs returns them (read from the store)."""
+        return self.store.top(user_id)
+
+    def apply_delta(
+        self,
+        profiles: Mapping[str, Dict[str, Any]],
+        jobs: Iterable[Mapping[str, Any]] = (),
+        removed_job_ids: Iterable[Any] = (),
+        removed_user_ids: Iterable[str] = (),
+    ) -> Dict[str, int]:
+        """
+        Daily re-match as a delta: applies removed and new/changed jobs, then profiles
+        (unchanged ones are skipped). Returns counts of what was applied.
+        """
+        before = dict(self.stats)
+        with self._lock:
+            for job_id in removed_job_ids:
+                self.remove_job(job_id)
+            for user_id in removed_user_ids:
+                self.remove_user(user_id)
+            for job in jobs:
+                self.add_job(job)
+            users_updated = sum(self.upsert_user(user_id, profile) for user_id, profile in profiles.items())
+        return {
+            "jobs_indexed": self.stats["jobs_indexed"] - before.get("jobs_indexed", 0),
+            "jobs_removed": self.stats["jobs_removed"] - before.get("jobs_removed", 0),
+            "users_updated": users_updated,
+            "pairs_scored": self.stats["pairs_scored"] - before.get("pairs_scored", 0),
+        }
@@ -0,0 +1,327 @@
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from packages.agents.job_matcher.job_matcher_utils import get_text_embeddings
+from packages.database.models import JobListing
+from packages.utilities.vector_matching.vector_matcher import JobVectorIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.getenv(
+    "JOB_VECTOR_INDEX_PATH",
+    os.path.join(tempfile.gettempdir(), "job_applier_job_vector_index.npz"),
+)
+DEFAULT_CANDIDATE_K = 200
+SAVE_INTERVAL = float(os.getenv("JOB_VECTOR_INDEX_SAVE_INTERVAL", "30"))  # seconds between index file writes
+
+JobsById = Union[Mapping[str, Dict[str, Any]], Callable[[Optional[List[str]]], Mapping[str, Dict[str, Any]]]]
+
+_JOB_TEXT_FIELDS = ("title", "company", "location", "description", "requirements")
+
+
+def job_listing_text(job: Any) -> str:
+    """
+    [CONTEXT] Builds the text that is embedded for a job listing (JobListing row or processed dict).
+    [PURPOSE] Keeps the indexed text identical no matter where the job comes from.
+    """
+    get = job.get if isinstance(job, Mapping) else lambda field: getattr(job, field, None)
+    return "\n".join(str(get(field)) for field in _JOB_TEXT_FIELDS if get(field))
+
+
+def profile_query_text(profile: Dict[str, Any]) -> str:
+    """
+    [CONTEXT] Builds the retrieval query text for a user profile.
+    [PURPOSE] Combines preferred titles, experience titles and skills into one embeddable string.
+    """
+    preferences = profile.get("preferences") or {}
+    titles = preferences.get("job_titles") or []
+    if isinstance(titles, str):
+        titles = [titles]
+    parts = list(titles)
+    parts.extend(exp.get("title") for exp in profile.get("experience", []) if exp.get("title"))
+    parts.extend(profile.get("skills", []))
+    return "\n".join(str(part) for part in parts)
+
+
+class JobIndexSync:
+    """
+    Keeps a JobVectorIndex in step with the job_listings table.
+
+    Changes are collected from SQLAlchemy mapper events while a session flushes and handed
+    over only after the transaction commits (rolled-back changes are dropped), so the index
+    never holds a job the database does not. A background thread embeds and applies them:
+    commits never wait for the embedding model, and change sets committed meanwhile are
+    merged into one batch. The index file is rewritten at most every ``save_interval``
+    seconds, and on ``flush`` and ``detach``.
+
+    Args:
+        index: The JobVectorIndex to maintain.
+        embed_texts: Function mapping a list of texts to one vector (or None) per text,
+            e.g. job_matcher_utils.get_text_embeddings.
+        path: Optional file the index is saved to.
+        save_interval: Minimum seconds between two saves of changes applied after commits.
+    """
+
+    def __init__(self, index: JobVectorIndex, embed_texts: Callable[[List[str]], Sequence[Any]], path: Optional[str] = None,
+                 save_interval: float = SAVE_INTERVAL):
+        self.index = index
+        self.embed_texts = embed_texts
+        self.path = path
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._attached = False
+        self._changes: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._file_mtime = self._mtime()
+
+    def upsert_jobs(self, jobs: Iterable[Any]) -> int:
+        """Embeds and (re)indexes the given jobs. Returns the number indexed."""
+        jobs = list(jobs)
+        if not jobs:
+            return 0
+        ids = [str(job["id"] if isinstance(job, Mapping) else job.id) for job in jobs]
+        vectors = self.embed_texts([job_listing_text(job) for job in jobs])
+        indexed = [(job_id, vector) for job_id, vector in zip(ids, vectors) if vector is not None]
+        if len(indexed) < len(ids):
+            logger.warning(f"{len(ids) - len(indexed)} jobs could not be embedded and were not indexed.")
+        if indexed:
+            with self._lock:
+                self.index.upsert([job_id for job_id, _ in indexed], [vector for _, vector in indexed])
+        return len(indexed)
+
+    def remove_jobs(self, job_ids: Iterable[str]) -> int:
+        with self._lock:
+            return self.index.remove(str(job_id) for job_id in job_ids)
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """Indexes every job listing in the database, streaming rows in batches."""
+        total = 0
+        batch = []
+        for job in db.query(JobListing).yield_per(batch_size):
+            batch.append(job)
+            if len(batch) >= batch_size:
+                total += self.upsert_jobs(batch)
+                batch = []
+        total += self.upsert_jobs(batch)
+        self.save()
+        logger.info(f"Job vector index rebuilt with {total} listings.")
+        return total
+
+    def save(self) -> None:
+        with self._lock:
+            if self.path:
+                self.index.save(self.path)
+                self._file_mtime = self._mtime()
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def flush(self) -> None:
+        """Waits until every committed change is applied, then saves the index."""
+        self._changes.join()
+        self.save()
+
+    def reload_if_changed(self) -> bool:
+        """
+        Loads the index file again if another process saved it since this one loaded or saved
+        it (e.g. the API process that writes job listings). Returns True if it was reloaded.
+        """
+        mtime = self._mtime()
+        if mtime is None or mtime == self._file_mtime or self._dirty or self._changes.unfinished_tasks:
+            return False
+        index = JobVectorIndex.load(self.path, backend=self.index.backend)
+        with self._lock:
+            self.index = index
+            self._file_mtime = mtime
+        return True
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns if self.path else None
+        except FileNotFoundError:
+            return None
+
+    # ------------------------------------------------------- SQLAlchemy hooks
+
+    def attach(self) -> None:
+        """Registers the ORM event listeners that feed committed JobListing changes into the index."""
+        if self._attached:
+            return
+        event.listen(JobListing, "after_insert", self._on_upsert)
+        event.listen(JobListing, "after_update", self._on_upsert)
+        event.listen(JobListing, "after_delete", self._on_delete)
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_soft_rollback", self._on_rollback)
+        self._attached = True
+
+    def detach(self) -> None:
+        if not self._attached:
+            return
+        event.remove(JobListing, "after_insert", self._on_upsert)
+        event.remove(JobListing, "after_update", self._on_upsert)
+        event.remove(JobListing, "after_delete", self._on_delete)
+        event.remove(Session, "after_commit", self._on_commit)
+        event.remove(Session, "after_soft_rollback", self._on_rollback)
+        self._attached = False
+        self.flush()
+
+    def _pending(self, session: Session) -> Dict[str, Any]:
+        return session.info.setdefault(("job_index_pending", id(self)), {})
+
+    def _on_upsert(self, mapper, connection, target) -> None:
+        session = Session.object_session(target)
+        if session is not None:
+            # Snapshot the embeddable fields now; the instance is expired after commit.
+            snapshot = {field: getattr(target, field, None) for field in _JOB_TEXT_FIELDS}
+            snapshot["id"] = target.id
+            self._pending(session)[str(target.id)] = snapshot
+
+    def _on_delete(self, mapper, connection, target) -> None:
+        session = Session.object_session(target)
+        if session is not None:
+            self._pending(session)[str(target.id)] = None
+
+    def _on_rollback(self, session: Session, previous_transaction) -> None:
+        session.info.pop(("job_index_pending", id(self)), None)
+
+    def _on_commit(self, session: Session) -> None:
+        pending = session.info.pop(("job_index_pending", id(self)), None)
+        if pending:
+            self._changes.put(pending)
+            self._ensure_worker()
+
+    # ------------------------------------------------------ background worker
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="job-index-sync", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._dirty:
+                timeout = max(0.0, self._last_save + self.save_interval - time.monotonic())
+            try:
+                batches = [self._changes.get(timeout=timeout)]
+            except queue.Empty:
+                self._save_logged()
+                continue
+            while True:
+                try:
+                    batches.append(self._changes.get_nowait())
+                except queue.Empty:
+                    break
+            merged = {}
+            for batch in batches:
+                merged.update(batch)
+            try:
+                self.remove_jobs(job_id for job_id, job in merged.items() if job is None)
+                self.upsert_jobs(job for job in merged.values() if job is not None)
+                self._dirty = True
+            except Exception as e:
+                logger.error(f"Failed to update job vector index after commit: {e}")
+            finally:
+                for _ in batches:
+                    self._changes.task_done()
+            if time.monotonic() - self._last_save >= self.save_interval:
+                self._save_logged()
+
+    def _save_logged(self) -> None:
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Failed to save job vector index to {self.path}: {e}")
+
+
+def load_job_listings(db: Session, job_ids: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    [CONTEXT] Loads job listings as dicts keyed by id: the given ids only, or every listing for None.
+    [PURPOSE] Feeds the retrieved candidates (and nothing else) into detailed scoring.
+    """
+    query = db.query(JobListing)
+    if job_ids is not None:
+        query = query.filter(JobListing.id.in_(list(job_ids)))
+    columns = [column.key for column in JobListing.__table__.columns]
+    return {str(job.id): {column: getattr(job, column) for column in columns} for job in query}
+
+
+_sync: Optional[JobIndexSync] = None
+_sync_lock = threading.Lock()
+
+
+def get_job_index_sync(db: Optional[Session] = None, path: Optional[str] = DEFAULT_INDEX_PATH) -> Optional[JobIndexSync]:
+    """
+    [CONTEXT] Process-wide JobIndexSync on ``path``, attached to the ORM events on first use.
+    [PURPOSE] Loads the saved index, or rebuilds it from ``db`` when there is none (or it cannot be
+              read), and afterwards picks up index files saved by other processes.
+    Returns None when job embeddings are unavailable.
+    """
+    global _sync
+    with _sync_lock:
+        if _sync is None:
+            _sync = _open_job_index(db, path)
+        elif not _sync.reload_if_changed() and not len(_sync.index) and db is not None:
+            _sync.rebuild(db)
+        return _sync
+
+
+def close_job_index_sync() -> None:
+    """Detaches the process-wide JobIndexSync (applying and saving pending changes), if any."""
+    global _sync
+    with _sync_lock:
+        if _sync is not None:
+            _sync.detach()
+            _sync = None
+
+
+def _open_job_index(db: Optional[Session], path: Optional[str]) -> Optional[JobIndexSync]:
+    index = None
+    if path and os.path.exists(path):
+        try:
+            index = JobVectorIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load job vector index {path}, rebuilding it: {e}")
+    if index is None:
+        probe = get_text_embeddings(["job"])[0]
+        if probe is None:
+            logger.warning("Job embeddings unavailable; semantic job retrieval is disabled.")
+            return None
+        index = JobVectorIndex(len(probe))
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    sync = JobIndexSync(index, get_text_embeddings, path=path)
+    if not len(index) and db is not None:
+        sync.rebuild(db)
+    sync.attach()
+    return sync
+
+
+def retrieve_candidates(
+    index: JobVectorIndex,
+    query_vector: Any,
+    jobs_by_id: JobsById,
+    k: int = DEFAULT_CANDIDATE_K,
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    [CONTEXT] First retrieval stage before detailed JobMatcherAgent scoring.
+    [PURPOSE] Returns the k most semantically similar jobs (with cosine scores) that are present in
+              jobs_by_id, a mapping or a function loading the jobs of a list of ids.
+    """
+    if query_vector is None:
+        return []
+    hits = index.search(query_vector, k)
+    if callable(jobs_by_id):
+        jobs_by_id = jobs_by_id([job_id for job_id, _ in hits])
+    return [(jobs_by_id[job_id], score) for job_id, score in hits if job_id in jobs_by_id]
@@ -1,15 +1,106 @@
+import heapq
 import logging
-from typing import List, Dict, Any, Optional
-import hashlib
+from dataclasses import replace
+from typing import Iterable, List, Dict, Any, Mapping, Optional
 from packages.agents.job_matcher.job_matcher_utils import (
     load_user_profile_data,
-    calculate_skill_score,
+    calculate_skill_bits_score,
     calculate_experience_score,
     calculate_education_score,
     calculate_preference_score,
     calculate_opportunity_score,
     calculate_culture_score,
+    get_text_embedding,
 )
+from packages.common_types.records import JobRecord
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
+from packages.agents.job_matcher.vectorized_matcher import JobBatch, score_job_batch, top_k_matches
+from packages.agents.job_matcher.job_index import DEFAULT_CANDIDATE_K, JobsById, profile_query_text, retrieve_candidates
+from packages.agents.job_matcher.recommendation_store import RecommendationStore, recommendation_id
+
+DEFAULT_USER_ID = "1"  # the profile load_user_profile_data loads
+
+
+def user_match_context(user_profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Profile values shared by every job scored against one user (see score_job). Profile skills
+    are not registered in the skill vocabulary; the ones it lacks are kept by name until a job
+    registers them (see refresh_user_skills).
+    """
+    vocabulary = get_skill_vocabulary()
+    skills = user_profile.get("skills", [])
+    return {
+        "skill_bits": vocabulary.encode(skills),
+        "unknown_skills": vocabulary.unknown(skills),
+        "vocabulary_size": len(vocabulary),
+        "experience": sum(int(exp.get("years", 0)) for exp in user_profile.get("experience", [])),
+        "education": set(edu.get("degree") for edu in user_profile.get("education", []) if edu.get("degree")),
+        "preferences": user_profile.get("preferences", {}),
+        "culture": user_profile.get("culture", {}),
+    }
+
+
+def refresh_user_skills(user: Dict[str, Any]) -> bool:
+    """
+    Adds the bits of a context's unknown skills that jobs registered since it was built;
+    returns True if ``skill_bits`` changed. Cheap when the vocabulary has not grown.
+    """
+    vocabulary = get_skill_vocabulary()
+    size = len(vocabulary)
+    if not user["unknown_skills"] or user["vocabulary_size"] == size:
+        return False
+    user["vocabulary_size"] = size
+    known = [name for name in user["unknown_skills"] if name in vocabulary]
+    if not known:
+        return False
+    user["skill_bits"] |= vocabulary.encode(known)
+    user["unknown_skills"] = user["unknown_skills"].difference(known)
+    return True
+
+
+def score_job(job: Mapping[str, Any], user: Dict[str, Any], details: Dict[str, Any]) -> int:
+    """
+    Computes the 0-100 compatibility score of one job (a dict or JobRecord), filling ``details``
+    with missing skills and qualifications and the opportunity and culture scores.
+    """
+    # 1. Skill Matching (50% of total score)
+    vocabulary = get_skill_vocabulary()
+    job_skills = job.get("required_skills", [])
+    job_bits = job.get("skill_bits")
+    if job_bits is None:
+        job_bits = vocabulary.encode(job_skills, add=True)
+    refresh_user_skills(user)
+    skill_score, missing_bits = calculate_skill_bits_score(user["skill_bits"], job_bits)
+    details["missing_skills"] = vocabulary.select(job_skills, missing_bits) if missing_bits else []
+
+    # 2. Experience Matching (20% of total score)
+    job_experience = job.get("required_experience", 0)
+    experience_score, missing_experience_qual = calculate_experience_score(user["experience"], job_experience)
+    if missing_experience_qual:
+        details["missing_qualifications"].append(missing_experience_qual)
+
+    # 3. Education Matching (15% of total score)
+    job_education = set(job.get("required_education", []))
+    education_score, missing_education_qual = calculate_education_score(user["education"], job_education)
+    if missing_education_qual:
+        details["missing_qualifications"].append(missing_education_qual)
+
+    # 4. Preference Matching (15% of total score)
+    preference_score = calculate_preference_score(user["preferences"], job)
+
+    # 5. Company Culture Matching (10 points out of 100)
+    culture_score = calculate_culture_score(user["culture"], job.get("culture", {}))
+    details["culture_score"] = culture_score
+
+    # 6. Opportunity Score (separate metric)
+    details["opportunity_score"] = calculate_opportunity_score(job)
+
+    # Calculate total compatibility score (0-100)
+    total_score = (
+        skill_score + experience_score + education_score + preference_score + culture_score
+    )
+    return round(total_score)
+
 
 class JobMatcherAgent:
     """
@@ -18,12 +109,16 @@ class JobMatcherAgent:
     Args:
         db: Database/session dependency.
         logger: Logger instance for dependency injection and testability.
+        store: Recommendation store the top matches are written to (default: a private in-process store).
+        user_id: Key of this user's recommendations in the store.
     """
-    _match_cache: Dict[str, List[Dict[str, Any]]] = {}
 
-    def __init__(self, db: Any, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(self, db: Any, logger: Optional[logging.Logger] = None, store: Optional[RecommendationStore] = None,
+                 user_id: str = DEFAULT_USER_ID) -> None:
         self.db = db
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.store = store or RecommendationStore()
+        self.user_id = user_id
         self.user_profile = self._load_user_profile()
         self.logger.info("JobMatcherAgent initialized.")
 
@@ -57,18 +152,8 @@ class JobMatcherAgent:
             self.logger.error("No user profile available for matching")
             return []
 
-        # Caching: hash user profile and job listings
-        cache_key = hashlib.sha256((str(self.user_profile) + str(processed_job_listings)).encode('utf-8')).hexdigest()
-        if cache_key in self._match_cache:
-            self.logger.info("Returning cached job matches.")
-            return self._match_cache[cache_key]
-
         matched_jobs: List[Dict[str, Any]] = []
-        user_skills = set(self.user_profile.get("skills", []))
-        user_experience = sum(int(exp.get("years", 0)) for exp in self.user_profile.get("experience", []))
-        user_education = set(edu.get("degree") for edu in self.user_profile.get("education", []) if edu.get("degree"))
-        user_preferences = self.user_profile.get("preferences", {})
-        user_culture = self.user_profile.get("culture", {})
+        user = self._user_match_context()
 
         for job in processed_job_listings:
             job["match_details"] = {
@@ -79,44 +164,10 @@ class JobMatcherAgent:
             }
 
             try:
-                # 1. Skill Matching (50% of total score)
-                job_skills = set(job.get("required_skills", []))
-                skill_score, missing_skills = calculate_skill_score(user_skills, job_skills)
-                job["match_details"]["missing_skills"] = missing_skills
-
-                # 2. Experience Matching (20% of total score)
-                job_experience = job.get("required_experience", 0)
-                experience_score, missing_experience_qual = calculate_experience_score(user_experience, job_experience)
-                if missing_experience_qual:
-                    job["match_details"]["missing_qualifications"].append(missing_experience_qual)
-
-                # 3. Education Matching (15% of total score)
-                job_education = set(job.get("required_education", []))
-                education_score, missing_education_qual = calculate_education_score(user_education, job_education)
-                if missing_education_qual:
-                    job["match_details"]["missing_qualifications"].append(missing_education_qual)
-
-                # 4. Preference Matching (15% of total score)
-                preference_score = calculate_preference_score(user_preferences, job)
-
-                # 5. Company Culture Matching (10 points out of 100)
-                job_culture = job.get("culture", {})
-                culture_score = calculate_culture_score(user_culture, job_culture)
-                job["match_details"]["culture_score"] = culture_score
-
-                # 6. Opportunity Score (separate metric)
-                opportunity_score = calculate_opportunity_score(job)
-                job["match_details"]["opportunity_score"] = opportunity_score
-
-                # Calculate total compatibility score (0-100)
-                total_score = (
-                    skill_score + experience_score + education_score + preference_score + culture_score
-                )
-                job["compatibility_score"] = round(total_score)
-
+                job["compatibility_score"] = self._score_job(job, user, job["match_details"])
                 matched_jobs.append(job)
                 self.logger.debug(
-                    f"Scored job: {job.get('title')} - Compatibility: {job['compatibility_score']}, Opportunity: {opportunity_score}, Culture: {culture_score}"
+                    f"Scored job: {job.get('title')} - Compatibility: {job['compatibility_score']}, Opportunity: {job['match_details']['opportunity_score']}, Culture: {job['match_details']['culture_score']}"
                 )
             except Exception as e:
                 self.logger.exception(f"Error scoring job {job.get('title', 'N/A')}: {e}")
@@ -134,9 +185,142 @@ class JobMatcherAgent:
         top_jobs = matched_jobs[:5]
 
         self.logger.info(f"Found {len(top_jobs)} highly compatible jobs")
-        self._match_cache[cache_key] = top_jobs
+        self._store_recommendations(top_jobs)
         return top_jobs
 
+    def _store_recommendations(self, top_jobs: List[Dict[str, Any]]) -> None:
+        """Replaces this user's stored recommendations with ``top_jobs`` (best first)."""
+        self.store.replace(self.user_id, [
+            ((job["compatibility_score"], job["match_details"]["opportunity_score"], -i), recommendation_id(job), job)
+            for i, job in enumerate(top_jobs)
+        ])
+
+    def get_recommendations(self) -> List[Dict[str, Any]]:
+        """
+        Returns the top matches stored by the last matching call, best first, without re-scoring.
+        """
+        return self.store.top(self.user_id)
+
+    def match_job_records(self, job_records: Iterable[JobRecord], top_n: int = 5) -> List[Dict[str, Any]]:
+        """
+        Scores compact JobRecords exactly like match_jobs without copying or mutating them;
+        only the returned top matches are converted to dicts.
+
+        Args:
+            job_records: Processed jobs, e.g. from JobProcessorAgent.process_records.
+            top_n: Number of top matches returned.
+
+        Returns:
+            Job dicts of the top matches with compatibility_score and match_details added.
+        """
+        if not self.user_profile:
+            self.logger.error("No user profile available for matching")
+            return []
+
+        user = self._user_match_context()
+        scored = []
+        count = 0
+        for count, record in enumerate(job_records, 1):
+            details = {"missing_skills": [], "missing_qualifications": [], "opportunity_score": 0, "culture_score": 0}
+            try:
+                score = self._score_job(record, user, details)
+            except Exception as e:
+                self.logger.exception(f"Error scoring job {record.title or 'N/A'}: {e}")
+                continue
+            if score >= 50:
+                scored.append((-score, -details["opportunity_score"], len(scored), record, details))
+
+        top = heapq.nsmallest(top_n, scored)
+        self.logger.info(f"Found {len(top)} highly compatible jobs among {count} records")
+        results = [
+            {**record.to_dict(), "match_details": details, "compatibility_score": -neg_score}
+            for neg_score, _, _, record, details in top
+        ]
+        self._store_recommendations(results)
+        return results
+
+    def match_job_batch(self, batch: JobBatch, top_n: int = 5) -> List[Dict[str, Any]]:
+        """
+        Vectorized matching: scores every job of a columnar JobBatch at once with the same
+        results as match_jobs, and selects the top matches with argpartition. Encode the jobs
+        once with JobBatch.from_jobs and reuse the batch for every user.
+
+        Args:
+            batch: Encoded processed jobs (dicts or JobRecords).
+            top_n: Number of top matches returned.
+
+        Returns:
+            Job dicts of the top matches with compatibility_score and match_details added.
+        """
+        if not self.user_profile:
+            self.logger.error("No user profile available for matching")
+            return []
+
+        scores, opportunity, valid = score_job_batch(batch, self.user_profile)
+        top = top_k_matches(scores, opportunity, valid, k=top_n)
+        user = self._user_match_context()
+        results = []
+        for i in top:
+            job = batch.jobs[i]
+            details = {"missing_skills": [], "missing_qualifications": [], "opportunity_score": 0, "culture_score": 0}
+            self._score_job(job, user, details)  # fills the per-job details of the few returned matches
+            job_dict = job.to_dict() if isinstance(job, JobRecord) else dict(job)
+            results.append({**job_dict, "match_details": details, "compatibility_score": int(scores[i])})
+        self.logger.info(f"Found {len(results)} highly compatible jobs among {len(batch)} jobs")
+        self._store_recommendations(results)
+        return results
+
+    def _user_match_context(self) -> Dict[str, Any]:
+        """Profile values shared by every job scored in one matching call."""
+        return user_match_context(self.user_profile)
+
+    def _score_job(self, job: Mapping[str, Any], user: Dict[str, Any], details: Dict[str, Any]) -> int:
+        return score_job(job, user, details)
+
+    def match_indexed_jobs(
+        self,
+        job_index: Any,
+        jobs_by_id: JobsById,
+        candidate_k: int = DEFAULT_CANDIDATE_K,
+    ) -> List[Dict[str, Any]]:
+        """
+        Two-stage matching: retrieve the candidate_k jobs closest to the user profile from a
+        JobVectorIndex, then run the detailed compatibility scoring of match_jobs on them only.
+
+        Args:
+            job_index: JobVectorIndex holding the job embeddings.
+            jobs_by_id: Processed job listings (dicts or JobRecords) keyed by job id, or a function
+                returning them for a list of ids (every listing for None), so only the candidates
+                are loaded.
+            candidate_k: Number of semantic candidates passed to detailed scoring.
+
+        Returns:
+            Top matched job listings, as returned by match_jobs, with semantic_similarity added.
+        """
+        if not self.user_profile:
+            self.logger.error("No user profile available for matching")
+            return []
+        query_vector = get_text_embedding(profile_query_text(self.user_profile))
+        if query_vector is None:
+            self.logger.warning("Profile embedding unavailable; scoring all jobs without retrieval.")
+            return self._match_loaded(list((jobs_by_id(None) if callable(jobs_by_id) else jobs_by_id).values()))
+        candidates = retrieve_candidates(job_index, query_vector, jobs_by_id, candidate_k)
+        jobs = []
+        for job, similarity in candidates:
+            if isinstance(job, JobRecord):
+                job = replace(job, extra=job.extra + (("semantic_similarity", round(similarity, 4)),))
+            else:
+                job["semantic_similarity"] = round(similarity, 4)
+            jobs.append(job)
+        self.logger.info(f"Retrieved {len(candidates)} of {len(job_index)} indexed jobs for detailed scoring")
+        return self._match_loaded(jobs)
+
+    def _match_loaded(self, jobs: List[Any]) -> List[Dict[str, Any]]:
+        """match_job_records for JobRecords, match_jobs for dicts."""
+        if jobs and isinstance(jobs[0], JobRecord):
+            return self.match_job_records(jobs)
+        return self.match_jobs(jobs)
+
 
 if __name__ == "__main__":
     from packages.utilities.logging_utils import setup_logging
@@ -1,30 +1,21 @@
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional
 from sqlalchemy.orm import Session
 from packages.database.user_data_model import UserDatabase
-import difflib
-import hashlib
 import time
 
-try:
-    from sentence_transformers import SentenceTransformer
-    import numpy as np
-    _st_model = SentenceTransformer('all-MiniLM-L6-v2')
-except ImportError:
-    _st_model = None
-    np = None
-
-_embedding_cache = {}
-
-_skill_taxonomy = {
-    "Python": ["Programming", "Scripting"],
-    "JavaScript": ["Programming", "Frontend"],
-    "Django": ["Python", "Web Framework"],
-    "React": ["JavaScript", "Frontend"],
-    "AWS": ["Cloud", "DevOps"],
-    "Docker": ["DevOps"],
-    "Kubernetes": ["DevOps"],
-    # ... add more as needed
-}
+import numpy as np
+from packages.utilities.vector_matching.embedding_generator import (
+    DEFAULT_EMBEDDING_MODEL as EMBEDDING_MODEL_NAME,
+    DEFAULT_EMBEDDING_MODEL_VERSION as EMBEDDING_MODEL_VERSION,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDINGS_AVAILABLE,
+    get_embedding_generator,
+)
+from packages.utilities.vector_matching.embedding_store import get_embedding_store, missing_texts
+from packages.utilities.location_index import EXACT, NEARBY, NO_MATCH, REGION, get_location_index
+from packages.utilities.skill_vocabulary import SKILL_TAXONOMY, SkillVocabulary, get_skill_vocabulary
+
+_skill_taxonomy = SKILL_TAXONOMY
 
 _experience_levels = {
     "intern": 0,
@@ -35,31 +26,16 @@ _experience_levels = {
     "principal": 5
 }
 
-def normalize_skill(skill: str) -> str:
-    return skill.strip().lower()
-
 def expand_skills(skills: List[str]) -> set:
     """Expand skills using the taxonomy for hierarchical matching."""
-    expanded = set()
-    for skill in skills:
-        norm = normalize_skill(skill)
-        expanded.add(norm)
-        for parent in _skill_taxonomy.get(skill, []):
-            expanded.add(normalize_skill(parent))
-    return expanded
+    vocabulary = get_skill_vocabulary()
+    return set(vocabulary.decode(vocabulary.encode(skills, expand=True))) | vocabulary.unknown(skills)
 
-def get_text_embedding(text: str, max_retries: int = 3) -> Optional[Any]:
-    """Get or compute the embedding for a given text, using cache. Handles rate limits."""
-    if not _st_model or not np:
-        return None
-    key = hashlib.sha256(text.encode('utf-8')).hexdigest()
-    if key in _embedding_cache:
-        return _embedding_cache[key]
+def _encode_with_retry(texts: List[str], batch_size: int, max_retries: int) -> Optional[Any]:
+    """Encode texts in one model call, backing off on rate limits."""
     for attempt in range(max_retries):
         try:
-            emb = _st_model.encode([text])[0]
-            _embedding_cache[key] = emb
-            return emb
+            return get_embedding_generator().generate_embeddings_batch(texts, batch_size=batch_size)
         except Exception as e:
             if 'rate limit' in str(e).lower() or 'too many requests' in str(e).lower():
                 time.sleep(2 ** attempt)
@@ -67,8 +43,31 @@ def get_text_embedding(text: str, max_retries: int = 3) -> Optional[Any]:
                 break
     return None
 
+def get_text_embedding(text: str, max_retries: int = 3) -> Optional[Any]:
+    """Get or compute the embedding for a given text, using the persistent embedding store. Handles rate limits."""
+    return get_text_embeddings([text], max_retries=max_retries)[0]
+
+def get_text_embeddings(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE, max_retries: int = 3) -> List[Optional[Any]]:
+    """
+    Batch variant of get_text_embedding: every text missing from the embedding store is
+    encoded in a single model.encode call. Returns one vector (or None) per input text.
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        return [None] * len(texts)
+    store = get_embedding_store(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_VERSION)
+    embeddings = store.get_many(texts)
+    if all(emb is not None for emb in embeddings):
+        return embeddings
+    missing = missing_texts([t for t, emb in zip(texts, embeddings) if emb is None], store)
+    vectors = _encode_with_retry(missing, batch_size, max_retries)
+    if vectors is None:
+        return embeddings
+    store.put_many(missing, vectors)
+    encoded = dict(zip(missing, np.asarray(vectors, dtype=np.float32)))
+    return [emb if emb is not None else encoded.get(text) for text, emb in zip(texts, embeddings)]
+
 def cosine_similarity(vec1, vec2) -> float:
-    if not np or vec1 is None or vec2 is None:
+    if vec1 is None or vec2 is None:
         return 0.0
     return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
 
@@ -109,15 +108,20 @@ def load_user_profile_data(db: Session) -> Dict[str, Any]:
         }
     return {}
 
-def calculate_skill_score(user_skills: set, job_skills: set) -> Tuple[float, List[str]]:
+def calculate_skill_score(user_skills: Iterable[str], job_skills: Iterable[str]) -> Tuple[float, List[str]]:
     """
     [CONTEXT] Calculates the skill matching score and identifies missing skills.
     [PURPOSE] Quantifies how well a user's skills align with job requirements.
     """
-    common_skills = user_skills.intersection(job_skills)
-    missing_skills = job_skills - user_skills
-    score = (len(common_skills) / len(job_skills)) * 50 if job_skills else 0
-    return score, list(missing_skills)
+    coverage, missing = get_skill_vocabulary().match(job_skills, user_skills)
+    return coverage * 50, missing
+
+def calculate_skill_bits_score(user_bits: int, job_bits: int) -> Tuple[float, int]:
+    """
+    [CONTEXT] Skill matching on SkillVocabulary bitsets (normalized names).
+    [PURPOSE] Returns the 0-50 skill score and the bitset of missing skills using popcounts only.
+    """
+    return SkillVocabulary.coverage(job_bits, user_bits) * 50, SkillVocabulary.missing(job_bits, user_bits)
 
 def calculate_experience_score(user_experience: int, job_experience: int) -> Tuple[float, Optional[str]]:
     """
@@ -148,67 +152,92 @@ def calculate_education_score(user_education: set, job_education: set) -> Tuple[
         score = 0
     return score, missing_qualification
 
-def calculate_preference_score(user_preferences: Dict[str, Any], job: Dict[str, Any]) -> float:
+MAX_PREFERENCE_SCORE = 15
+
+
+# Share of MAX_PREFERENCE_SCORE per LocationIndex match level.
+LOCATION_MATCH_WEIGHTS = {EXACT: 0.4, NEARBY: 0.3, REGION: 0.2, NO_MATCH: 0}
+
+
+def location_preference_score(user_preferences: Dict[str, Any], job_location: str, job_remote: Any,
+                              job_location_id: Optional[int] = None) -> float:
     """
-    [CONTEXT] Calculates the preference matching score.
-    [PURPOSE] Quantifies how well a job aligns with user's specified preferences, including fuzzy location matching and remote/hybrid logic.
+    Location part of the preference score: exact, gazetteer (same place, nearby city, same region)
+    and remote/hybrid matching. ``job_location_id`` is the job's LocationIndex id if resolved at ingest.
     """
-    preference_score = 0
-    MAX_PREFERENCE_SCORE = 15
-
-    # Enhanced Location preference (fuzzy and remote/hybrid logic)
-    job_location = job.get("location", "")
     user_job_locations = user_preferences.get("job_locations", [])
-    job_remote = job.get("remote")
     user_remote_preference = user_preferences.get("remote")
     location_score = 0
     if user_job_locations:
+        index = get_location_index()
+        if job_location_id is None:
+            job_location_id = index.resolve(job_location)
         for user_loc in user_job_locations:
             # Exact match
             if job_location == user_loc:
                 location_score = MAX_PREFERENCE_SCORE * 0.4
                 break
-            # Fuzzy match (city/region similarity)
-            similarity = difflib.SequenceMatcher(None, job_location.lower(), user_loc.lower()).ratio()
-            if similarity > 0.8:
-                location_score = MAX_PREFERENCE_SCORE * 0.3  # Partial for close match
-                break
-            elif similarity > 0.6:
-                location_score = MAX_PREFERENCE_SCORE * 0.2  # Lesser for somewhat close
+            # Same place, nearby city or same region, on resolved place ids
+            level = index.match_level(index.resolve(user_loc), job_location_id)
+            location_score = max(location_score, MAX_PREFERENCE_SCORE * LOCATION_MATCH_WEIGHTS[level])
         # Remote/hybrid logic
         if (job_remote or ("remote" in job_location.lower() or "hybrid" in job_location.lower())) and (user_remote_preference or "remote" in [l.lower() for l in user_job_locations]):
             location_score = max(location_score, MAX_PREFERENCE_SCORE * 0.4)  # Full points for remote match
-    preference_score += location_score
+    return location_score
+
 
-    # Job type preference (e.g., Full-time, Contract)
-    job_type = job.get("job_type")
+def job_type_preference_score(user_preferences: Dict[str, Any], job_type: Any) -> float:
+    """Job type part of the preference score (e.g., Full-time, Contract)."""
     user_job_types = user_preferences.get("job_types", [])
     if job_type and user_job_types and job_type in user_job_types:
-        preference_score += MAX_PREFERENCE_SCORE * 0.3  # 30% of preference score for job type
+        return MAX_PREFERENCE_SCORE * 0.3  # 30% of preference score for job type
+    return 0
 
-    # Salary range preference (robust comparison)
-    job_salary_normalized = job.get("salary")  # 0-1, where 1 = $200,000
-    user_salary_range_str = user_preferences.get("salary_range")
-    if job_salary_normalized is not None and user_salary_range_str:
-        try:
-            min_salary_str, max_salary_str = user_salary_range_str.replace("$", "").replace(",", "").split(" - ")
-            min_salary = int(min_salary_str)
-            max_salary = int(max_salary_str)
-            job_salary_actual = job_salary_normalized * 200000  # Assume 1.0 = $200,000
-            (min_salary + max_salary) / 2
-            if min_salary <= job_salary_actual <= max_salary:
-                preference_score += MAX_PREFERENCE_SCORE * 0.2  # 20% for salary, perfect match
-            elif job_salary_actual > max_salary:
-                preference_score += MAX_PREFERENCE_SCORE * 0.2  # Still a match if above
-            elif min_salary - 10000 <= job_salary_actual < min_salary:
-                preference_score += MAX_PREFERENCE_SCORE * 0.1  # Partial if within $10k below min
-        except ValueError:
-            pass
-
-    # Remote preference (already handled above, but keep for backward compatibility)
+
+def parse_salary_range(user_salary_range_str: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parses a "$80,000 - $120,000" salary range; None if missing or malformed."""
+    if not user_salary_range_str:
+        return None
+    try:
+        min_salary_str, max_salary_str = user_salary_range_str.replace("$", "").replace(",", "").split(" - ")
+        return int(min_salary_str), int(max_salary_str)
+    except ValueError:
+        return None
+
+
+def salary_preference_score(salary_range: Optional[Tuple[int, int]], job_salary_normalized: Any) -> float:
+    """Salary part of the preference score; the job salary is normalized 0-1, where 1 = $200,000."""
+    if job_salary_normalized is None or salary_range is None:
+        return 0
+    min_salary, max_salary = salary_range
+    job_salary_actual = job_salary_normalized * 200000  # Assume 1.0 = $200,000
+    if min_salary <= job_salary_actual <= max_salary:
+        return MAX_PREFERENCE_SCORE * 0.2  # 20% for salary, perfect match
+    elif job_salary_actual > max_salary:
+        return MAX_PREFERENCE_SCORE * 0.2  # Still a match if above
+    elif min_salary - 10000 <= job_salary_actual < min_salary:
+        return MAX_PREFERENCE_SCORE * 0.1  # Partial if within $10k below min
+    return 0
+
+
+def remote_preference_score(user_preferences: Dict[str, Any], job_remote: Any) -> float:
+    """Remote preference part (already rewarded by the location part, kept for backward compatibility)."""
+    user_remote_preference = user_preferences.get("remote")
     if user_remote_preference is not None and job_remote == user_remote_preference:
-        preference_score += MAX_PREFERENCE_SCORE * 0.1  # 10% for remote preference
+        return MAX_PREFERENCE_SCORE * 0.1  # 10% for remote preference
+    return 0
+
 
+def calculate_preference_score(user_preferences: Dict[str, Any], job: Dict[str, Any]) -> float:
+    """
+    [CONTEXT] Calculates the preference matching score.
+    [PURPOSE] Quantifies how well a job aligns with user's specified preferences, including gazetteer location matching and remote/hybrid logic.
+    """
+    preference_score = 0
+    preference_score += location_preference_score(user_preferences, job.get("location", ""), job.get("remote"), job.get("location_id"))
+    preference_score += job_type_preference_score(user_preferences, job.get("job_type"))
+    preference_score += salary_preference_score(parse_salary_range(user_preferences.get("salary_range")), job.get("salary"))
+    preference_score += remote_preference_score(user_preferences, job.get("remote"))
     return min(preference_score, MAX_PREFERENCE_SCORE)
 
 
@@ -231,19 +260,21 @@ def calculate_culture_score(user_culture: Dict[str, Any], job_culture: Dict[str,
         score += max(0, 1 - diff)  # 1 if perfect match, 0 if opposite
     return round((score / len(keys)) * 10, 2)  # Out of 10
 
+OPPORTUNITY_FACTORS = {
+    "salary": 0.4,
+    "growth_potential": 0.3,
+    "company_reputation": 0.2,
+    "benefits": 0.1,
+}
+
+
 def calculate_opportunity_score(job: Dict[str, Any]) -> float:
     """
     [CONTEXT] Calculates the opportunity score for a job.
     [PURPOSE] Provides a metric for the attractiveness of a job beyond direct qualifications.
     """
     opportunity_score = 0
-    opportunity_factors = {
-        "salary": 0.4,
-        "growth_potential": 0.3,
-        "company_reputation": 0.2,
-        "benefits": 0.1,
-    }
-    for factor, weight in opportunity_factors.items():
+    for factor, weight in OPPORTUNITY_FACTORS.items():
         if factor in job:
             opportunity_score += job[factor] * weight * 100
     return opportunity_score
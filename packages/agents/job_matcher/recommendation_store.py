@@ -0,0 +1,318 @@
+import heapq
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from packages.utilities.cache_utils import content_hash, get_redis_client
+
+try:
+    from redis.exceptions import WatchError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+    class WatchError(Exception):
+        """Stand-in so the transaction retry below does not need redis to import."""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 5
+TRANSACTION_RETRIES = 5  # attempts of a watched read-then-write before giving up
+
+# (compatibility score, opportunity score, tie-breaker); higher ranks are better
+Rank = Tuple[float, ...]
+Entry = Tuple[Rank, Any, Dict[str, Any]]  # (rank, job id, match as returned by match_jobs)
+
+
+def recommendation_id(job: Mapping[str, Any]) -> Any:
+    """Store key of a job: its ``id``, or a digest of title, company and location for jobs without one."""
+    job_id = job.get("id")
+    if job_id is None:
+        job_id = content_hash(job.get("title"), job.get("company"), job.get("location"))
+    return job_id
+
+
+class RecommendationStore:
+    """
+    [CONTEXT] Per-user top-k job recommendations, written by matching and read by the API.
+    [PURPOSE] Each user holds at most ``top_k`` matches in a min-heap keyed by rank, so a
+              recommendation read is O(k) and never re-scores jobs. Matches are written as
+              they are found (add) or recomputed (replace), and dropped when a job expires
+              (remove_job). This in-process store is the default; RedisRecommendationStore
+              shares the same recommendations between workers and restarts.
+
+    Args:
+        top_k: Matches kept per user; a worse match is evicted when a better one is added.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.top_k = top_k
+        self._heaps: Dict[str, List[Tuple[Rank, Any]]] = {}  # worst first
+        self._matches: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._holders: Dict[Any, Set[str]] = {}  # job id -> users recommended it
+        self._lock = threading.RLock()
+
+    def add(self, user_id: str, rank: Rank, job_id: Any, match: Dict[str, Any], evict: Iterable[Any] = ()) -> bool:
+        """
+        Adds (or re-ranks) one match after removing the ``evict`` job ids; returns False when the
+        user already holds ``top_k`` better matches.
+        """
+        with self._lock:
+            for evicted in evict:
+                self.discard(user_id, evicted)
+            self.discard(user_id, job_id)
+            heap = self._heaps.setdefault(user_id, [])
+            item = (tuple(rank), job_id)
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                _, dropped = heapq.heapreplace(heap, item)
+                self._forget(user_id, dropped)
+            else:
+                return False
+            self._matches.setdefault(user_id, {})[job_id] = match
+            self._holders.setdefault(job_id, set()).add(user_id)
+            return True
+
+    def replace(self, user_id: str, entries: Iterable[Entry]) -> None:
+        """Replaces all of a user's matches, keeping the ``top_k`` best of ``entries``."""
+        with self._lock:
+            self.clear(user_id)
+            for rank, job_id, match in heapq.nlargest(self.top_k, entries, key=lambda entry: tuple(entry[0])):
+                self.add(user_id, rank, job_id, match)
+
+    def discard(self, user_id: str, job_id: Any) -> None:
+        with self._lock:
+            heap = self._heaps.get(user_id)
+            if not heap or job_id not in self._matches.get(user_id, {}):
+                return
+            heap[:] = [item for item in heap if item[1] != job_id]
+            heapq.heapify(heap)
+            self._forget(user_id, job_id)
+            if not heap:
+                del self._heaps[user_id]
+
+    def _forget(self, user_id: str, job_id: Any) -> None:
+        matches = self._matches.get(user_id, {})
+        matches.pop(job_id, None)
+        if not matches:
+            self._matches.pop(user_id, None)
+        holders = self._holders.get(job_id)
+        if holders is not None:
+            holders.discard(user_id)
+            if not holders:
+                del self._holders[job_id]
+
+    def remove_job(self, job_id: Any) -> List[str]:
+        """Drops an expired job from every user's matches; returns the users that held it."""
+        with self._lock:
+            users = list(self._holders.get(job_id, ()))
+            for user_id in users:
+                self.discard(user_id, job_id)
+            return users
+
+    def clear(self, user_id: str) -> None:
+        with self._lock:
+            for _, job_id in self._heaps.pop(user_id, []):
+                self._forget(user_id, job_id)
+
+    def ranked(self, user_id: str) -> List[Tuple[Rank, Any]]:
+        """A user's (rank, job id) pairs, best first."""
+        with self._lock:
+            return sorted(self._heaps.get(user_id, []), reverse=True)
+
+    def top(self, user_id: str) -> List[Dict[str, Any]]:
+        """A user's matches, best first, as match_jobs returns them."""
+        with self._lock:
+            matches = self._matches.get(user_id, {})
+            return [dict(matches[job_id]) for _, job_id in self.ranked(user_id)]
+
+
+class RedisRecommendationStore(RecommendationStore):
+    """
+    [CONTEXT] RecommendationStore shared through Redis.
+    [PURPOSE] Per user, a sorted set ``<namespace>:user:<id>`` ranks job ids (trimmed to
+              ``top_k`` after every write) and a hash ``...:matches`` holds
+              the match JSON with its exact rank; ``<namespace>:job:<id>`` sets index the users
+              holding a job for expiry. Reads are a single HGETALL of at most ``top_k`` fields.
+              Writes that depend on what is stored (replace, trim) read and write in one
+              WATCH/MULTI transaction. Redis failures are logged; failed reads return no
+              recommendations.
+
+    Args:
+        redis_client: Synchronous ``redis.Redis`` client.
+        top_k: Matches kept per user.
+        namespace: Key prefix.
+    """
+
+    def __init__(self, redis_client, top_k: int = DEFAULT_TOP_K, namespace: str = "recs"):
+        super().__init__(top_k)
+        self.redis = redis_client
+        self.namespace = namespace
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.namespace}:user:{user_id}"
+
+    def _job_key(self, member: str) -> str:
+        return f"{self.namespace}:job:{member}"
+
+    @staticmethod
+    def _member(job_id: Any) -> str:
+        return json.dumps(job_id)  # keeps int and str ids apart and round-trips them
+
+    @staticmethod
+    def _sort_score(rank: Rank) -> float:
+        # Score in the thousands, opportunity below, then the tie-breaker (-seq, 0 or less) as a
+        # fraction under 0.001 that shrinks as seq grows. A double cannot hold every rank exactly,
+        # so trimming and reads order by the exact rank stored in the hash.
+        tiebreak = 0.001 / (1 - rank[2]) if len(rank) > 2 and rank[2] <= 0 else 0
+        return float(rank[0]) * 1000 + float(rank[1] if len(rank) > 1 else 0) + tiebreak
+
+    @staticmethod
+    def _text(value) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def _write(self, operation: str, build) -> Optional[list]:
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            build(pipe)
+            return pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis {operation} failed for recommendations '{self.namespace}': {e}")
+            return None
+
+    def _transaction(self, operation: str, key: str, build) -> Optional[list]:
+        """
+        Runs ``build(pipe)`` with ``key`` watched: it reads through ``pipe``, calls ``pipe.multi()``
+        and queues its writes, which are applied atomically unless another client changed ``key``
+        in between (then it runs again).
+        """
+        for _ in range(TRANSACTION_RETRIES):
+            try:
+                with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.watch(key)
+                    build(pipe)
+                    return pipe.execute()
+            except WatchError:
+                continue
+            except Exception as e:
+                logger.warning(f"Redis {operation} failed for recommendations '{self.namespace}': {e}")
+                return None
+        logger.warning(f"Redis {operation} for recommendations '{self.namespace}' gave up after {TRANSACTION_RETRIES} conflicting writes")
+        return None
+
+    def _queue_add(self, pipe, user_id: str, rank: Rank, job_id: Any, match: Dict[str, Any]) -> None:
+        key, member = self._user_key(user_id), self._member(job_id)
+        pipe.zadd(key, {member: self._sort_score(rank)})
+        pipe.hset(f"{key}:matches", member, json.dumps({"rank": list(rank), "match": match}, default=str))
+        pipe.sadd(self._job_key(member), user_id)
+
+    def _queue_remove(self, pipe, user_id: str, members: Iterable[str]) -> None:
+        members = list(members)
+        if members:
+            key = self._user_key(user_id)
+            pipe.zrem(key, *members)
+            pipe.hdel(f"{key}:matches", *members)
+            for member in members:
+                pipe.srem(self._job_key(member), user_id)
+
+    def _trim(self, user_id: str) -> List[str]:
+        """Removes the matches ranked below ``top_k`` (with their hash fields and job index entries)."""
+        matches_key = f"{self._user_key(user_id)}:matches"
+        overflow: List[str] = []
+
+        def build(pipe):
+            fields = pipe.hgetall(matches_key)
+            ranked = sorted(fields.items(), key=lambda item: tuple(json.loads(item[1])["rank"]), reverse=True)
+            overflow[:] = [self._text(member) for member, _ in ranked[self.top_k:]]
+            pipe.multi()
+            self._queue_remove(pipe, user_id, overflow)
+
+        if self._transaction("trim", matches_key, build) is None:
+            return []
+        return overflow
+
+    def add(self, user_id: str, rank: Rank, job_id: Any, match: Dict[str, Any], evict: Iterable[Any] = ()) -> bool:
+        def build(pipe):
+            self._queue_remove(pipe, user_id, [self._member(job) for job in evict])
+            self._queue_add(pipe, user_id, rank, job_id, match)
+            pipe.zcard(self._user_key(user_id))
+
+        result = self._write("add", build)
+        if result is None:
+            return False
+        if result[-1] > self.top_k:
+            return self._member(job_id) not in self._trim(user_id)
+        return True
+
+    def replace(self, user_id: str, entries: Iterable[Entry]) -> None:
+        best = heapq.nlargest(self.top_k, entries, key=lambda entry: tuple(entry[0]))
+        key = self._user_key(user_id)
+
+        def build(pipe):
+            old = [self._text(m) for m in pipe.zrange(key, 0, -1)]
+            pipe.multi()
+            self._queue_remove(pipe, user_id, old)
+            pipe.delete(key, f"{key}:matches")
+            for rank, job_id, match in best:
+                self._queue_add(pipe, user_id, rank, job_id, match)
+
+        self._transaction("replace", key, build)
+
+    def discard(self, user_id: str, job_id: Any) -> None:
+        self._write("discard", lambda pipe: self._queue_remove(pipe, user_id, [self._member(job_id)]))
+
+    def remove_job(self, job_id: Any) -> List[str]:
+        member = self._member(job_id)
+        try:
+            users = sorted(self._text(u) for u in self.redis.smembers(self._job_key(member)))
+        except Exception as e:
+            logger.warning(f"Redis read failed for recommendations '{self.namespace}': {e}")
+            return []
+
+        def build(pipe):
+            for user_id in users:
+                self._queue_remove(pipe, user_id, [member])
+            pipe.delete(self._job_key(member))
+
+        self._write("remove_job", build)
+        return users
+
+    def clear(self, user_id: str) -> None:
+        self.replace(user_id, [])
+
+    def _entries(self, user_id: str) -> List[Tuple[Rank, Any, Dict[str, Any]]]:
+        try:
+            fields = self.redis.hgetall(f"{self._user_key(user_id)}:matches")
+        except Exception as e:
+            logger.warning(f"Redis read failed for recommendations '{self.namespace}': {e}")
+            return []
+        entries = []
+        for member, raw in fields.items():
+            value = json.loads(raw)
+            entries.append((tuple(value["rank"]), json.loads(self._text(member)), value["match"]))
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        return entries[:self.top_k]
+
+    def ranked(self, user_id: str) -> List[Tuple[Rank, Any]]:
+        return [(rank, job_id) for rank, job_id, _ in self._entries(user_id)]
+
+    def top(self, user_id: str) -> List[Dict[str, Any]]:
+        return [match for _, _, match in self._entries(user_id)]
+
+
+_store: Optional[RecommendationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_recommendation_store(top_k: int = DEFAULT_TOP_K) -> RecommendationStore:
+    """Returns the process-wide store: Redis-backed when REDIS_URL is configured, in-process otherwise."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                client = get_redis_client()
+                _store = RedisRecommendationStore(client, top_k) if client is not None else RecommendationStore(top_k)
+                logger.info(f"Using {type(_store).__name__} for recommendations (top {top_k} per user).")
+    return _store
@@ -11,6 +11,26 @@ print(f"Current Working Directory: {os.getcwd()}")
 print(f"Sys Path: {sys.path}")
 
 from packages.agents.job_matcher.job_matcher_agent import JobMatcherAgent
+from packages.utilities.vector_matching.vector_matcher import JobVectorIndex
+from unittest import mock
+import pytest
+from packages.agents.job_matcher.job_index import JobIndexSync, load_job_listings, retrieve_candidates
+from packages.database.models import JobApplication, JobListing
+from packages.database.config import Base
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import tempfile
+import numpy as np
+import copy
+from packages.common_types.records import JobRecord
+from packages.agents.job_processor.job_processor_agent import JobProcessorAgent
+from packages.agents.job_matcher.vectorized_matcher import JobBatch, score_job_batch, top_k_matches
+import random
+from packages.agents.job_matcher.job_matcher_utils import calculate_skill_score, expand_skills, location_preference_score
+from packages.agents.job_matcher.incremental_matcher import IncrementalMatcher
+from packages.agents.job_matcher.recommendation_store import RecommendationStore, RedisRecommendationStore
+from packages.utilities.location_index import get_location_index
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
 
 class DummyDB:
     pass
@@ -137,5 +157,356 @@ class TestJobMatcherAgent(unittest.TestCase):
         self.assertIn("Partial Culture", titles)
         # Poor Culture may be filtered out if score < 50
 
+class TestJobRecords(unittest.TestCase):
+    PROFILE = {
+        "skills": ["Python", "Java"],
+        "experience": [{"years": 3}],
+        "education": [{"degree": "B.S. Computer Science"}],
+        "preferences": {"job_locations": ["Remote"], "salary_range": "$80,000 - $120,000", "job_types": ["Full-time"]},
+        "culture": {"work_life_balance": 0.8, "innovation": 0.7},
+    }
+    JOBS = [
+        {"id": 1, "title": "Low Salary", "company": "A", "location": "Remote", "required_skills": ["Python"], "required_experience": 3, "required_education": ["B.S. Computer Science"], "salary": 0.3, "url": "https://a.example"},
+        {"id": 2, "title": "In Range", "company": "B", "location": "Remote USA", "job_type": "Full-time", "required_skills": ["Python", " Java"], "required_experience": 3, "required_education": ["B.S. Computer Science"], "salary": 0.5, "culture": {"work_life_balance": 0.9, "innovation": 0.6}},
+        {"id": 3, "title": "Above Range", "company": "C", "location": "Remote", "required_skills": ["Python", "Go"], "required_experience": 2, "required_education": [], "salary": 0.7, "growth_potential": 0.9},
+        {"id": 4, "title": "Tie", "company": "C", "location": "Remote", "required_skills": ["Python", "Go"], "required_experience": 2, "salary": 0.7, "growth_potential": 0.9},
+        {"id": 5, "title": "Unqualified", "company": "D", "location": "Berlin", "required_skills": ["Rust"], "required_experience": 9},
+    ]
+
+    def test_record_matching_equals_dict_matching(self):
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=self.PROFILE):
+            agent = JobMatcherAgent(DummyDB())
+        processor = JobProcessorAgent()
+        expected = agent.match_jobs(processor.process(copy.deepcopy(self.JOBS)))
+        records = processor.process_records(copy.deepcopy(self.JOBS))
+        actual = agent.match_job_records(records)
+        strip = lambda jobs: [{k: v for k, v in job.items() if v not in (None, [])} for job in jobs]
+        self.assertEqual(strip(actual), strip(expected))
+        self.assertEqual([job["title"] for job in actual], ["In Range", "Low Salary", "Above Range", "Tie"])
+
+
+class TestVectorizedMatcher(unittest.TestCase):
+    SKILLS = ["Python", "Java", "SQL", "Go", "AWS", " Java"]
+    LOCATIONS = ["Remote", "New York, NY", "Berlin", "Hybrid Austin", ""]
+
+    def random_job(self, rng, i):
+        job = {"id": i, "title": f"Job {i}", "location": rng.choice(self.LOCATIONS),
+               "required_skills": rng.sample(self.SKILLS, rng.randint(0, 4)),
+               "required_experience": rng.randint(0, 8),
+               "required_education": rng.sample(["B.S. Computer Science", "M.S. Statistics"], rng.randint(0, 2))}
+        for factor in ("salary", "growth_potential", "company_reputation", "benefits"):
+            if rng.random() < 0.7:
+                job[factor] = round(rng.random(), 3)
+        if rng.random() < 0.5:
+            job["remote"] = rng.choice([True, False])
+        if rng.random() < 0.5:
+            job["job_type"] = rng.choice(["Full-time", "Contract"])
+        if rng.random() < 0.5:
+            job["culture"] = {k: round(rng.random(), 2) for k in rng.sample(["work_life_balance", "innovation", "diversity"], rng.randint(0, 3))}
+        return job
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.jobs = [self.random_job(rng, i) for i in range(300)] + [
+            {"id": "bad", "title": "Bad", "required_skills": None},
+            {"id": "no-location", "title": "No location", "location": None, "required_skills": ["Python"]},
+        ]
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=TestJobRecords.PROFILE):
+            self.agent = JobMatcherAgent(DummyDB())
+
+    def test_scores_equal_scalar_scoring(self):
+        for jobs in (self.jobs, [JobRecord.from_dict(job) for job in self.jobs if job["id"] != "bad"]):
+            scores, opportunity, valid = score_job_batch(JobBatch.from_jobs(jobs), self.agent.user_profile)
+            user = self.agent._user_match_context()
+            for i, job in enumerate(jobs):
+                details = {"missing_skills": [], "missing_qualifications": [], "opportunity_score": 0, "culture_score": 0}
+                try:
+                    expected = self.agent._score_job(job, user, details)
+                except Exception:
+                    self.assertFalse(valid[i], job["id"])
+                    continue
+                self.assertTrue(valid[i], job["id"])
+                self.assertEqual((scores[i], opportunity[i]), (expected, details["opportunity_score"]), job["id"])
+
+    def test_top_matches_equal_match_jobs(self):
+        expected = self.agent.match_jobs(copy.deepcopy(self.jobs))
+        actual = self.agent.match_job_batch(JobBatch.from_jobs(self.jobs))
+        self.assertEqual(len(actual), 5)
+        self.assertEqual(actual, expected)
+
+    def test_top_k_keeps_ties_in_input_order(self):
+        scores = np.array([60, 80, 80, 40, 80, 90])
+        opportunity = np.array([0.0, 5.0, 7.0, 9.0, 5.0, 1.0])
+        valid = np.array([True, True, True, True, True, False])
+        self.assertEqual(top_k_matches(scores, opportunity, valid, k=3).tolist(), [2, 1, 4])
+        self.assertEqual(top_k_matches(scores, opportunity, valid, k=10).tolist(), [2, 1, 4, 0])
+
+
+class TestSkillMatching(unittest.TestCase):
+    def test_expand_skills_adds_taxonomy_parents(self):
+        self.assertEqual(expand_skills(["django", "Docker"]), {"django", "python", "web framework", "docker", "devops"})
+
+    def test_skill_score_is_case_insensitive(self):
+        score, missing = calculate_skill_score(["Python", "java"], ["Python", " Java", "Go", "python"])
+        self.assertAlmostEqual(score, (2 / 3) * 50)
+        self.assertEqual(missing, ["Go"])
+        self.assertEqual(calculate_skill_score(["Python"], []), (0, []))
+
+
+class TestLocationPreference(unittest.TestCase):
+    def test_location_preference_score(self):
+        index = get_location_index()
+        preferences = {"job_locations": ["San Francisco", "Berlin"], "remote": False}
+        self.assertEqual(location_preference_score(preferences, "Berlin", None), 15 * 0.4)
+        self.assertEqual(location_preference_score(preferences, "Oakland, CA", None), 15 * 0.3)
+        self.assertEqual(location_preference_score(preferences, "Los Angeles, CA", None), 15 * 0.2)
+        self.assertEqual(location_preference_score(preferences, "Bern", None), 0)
+        self.assertEqual(location_preference_score(preferences, "Anywhere", None, index.resolve("SF")), 15 * 0.4)
+
+
+class TestIncrementalMatcher(unittest.TestCase):
+    SKILLS = ["Python", "Java", "SQL", "Go", "AWS", "Docker", "React", "Rust", "Kafka", "Spark"]
+    LOCATIONS = ["San Francisco, CA", "Oakland, CA", "New York, NY", "Austin, TX", "Berlin", "Remote", "Hybrid - Austin", "Bay Area"]
+    random_job = TestVectorizedMatcher.random_job
+
+    def random_profile(self, rng):
+        preferences = {"job_locations": rng.sample(["San Francisco", "Berlin", "New York City", "Remote", "Bay Area", "California"], rng.randint(0, 2))}
+        if rng.random() < 0.5:
+            preferences["job_types"] = ["Full-time"]
+        if rng.random() < 0.5:
+            preferences["remote"] = rng.choice([True, False])
+        return {"skills": rng.sample(self.SKILLS, rng.randint(1, 4)), "experience": [{"years": rng.randint(0, 6)}],
+                "education": [{"degree": "B.S. Computer Science"}] if rng.random() < 0.6 else [], "preferences": preferences}
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.rng = rng
+        self.jobs = [self.random_job(rng, i) for i in range(150)]
+        self.profiles = {f"user{i}": self.random_profile(rng) for i in range(25)}
+
+    def expected(self, profile, jobs):
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=profile):
+            agent = JobMatcherAgent(DummyDB())
+        return [(job["id"], job["compatibility_score"]) for job in agent.match_jobs(copy.deepcopy(jobs))]
+
+    def assert_equals_full_matching(self, matcher):
+        jobs = matcher.jobs()
+        for user_id, profile in self.profiles.items():
+            actual = [(job["id"], job["compatibility_score"]) for job in matcher.top_matches(user_id)]
+            self.assertEqual(actual, self.expected(profile, jobs), user_id)
+
+    def test_incremental_updates_equal_full_matching(self):
+        matcher = IncrementalMatcher()
+        users = list(self.profiles.items())
+        for user_id, profile in users[:10]:
+            matcher.upsert_user(user_id, profile)
+        for job in self.jobs[:100]:
+            matcher.add_job(job)
+        matcher.apply_delta(dict(users[10:]), jobs=self.jobs[100:])
+        self.assert_equals_full_matching(matcher)
+
+        for job in self.rng.sample(self.jobs, 15):
+            matcher.add_job(dict(job, required_skills=self.rng.sample(self.SKILLS, 2)))
+        for job_id in self.rng.sample(range(150), 20):
+            matcher.remove_job(job_id)
+        for user_id in self.rng.sample(list(self.profiles), 5):
+            self.profiles[user_id] = self.random_profile(self.rng)
+            matcher.upsert_user(user_id, self.profiles[user_id])
+        self.assert_equals_full_matching(matcher)
+
+    def test_profile_skills_are_matched_once_a_job_registers_them(self):
+        vocabulary = get_skill_vocabulary()
+        skill = f"Skill {len(vocabulary)}-{self.rng.random()}"  # not yet in the process-wide vocabulary
+        profile = {"skills": [skill], "experience": [{"years": 5}], "education": [], "preferences": {"job_locations": ["Berlin"]}}
+        matcher = IncrementalMatcher()
+        matcher.upsert_user("u", profile)  # shares no location with the job, so only a skill key can reach it
+        self.assertNotIn(skill, vocabulary)
+        job = {"id": "new-skill", "title": "New", "location": "Austin, TX", "required_skills": [skill]}
+        self.assertEqual(matcher.add_job(job), ["u"])
+        self.assertEqual(matcher.top_matches("u")[0]["match_details"]["missing_skills"], [])
+        self.assertEqual([(m["id"], m["compatibility_score"]) for m in matcher.top_matches("u")], self.expected(profile, [job]))
+
+    def test_new_job_fans_out_to_candidate_users_only(self):
+        matcher = IncrementalMatcher()
+        for user_id, profile in self.profiles.items():
+            matcher.upsert_user(user_id, profile)
+        for job in self.jobs:
+            matcher.add_job(job)
+        before = matcher.stats["pairs_scored"]
+        matched = matcher.add_job({"id": "rust-berlin", "title": "Rust", "location": "Berlin", "required_skills": ["Rust"]})
+        scored = matcher.stats["pairs_scored"] - before
+        self.assertLess(scored, len(self.profiles))
+        self.assertTrue(all(any(m["id"] == "rust-berlin" for m in matcher.top_matches(u)) for u in matched))
+        self.assertFalse(matcher.upsert_user("user0", self.profiles["user0"]))  # unchanged profile: no re-match
+        self.assertEqual(matcher.add_job(self.jobs[0]), [])
+
+    def test_restarted_matcher_keeps_stored_matches_until_jobs_are_indexed(self):
+        store = RecommendationStore()
+        matcher = IncrementalMatcher(store=store)
+        matcher.apply_delta(self.profiles, jobs=self.jobs)
+        stored = {user_id: matcher.top_matches(user_id) for user_id in self.profiles}
+        restarted = IncrementalMatcher(store=store)
+        restarted.apply_delta(self.profiles)
+        self.assertEqual({user_id: restarted.top_matches(user_id) for user_id in self.profiles}, stored)
+        restarted.apply_delta({}, jobs=self.jobs)
+        self.assert_equals_full_matching(restarted)
+
+
+@pytest.mark.usefixtures("fake_redis")
+class TestRecommendationStore(unittest.TestCase):
+    def match(self, job_id, score):
+        return {"id": job_id, "title": f"Job {job_id}", "compatibility_score": score, "match_details": {}}
+
+    def check_bounded_top_k(self, store):
+        for job_id, score in enumerate([60, 90, 75, 55, 90, 80]):
+            store.add("u1", (score, 0.0, -job_id), job_id, self.match(job_id, score))
+        store.add("u2", (70, 0.0, 0), 2, self.match(2, 70))
+        self.assertEqual([m["id"] for m in store.top("u1")], [1, 4, 5])
+        self.assertFalse(store.add("u1", (50, 0.0, -9), 9, self.match(9, 50)))
+        self.assertEqual(store.remove_job(2), ["u2"])
+        self.assertEqual(store.top("u2"), [])
+        self.assertEqual(store.remove_job(4), ["u1"])
+        self.assertEqual([rank[0] for rank, _ in store.ranked("u1")], [90, 80])
+        store.replace("u1", [((65, 1.0, 0), "a", self.match("a", 65))])
+        self.assertEqual(store.top("u1"), [self.match("a", 65)])
+        store.clear("u1")
+        self.assertEqual(store.top("u1"), [])
+
+    def test_in_memory_store_keeps_top_k(self):
+        self.check_bounded_top_k(RecommendationStore(top_k=3))
+
+    def test_redis_store_keeps_top_k(self):
+        redis = self.fake_redis
+        self.check_bounded_top_k(RedisRecommendationStore(redis, top_k=3))
+        self.assertEqual(redis.data, {})  # nothing left behind once every user is cleared
+
+    def test_redis_store_breaks_ties_by_arrival(self):
+        store = RedisRecommendationStore(self.fake_redis, top_k=2)
+        for seq, job_id in [(2, "c"), (0, "a"), (1, "b")]:
+            store.add("u1", (80, 5.0, -seq), job_id, self.match(job_id, 80))
+        self.assertEqual([job_id for _, job_id in store.ranked("u1")], ["a", "b"])
+        store.replace("u1", [((70, 0.0, -3), "d", self.match("d", 70))])
+        self.assertEqual(store.top("u1"), [self.match("d", 70)])
+        self.assertEqual(set(self.fake_redis.data), {"recs:user:u1", "recs:user:u1:matches", 'recs:job:"d"'})
+
+    def test_agent_writes_recommendations_instead_of_caching(self):
+        store = RecommendationStore()
+        profile = TestIncrementalMatcher().random_profile(random.Random(1))
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=profile):
+            agent = JobMatcherAgent(DummyDB(), store=store, user_id="user1")
+        rng = random.Random(3)
+        jobs = [TestVectorizedMatcher().random_job(rng, i) for i in range(60)]
+        top = agent.match_jobs(jobs)
+        self.assertEqual([(m["id"], m["compatibility_score"]) for m in agent.get_recommendations()],
+                         [(m["id"], m["compatibility_score"]) for m in top])
+        self.assertEqual(store.top("user1"), agent.get_recommendations())
+        agent.match_jobs([])
+        self.assertEqual(agent.get_recommendations(), [])
+
+    def test_incremental_matcher_persists_to_redis(self):
+        tests = TestIncrementalMatcher()
+        tests.setUp()
+        redis = self.fake_redis
+        matcher = IncrementalMatcher(store=RedisRecommendationStore(redis))
+        for user_id, profile in tests.profiles.items():
+            matcher.upsert_user(user_id, profile)
+        for job in tests.jobs:
+            matcher.add_job(job)
+        for job_id in range(0, 150, 7):
+            matcher.remove_job(job_id)
+        tests.assert_equals_full_matching(matcher)
+
+        restarted = RedisRecommendationStore(redis)  # e.g. the API process
+        for user_id in tests.profiles:
+            self.assertEqual(restarted.top(user_id), matcher.top_matches(user_id))
+            self.assertLessEqual(redis.zcard(f"recs:user:{user_id}"), 5)
+
+
+class TestJobIndex(unittest.TestCase):
+
+    def test_sync_applies_only_committed_changes(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[JobListing.__table__, JobApplication.__table__])
+        Session = sessionmaker(bind=engine)
+        words = ["python", "java", "sales"]
+
+        def embed(texts):
+            return [np.array([float(w in t.lower()) for w in words]) + 0.01 for t in texts]
+
+        calls = []
+
+        def embed_batch(texts):
+            calls.append(len(texts))
+            return embed(texts)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            sync = JobIndexSync(JobVectorIndex(3), embed_batch, path=path, save_interval=3600)
+            sync.attach()
+            try:
+                session = Session()
+                session.add(JobListing(id="1", title="Python Developer", company="A", location="Remote",
+                                       description="Python", url="http://a/1"))
+                session.add(JobListing(id="2", title="Sales Lead", company="B", location="Remote",
+                                       description="Sales", url="http://a/2"))
+                session.commit()
+                sync.flush()
+                self.assertEqual(len(sync.index), 2)
+                self.assertEqual(calls, [2])  # one batch per change set, off the committing thread
+                self.assertEqual(sync.index.search([0, 0, 1], k=1)[0][0], "2")
+
+                session.add(JobListing(id="3", title="Java Engineer", company="C", location="Remote",
+                                       description="Java", url="http://a/3"))
+                session.flush()
+                session.rollback()
+                self.assertNotIn("3", sync.index)
+
+                session.delete(session.get(JobListing, "2"))
+                session.commit()
+                sync.flush()
+                self.assertEqual(sync.index.ids, ["1"])
+                self.assertEqual(JobVectorIndex.load(path).ids, ["1"])
+
+                candidates = retrieve_candidates(sync.index, embed(["python"])[0],
+                                                 lambda ids: load_job_listings(session, ids), k=5)
+                self.assertEqual([(job["id"], job["title"]) for job, _ in candidates], [("1", "Python Developer")])
+                session.close()
+            finally:
+                sync.detach()
+
+    def test_match_indexed_jobs_loads_only_candidates(self):
+        index = JobVectorIndex(2)
+        index.upsert(["near", "far", "mid"], [[1, 0], [0, 1], [1, 1]])
+        requested = []
+
+        def load_jobs(job_ids):
+            requested.append(job_ids)
+            return {job_id: {"id": job_id, "title": job_id, "required_skills": ["Python"]} for job_id in job_ids}
+
+        profile = {"skills": ["Python"], "experience": [{"title": "Developer", "years": 5}]}
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=profile):
+            agent = JobMatcherAgent(DummyDB(), store=RecommendationStore())
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.get_text_embedding", return_value=np.array([1.0, 0.1])):
+            matches = agent.match_indexed_jobs(index, load_jobs, candidate_k=2)
+        self.assertEqual(requested, [["near", "mid"]])
+        self.assertTrue(all(match["id"] in ("near", "mid") and "semantic_similarity" in match for match in matches))
+
+    def test_match_indexed_jobs_scores_job_records(self):
+        index = JobVectorIndex(2)
+        index.upsert(["near", "far"], [[1, 0], [0, 1]])
+        processor = JobProcessorAgent()
+
+        def load_jobs(job_ids):
+            jobs = [{"id": job_id, "title": job_id, "required_skills": ["Python"]} for job_id in job_ids]
+            return {record.id: record for record in processor.process_records(jobs)}
+
+        profile = {"skills": ["Python"], "experience": [{"title": "Developer", "years": 5}]}
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=profile):
+            agent = JobMatcherAgent(DummyDB(), store=RecommendationStore())
+        with mock.patch("packages.agents.job_matcher.job_matcher_agent.get_text_embedding", return_value=np.array([1.0, 0.1])):
+            matches = agent.match_indexed_jobs(index, load_jobs, candidate_k=1)
+        self.assertEqual([(match["id"], match["semantic_similarity"]) for match in matches], [("near", 0.995)])
+        self.assertEqual(agent.get_recommendations()[0]["semantic_similarity"], 0.995)
+
 if __name__ == '__main__':
     unittest.main()
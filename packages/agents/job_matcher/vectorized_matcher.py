@@ -0,0 +1,218 @@
+import logging
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
+from packages.agents.job_matcher.job_matcher_utils import (
+    MAX_PREFERENCE_SCORE,
+    OPPORTUNITY_FACTORS,
+    job_type_preference_score,
+    location_preference_score,
+    parse_salary_range,
+    remote_preference_score,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _codes(values: Iterable[Hashable]) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encodes values: returns (int32 code per value, unique values in first-seen order)."""
+    vocabulary: Dict[Any, int] = {}
+    codes = [vocabulary.setdefault(value, len(vocabulary)) for value in values]
+    return np.asarray(codes, dtype=np.int32), list(vocabulary)
+
+
+def _set_counts(rows: np.ndarray, indices: np.ndarray, size: int, member_ids: Iterable[int], n: int) -> np.ndarray:
+    """Per job, how many of its (unique) CSR set entries are in ``member_ids``."""
+    flags = np.zeros(size, dtype=np.float64)
+    flags[[i for i in member_ids if i is not None and i < size]] = 1
+    return np.bincount(rows, weights=flags[indices], minlength=n)
+
+
+class JobBatch:
+    """
+    [CONTEXT] Columnar encoding of many processed jobs (dicts or JobRecords) for vectorized matching.
+    [PURPOSE] Jobs are encoded once; every user is then scored against all of them with array
+              operations instead of a Python loop (see score_job_batch).
+
+    Columns: required skills as CSR sets of SkillVocabulary ids, education as CSR sets over a
+    per-batch vocabulary, required experience,
+    salary and opportunity factors (NaN when absent), dictionary codes for location, remote flag
+    and job type, and a culture matrix (NaN for missing keys). Jobs whose fields would make the
+    scalar scoring functions raise are marked invalid and never matched, like match_jobs skips them.
+    """
+
+    def __init__(self, jobs: Sequence[Mapping[str, Any]]):
+        self.jobs = jobs
+        n = len(jobs)
+        self.valid = np.ones(n, dtype=bool)
+        self.skill_vocabulary = get_skill_vocabulary()
+        self.education_vocabulary: Dict[str, int] = {}
+        self.culture_keys: Dict[str, int] = {}
+        skill_rows, education_rows, culture_rows = [], [], []
+        experience = np.zeros(n, dtype=np.float64)
+        opportunity = np.full((n, len(OPPORTUNITY_FACTORS)), np.nan)
+        salary = np.full(n, np.nan)
+        locations, remotes, job_types = [], [], []
+
+        for i, job in enumerate(jobs):
+            try:
+                skills = {self.skill_vocabulary.id_of(s, add=True) for s in set(job.get("required_skills", []))}
+                education = {self.education_vocabulary.setdefault(e, len(self.education_vocabulary)) for e in set(job.get("required_education", []))}
+                experience[i] = job.get("required_experience", 0)
+                for j, factor in enumerate(OPPORTUNITY_FACTORS):
+                    if factor in job:
+                        opportunity[i, j] = float(job[factor])
+                job_salary = job.get("salary")
+                if job_salary is not None:
+                    salary[i] = float(job_salary)
+                culture = job.get("culture", {})
+                culture = {self.culture_keys.setdefault(k, len(self.culture_keys)): float(v) for k, v in culture.items()} if culture else {}
+                location, remote, job_type = job.get("location", ""), job.get("remote"), job.get("job_type")
+                hash((location, remote, job_type))  # dictionary-encoded below
+            except Exception as e:
+                logger.warning(f"Job {job.get('title', 'N/A')} cannot be scored and is excluded: {e}")
+                self.valid[i] = False
+                skills, education, culture, location, remote, job_type = set(), set(), {}, "", None, None
+            skill_rows.append(sorted(skills))
+            education_rows.append(sorted(education))
+            culture_rows.append(culture)
+            locations.append(location)
+            remotes.append(remote)
+            job_types.append(job_type)
+
+        self.skill_indptr, self.skill_indices = self._csr(skill_rows)
+        self.education_indptr, self.education_indices = self._csr(education_rows)
+        self.skill_counts = np.diff(self.skill_indptr)
+        self.education_counts = np.diff(self.education_indptr)
+        self.skill_rows = np.repeat(np.arange(n), self.skill_counts)
+        self.education_rows = np.repeat(np.arange(n), self.education_counts)
+        self.experience = experience
+        self.salary = salary
+        self.opportunity = opportunity
+        self.location_codes, self.location_values = _codes(zip(locations, remotes))
+        self.remote_codes, self.remote_values = _codes(remotes)
+        self.job_type_codes, self.job_type_values = _codes(job_types)
+        self.culture = np.full((n, len(self.culture_keys)), np.nan)
+        for i, culture in enumerate(culture_rows):
+            for k, v in culture.items():
+                self.culture[i, k] = v
+        self.has_culture = ~np.isnan(self.culture).all(axis=1) if self.culture_keys else np.zeros(n, dtype=bool)
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Mapping[str, Any]]) -> "JobBatch":
+        return cls(jobs if isinstance(jobs, Sequence) else list(jobs))
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    @staticmethod
+    def _csr(rows: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        indices = np.fromiter((c for row in rows for c in row), dtype=np.int64, count=int(indptr[-1]))
+        return indptr, indices
+
+
+def _per_value(values: List[Any], codes: np.ndarray, score) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluates a scalar scoring function once per distinct value; returns (scores, failed mask)."""
+    table = np.zeros(len(values), dtype=np.float64)
+    failed = np.zeros(len(values), dtype=bool)
+    for code, value in enumerate(values):
+        try:
+            table[code] = score(value)
+        except Exception:
+            failed[code] = True
+    return table[codes], failed[codes]
+
+
+def score_job_batch(batch: JobBatch, user_profile: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    [CONTEXT] Vectorized equivalent of JobMatcherAgent._score_job over every job in ``batch``.
+    [PURPOSE] Returns (compatibility scores as int64, opportunity scores, valid mask), equal to
+              the scalar calculate_*_score functions. Categorical preference parts (location,
+              job type, remote) are evaluated once per distinct value with the scalar functions.
+    """
+    n = len(batch)
+    valid = batch.valid.copy()
+    preferences = user_profile.get("preferences", {})
+    user_culture = user_profile.get("culture", {})
+    user_experience = sum(int(exp.get("years", 0)) for exp in user_profile.get("experience", []))
+    user_skills = [batch.skill_vocabulary.id_of(s, add=False) for s in user_profile.get("skills", [])]
+    user_education = set(edu.get("degree") for edu in user_profile.get("education", []) if edu.get("degree"))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 1. Skill Matching (50% of total score)
+        common = _set_counts(batch.skill_rows, batch.skill_indices, len(batch.skill_vocabulary), user_skills, n)
+        skill = np.where(batch.skill_counts > 0, (common / batch.skill_counts) * 50, 0.0)
+
+        # 2. Experience Matching (20% of total score)
+        job_experience = batch.experience
+        experience = np.where(user_experience >= job_experience, 20.0, (user_experience / job_experience) * 20)
+        valid &= (user_experience >= job_experience) | (job_experience != 0)  # ZeroDivisionError in the scalar path
+
+        # 3. Education Matching (15% of total score)
+        education_ids = [batch.education_vocabulary.get(e) for e in user_education]
+        common = _set_counts(batch.education_rows, batch.education_indices, len(batch.education_vocabulary), education_ids, n)
+        education = np.where(batch.education_counts > 0, (common / batch.education_counts) * 15, 0.0)
+
+    # 4. Preference Matching (15% of total score), summed in the scalar function's order
+    location, failed = _per_value(batch.location_values, batch.location_codes,
+                                  lambda value: location_preference_score(preferences, value[0], value[1]))
+    valid &= ~failed
+    job_type, _ = _per_value(batch.job_type_values, batch.job_type_codes,
+                             lambda value: job_type_preference_score(preferences, value))
+    remote, _ = _per_value(batch.remote_values, batch.remote_codes,
+                           lambda value: remote_preference_score(preferences, value))
+    salary = np.zeros(n)
+    salary_range = parse_salary_range(preferences.get("salary_range"))
+    if salary_range is not None:
+        min_salary, max_salary = salary_range
+        actual = batch.salary * 200000
+        salary = np.select(
+            [(min_salary <= actual) & (actual <= max_salary), actual > max_salary, (min_salary - 10000 <= actual) & (actual < min_salary)],
+            [MAX_PREFERENCE_SCORE * 0.2, MAX_PREFERENCE_SCORE * 0.2, MAX_PREFERENCE_SCORE * 0.1],
+            0.0,
+        )
+    preference = np.minimum(((location + job_type) + salary) + remote, MAX_PREFERENCE_SCORE)
+
+    # 5. Company Culture Matching (10 points out of 100)
+    culture = np.zeros(n)
+    user_columns = [(c, float(user_culture[k])) for k, c in batch.culture_keys.items() if k in user_culture] if user_culture else []
+    if user_columns:
+        columns = [c for c, _ in user_columns]
+        job_values = batch.culture[:, columns]
+        shared = ~np.isnan(job_values)
+        closeness = np.where(shared, np.maximum(0, 1 - np.abs(np.array([v for _, v in user_columns]) - job_values)), 0.0)
+        counts = shared.sum(axis=1)
+        rows = np.flatnonzero(batch.has_culture & (counts > 0))
+        raw = (closeness[rows].sum(axis=1) / counts[rows]) * 10
+        # Python's round(x, 2) per distinct value, so rounding matches the scalar function exactly
+        distinct, inverse = np.unique(raw, return_inverse=True)
+        culture[rows] = np.array([round(float(x), 2) for x in distinct])[inverse]
+
+    # 6. Opportunity Score (separate metric)
+    opportunity = np.zeros(n)
+    for j, weight in enumerate(OPPORTUNITY_FACTORS.values()):
+        column = batch.opportunity[:, j]
+        opportunity = opportunity + np.where(np.isnan(column), 0.0, (column * weight) * 100)
+
+    total = (((skill + experience) + education) + preference) + culture
+    scores = np.rint(np.where(valid, total, 0)).astype(np.int64)
+    return scores, opportunity, valid
+
+
+def top_k_matches(scores: np.ndarray, opportunity: np.ndarray, valid: np.ndarray, k: int = 5, min_score: int = 50) -> np.ndarray:
+    """
+    [CONTEXT] Ranking stage of vectorized matching.
+    [PURPOSE] Returns the indices of the k best jobs with score >= min_score, ordered like match_jobs
+              (score desc, opportunity desc, input order), selected with argpartition instead of a full sort.
+    """
+    candidates = np.flatnonzero(valid & (scores >= min_score))
+    if len(candidates) > k:
+        part = np.argpartition(-scores[candidates], k - 1)[:k]
+        threshold = scores[candidates[part]].min()
+        candidates = candidates[scores[candidates] >= threshold]  # keep every job tied at the cut-off
+    order = np.lexsort((candidates, -opportunity[candidates], -scores[candidates]))
+    return candidates[order[:k]]
@@ -1,7 +1,8 @@
 import logging
 import logging
-from typing import List, Dict, Any
-from packages.agents.job_processor.job_processor_utils import clean_and_normalize_job, enrich_job_data
+from typing import Iterable, List, Dict, Any
+from packages.agents.job_processor.job_processor_utils import build_job_record, clean_and_normalize_job, enrich_job_data
+from packages.common_types.records import JobRecord
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +35,15 @@ class JobProcessorAgent:
         )
         return processed_listings
 
-
+    def process_records(self, job_listings: Iterable[Dict[str, Any]]) -> List[JobRecord]:
+        """
+        [CONTEXT] Same processing as ``process``, producing compact immutable JobRecords.
+        [PURPOSE] Used by high-volume matching, which keeps jobs as records end to end and
+                  converts back to dicts only for the results it returns.
+        """
+        records = [build_job_record(job) for job in job_listings]
+        self.logger.info(f"Processed {len(records)} listings into job records.")
+        return records
 
 
 
@@ -1,28 +1,23 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-def clean_and_normalize_job(job: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    [CONTEXT] Cleans and normalizes individual job listing data.
-    [PURPOSE] Ensures consistency in data formats (e.g., location, title).
-    """
-    cleaned_job = job.copy()
-    cleaned_job["title"] = cleaned_job.get("title", "").strip()
-    cleaned_job["company"] = cleaned_job.get("company", "").strip()
-    cleaned_job["location"] = (
-        cleaned_job.get("location", "").replace("USA", "").strip()
-    )  # Example normalization
-    cleaned_job["description"] = cleaned_job.get("description", "").strip()
-    return cleaned_job
+from packages.common_types.records import JobRecord
+from packages.utilities.location_index import get_location_index
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
 
-def enrich_job_data(job: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    [CONTEXT] Enriches job listing data with additional derived information.
-    [PURPOSE] Adds valuable insights like required skills, experience level, or industry.
-    """
-    enriched_job = job.copy()
+
+def _clean_fields(job: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "title": job.get("title", "").strip(),
+        "company": job.get("company", "").strip(),
+        "location": job.get("location", "").replace("USA", "").strip(),  # Example normalization
+        "description": job.get("description", "").strip(),
+    }
+
+
+def _enriched_fields(description: str) -> Dict[str, Any]:
     # Dummy enrichment: add a 'skills' field
-    description = enriched_job.get("description", "").lower()
-    skills = []
+    description = description.lower()
+    skills: List[str] = []
     if "python" in description:
         skills.append("Python")
     if "java" in description:
@@ -31,13 +26,43 @@ def enrich_job_data(job: Dict[str, Any]) -> Dict[str, Any]:
         skills.append("SQL")
     if "machine learning" in description:
         skills.append("Machine Learning")
-    enriched_job["extracted_skills"] = skills
 
     # Dummy enrichment: add an 'experience_level' field
     if any(keyword in description for keyword in ["senior", "lead", "architect"]):
-        enriched_job["experience_level"] = "Senior"
+        experience_level = "Senior"
     elif any(keyword in description for keyword in ["junior", "entry-level"]):
-        enriched_job["experience_level"] = "Junior"
+        experience_level = "Junior"
     else:
-        enriched_job["experience_level"] = "Mid-level"
-    return enriched_job
\ No newline at end of file
+        experience_level = "Mid-level"
+    return {"extracted_skills": skills, "experience_level": experience_level}
+
+
+def clean_and_normalize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    [CONTEXT] Cleans and normalizes individual job listing data.
+    [PURPOSE] Ensures consistency in data formats (e.g., location, title).
+    """
+    cleaned_job = job.copy()
+    cleaned_job.update(_clean_fields(job))
+    return cleaned_job
+
+def enrich_job_data(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    [CONTEXT] Enriches job listing data with additional derived information.
+    [PURPOSE] Adds valuable insights like required skills, experience level, or industry.
+    """
+    enriched_job = job.copy()
+    enriched_job.update(_enriched_fields(enriched_job.get("description", "")))
+    return enriched_job
+
+def build_job_record(job: Dict[str, Any]) -> JobRecord:
+    """
+    [CONTEXT] Cleans, normalizes and enriches a raw job listing straight into a JobRecord.
+    [PURPOSE] Same result as enrich_job_data(clean_and_normalize_job(job)) without the intermediate dict copies.
+    """
+    cleaned = _clean_fields(job)
+    required_skills = job.get("required_skills")
+    if required_skills and all(isinstance(skill, str) for skill in required_skills):
+        cleaned["skill_bits"] = get_skill_vocabulary().encode(required_skills, add=True)
+    cleaned["location_id"] = get_location_index().resolve(cleaned["location"])
+    return JobRecord.from_dict(job, **cleaned, **_enriched_fields(cleaned["description"]))
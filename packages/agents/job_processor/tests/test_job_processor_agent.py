@@ -1,5 +1,8 @@
+import copy
 import pytest
 from packages.agents.job_processor.job_processor_agent import JobProcessorAgent
+from packages.utilities.location_index import get_location_index
+from packages.utilities.skill_vocabulary import get_skill_vocabulary
 
 @pytest.fixture
 def job_processor_agent():
@@ -36,4 +39,26 @@ def test_process_job_listing_missing_fields(job_processor_agent):
     assert "title" in processed_job
     assert "company" in processed_job
     assert "processed_date" in processed_job
-    assert "description" not in processed_job
\ No newline at end of file
+    assert "description" not in processed_job
+
+
+def test_process_records_matches_process(job_processor_agent):
+    jobs = [
+        {"id": 1, "title": "Backend", "company": "A", "location": "Remote", "required_skills": ["Python", " Java"], "required_experience": 3, "salary": 0.5, "culture": {"innovation": 0.6}},
+        {"id": 2, "title": "Unqualified", "company": "D", "location": "Berlin", "required_skills": ["Rust"], "required_experience": 9, "required_education": []},
+    ]
+    records = job_processor_agent.process_records(copy.deepcopy(jobs))
+    assert [record.to_dict() for record in records] == [
+        {k: v for k, v in job.items() if k not in ("match_details", "compatibility_score") and v not in (None, [])}
+        for job in job_processor_agent.process(copy.deepcopy(jobs))
+    ]
+
+def test_job_records_carry_skill_bits(job_processor_agent):
+    record = job_processor_agent.process_records([{"title": "A", "required_skills": ["Python", "SQL"]}])[0]
+    assert record.get("skill_bits") == get_skill_vocabulary().encode(["python", "sql"])
+    assert "skill_bits" not in record.to_dict()
+
+def test_job_records_carry_location_id(job_processor_agent):
+    record = job_processor_agent.process_records([{"title": "A", "location": "Chicago, IL USA"}])[0]
+    assert record.get("location_id") == get_location_index().resolve("Chicago")
+    assert "location_id" not in record.to_dict()
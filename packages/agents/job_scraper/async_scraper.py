@@ -0,0 +1,266 @@
+import asyncio
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from packages.agents.job_scraper.http_cache import CachedPage, HttpCache
+from packages.agents.job_scraper.job_scraper_utils import JobScraperBase, ProxyRotator, is_captcha_page
+from packages.agents.job_scraper.page_parser import response_charset
+from packages.agents.job_scraper.rate_limiter import DomainRateLimiter, THROTTLE_STATUSES
+
+DEFAULT_CONNECTIONS_PER_HOST = 4
+
+
+def job_key(job: Mapping) -> Hashable:
+    """Deduplication key of a scraped job: its URL, or title, company and location when it has none."""
+    url = job.get("url")
+    if url:
+        return url.split("#")[0].rstrip("/")
+    return tuple((job.get(field) or "").strip().lower() for field in ("title", "company", "location"))
+
+
+class DomainLimiter:
+    """
+    Per-host request limits for the async engine: at most ``max_concurrency`` requests in
+    flight per host, each started with a token from the host's bucket in ``rate_limiter``
+    (shared with the blocking scrapers and, through Redis, with other workers).
+    Different hosts never wait for each other.
+
+    Args:
+        max_concurrency: Concurrent requests per host.
+        rate_limiter: Token buckets per host (default: DomainRateLimiter()).
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_CONNECTIONS_PER_HOST, rate_limiter: Optional[DomainRateLimiter] = None):
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """Waits for a free request slot and a rate-limit token on ``host``."""
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            await self.rate_limiter.acquire_async(host)
+            yield
+
+
+def _not_captcha(page: CachedPage) -> bool:
+    return not is_captcha_page(page.body)
+
+
+class AsyncScrapeEngine:
+    """
+    [CONTEXT] Concurrent scraping of several job boards for the API and workers.
+    [PURPOSE] Fetches every platform, and every result page of a platform, concurrently over a
+              shared httpx.AsyncClient (keep-alive connections pooled per host) under per-host
+              limits, and merges the parsed jobs into one deduplicated stream. Latency is bounded
+              by the slowest platform instead of the sum of all of them. Parsing reuses the
+              platform scrapers' page descriptions (search_params/page_params/parse_jobs).
+
+    The engine binds to the event loop it is first used on; use one engine per loop and close
+    it with ``aclose`` (or ``async with``).
+
+    Args:
+        scrapers: Platform name -> scraper (IndeedScraper, LinkedInScraper, ...).
+        limiter: Per-host limiter (default: DomainLimiter()).
+        proxy_rotator: Optional proxies; one pooled client is kept per proxy.
+        timeout: Request timeout in seconds.
+        max_retries: Attempts per page; a 429/503 pauses the host for its Retry-After, other
+            failures back off with the rate limiter's jittered exponential delay.
+        check_robots: Skip URLs disallowed by robots.txt.
+        logger: Optional logger for dependency injection.
+        http_cache: Optional HttpCache shared with the blocking scrapers; fresh pages are not
+            requested and stale ones are revalidated with a conditional request.
+    """
+
+    def __init__(
+        self,
+        scrapers: Mapping[str, JobScraperBase],
+        limiter: Optional[DomainLimiter] = None,
+        proxy_rotator: Optional[ProxyRotator] = None,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        check_robots: bool = True,
+        logger: Optional[logging.Logger] = None,
+        http_cache: Optional[HttpCache] = None,
+    ) -> None:
+        self.scrapers = dict(scrapers)
+        self.limiter = limiter or DomainLimiter()
+        self.proxy_rotator = proxy_rotator or ProxyRotator()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.check_robots = check_robots
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.http_cache = http_cache
+        self.stats: Counter = Counter()
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
+
+    async def __aenter__(self) -> "AsyncScrapeEngine":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    def _client(self) -> httpx.AsyncClient:
+        proxy = self.proxy_rotator.get_proxy()
+        client = self._clients.get(proxy)
+        if client is None:
+            limits = httpx.Limits(max_connections=None, max_keepalive_connections=self.limiter.max_concurrency * 8)
+            client = httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True, proxy=proxy)
+            self._clients[proxy] = client
+        return client
+
+    async def fetch(self, scraper: JobScraperBase, url: str, params: Optional[Dict] = None,
+                    headers: Optional[Dict[str, str]] = None, page_type: str = "search") -> Optional[str]:
+        """GETs a page with retries under the host's limits; returns its text, or None on failure."""
+        page = await self.fetch_content(scraper, url, params, headers, page_type)
+        if page is None:
+            return None
+        content, charset = page
+        return content.decode(charset or "utf-8", errors="replace")
+
+    async def fetch_content(self, scraper: JobScraperBase, url: str, params: Optional[Dict] = None,
+                            headers: Optional[Dict[str, str]] = None, page_type: str = "search",
+                            validate: Optional[Callable[[CachedPage], bool]] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        ``fetch`` without decoding: returns the response body and its declared charset. A fresh
+        page in the http_cache is returned without a request; a stale one is revalidated. A
+        downloaded page is stored only if ``validate`` accepts it (by default, if it is not a
+        CAPTCHA page); validation runs in a worker thread.
+        """
+        get = await asyncio.to_thread(self.http_cache.begin, url, params, page_type) if self.http_cache else None
+        if get is not None:
+            if get.fresh is not None:
+                return get.fresh.body, response_charset(get.fresh.headers)
+            headers = get.headers(headers)
+        if self.check_robots and not await scraper.robots_checker.can_fetch_async(url):
+            self.logger.warning(f"Blocked by robots.txt: {url}")
+            return None
+        host = urlparse(url).netloc
+        rate_limiter = self.limiter.rate_limiter
+        for attempt in range(self.max_retries):
+            async with self.limiter.slot(host):
+                self.stats["requests"] += 1
+                try:
+                    resp = await self._client().get(url, params=params, headers=headers)
+                    if resp.status_code not in THROTTLE_STATUSES:
+                        if resp.status_code != 304 or get is None or get.cached is None:
+                            resp.raise_for_status()
+                        if get is None:
+                            return resp.content, response_charset(resp.headers)
+                        page = await asyncio.to_thread(get.complete, resp.status_code, resp.headers, resp.content,
+                                                       resp.encoding, validate or _not_captcha)
+                        return page.body, response_charset(page.headers)
+                    pause = await asyncio.to_thread(rate_limiter.retry_after, host, resp.headers.get("Retry-After"), attempt)
+                    self.stats["throttled"] += 1
+                    self.logger.warning(f"Throttled by {host} ({resp.status_code}, attempt {attempt + 1}); pausing it for {pause:.1f}s")
+                    delay = 0.0  # the next slot waits out the pause
+                except httpx.HTTPError as e:
+                    self.logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
+                    delay = rate_limiter.backoff(attempt)
+            if attempt + 1 < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+        self.logger.error(f"All retries failed for {url}")
+        return None
+
+    async def _fetch_page(self, name: str, scraper: JobScraperBase, query: str, location: str, page: int) -> Optional[List[Dict]]:
+        parsed: List[List[Dict]] = []
+
+        def has_jobs(fetched_page: CachedPage) -> bool:
+            # Parsed before storing, so blocked and empty pages are never cached
+            if is_captcha_page(fetched_page.body):
+                return False
+            parsed.append(scraper.parse_jobs(fetched_page.body, response_charset(fetched_page.headers)))
+            return bool(parsed[0])
+
+        fetched = await self.fetch_content(scraper, scraper.BASE_URL, params=scraper.page_params(query, location, page),
+                                           headers=scraper.HEADERS, validate=has_jobs)
+        if fetched is None:
+            return None
+        content, charset = fetched
+        if is_captcha_page(content):
+            self.logger.warning(f"[{name}] CAPTCHA detected. Skipping page.")
+            return None
+        return parsed[0] if parsed else scraper.parse_jobs(content, charset)
+
+    async def _scrape(self, name: str, scraper: JobScraperBase, query: str, location: str, num_results: int,
+                      queue: asyncio.Queue) -> None:
+        """Fetches all pages of one platform concurrently and queues their jobs in page order."""
+        pages = [
+            asyncio.create_task(self._fetch_page(name, scraper, query, location, page))
+            for page in range(scraper.page_count(num_results))
+        ]
+        found = 0
+        try:
+            for page in pages:
+                jobs = await page
+                if not jobs:
+                    if jobs is not None:
+                        self.logger.warning(f"[{name}] No job cards found. HTML may have changed or bot blocked.")
+                    break  # later pages of a blocked or exhausted search are not used
+                for job in jobs[:num_results - found]:
+                    await queue.put((name, job))
+                found = min(num_results, found + len(jobs))
+                if found >= num_results:
+                    break
+            self.logger.info(f"Found {found} jobs on {name}")
+        except Exception as e:
+            self.logger.error(f"Error searching {name}: {e}")
+        finally:
+            for page in pages:
+                page.cancel()
+            await asyncio.gather(*pages, return_exceptions=True)
+            await queue.put(None)
+
+    async def stream(self, query: str, location: str = "", num_results: int = 10,
+                     platforms: Optional[Iterable[str]] = None) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Yields (platform, job) as pages arrive from all platforms, at most ``num_results`` per
+        platform, skipping jobs already yielded by another page or platform (see job_key).
+        """
+        names = list(platforms) if platforms is not None else list(self.scrapers)
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._scrape(name, self.scrapers[name], query, location, num_results, queue))
+            for name in names
+        ]
+        seen = set()
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                    continue
+                key = job_key(item[1])
+                if key in seen:
+                    self.stats["duplicates"] += 1
+                    continue
+                seen.add(key)
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def search(self, query: str, location: str = "", num_results: int = 10,
+                     platforms: Optional[Iterable[str]] = None) -> Dict[str, List[Dict]]:
+        """Collects ``stream`` into platform name -> deduplicated job listings."""
+        names = list(platforms) if platforms is not None else list(self.scrapers)
+        results: Dict[str, List[Dict]] = {name: [] for name in names}
+        async for name, job in self.stream(query, location, num_results, names):
+            results[name].append(job)
+        return results
@@ -0,0 +1,359 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from packages.utilities.cache_utils import content_hash
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    from prometheus_client import Counter as PrometheusCounter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+__all__ = ["CachedPage", "ConditionalGet", "HttpCache", "PAGE_TTLS", "get_http_cache"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CACHE_DIR = os.getenv(
+    "SCRAPER_HTTP_CACHE_DIR", os.path.join(tempfile.gettempdir(), "job_applier_http_cache")
+)
+HTTP_CACHE_ENABLED = os.getenv("SCRAPER_HTTP_CACHE", "true").lower() in ("1", "true", "yes")
+
+# Seconds a stored page is served without contacting the site, per page type. Older pages
+# with an ETag or Last-Modified are revalidated with a conditional request (304: no download).
+PAGE_TTLS = {
+    "search": 15 * 60,  # result pages change as postings come and go
+    "detail": 12 * 3600,  # a posting's own page rarely changes
+    "robots": 24 * 3600,
+}
+DEFAULT_TTL = 15 * 60
+PRUNE_AFTER = 7 * 24 * 3600  # entries untouched this long are deleted by prune()
+
+# Response headers kept with a page; the rest are dropped.
+_STORED_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "date")
+
+if PROMETHEUS_AVAILABLE:
+    http_cache_counter = PrometheusCounter(
+        'scraper_http_cache_requests_total', 'Scraper HTTP cache lookups by outcome', ['page_type', 'result']
+    )
+    http_cache_bytes_counter = PrometheusCounter(
+        'scraper_http_cache_bytes_saved_total', 'Response bytes served from the scraper HTTP cache', ['page_type']
+    )
+
+
+def _compress(body: bytes) -> tuple:
+    if ZSTD_AVAILABLE:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(body)
+    return "zlib", zlib.compress(body, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ValueError("entry is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+@dataclass(slots=True)
+class CachedPage:
+    """A stored response body with the headers needed to revalidate it (``from_cache`` is False for a page just downloaded)."""
+    url: str
+    page_type: str
+    status: int
+    body: bytes
+    encoding: Optional[str]
+    fetched_at: float
+    headers: Dict[str, str] = field(default_factory=dict)
+    key: str = ""
+    from_cache: bool = True
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.fetched_at
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers (If-None-Match / If-Modified-Since) for revalidating this page."""
+        conditional = {}
+        if self.headers.get("etag"):
+            conditional["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            conditional["If-Modified-Since"] = self.headers["last-modified"]
+        return conditional
+
+    def to_response(self) -> requests.Response:
+        """The page as a ``requests.Response``, for callers of safe_request."""
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp._content = self.body
+        resp.encoding = self.encoding
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp.from_cache = self.from_cache
+        return resp
+
+
+class ConditionalGet:
+    """
+    One GET through an HttpCache, for callers that make the request themselves (e.g. async
+    clients): use ``fresh`` if set, otherwise send ``headers()`` and pass the response to
+    ``complete``. HttpCache.fetch runs the same steps with a blocking request function.
+    """
+
+    def __init__(self, cache: "HttpCache", url: str, params: Optional[Mapping[str, Any]], page_type: str):
+        self.cache = cache
+        self.url = url
+        self.params = params
+        self.page_type = page_type
+        self.cached = cache.lookup(url, params, page_type)
+
+    @property
+    def fresh(self) -> Optional[CachedPage]:
+        """The stored page when it can be used without a request."""
+        return self.cached if self.cached is not None and self.cache.is_fresh(self.cached) else None
+
+    def headers(self, headers: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+        """Request headers plus the stored page's validators, if any."""
+        return {**(headers or {}), **(self.cached.validators() if self.cached is not None else {})}
+
+    def complete(self, status: int, headers: Mapping[str, str], body: bytes, encoding: Optional[str] = None,
+                 validate: Optional[Callable[[CachedPage], bool]] = None) -> CachedPage:
+        """
+        The page for the response: a 304 revalidates the stored page; a 2xx page is stored if
+        ``validate`` accepts it (CAPTCHA and empty result pages must not be served from the cache).
+        """
+        if status == 304 and self.cached is not None:
+            return self.cache.revalidated(self.cached, headers)
+        page = CachedPage(url=self.url, page_type=self.page_type, status=status, body=body, encoding=encoding,
+                          fetched_at=time.time(), headers=dict(headers), from_cache=False)
+        if 200 <= status < 300 and (validate is None or validate(page)):
+            stored = self.cache.store(self.url, self.params, self.page_type, status, headers, body, encoding)
+            if stored is not None:
+                stored.from_cache = False
+                return stored
+        elif 200 <= status < 300:
+            self.cache._record(self.page_type, "miss")
+        return page
+
+
+class HttpCache:
+    """
+    On-disk HTTP response cache for the scrapers, keyed by URL and query parameters.
+
+    A page younger than its type's TTL (``ttls``, default PAGE_TTLS) is served without a
+    request (``hit``). An older page with an ETag or Last-Modified is revalidated: the request
+    carries ``CachedPage.validators()`` and a 304 marks the page fresh again (``revalidated``),
+    so unchanged pages are never downloaded again. Everything else is downloaded and stored
+    (``miss``) if the caller's validation accepts it. ``fetch`` (or ``begin`` for callers that
+    send the request themselves) runs these steps. Bodies are compressed with zstd (zlib when
+    zstandard is not installed) and written atomically, so several workers can share one
+    directory.
+
+    Outcomes are counted in-process (see ``stats``) and, when prometheus_client is installed,
+    exported per page type.
+
+    Args:
+        directory: Cache directory (default: SCRAPER_HTTP_CACHE_DIR or a temp directory).
+        ttls: Page type -> seconds a page is fresh; missing types use DEFAULT_TTL.
+    """
+
+    def __init__(self, directory: str = DEFAULT_HTTP_CACHE_DIR, ttls: Optional[Mapping[str, float]] = None):
+        self.directory = directory
+        self.ttls = {**PAGE_TTLS, **(ttls or {})}
+        self._stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        return content_hash("GET", url, dict(params or {}))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def ttl(self, page_type: str) -> float:
+        return self.ttls.get(page_type, DEFAULT_TTL)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return page.age() < self.ttl(page.page_type)
+
+    # Lookups ------------------------------------------------------------
+
+    def get(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CachedPage]:
+        """The stored page for a request, fresh or not; None if there is none (or it is unreadable)."""
+        key = self.key(url, params)
+        try:
+            with open(self._path(key), "rb") as f:
+                meta = json.loads(f.readline())
+                body = _decompress(meta.pop("codec"), f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Unreadable HTTP cache entry for {url}: {e}")
+            return None
+        return CachedPage(body=body, key=key, **meta)
+
+    def lookup(self, url: str, params: Optional[Mapping[str, Any]] = None, page_type: str = "search") -> Optional[CachedPage]:
+        """
+        The stored page for a request. When it is fresh the lookup counts as a hit and the page
+        can be used as is; otherwise (check ``is_fresh``) it is only good for revalidation.
+        """
+        page = self.get(url, params)
+        if page is not None and self.is_fresh(page):
+            self._record(page_type, "hit", len(page.body))
+        return page
+
+    def begin(self, url: str, params: Optional[Mapping[str, Any]] = None, page_type: str = "search") -> ConditionalGet:
+        """Starts a GET whose request the caller sends (see ConditionalGet)."""
+        return ConditionalGet(self, url, params, page_type)
+
+    def fetch(self, url: str, params: Optional[Mapping[str, Any]], page_type: str,
+              request: Callable[[Dict[str, str]], Any], headers: Optional[Mapping[str, str]] = None,
+              validate: Optional[Callable[[CachedPage], bool]] = None) -> Optional[CachedPage]:
+        """
+        GET through the cache: a fresh page is returned without a request; otherwise
+        ``request(headers)`` sends the request (conditional when a stale page has validators)
+        and returns a response with ``status_code``, ``headers``, ``content`` and ``encoding``,
+        or None when it failed. A 304 reuses the stored page; a 2xx page is stored when
+        ``validate`` accepts it. Returns None if the request failed.
+        """
+        get = self.begin(url, params, page_type)
+        if get.fresh is not None:
+            return get.fresh
+        resp = request(get.headers(headers))
+        if resp is None:
+            return None
+        return get.complete(resp.status_code, resp.headers, resp.content, resp.encoding, validate)
+
+    # Updates ------------------------------------------------------------
+
+    def store(self, url: str, params: Optional[Mapping[str, Any]], page_type: str, status: int,
+              headers: Mapping[str, str], body: bytes, encoding: Optional[str] = None) -> Optional[CachedPage]:
+        """Stores a downloaded page (a miss); responses marked ``no-store`` are not kept."""
+        self._record(page_type, "miss")
+        kept = self._kept_headers(headers)
+        if "no-store" in kept.get("cache-control", "").lower():
+            return None
+        page = CachedPage(url=url, page_type=page_type, status=status, body=body, encoding=encoding,
+                          fetched_at=time.time(), headers=kept, key=self.key(url, params))
+        self._write(page)
+        return page
+
+    def revalidated(self, page: CachedPage, headers: Mapping[str, str]) -> CachedPage:
+        """Marks a stored page fresh again after a 304, taking any updated validators from ``headers``."""
+        self._record(page.page_type, "revalidated", len(page.body))
+        page.headers.update(self._kept_headers(headers))
+        page.fetched_at = time.time()
+        self._write(page)
+        return page
+
+    def discard(self, url: str, params: Optional[Mapping[str, Any]] = None) -> None:
+        """Deletes the stored page of a request, e.g. one that turned out to hold no results."""
+        try:
+            os.remove(self._path(self.key(url, params)))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete HTTP cache entry for {url}: {e}")
+
+    @staticmethod
+    def _kept_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+        headers = CaseInsensitiveDict(headers)
+        return {name: headers[name] for name in _STORED_HEADERS if headers.get(name)}
+
+    def _write(self, page: CachedPage) -> None:
+        path = self._path(page.key)
+        codec, data = _compress(page.body)
+        meta = {
+            "codec": codec, "url": page.url, "page_type": page.page_type, "status": page.status,
+            "encoding": page.encoding, "fetched_at": page.fetched_at, "headers": page.headers,
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {page.url}: {e}")
+
+    def prune(self, max_age: float = PRUNE_AFTER) -> int:
+        """Deletes entries not stored or revalidated for ``max_age`` seconds; returns how many."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    # Metrics ------------------------------------------------------------
+
+    def _record(self, page_type: str, result: str, saved_bytes: int = 0) -> None:
+        with self._stats_lock:
+            self._stats[result] += 1
+            self._stats["bytes_saved"] += saved_bytes
+        if PROMETHEUS_AVAILABLE:
+            http_cache_counter.labels(page_type=page_type, result=result).inc()
+            if saved_bytes:
+                http_cache_bytes_counter.labels(page_type=page_type).inc(saved_bytes)
+
+    def stats(self) -> dict:
+        """Returns this process's hits, 304 revalidations, misses, bytes not downloaded and hit rate."""
+        with self._stats_lock:
+            hits, revalidated, misses = self._stats["hit"], self._stats["revalidated"], self._stats["miss"]
+            bytes_saved = self._stats["bytes_saved"]
+        lookups = hits + revalidated + misses
+        return {
+            "hits": hits,
+            "revalidated": revalidated,
+            "misses": misses,
+            "bytes_saved": bytes_saved,
+            "hit_rate": round((hits + revalidated) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Returns the process-wide cache in DEFAULT_HTTP_CACHE_DIR, or None if SCRAPER_HTTP_CACHE is off."""
+    global _cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = HttpCache()
+                except OSError as e:
+                    logger.warning(f"HTTP cache disabled, cannot use {DEFAULT_HTTP_CACHE_DIR}: {e}")
+                    return None
+                logger.info(f"Using HTTP cache in {_cache.directory} ({'zstd' if ZSTD_AVAILABLE else 'zlib'}).")
+    return _cache
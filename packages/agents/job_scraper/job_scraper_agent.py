@@ -1,27 +1,92 @@
+import asyncio
 import logging
-from typing import List, Dict, Optional
-from packages.agents.job_scraper.job_scraper_utils import IndeedScraper, LinkedInScraper, GoogleJobsScraper, RateLimiter, ProxyRotator
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from packages.agents.job_scraper.job_scraper_utils import IndeedScraper, LinkedInScraper, GoogleJobsScraper, ProxyRotator
+from packages.agents.job_scraper.async_scraper import AsyncScrapeEngine, DomainLimiter
+from packages.agents.job_scraper.http_cache import HttpCache, get_http_cache
+from packages.agents.job_scraper.rate_limiter import DomainRateLimiter
+from packages.agents.job_scraper.robots_cache import RobotsTxtCache, get_robots_cache
+from packages.utilities.cache_utils import get_redis_client
 
 class JobScraperAgent:
     """
     Orchestrates the scraping of job listings from various online sources.
 
     Args:
-        rate_limiter: Optional RateLimiter instance for controlling request rate.
+        rate_limiter: Optional DomainRateLimiter; by default one per agent, with buckets in Redis
+            (shared by all scraper workers) when REDIS_URL is set.
         proxies: Optional list of proxy URLs for rotation.
         logger: Optional logger for dependency injection and testability.
+        max_connections_per_host: Concurrent requests per job board in the async engine.
+        http_cache: Optional HttpCache for all scrapers and engines (default: the process-wide
+            on-disk cache, see get_http_cache).
+        robots_cache: Optional RobotsTxtCache for all scrapers (default: the process-wide cache,
+            shared through Redis when REDIS_URL is set).
     """
-    def __init__(self, rate_limiter: Optional[RateLimiter] = None, proxies: Optional[List[str]] = None, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(self, rate_limiter: Optional[DomainRateLimiter] = None, proxies: Optional[List[str]] = None, logger: Optional[logging.Logger] = None,
+                 max_connections_per_host: int = 4, http_cache: Optional[HttpCache] = None,
+                 robots_cache: Optional[RobotsTxtCache] = None) -> None:
         self.logger = logger or logging.getLogger(__name__)
-        rate_limiter = rate_limiter or RateLimiter()
-        proxy_rotator = ProxyRotator(proxies)
-        self.indeed = IndeedScraper(rate_limiter=rate_limiter, proxy_rotator=proxy_rotator)
-        self.linkedin = LinkedInScraper(rate_limiter=rate_limiter, proxy_rotator=proxy_rotator)
-        self.google = GoogleJobsScraper(rate_limiter=rate_limiter, proxy_rotator=proxy_rotator)
+        self.rate_limiter = rate_limiter or DomainRateLimiter(redis_client=get_redis_client())
+        self.proxy_rotator = ProxyRotator(proxies)
+        self.max_connections_per_host = max_connections_per_host
+        self.http_cache = http_cache or get_http_cache()
+        self.robots_cache = robots_cache or get_robots_cache()
+        scraper_options = dict(rate_limiter=self.rate_limiter, proxy_rotator=self.proxy_rotator,
+                               http_cache=self.http_cache, robots_checker=self.robots_cache)
+        self.indeed = IndeedScraper(**scraper_options)
+        self.linkedin = LinkedInScraper(**scraper_options)
+        self.google = GoogleJobsScraper(**scraper_options)
+        self.scrapers = {'indeed': self.indeed, 'linkedin': self.linkedin, 'google_jobs': self.google}
+        self._engine: Optional[AsyncScrapeEngine] = None
+
+    def new_engine(self, **kwargs) -> AsyncScrapeEngine:
+        """Creates an async engine over this agent's scrapers, proxies and rate limits."""
+        kwargs.setdefault("limiter", DomainLimiter(self.max_connections_per_host, self.rate_limiter))
+        kwargs.setdefault("http_cache", self.http_cache)
+        return AsyncScrapeEngine(self.scrapers, proxy_rotator=self.proxy_rotator, logger=self.logger, **kwargs)
+
+    @property
+    def engine(self) -> AsyncScrapeEngine:
+        """The agent's long-lived engine; its pooled connections are reused across searches on one event loop."""
+        if self._engine is None:
+            self._engine = self.new_engine()
+        return self._engine
+
+    async def prefetch_robots(self) -> None:
+        """Loads robots.txt of every platform concurrently, so the first searches do not wait for it."""
+        count = await self.robots_cache.prefetch(scraper.BASE_URL for scraper in self.scrapers.values())
+        self.logger.info(f"Prefetched robots.txt for {count} job boards")
+
+    async def aclose(self) -> None:
+        if self._engine is not None:
+            await self._engine.aclose()
+            self._engine = None
+
+    def stream_jobs(self, query: str, location: str = "", num_results: int = 10) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Searches all platforms concurrently and yields (platform, job) as result pages arrive,
+        deduplicated across platforms.
+
+        Args:
+            query: Job title or keywords.
+            location: Job location.
+            num_results: Maximum number of results per platform.
+        """
+        self.logger.info(f"Streaming all platforms for '{query}' in '{location}' (max {num_results} per platform)")
+        return self.engine.stream(query, location, num_results)
+
+    async def asearch_all_platforms(self, query: str, location: str = "", num_results: int = 10) -> Dict[str, List[Dict]]:
+        """Async search_all_platforms on the agent's long-lived engine."""
+        results = await self.engine.search(query, location, num_results)
+        self.logger.info(f"Total jobs found across all platforms: {sum(len(jobs) for jobs in results.values())}")
+        return results
 
     def search_all_platforms(self, query: str, location: str = "", num_results: int = 10) -> Dict[str, List[Dict]]:
         """
-        Search all available platforms for job listings.
+        Search all available platforms for job listings. Platforms and result pages are fetched
+        concurrently (see AsyncScrapeEngine), so this takes about as long as the slowest platform.
+        Must not be called from a running event loop; use asearch_all_platforms there.
 
         Args:
             query: Job title or keywords.
@@ -33,33 +98,11 @@ class JobScraperAgent:
         """
         self.logger.info(f"Searching all platforms for '{query}' in '{location}' (max {num_results} per platform)")
 
-        results = {
-            'indeed': [],
-            'linkedin': [],
-            'google_jobs': []
-        }
-
-        # Search Indeed
-        try:
-            results['indeed'] = self.search_indeed(query, location, num_results)
-            self.logger.info(f"Found {len(results['indeed'])} jobs on Indeed")
-        except Exception as e:
-            self.logger.error(f"Error searching Indeed: {e}")
-
-        # Search LinkedIn
-        try:
-            results['linkedin'] = self.search_linkedin(query, location, num_results)
-            self.logger.info(f"Found {len(results['linkedin'])} jobs on LinkedIn")
-        except Exception as e:
-            self.logger.error(f"Error searching LinkedIn: {e}")
-
-        # Search Google Jobs
-        try:
-            results['google_jobs'] = self.search_google_jobs(query, location, num_results)
-            self.logger.info(f"Found {len(results['google_jobs'])} jobs on Google Jobs")
-        except Exception as e:
-            self.logger.error(f"Error searching Google Jobs: {e}")
+        async def search() -> Dict[str, List[Dict]]:
+            async with self.new_engine() as engine:
+                return await engine.search(query, location, num_results)
 
+        results = asyncio.run(search())
         total_jobs = sum(len(jobs) for jobs in results.values())
         self.logger.info(f"Total jobs found across all platforms: {total_jobs}")
 
@@ -1,26 +1,12 @@
 import requests
-from bs4 import BeautifulSoup
 import time
-import random
-from typing import List, Dict, Optional, Any
-import urllib.robotparser
+from typing import List, Dict, Optional, Any, Union
+from urllib.parse import urlparse
 import logging
-
-class RateLimiter:
-    """
-    Simple rate limiter for web scraping.
-
-    Args:
-        min_delay: Minimum delay between requests (seconds).
-        max_delay: Maximum delay between requests (seconds).
-    """
-    def __init__(self, min_delay: float = 1.0, max_delay: float = 3.0) -> None:
-        self.min_delay = min_delay
-        self.max_delay = max_delay
-
-    def wait(self) -> None:
-        """Wait for a random delay between min_delay and max_delay."""
-        time.sleep(random.uniform(self.min_delay, self.max_delay))
+from packages.agents.job_scraper.http_cache import HttpCache
+from packages.agents.job_scraper.page_parser import CardLayout, CardParser, response_charset
+from packages.agents.job_scraper.rate_limiter import DomainRateLimiter, THROTTLE_STATUSES
+from packages.agents.job_scraper.robots_cache import RobotsTxtCache, get_robots_cache
 
 class ProxyRotator:
     """
@@ -41,99 +27,154 @@ class ProxyRotator:
         self.index += 1
         return proxy
 
-class RobotsTxtChecker:
-    """
-    Checks robots.txt for scraping permissions.
-
-    Args:
-        user_agent: User agent string to use for robots.txt checks.
-    """
-    def __init__(self, user_agent: str = "*") -> None:
-        self.user_agent = user_agent
-        self.parsers: Dict[str, urllib.robotparser.RobotFileParser] = {}
-
-    def can_fetch(self, url: str) -> bool:
-        """
-        Check if the given URL can be fetched according to robots.txt.
-
-        Args:
-            url: The URL to check.
-        Returns:
-            True if allowed, False otherwise.
-        """
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}"
-        if base_url not in self.parsers:
-            rp = urllib.robotparser.RobotFileParser()
-            rp.set_url(f"{base_url}/robots.txt")
-            try:
-                rp.read()
-            except Exception:
-                return True  # If robots.txt can't be read, default to allow
-            self.parsers[base_url] = rp
-        return self.parsers[base_url].can_fetch(self.user_agent, url)
-
 class JobScraperBase:
     """
     Base class for job scrapers with rate limiting, proxy rotation, and robots.txt checking.
 
     Args:
-        rate_limiter: Optional RateLimiter instance.
+        rate_limiter: Optional DomainRateLimiter, shared by the scrapers (and workers) that should share a budget.
         proxy_rotator: Optional ProxyRotator instance.
         max_retries: Maximum number of request retries.
         logger: Optional logger for dependency injection.
+        http_cache: Optional HttpCache; fresh pages are served from it and stale ones revalidated.
+        robots_checker: Optional RobotsTxtCache (default: the process-wide one, see get_robots_cache).
     """
-    def __init__(self, rate_limiter: Optional[RateLimiter] = None, proxy_rotator: Optional[ProxyRotator] = None, max_retries: int = 3, logger: Optional[logging.Logger] = None) -> None:
-        self.rate_limiter = rate_limiter or RateLimiter()
+    # Result pages, shared by search_jobs and the async engine (async_scraper.py)
+    BASE_URL = ""
+    HEADERS: Dict[str, str] = {}
+    PAGE_SIZE = 10  # results per page; the offset parameter advances by this much
+    OFFSET_PARAM: Optional[str] = "start"  # None for sources with a single result page
+    PARSER: Optional[CardParser] = None  # the platform's compiled card selectors
+
+    def __init__(self, rate_limiter: Optional[DomainRateLimiter] = None, proxy_rotator: Optional[ProxyRotator] = None, max_retries: int = 3, logger: Optional[logging.Logger] = None,
+                 http_cache: Optional[HttpCache] = None, robots_checker: Optional[RobotsTxtCache] = None) -> None:
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        self.http_cache = http_cache
         self.proxy_rotator = proxy_rotator or ProxyRotator()
         self.max_retries = max_retries
-        self.robots_checker = RobotsTxtChecker()
+        self.robots_checker = robots_checker or get_robots_cache()
         self.logger = logger or logging.getLogger(self.__class__.__name__)
 
-    def safe_request(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: int = 10) -> Optional[requests.Response]:
+    def search_params(self, query: str, location: str) -> Dict[str, Any]:
+        """Query parameters of the first result page."""
+        return {"q": query, "l": location}
+
+    def page_params(self, query: str, location: str, page: int) -> Dict[str, Any]:
+        params = self.search_params(query, location)
+        if self.OFFSET_PARAM:
+            params[self.OFFSET_PARAM] = page * self.PAGE_SIZE
+        return params
+
+    def page_count(self, num_results: int) -> int:
+        """Result pages needed for ``num_results`` jobs."""
+        if not self.OFFSET_PARAM:
+            return 1
+        return max(1, -(-num_results // self.PAGE_SIZE))
+
+    def parse_jobs(self, content: Union[bytes, str], encoding: Optional[str] = None) -> List[Dict]:
+        """
+        Job dicts (title, company, location, summary, url) of the cards on one result page.
+        ``content`` is best passed as the response bytes, with the charset from its headers.
+        """
+        if self.PARSER is None:
+            raise NotImplementedError
+        return self.PARSER.parse(content, encoding)
+
+    def safe_request(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: int = 10,
+                     page_type: str = "search") -> Optional[requests.Response]:
         """
-        Make a request with retries, proxy rotation, and robots.txt check.
+        Make a request with retries, proxy rotation, and robots.txt check. Every attempt takes a
+        token from the domain's rate limit; a 429/503 pauses the domain for its Retry-After.
+        With an http_cache, a fresh cached page is returned without a request and a stale one
+        is requested conditionally (a 304 returns the cached page); CAPTCHA pages are not stored.
 
         Args:
             url: The URL to request.
             params: Query parameters.
             headers: Request headers.
             timeout: Request timeout in seconds.
+            page_type: Cache TTL policy of the page ("search", "detail", ...; see http_cache.PAGE_TTLS).
         Returns:
             Response object if successful, None otherwise.
         """
+        if not self.http_cache:
+            return self._request(url, params, headers, timeout)
+        page = self.http_cache.fetch(url, params, page_type, lambda request_headers: self._request(url, params, request_headers, timeout),
+                                     headers=headers, validate=lambda page: not is_captcha_page(page.body))
+        return page.to_response() if page is not None else None
+
+    def _request(self, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]], timeout: int) -> Optional[requests.Response]:
+        """The retrying GET behind safe_request; returns the first 2xx or 304 response."""
         if not self.robots_checker.can_fetch(url):
             self.logger.warning(f"Blocked by robots.txt: {url}")
             return None
-        attempt = 0
-        while attempt < self.max_retries:
+        domain = urlparse(url).netloc
+        for attempt in range(self.max_retries):
+            self.rate_limiter.acquire(domain)
             proxy = self.proxy_rotator.get_proxy()
             proxies = {"http": proxy, "https": proxy} if proxy else None
             try:
                 resp = requests.get(url, params=params, proxies=proxies, headers=headers, timeout=timeout)
+            except Exception as e:
+                self.logger.warning(f"Request failed (attempt {attempt+1}): {e}")
+                time.sleep(self.rate_limiter.backoff(attempt))
+                continue
+            if resp.status_code in THROTTLE_STATUSES:
+                pause = self.rate_limiter.retry_after(domain, resp.headers.get("Retry-After"), attempt)
+                self.logger.warning(f"Throttled by {domain} ({resp.status_code}, attempt {attempt+1}); pausing it for {pause:.1f}s")
+                continue  # the next acquire waits out the pause
+            try:
                 resp.raise_for_status()
                 return resp
             except Exception as e:
                 self.logger.warning(f"Request failed (attempt {attempt+1}): {e}")
-                self.rate_limiter.wait()
-                attempt += 1
-                time.sleep(2 ** attempt)  # Exponential backoff
+                time.sleep(self.rate_limiter.backoff(attempt))
         self.logger.error(f"All retries failed for {url}")
         return None
 
-def is_captcha_page(html: str) -> bool:
-    """Detect if the HTML page is a CAPTCHA page."""
+    def _search_pages(self, query: str, location: str, num_results: int) -> List[Dict]:
+        """Fetches result pages one after another until ``num_results`` jobs are found."""
+        name = self.__class__.__name__
+        jobs: List[Dict] = []
+        page = 0
+        while len(jobs) < num_results:
+            params = self.page_params(query, location, page)
+            resp = self.safe_request(self.BASE_URL, params=params, headers=self.HEADERS)
+            if resp is None:
+                break
+            if is_captcha_page(resp.content):
+                self.logger.warning(f"[{name}] CAPTCHA detected. Skipping page.")
+                break
+            page_jobs = self.parse_jobs(resp.content, response_charset(resp.headers))
+            if not page_jobs:
+                self.logger.warning(f"[{name}] No job cards found. HTML may have changed or bot blocked.")
+                if self.http_cache:
+                    self.http_cache.discard(self.BASE_URL, params)  # not served again within the page's TTL
+                break
+            jobs.extend(page_jobs)
+            if not self.OFFSET_PARAM:
+                break
+            page += 1
+        return jobs[:num_results]
+
+def is_captcha_page(html: Union[bytes, str]) -> bool:
+    """Detect if the HTML page (text or response bytes) is a CAPTCHA page."""
     captcha_keywords = [
         'captcha', 'recaptcha', 'g-recaptcha', 'hcaptcha',
         'please verify you are a human', 'are you a robot',
         'security check', 'unusual traffic', 'verify you are not a robot'
     ]
     html_lower = html.lower()
+    if isinstance(html_lower, bytes):
+        captcha_keywords = [keyword.encode() for keyword in captcha_keywords]
     return any(keyword in html_lower for keyword in captcha_keywords)
 
 class IndeedScraper(JobScraperBase):
     BASE_URL = "https://www.indeed.com/jobs"
+    PARSER = CardParser(CardLayout(
+        cards=".jobsearch-SerpJobCard, .result", title=".title a", company=".company", location=".location",
+        summary=".summary", link=".title a", url_prefix="https://www.indeed.com",
+    ))
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     }
@@ -148,43 +189,19 @@ class IndeedScraper(JobScraperBase):
         Returns:
             List of job listings as dictionaries.
         """
-        jobs: List[Dict] = []
-        params = {"q": query, "l": location}
-        start = 0
-        while len(jobs) < num_results:
-            params["start"] = start
-            resp = self.safe_request(self.BASE_URL, params=params, headers=self.HEADERS)
-            if resp is None:
-                break
-            if is_captcha_page(resp.text):
-                self.logger.warning("[IndeedScraper] CAPTCHA detected. Skipping page.")
-                break
-            soup = BeautifulSoup(resp.text, "html.parser")
-            cards = soup.select(".jobsearch-SerpJobCard, .result")
-            if not cards:
-                self.logger.warning("[IndeedScraper] No job cards found. HTML may have changed or bot blocked.")
-                break
-            for card in cards:
-                title = card.select_one(".title a")
-                company = card.select_one(".company")
-                location = card.select_one(".location")
-                summary = card.select_one(".summary")
-                job = {
-                    "title": title.text.strip() if title else None,
-                    "company": company.text.strip() if company else None,
-                    "location": location.text.strip() if location else None,
-                    "summary": summary.text.strip() if summary else None,
-                    "url": f"https://www.indeed.com{title['href']}" if title and title.has_attr('href') else None,
-                }
-                jobs.append(job)
-                if len(jobs) >= num_results:
-                    break
-            self.rate_limiter.wait()
-            start += 10
-        return jobs[:num_results]
+        return self._search_pages(query, location, num_results)
+
 
 class LinkedInScraper(JobScraperBase):
     BASE_URL = "https://www.linkedin.com/jobs/search/"
+    PAGE_SIZE = 25
+    PARSER = CardParser(CardLayout(
+        cards=".result-card.job-result-card, .base-card",
+        title=".base-search-card__title, .result-card__title",
+        company=".base-search-card__subtitle, .result-card__subtitle",
+        location=".job-search-card__location, .job-result-card__location",
+        link="a.base-card__full-link, a.result-card__full-card-link",
+    ))
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept-Language": "en-US,en;q=0.9",
@@ -200,43 +217,23 @@ class LinkedInScraper(JobScraperBase):
         Returns:
             List of job listings as dictionaries.
         """
-        jobs: List[Dict] = []
-        params = {"keywords": query, "location": location}
-        start = 0
-        while len(jobs) < num_results:
-            params["start"] = start
-            resp = self.safe_request(self.BASE_URL, params=params, headers=self.HEADERS)
-            if resp is None:
-                break
-            if is_captcha_page(resp.text):
-                self.logger.warning("[LinkedInScraper] CAPTCHA detected. Skipping page.")
-                break
-            soup = BeautifulSoup(resp.text, "html.parser")
-            cards = soup.select(".result-card.job-result-card, .base-card")
-            if not cards:
-                self.logger.warning("[LinkedInScraper] No job cards found. HTML may have changed or bot blocked.")
-                break
-            for card in cards:
-                title = card.select_one(".base-search-card__title, .result-card__title")
-                company = card.select_one(".base-search-card__subtitle, .result-card__subtitle")
-                location = card.select_one(".job-search-card__location, .job-result-card__location")
-                url = card.select_one("a.base-card__full-link, a.result-card__full-card-link")
-                job = {
-                    "title": title.text.strip() if title else None,
-                    "company": company.text.strip() if company else None,
-                    "location": location.text.strip() if location else None,
-                    "summary": None,
-                    "url": url["href"] if url and url.has_attr("href") else None,
-                }
-                jobs.append(job)
-                if len(jobs) >= num_results:
-                    break
-            self.rate_limiter.wait()
-            start += 25
-        return jobs[:num_results]
+        return self._search_pages(query, location, num_results)
+
+    def search_params(self, query: str, location: str) -> Dict[str, Any]:
+        return {"keywords": query, "location": location}
+
 
 class GlassdoorScraper(JobScraperBase):
     BASE_URL = "https://www.glassdoor.com/Job/jobs.htm"
+    PARSER = CardParser(CardLayout(
+        cards=".react-job-listing, .jl",
+        title=".jobLink, .jobTitle",
+        company=".jobEmpolyerName, .jobInfoItem.jobEmpolyerName",
+        location=".jobLocation, .subtle.loc",
+        summary=".jobDescriptionContent, .job-snippet",
+        link="a.jobLink, a.jobTitle",
+        url_prefix="https://www.glassdoor.com",
+    ))
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept-Language": "en-US,en;q=0.9",
@@ -257,6 +254,7 @@ class GlassdoorScraper(JobScraperBase):
         start = 0
         while len(jobs) < num_results:
             params["s"] = start
+            self.rate_limiter.acquire(urlparse(self.BASE_URL).netloc)
             proxy = self.proxy_rotator.get_proxy()
             proxies = {"http": proxy, "https": proxy} if proxy else None
             try:
@@ -265,28 +263,11 @@ class GlassdoorScraper(JobScraperBase):
             except Exception as e:
                 self.logger.warning(f"[GlassdoorScraper] Request failed: {e}")
                 break
-            soup = BeautifulSoup(resp.text, "html.parser")
-            cards = soup.select(".react-job-listing, .jl")
-            if not cards:
+            page_jobs = self.parse_jobs(resp.content, response_charset(resp.headers))
+            if not page_jobs:
                 self.logger.warning("[GlassdoorScraper] No job cards found. HTML may have changed or bot blocked.")
                 break
-            for card in cards:
-                title = card.select_one(".jobLink, .jobTitle")
-                company = card.select_one(".jobEmpolyerName, .jobInfoItem.jobEmpolyerName")
-                location = card.select_one(".jobLocation, .subtle.loc")
-                summary = card.select_one(".jobDescriptionContent, .job-snippet")
-                url = card.select_one("a.jobLink, a.jobTitle")
-                job = {
-                    "title": title.text.strip() if title else None,
-                    "company": company.text.strip() if company else None,
-                    "location": location.text.strip() if location else None,
-                    "summary": summary.text.strip() if summary else None,
-                    "url": f"https://www.glassdoor.com{url['href']}" if url and url.has_attr('href') else None,
-                }
-                jobs.append(job)
-                if len(jobs) >= num_results:
-                    break
-            self.rate_limiter.wait()
+            jobs.extend(page_jobs[:num_results - len(jobs)])
             start += 10
         return jobs[:num_results]
 
@@ -297,6 +278,12 @@ class CompanyScraper(JobScraperBase):
 
 class GoogleJobsScraper(JobScraperBase):
     BASE_URL = "https://www.google.com/search"
+    OFFSET_PARAM = None
+    # Google Jobs cards are not standard HTML and may not be present; this is a best-effort demo
+    PARSER = CardParser(CardLayout(
+        cards=".BjJfJf.PUpOsf",  # This selector may change
+        title=".BjJfJf.PUpOsf span", company=".vNEEBe", location=".Qk80Jf", link="a",
+    ))
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept-Language": "en-US,en;q=0.9",
@@ -312,33 +299,8 @@ class GoogleJobsScraper(JobScraperBase):
         Returns:
             List of job listings as dictionaries.
         """
-        jobs: List[Dict] = []
-        params = {"q": f"{query} jobs near {location}" if location else f"{query} jobs"}
-        resp = self.safe_request(self.BASE_URL, params=params, headers=self.HEADERS)
-        if resp is None:
-            return []
-        if is_captcha_page(resp.text):
-            self.logger.warning("[GoogleJobsScraper] CAPTCHA detected. Skipping page.")
-            return []
-        soup = BeautifulSoup(resp.text, "html.parser")
-        # Google Jobs cards are not standard HTML and may not be present; this is a best-effort demo
-        cards = soup.select(".BjJfJf.PUpOsf")  # This selector may change
-        if not cards:
-            self.logger.warning("[GoogleJobsScraper] No job cards found. Google may have blocked scraping or changed HTML.")
-            return []
-        for card in cards:
-            title = card.select_one(".BjJfJf.PUpOsf span")
-            company = card.select_one(".vNEEBe")
-            location = card.select_one(".Qk80Jf")
-            url = card.select_one("a")
-            job = {
-                "title": title.text.strip() if title else None,
-                "company": company.text.strip() if company else None,
-                "location": location.text.strip() if location else None,
-                "summary": None,
-                "url": url["href"] if url and url.has_attr("href") else None,
-            }
-            jobs.append(job)
-            if len(jobs) >= num_results:
-                break
-        return jobs[:num_results]
+        return self._search_pages(query, location, num_results)
+
+    def search_params(self, query: str, location: str) -> Dict[str, Any]:
+        return {"q": f"{query} jobs near {location}" if location else f"{query} jobs"}
+
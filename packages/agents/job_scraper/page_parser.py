@@ -0,0 +1,159 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+__all__ = ["CardLayout", "CardParser", "LXML_AVAILABLE", "css_to_xpath", "response_charset"]
+
+_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset", re.IGNORECASE)
+_COMPOUND = re.compile(r"^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)$")
+
+
+def response_charset(headers: Mapping[str, str]) -> Optional[str]:
+    """The charset declared in a response's Content-Type header, if any."""
+    match = _CHARSET.search(headers.get("content-type") or headers.get("Content-Type") or "")
+    return match.group(1) if match else None
+
+
+def css_to_xpath(selector: str, scoped: bool = False) -> str:
+    """
+    XPath equivalent of a CSS selector made of ``tag.class`` compounds, descendant combinators
+    and ``,`` alternatives (the only forms the card layouts use). With ``scoped`` the matches
+    are descendants of the context element, as with BeautifulSoup's ``select_one`` on a card;
+    the context element itself may still match a leading compound (".card span").
+    """
+    alternatives = []
+    for alternative in selector.split(","):
+        compounds = alternative.split()
+        if not compounds:
+            raise ValueError(f"unsupported selector: {selector!r}")
+        steps = []
+        for i, compound in enumerate(compounds):
+            match = _COMPOUND.match(compound)
+            if not match:
+                raise ValueError(f"unsupported selector: {selector!r}")
+            predicates = "".join(
+                f"[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+                for name in match.group(2).split(".")[1:]
+            )
+            if i == 0:
+                axis = "descendant::" if scoped and len(compounds) == 1 else "descendant-or-self::"
+            else:
+                axis = "descendant::"
+            steps.append(f"{axis}{match.group(1) or '*'}{predicates}")
+        alternatives.append("/".join(steps))
+    return " | ".join(alternatives)
+
+
+@dataclass(frozen=True)
+class CardLayout:
+    """
+    CSS selectors of one platform's job cards on a result page.
+
+    Args:
+        cards: Selector of the card elements.
+        title, company, location, summary: Selectors, within a card, of the fields' elements.
+        link: Selector of the element whose ``href`` is the job URL.
+        url_prefix: Prepended to relative hrefs (e.g. "https://www.indeed.com").
+    """
+    cards: str
+    title: str
+    company: str
+    location: str
+    summary: Optional[str] = None
+    link: Optional[str] = None
+    url_prefix: str = ""
+
+
+class CardParser:
+    """
+    Extracts job dicts (title, company, location, summary, url) from result pages.
+
+    With lxml the layout's selectors are compiled to XPath once, and pages are parsed straight
+    from the response bytes by libxml2, several times faster than BeautifulSoup's html.parser.
+    Without lxml, BeautifulSoup runs the same CSS selectors.
+
+    Args:
+        layout: The platform's card selectors.
+    """
+
+    FIELDS = ("title", "company", "location", "summary")
+
+    def __init__(self, layout: CardLayout):
+        self.layout = layout
+        self._parsers = threading.local()  # lxml parsers must not be shared between threads
+        if LXML_AVAILABLE:
+            self._cards = etree.XPath(css_to_xpath(layout.cards))
+            self._fields = [
+                (name, etree.XPath(f"({css_to_xpath(getattr(layout, name), scoped=True)})[1]"))
+                for name in self.FIELDS if getattr(layout, name)
+            ]
+            self._link = etree.XPath(f"({css_to_xpath(layout.link, scoped=True)})[1]") if layout.link else None
+
+    def _url(self, href: Optional[str]) -> Optional[str]:
+        if not href:
+            return None
+        return f"{self.layout.url_prefix}{href}" if self.layout.url_prefix else href
+
+    def _lxml_parser(self, encoding: Optional[str]):
+        parsers = self._parsers.__dict__
+        if encoding not in parsers:
+            parsers[encoding] = lxml_html.HTMLParser(encoding=encoding)
+        return parsers[encoding]
+
+    def parse(self, content: Union[bytes, str], encoding: Optional[str] = None) -> List[Dict]:
+        """
+        Job dicts of the cards in one result page.
+
+        Args:
+            content: The page, preferably the undecoded response body.
+            encoding: Charset of ``content`` from the response headers; without one, a
+                ``<meta charset>`` in the page is used, else UTF-8.
+        """
+        if not LXML_AVAILABLE:
+            return self._parse_soup(content, encoding)
+        if isinstance(content, bytes) and encoding is None and not _META_CHARSET.search(content, 0, 4096):
+            encoding = "utf-8"  # libxml2 would otherwise assume Latin-1
+        if not content.strip():
+            return []
+        try:
+            root = lxml_html.document_fromstring(content, parser=self._lxml_parser(encoding if isinstance(content, bytes) else None))
+        except (etree.ParserError, LookupError, ValueError):
+            return self._parse_soup(content, encoding)
+        jobs = []
+        for card in self._cards(root):
+            job = {name: None for name in self.FIELDS}
+            for name, select in self._fields:
+                found = select(card)
+                job[name] = found[0].text_content().strip() if found else None
+            link = self._link(card) if self._link is not None else ()
+            job["url"] = self._url(link[0].get("href")) if link else None
+            jobs.append(job)
+        return jobs
+
+    def _parse_soup(self, content: Union[bytes, str], encoding: Optional[str]) -> List[Dict]:
+        if isinstance(content, bytes):
+            soup = BeautifulSoup(content, "html.parser", from_encoding=encoding)
+        else:
+            soup = BeautifulSoup(content, "html.parser")
+        jobs = []
+        for card in soup.select(self.layout.cards):
+            job = {}
+            for name in self.FIELDS:
+                selector = getattr(self.layout, name)
+                found = card.select_one(selector) if selector else None
+                job[name] = found.text.strip() if found else None
+            link = card.select_one(self.layout.link) if self.layout.link else None
+            job["url"] = self._url(link["href"]) if link and link.has_attr("href") else None
+            jobs.append(job)
+        return jobs
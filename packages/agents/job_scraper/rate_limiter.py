@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+__all__ = [
+    "DomainRateLimiter",
+    "MemoryTokenBuckets",
+    "RedisTokenBuckets",
+    "THROTTLE_STATUSES",
+    "parse_retry_after",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 1.0  # requests per second per domain
+DEFAULT_BURST = 2
+MAX_RETRY_AFTER = 300.0  # seconds; longer Retry-After values are capped
+REDIS_RETRY_INTERVAL = 30.0  # seconds on the local buckets after a Redis failure
+THROTTLE_STATUSES = {429, 503}  # responses that pause the whole domain
+
+# GCRA ("virtual scheduling" token bucket): each key stores the theoretical arrival time (TAT)
+# of the next request. A reservation waits until TAT - tolerance, where tolerance allows a
+# burst of ``burst`` requests, and pushes TAT one interval further. Times are in milliseconds
+# from the Redis server clock, so workers on different hosts agree. Requires Redis >= 5
+# (effects replication of scripts that read TIME).
+_RESERVE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local interval, tolerance = tonumber(ARGV[1]), tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local wait = tat - tolerance - now
+if wait < 0 then wait = 0 end
+redis.call('SET', KEYS[1], tat + interval, 'PX', math.ceil(tat + interval - now) + 1000)
+return math.ceil(wait)
+"""
+
+_BLOCK_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local until_tat = now + tonumber(ARGV[1]) + tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < until_tat then tat = until_tat end
+redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now) + 1000)
+return 0
+"""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date); None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class MemoryTokenBuckets:
+    """Per-process GCRA buckets (the default, and the fallback when Redis fails)."""
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, interval: float, tolerance: float) -> float:
+        """Takes one token from ``key``; returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat.get(key, now), now)
+            self._tat[key] = tat + interval
+            return max(0.0, tat - tolerance - now)
+
+    def block(self, key: str, seconds: float, tolerance: float) -> None:
+        """Makes the next reservation on ``key`` wait at least ``seconds``."""
+        with self._lock:
+            now = time.monotonic()
+            self._tat[key] = max(self._tat.get(key, now), now + seconds + tolerance)
+
+
+class RedisTokenBuckets:
+    """
+    GCRA buckets in Redis, shared by every process using the same keys. Each operation is one
+    atomic script call.
+
+    Args:
+        redis_client: Synchronous ``redis.Redis`` client.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self._reserve = redis_client.register_script(_RESERVE_SCRIPT)
+        self._block = redis_client.register_script(_BLOCK_SCRIPT)
+
+    def reserve(self, key: str, interval: float, tolerance: float) -> float:
+        wait_ms = self._reserve(keys=[key], args=[interval * 1000, tolerance * 1000])
+        return int(wait_ms) / 1000
+
+    def block(self, key: str, seconds: float, tolerance: float) -> None:
+        self._block(keys=[key], args=[seconds * 1000, tolerance * 1000])
+
+
+class DomainRateLimiter:
+    """
+    Token-bucket rate limits per domain, shared between scraper workers.
+
+    Every request takes a token from its domain's bucket (``acquire``/``acquire_async``), so a
+    domain gets at most ``rate`` requests per second after an initial burst of ``burst``,
+    whichever scraper or process sends them. A throttling response (429/503) pauses the whole
+    domain for its Retry-After (or a jittered backoff when there is none) through
+    ``retry_after``. With a Redis client the buckets live in Redis and all workers share one
+    budget per domain; if Redis fails, the limiter uses per-process buckets for
+    REDIS_RETRY_INTERVAL seconds before trying Redis again.
+
+    Args:
+        rate: Default requests per second per domain (None: no limit apart from retry_after pauses).
+        burst: Default requests allowed back to back after an idle period.
+        domain_limits: Domain (host[:port]) -> (rate, burst) overrides.
+        redis_client: Optional synchronous ``redis.Redis`` client for shared buckets.
+        namespace: Redis key prefix.
+        backoff_base: Base delay in seconds of the jittered exponential backoff.
+        backoff_cap: Maximum backoff delay in seconds.
+        max_retry_after: Longest Retry-After honored, in seconds.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        domain_limits: Optional[Mapping[str, Tuple[float, int]]] = None,
+        redis_client=None,
+        namespace: str = "ratelimit",
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        max_retry_after: float = MAX_RETRY_AFTER,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.domain_limits = dict(domain_limits or {})
+        self.namespace = namespace
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self.local = MemoryTokenBuckets()
+        self.buckets = RedisTokenBuckets(redis_client) if redis_client is not None else self.local
+        self.stats: Counter = Counter()
+        self._redis_retry_at = 0.0
+
+    def limits_for(self, domain: str) -> Tuple[Optional[float], int]:
+        return self.domain_limits.get(domain, (self.rate, self.burst))
+
+    def _bucket(self, domain: str) -> Tuple[str, float, float]:
+        rate, burst = self.limits_for(domain)
+        interval = 1.0 / rate if rate else 0.0  # unlimited domains only wait out retry_after pauses
+        return f"{self.namespace}:{domain}", interval, max(0, burst - 1) * interval
+
+    def _call(self, operation: str, *args):
+        if self.buckets is self.local or time.monotonic() < self._redis_retry_at:
+            return getattr(self.local, operation)(*args)
+        try:
+            return getattr(self.buckets, operation)(*args)
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+            logger.warning(f"Redis rate limiter {operation} failed, using local buckets for {REDIS_RETRY_INTERVAL:.0f}s: {e}")
+            return getattr(self.local, operation)(*args)
+
+    def reserve(self, domain: str) -> float:
+        """Takes a token for one request to ``domain``; returns the seconds to wait before sending it."""
+        wait = self._call("reserve", *self._bucket(domain))
+        if wait > 0:
+            self.stats["waits"] += 1
+            self.stats["wait_seconds"] += wait
+        return wait
+
+    def acquire(self, domain: str) -> None:
+        """Blocks until a request to ``domain`` may be sent."""
+        wait = self.reserve(domain)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, domain: str) -> None:
+        """Waits, without blocking the event loop, until a request to ``domain`` may be sent."""
+        if self.buckets is self.local:
+            wait = self.reserve(domain)
+        else:
+            wait = await asyncio.to_thread(self.reserve, domain)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential backoff for retry ``attempt`` (0-based): half fixed, half random."""
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def retry_after(self, domain: str, retry_after: Optional[str] = None, attempt: int = 0) -> float:
+        """
+        Pauses ``domain`` for every worker after a throttling response: for the Retry-After
+        header's delay (capped at ``max_retry_after``), or ``backoff(attempt)`` without one.
+        Returns the pause in seconds.
+        """
+        pause = parse_retry_after(retry_after)
+        pause = self.backoff(attempt) if pause is None else min(pause, self.max_retry_after)
+        self.stats["throttled"] += 1
+        key, _, tolerance = self._bucket(domain)
+        self._call("block", key, pause, tolerance)
+        return pause
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from packages.agents.job_scraper.http_cache import PAGE_TTLS
+from packages.agents.job_scraper.rate_limiter import REDIS_RETRY_INTERVAL
+from packages.utilities.cache_utils import get_redis_client
+
+__all__ = ["RobotsTxtCache", "get_robots_cache"]
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_TTL = PAGE_TTLS["robots"]
+NEGATIVE_TTL = 10 * 60  # seconds an unreachable robots.txt (timeout, 5xx) is remembered
+ROBOTS_TIMEOUT = 5.0
+MAX_ROBOTS_CHARS = 500 * 1024  # longer files are truncated (RFC 9309 requires parsing 500 KiB)
+
+
+def _parser(entry: Dict) -> RobotFileParser:
+    parser = RobotFileParser()
+    status = entry["status"]
+    if status is None or status >= 500:
+        parser.allow_all = True  # unreachable: allowed, as before, until NEGATIVE_TTL runs out
+    elif status in (401, 403):
+        parser.disallow_all = True
+    elif status >= 400:
+        parser.allow_all = True  # no robots.txt
+    else:
+        parser.parse(entry["body"].splitlines())
+    return parser
+
+
+class RobotsTxtCache:
+    """
+    robots.txt rules per origin (scheme://host[:port]), shared by all scrapers.
+
+    Each origin's robots.txt is fetched once, with a timeout, and kept for ``ttl`` seconds. A
+    missing file (4xx) is cached like a real one; an unreachable one (timeout, connection
+    error, 5xx) allows scraping and is cached for ``negative_ttl``, so a broken host is not
+    asked again on every request. With a Redis client the fetched files are shared: one worker
+    fetches an origin (the others wait up to ``timeout`` for it, holding a short Redis lock)
+    and every worker reuses the result. If Redis fails, the cache works per process for
+    REDIS_RETRY_INTERVAL seconds before trying Redis again.
+
+    Args:
+        user_agent: User agent the rules are checked for.
+        redis_client: Optional synchronous ``redis.Redis`` client.
+        namespace: Redis key prefix.
+        ttl: Seconds fetched rules are kept.
+        negative_ttl: Seconds an unreachable robots.txt is kept.
+        timeout: Fetch timeout in seconds.
+    """
+
+    def __init__(self, user_agent: str = "*", redis_client=None, namespace: str = "robots",
+                 ttl: float = ROBOTS_TTL, negative_ttl: float = NEGATIVE_TTL, timeout: float = ROBOTS_TIMEOUT) -> None:
+        self.user_agent = user_agent
+        self.redis = redis_client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.stats: Counter = Counter()
+        self._rules: Dict[str, Tuple[float, RobotFileParser]] = {}  # origin -> (expires at, rules)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._redis_retry_at = 0.0
+
+    @staticmethod
+    def origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _cached(self, origin: str) -> Optional[RobotFileParser]:
+        entry = self._rules.get(origin)
+        if entry is not None and entry[0] > time.time():
+            self.stats["hits"] += 1
+            return entry[1]
+        return None
+
+    def rules(self, origin: str) -> RobotFileParser:
+        """The origin's rules: from this process, from Redis, or fetched (once per origin at a time)."""
+        parser = self._cached(origin)
+        if parser is not None:
+            return parser
+        with self._lock:
+            lock = self._locks.setdefault(origin, threading.Lock())
+        with lock:
+            parser = self._cached(origin)
+            if parser is None:
+                entry = self._load_shared(origin) or self._fetch_shared(origin)
+                parser = _parser(entry)
+                self._rules[origin] = (entry["expires_at"], parser)
+            return parser
+
+    def can_fetch(self, url: str) -> bool:
+        """
+        Check if the given URL can be fetched according to robots.txt.
+
+        Args:
+            url: The URL to check.
+        Returns:
+            True if allowed, False otherwise.
+        """
+        return self.rules(self.origin(url)).can_fetch(self.user_agent, url)
+
+    async def can_fetch_async(self, url: str) -> bool:
+        """can_fetch for the event loop: cached rules are checked inline, loading runs in a thread."""
+        origin = self.origin(url)
+        parser = self._cached(origin) or await asyncio.to_thread(self.rules, origin)
+        return parser.can_fetch(self.user_agent, url)
+
+    async def prefetch(self, urls: Iterable[str]) -> int:
+        """Loads the rules of every origin in ``urls`` concurrently; returns the number of origins."""
+        origins = {self.origin(url) for url in urls if url}
+        await asyncio.gather(*(asyncio.to_thread(self.rules, origin) for origin in origins))
+        return len(origins)
+
+    def clear(self) -> None:
+        self._rules.clear()
+
+    # Fetching -----------------------------------------------------------
+
+    def _fetch(self, origin: str) -> Dict:
+        self.stats["fetches"] += 1
+        try:
+            resp = requests.get(f"{origin}/robots.txt", headers={"User-Agent": self.user_agent}, timeout=self.timeout)
+            status = resp.status_code
+            body = resp.text[:MAX_ROBOTS_CHARS] if status < 300 else ""
+        except requests.RequestException as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Could not read {origin}/robots.txt, allowing for {self.negative_ttl:.0f}s: {e}")
+            status, body = None, ""
+        ttl = self.ttl if status is not None and status < 500 else self.negative_ttl
+        return {"status": status, "body": body, "expires_at": time.time() + ttl}
+
+    # Sharing ------------------------------------------------------------
+
+    def _key(self, origin: str) -> str:
+        return f"{self.namespace}:{origin}"
+
+    def _shared(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        self.stats["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        logger.warning(f"Redis robots.txt cache {operation} failed, using the local cache for {REDIS_RETRY_INTERVAL:.0f}s: {error}")
+
+    def _load_shared(self, origin: str) -> Optional[Dict]:
+        if not self._shared():
+            return None
+        try:
+            raw = self.redis.get(self._key(origin))
+        except Exception as e:
+            self._redis_failed("read", e)
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if entry["expires_at"] <= time.time():
+            return None
+        self.stats["shared_hits"] += 1
+        return entry
+
+    def _fetch_shared(self, origin: str) -> Dict:
+        """Fetches the origin's robots.txt unless another worker is already fetching it."""
+        if not self._shared():
+            return self._fetch(origin)
+        lock_key = f"{self._key(origin)}:lock"
+        try:
+            leader = self.redis.set(lock_key, "1", nx=True, px=int((self.timeout + 1) * 1000))
+        except Exception as e:
+            self._redis_failed("lock", e)
+            return self._fetch(origin)
+        if not leader:
+            deadline = time.monotonic() + self.timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                entry = self._load_shared(origin)
+                if entry is not None:
+                    return entry
+        entry = self._fetch(origin)
+        try:
+            self.redis.set(self._key(origin), json.dumps(entry), ex=max(1, int(entry["expires_at"] - time.time())))
+            self.redis.delete(lock_key)
+        except Exception as e:
+            self._redis_failed("write", e)
+        return entry
+
+
+_cache: Optional[RobotsTxtCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_robots_cache() -> RobotsTxtCache:
+    """Returns the process-wide cache: shared through Redis when REDIS_URL is configured."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RobotsTxtCache(redis_client=get_redis_client())
+    return _cache
@@ -0,0 +1,117 @@
+"""
+Generates synthetic result pages, one per job board, for the parser tests and
+tools/benchmarks/scraper_parse_benchmark.py.
+
+The pages are not saved from the job boards. Each card uses the markup that the
+platform scraper's PARSER CardLayout selects (plus some of the attributes and
+wrappers the real boards add), inside the inline scripts, styles and navigation
+that make real result pages 150-300 KiB. The same seed always gives the same pages.
+
+Usage:
+    python packages/agents/job_scraper/tests/result_pages.py [out_dir]
+"""
+import html
+import json
+import os
+import random
+import sys
+from typing import Dict
+
+SEED = 25
+CARD_COUNTS = {"indeed": 15, "linkedin": 25, "glassdoor": 30, "google_jobs": 10}
+
+TITLES = ["Senior Python Developer", "Backend Engineer (Go/Python)", "Data Engineer – Streaming", "Machine Learning Engineer",
+          "Full-Stack Engineer, React & Node.js", "Site Reliability Engineer", "Software Engineer II", "Développeur Python",
+          "Platform Engineer – Kubernetes", "Analytics Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Zürich Re Digital", "Stark Industries", "Wayne Enterprises",
+             "Hooli", "Pied Piper", "Vandelay Import/Export"]
+LOCATIONS = ["Remote", "San Francisco, CA", "New York, NY", "Austin, TX", "Berlin, Germany", "München, Germany",
+             "London, UK", "Toronto, ON", "Hybrid – Seattle, WA", "São Paulo, Brazil"]
+SUMMARY = ("Build and operate services that process millions of job postings a day. You will work with Python, "
+           "PostgreSQL, Redis and Kubernetes, own features end to end, and mentor engineers. Benefits include "
+           "equity, learning budget & flexible hours.")
+
+
+def chrome(rng: random.Random, title: str, body: str, n_script: int = 60) -> str:
+    """Wraps the cards in a page with a large inline state blob, stylesheet and navigation."""
+    blob = json.dumps({"experiments": [{"id": i, "variant": rng.choice("ABCD"), "payload": "x" * 120} for i in range(n_script * 10)]})
+    style = "".join(f".c{i}{{margin:{i % 7}px;padding:{i % 5}px;color:#{i:06x}}}" for i in range(n_script * 20))
+    nav = "".join(f'<li class="nav-item"><a href="/browse/{i}">Category {i}</a></li>' for i in range(80))
+    return (f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f'<style>{style}</style><script>window.__INITIAL_STATE__ = {blob};</script></head>'
+            f'<body><header><nav><ul>{nav}</ul></nav></header><main>{body}</main>'
+            f'<footer><p>© 2026 &amp; friends</p><!-- tracking --><script>var t = "{"y" * 2000}";</script></footer></body></html>\n')
+
+
+def _indeed(t: str, c: str, l: str, i: int) -> str:
+    return (f'<div class="jobsearch-SerpJobCard unifiedRow row result" data-jk="{i:016x}">'
+            f'<h2 class="title"><a class="jobtitle turnstileLink" href="/rc/clk?jk={i:016x}&amp;fccid=abc" title="{html.escape(t)}">'
+            f'{html.escape(t)}</a><span class="new">new</span></h2><div class="sjcl"><div><span class="company">\n  {html.escape(c)}</span>'
+            f'<span class="ratingsDisplay"><span class="ratingsContent">4.{i % 10}</span></span></div>'
+            f'<div class="location accessible-contrast-color-location">{html.escape(l)}</div></div>'
+            f'<div class="summary"><ul><li>{html.escape(SUMMARY)}</li></ul></div></div>')
+
+
+def _linkedin(t: str, c: str, l: str, i: int) -> str:
+    return (f'<li><div class="base-card relative base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{3900000000 + i}">'
+            f'<a class="base-card__full-link absolute" href="https://www.linkedin.com/jobs/view/{3900000000 + i}/?trk=public_jobs">'
+            f'<span class="sr-only">{html.escape(t)}</span></a><div class="base-search-card__info">'
+            f'<h3 class="base-search-card__title">\n        {html.escape(t)}\n      </h3>'
+            f'<h4 class="base-search-card__subtitle"><a class="hidden-nested-link" href="https://www.linkedin.com/company/{i}">{html.escape(c)}</a></h4>'
+            f'<div class="base-search-card__metadata"><span class="job-search-card__location">{html.escape(l)}</span>'
+            f'<time class="job-search-card__listdate" datetime="2026-10-1{i % 10}">{i % 10} days ago</time></div></div></div></li>')
+
+
+def _glassdoor(t: str, c: str, l: str, i: int) -> str:
+    return (f'<li class="react-job-listing css-7x0jr eigr9kq3" data-id="{1008000000 + i}">'
+            f'<div class="d-flex flex-column"><div class="jobHeader"><a class="jobEmpolyerName" href="/Overview/W-EI_IE{i}.htm">{html.escape(c)}</a></div>'
+            f'<a class="jobLink jobTitle" href="/partner/jobListing.htm?jobListingId={1008000000 + i}">{html.escape(t)}</a>'
+            f'<div class="jobLocation">{html.escape(l)}</div>'
+            f'<div class="job-snippet">{html.escape(SUMMARY[:140])}…</div></div></li>')
+
+
+def _google_jobs(t: str, c: str, l: str, i: int) -> str:
+    return (f'<li><div class="BjJfJf PUpOsf"><div class="KLsYvd" role="heading"><span>{html.escape(t)}</span></div>'
+            f'<div class="vNEEBe">{html.escape(c)}</div><div class="Qk80Jf">{html.escape(l)}</div>'
+            f'<div class="Qk80Jf">via LinkedIn</div><a href="https://careers.example.com/jobs/{i}?utm_source=google_jobs_apply">Apply</a></div></li>')
+
+
+# platform -> (card renderer, page title, results container, inline script size)
+PAGES = {
+    "indeed": (_indeed, "Python Jobs | Indeed.com", '<div id="resultsCol">{}</div>', 60),
+    "linkedin": (_linkedin, "Python Jobs | LinkedIn", '<ul class="jobs-search__results-list">{}</ul>', 60),
+    "glassdoor": (_glassdoor, "Python Jobs | Glassdoor", '<ul class="hover p-0 css-7ry9k1">{}</ul>', 60),
+    "google_jobs": (_google_jobs, "python jobs - Google Search", '<ul class="iFjolb">{}</ul>', 120),
+}
+
+_pages: Dict[str, bytes] = {}
+
+
+def result_pages(seed: int = SEED) -> Dict[str, bytes]:
+    """The UTF-8 encoded result page of every platform, by platform name (generated once per process)."""
+    if seed == SEED and _pages:
+        return _pages
+    rng = random.Random(seed)
+    pages = {}
+    for name, (render, title, container, n_script) in PAGES.items():
+        cards = []
+        for i in range(CARD_COUNTS[name]):
+            t, c, l = rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(LOCATIONS)
+            cards.append(render(t, c, l, i))
+        pages[name] = chrome(rng, title, container.format("".join(cards)), n_script).encode("utf-8")
+    if seed == SEED:
+        _pages.update(pages)
+    return pages
+
+
+def main() -> None:
+    out = sys.argv[1] if len(sys.argv) > 1 else "."
+    os.makedirs(out, exist_ok=True)
+    for name, content in result_pages().items():
+        with open(os.path.join(out, f"{name}.html"), "wb") as f:
+            f.write(content)
+        print(f"{name}.html: {len(content) / 1024:.0f} KiB, {CARD_COUNTS[name]} cards")
+
+
+if __name__ == "__main__":
+    main()
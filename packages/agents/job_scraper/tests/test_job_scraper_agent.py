@@ -1,7 +1,20 @@
 import pytest
 from packages.agents.job_scraper.job_scraper_agent import JobScraperAgent
 import unittest
-from packages.agents.job_scraper.job_scraper_utils import IndeedScraper, GoogleJobsScraper
+from packages.agents.job_scraper.job_scraper_utils import IndeedScraper, GoogleJobsScraper, GlassdoorScraper, LinkedInScraper
+from packages.agents.job_scraper.async_scraper import AsyncScrapeEngine, DomainLimiter, job_key
+from packages.agents.job_scraper.http_cache import HttpCache
+from packages.agents.job_scraper.page_parser import CardLayout, CardParser, css_to_xpath, response_charset
+from packages.agents.job_scraper.rate_limiter import DomainRateLimiter, MemoryTokenBuckets, parse_retry_after
+from packages.agents.job_scraper.robots_cache import RobotsTxtCache
+from packages.agents.job_scraper.tests.result_pages import CARD_COUNTS, result_pages
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
 @pytest.fixture
 def job_scraper_agent():
@@ -61,5 +74,448 @@ class TestGoogleJobsScraper(unittest.TestCase):
             self.assertIsInstance(job["location"], (str, type(None)))
             self.assertIsInstance(job["summary"], (str, type(None)))
 
+def indeed_page(start, count):
+    return "".join(
+        f'<div class="result"><h2 class="title"><a href="/viewjob?jk={i}">Python Developer {i}</a></h2>'
+        f'<span class="company">Indeed Co {i}</span><div class="location">Remote</div><div class="summary">Python</div></div>'
+        for i in range(start, start + count)
+    )
+
+
+def linkedin_page(start, count, base):
+    return "".join(
+        f'<div class="base-card"><h3 class="base-search-card__title">Engineer {i}</h3>'
+        f'<h4 class="base-search-card__subtitle">LinkedIn Co</h4><span class="job-search-card__location">Berlin</span>'
+        f'<a class="base-card__full-link" href="{base}/jobs/view/{i}"></a></div>'
+        for i in range(start, start + count)
+    )
+
+
+def google_page(linkedin_base):
+    # The first card is the LinkedIn posting 0 again
+    return (f'<div class="BjJfJf PUpOsf"><span>Engineer 0</span><div class="vNEEBe">LinkedIn Co</div>'
+            f'<div class="Qk80Jf">Berlin</div><a href="{linkedin_base}/jobs/view/0"></a></div>'
+            '<div class="BjJfJf PUpOsf"><span>Data Engineer</span><div class="vNEEBe">G Co</div>'
+            '<div class="Qk80Jf">Remote</div><a href="https://example.com/g/1"></a></div>')
+
+
+class StubJobBoard:
+    """
+    A local HTTP server standing in for one job board: fixed latency per page, optional failures,
+    an optional ETag (pages requested with a matching If-None-Match get a 304) and an optional
+    robots.txt (404 without one).
+    """
+
+    def __init__(self, render, delay=0.0, failures=0, failure_status=503, retry_after=None, etag=None,
+                 robots=None, robots_delay=0.0):
+        self.render, self.delay, self.failures = render, delay, failures
+        self.failure_status, self.retry_after, self.etag = failure_status, retry_after, etag
+        self.robots, self.robots_delay = robots, robots_delay
+        self.starts, self.in_flight, self.max_in_flight = [], 0, 0
+        self.not_modified = self.robots_requests = 0
+        self.lock = threading.Lock()
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/robots.txt":
+                    with board.lock:
+                        board.robots_requests += 1
+                    time.sleep(board.robots_delay)
+                    if board.robots is None:
+                        self.send_error(404)
+                        return
+                    body = board.robots.encode()
+                    try:
+                        self.send_response(200)
+                        self.send_header("Content-Type", "text/plain")
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                    except ConnectionError:
+                        pass  # the client timed out
+                    return
+                with board.lock:
+                    board.starts.append(time.perf_counter())
+                    board.in_flight += 1
+                    board.max_in_flight = max(board.max_in_flight, board.in_flight)
+                    fail = board.failures > 0
+                    board.failures -= fail
+                time.sleep(board.delay)
+                with board.lock:
+                    board.in_flight -= 1
+                if fail:
+                    self.send_response(board.failure_status)
+                    if board.retry_after is not None:
+                        self.send_header("Retry-After", board.retry_after)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if board.etag is not None and self.headers.get("If-None-Match") == board.etag:
+                    with board.lock:
+                        board.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", board.etag)
+                    self.end_headers()
+                    return
+                start = int(parse_qs(url.query).get("start", ["0"])[0])
+                body = board.render(start).encode()
+                self.send_response(200)
+                if board.etag is not None:
+                    self.send_header("ETag", board.etag)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestAsyncScrapeEngine(unittest.TestCase):
+    DELAY = 0.3
+
+    def setUp(self):
+        self.indeed = StubJobBoard(lambda start: indeed_page(start, 10), delay=self.DELAY)
+        self.linkedin = StubJobBoard(lambda start: linkedin_page(start, 25, self.linkedin.url), delay=self.DELAY)
+        # Google answers last, so its copy of the LinkedIn posting is the duplicate
+        self.google = StubJobBoard(lambda start: google_page(self.linkedin.url), delay=self.DELAY + 0.1)
+        for board in (self.indeed, self.linkedin, self.google):
+            self.addCleanup(board.close)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.agent = JobScraperAgent(rate_limiter=DomainRateLimiter(rate=None, backoff_base=0), http_cache=HttpCache(cache_dir.name))
+        self.agent.indeed.BASE_URL = f"{self.indeed.url}/jobs"
+        self.agent.linkedin.BASE_URL = f"{self.linkedin.url}/jobs/search/"
+        self.agent.google.BASE_URL = f"{self.google.url}/search"
+
+    def search(self, num_results, **engine_kwargs):
+        async def run():
+            async with self.agent.new_engine(**engine_kwargs) as engine:
+                started = time.perf_counter()
+                results = await engine.search("Python", "Remote", num_results)
+                return results, time.perf_counter() - started, engine.stats
+        return asyncio.run(run())
+
+    def test_platforms_and_pages_are_fetched_concurrently(self):
+        results, elapsed, stats = self.search(30)
+        # 3 Indeed pages + 2 LinkedIn pages + 1 Google page; one after another this takes 6 x DELAY
+        self.assertLess(elapsed, 3 * self.DELAY)
+        self.assertEqual(stats["requests"], 6)
+        self.assertEqual([job["title"] for job in results["indeed"]], [f"Python Developer {i}" for i in range(30)])
+        self.assertEqual(len(results["linkedin"]), 30)
+        self.assertEqual(results["indeed"][0]["url"], "https://www.indeed.com/viewjob?jk=0")
+
+    def test_results_are_deduplicated_across_platforms(self):
+        results, _, stats = self.search(5)
+        self.assertEqual([job["title"] for job in results["google_jobs"]], ["Data Engineer"])
+        self.assertEqual(stats["duplicates"], 1)
+        jobs = [job for platform in results.values() for job in platform]
+        self.assertEqual(len({job_key(job) for job in jobs}), len(jobs))
+
+    def test_per_host_limits(self):
+        results, _, _ = self.search(30, limiter=DomainLimiter(max_concurrency=1, rate_limiter=self.agent.rate_limiter))
+        self.assertEqual(len(results["indeed"]), 30)
+        self.assertEqual(self.indeed.max_in_flight, 1)
+        gaps = [b - a for a, b in zip(self.indeed.starts, self.indeed.starts[1:])]
+        self.assertTrue(all(gap >= self.DELAY for gap in gaps), gaps)
+
+    def test_failed_requests_are_retried(self):
+        self.google.failures, self.google.failure_status = 1, 500
+        results, _, stats = self.search(5)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(len(results["google_jobs"]), 1)
+
+    def test_throttled_domain_waits_for_retry_after(self):
+        self.indeed.failures, self.indeed.failure_status, self.indeed.retry_after = 1, 429, "1"
+        results, elapsed, stats = self.search(30)
+        self.assertEqual(stats["throttled"], 1)
+        self.assertEqual(len(results["indeed"]), 30)
+        # 3 concurrent pages, one throttled: its retry waited out the pause; other boards were not held up
+        first, *_, retry = sorted(self.indeed.starts)
+        self.assertEqual(len(self.indeed.starts), 4)
+        self.assertGreaterEqual(retry - first, 0.95)
+        self.assertLess(max(self.linkedin.starts) - first, 0.5)
+
+    def test_blocking_scraper_honors_retry_after(self):
+        self.indeed.failures, self.indeed.failure_status, self.indeed.retry_after = 1, 429, "0.5"
+        started = time.perf_counter()
+        jobs = self.agent.indeed.search_jobs("Python", "Remote", 20)
+        self.assertEqual(len(jobs), 20)
+        self.assertEqual(self.agent.rate_limiter.stats["throttled"], 1)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.5 + 2 * self.DELAY)
+
+    def test_sync_search_all_platforms(self):
+        started = time.perf_counter()
+        results = self.agent.search_all_platforms("Python", "Remote", 10)
+        self.assertLess(time.perf_counter() - started, 3 * self.DELAY)
+        self.assertEqual({name: len(jobs) for name, jobs in results.items()}, {"indeed": 10, "linkedin": 10, "google_jobs": 1})
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.board = StubJobBoard(lambda start: indeed_page(start, 10), etag='"v1"')
+        self.addCleanup(self.board.close)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        self.limiter = DomainRateLimiter(rate=None, backoff_base=0)
+
+    def scraper(self, **ttls):
+        scraper = IndeedScraper(rate_limiter=self.limiter, http_cache=HttpCache(self.cache_dir, ttls=ttls))
+        scraper.BASE_URL = f"{self.board.url}/jobs"
+        return scraper
+
+    def engine_search(self, scraper):
+        async def run():
+            engine = AsyncScrapeEngine({"indeed": scraper}, limiter=DomainLimiter(rate_limiter=self.limiter),
+                                       http_cache=scraper.http_cache)
+            async with engine:
+                return await engine.search("Python", "Remote", 20)
+        return asyncio.run(run())["indeed"]
+
+    def test_fresh_pages_are_not_requested_again(self):
+        scraper = self.scraper()
+        first = scraper.search_jobs("Python", "Remote", 20)
+        self.assertEqual(len(self.board.starts), 2)
+        # Another worker (new cache instance, same directory) and the async engine reuse the pages
+        self.assertEqual(self.scraper().search_jobs("Python", "Remote", 20), first)
+        self.assertEqual(self.engine_search(scraper), first)
+        self.assertEqual(len(self.board.starts), 2)
+        self.assertEqual(scraper.http_cache.stats()["hits"], 2)
+
+    def test_stale_pages_are_revalidated(self):
+        scraper = self.scraper(search=0)
+        first = self.engine_search(scraper)
+        self.assertEqual(self.engine_search(scraper), first)
+        self.assertEqual(scraper.search_jobs("Python", "Remote", 20), first)
+        self.assertEqual(len(self.board.starts), 6)
+        self.assertEqual(self.board.not_modified, 4)
+        stats = scraper.http_cache.stats()
+        self.assertEqual((stats["misses"], stats["revalidated"], stats["hits"]), (2, 4, 0))
+        self.assertEqual(stats["hit_rate"], round(4 / 6, 4))
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_changed_pages_are_downloaded(self):
+        scraper = self.scraper(search=0)
+        scraper.search_jobs("Python", "Remote", 10)
+        self.board.etag = '"v2"'
+        self.board.render = lambda start: indeed_page(start + 100, 10)
+        jobs = scraper.search_jobs("Python", "Remote", 10)
+        self.assertEqual(jobs[0]["title"], "Python Developer 100")
+        self.assertEqual(self.board.not_modified, 0)
+        self.assertEqual(scraper.http_cache.get(scraper.BASE_URL, scraper.page_params("Python", "Remote", 0)).headers["etag"], '"v2"')
+
+    def test_blocked_and_empty_pages_are_not_served_from_the_cache(self):
+        scraper = self.scraper()
+        params = scraper.page_params("Python", "Remote", 0)
+        for render in (lambda start: "<html>Please verify you are a human</html>", lambda start: "<html></html>"):
+            self.board.render = render
+            self.assertEqual(scraper.search_jobs("Python", "Remote", 10), [])
+            self.assertEqual(self.engine_search(scraper), [])
+            self.assertIsNone(scraper.http_cache.get(scraper.BASE_URL, params))
+        self.board.render = lambda start: indeed_page(start, 10)
+        self.assertEqual(len(scraper.search_jobs("Python", "Remote", 10)), 10)
+        self.assertEqual(len(self.engine_search(scraper)), 20)
+        # 1 + 2 requests per bad page, then page 0 (reused by the engine) and page 1
+        self.assertEqual(len(self.board.starts), 8)
+
+    def test_entries_are_compressed_and_keyed_by_params(self):
+        cache = HttpCache(self.cache_dir)
+        body = indeed_page(0, 50).encode()
+        page = cache.store("https://jobs.example/search", {"q": "python"}, "search", 200,
+                           {"ETag": '"a"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT", "Set-Cookie": "x"}, body, "utf-8")
+        self.assertLess(os.path.getsize(cache._path(page.key)), len(body) / 4)
+        self.assertIsNone(cache.get("https://jobs.example/search", {"q": "java"}))
+        stored = cache.get("https://jobs.example/search", {"q": "python"})
+        self.assertEqual(stored.body, body)
+        self.assertNotIn("set-cookie", stored.headers)
+        self.assertEqual(stored.validators(), {"If-None-Match": '"a"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(stored.to_response().text, body.decode())
+
+    def test_ttl_per_page_type_and_no_store(self):
+        cache = HttpCache(self.cache_dir, ttls={"search": 60, "detail": 3600})
+        search = cache.store("https://jobs.example/s", None, "search", 200, {}, b"s")
+        detail = cache.store("https://jobs.example/d", None, "detail", 200, {}, b"d")
+        search.fetched_at = detail.fetched_at = search.fetched_at - 120
+        self.assertFalse(cache.is_fresh(search))
+        self.assertTrue(cache.is_fresh(detail))
+        self.assertIsNone(cache.store("https://jobs.example/p", None, "detail", 200, {"Cache-Control": "private, no-store"}, b"p"))
+        self.assertIsNone(cache.get("https://jobs.example/p"))
+        self.assertEqual(cache.prune(max_age=-1), 2)
+
+
+@pytest.mark.usefixtures("fake_redis")
+class TestRobotsTxtCache(unittest.TestCase):
+    def setUp(self):
+        self.board = StubJobBoard(lambda start: indeed_page(start, 10), robots="User-agent: *\nDisallow: /private\n")
+        self.addCleanup(self.board.close)
+
+    def scraper(self, robots_checker):
+        scraper = IndeedScraper(rate_limiter=DomainRateLimiter(rate=None), robots_checker=robots_checker)
+        scraper.BASE_URL = f"{self.board.url}/jobs"
+        return scraper
+
+    def test_rules_are_fetched_once_per_origin(self):
+        cache = RobotsTxtCache()
+        self.assertTrue(cache.can_fetch(f"{self.board.url}/jobs?q=python"))
+        self.assertFalse(cache.can_fetch(f"{self.board.url}/private/admin"))
+        self.assertEqual(len(self.scraper(cache).search_jobs("Python", "Remote", 20)), 20)
+        self.assertTrue(asyncio.run(cache.can_fetch_async(f"{self.board.url}/jobs")))
+        self.assertEqual(self.board.robots_requests, 1)
+        self.assertEqual(cache.stats["fetches"], 1)
+
+    def test_disallowed_pages_are_not_requested(self):
+        self.board.robots = "User-agent: *\nDisallow: /jobs\n"
+        scraper = self.scraper(RobotsTxtCache())
+        self.assertEqual(scraper.search_jobs("Python", "Remote", 10), [])
+        engine = AsyncScrapeEngine({"indeed": scraper}, limiter=DomainLimiter(rate_limiter=scraper.rate_limiter))
+        self.assertEqual(asyncio.run(engine.search("Python", "Remote", 10)), {"indeed": []})
+        self.assertEqual(self.board.starts, [])
+
+    def test_unreachable_robots_is_cached_briefly(self):
+        self.board.robots_delay = 0.5
+        cache = RobotsTxtCache(timeout=0.1, ttl=3600, negative_ttl=60)
+        started = time.perf_counter()
+        self.assertTrue(cache.can_fetch(f"{self.board.url}/private/admin"))  # unreachable: allowed
+        self.assertLess(time.perf_counter() - started, 0.4)
+        self.assertTrue(cache.can_fetch(f"{self.board.url}/private/admin"))
+        self.assertEqual((cache.stats["fetches"], cache.stats["errors"]), (1, 1))
+        expires_at, _ = cache._rules[cache.origin(self.board.url)]
+        self.assertLessEqual(expires_at - time.time(), 60)
+
+    def test_missing_robots_is_cached_like_rules(self):
+        self.board.robots = None
+        cache = RobotsTxtCache(ttl=3600, negative_ttl=60)
+        self.assertTrue(cache.can_fetch(f"{self.board.url}/private/admin"))
+        expires_at, _ = cache._rules[cache.origin(self.board.url)]
+        self.assertGreater(expires_at - time.time(), 3500)
+
+    def test_workers_share_one_fetch_through_redis(self):
+        redis = self.fake_redis
+        workers = [RobotsTxtCache(redis_client=redis) for _ in range(3)]
+        self.assertEqual([w.can_fetch(f"{self.board.url}/private/x") for w in workers], [False] * 3)
+        self.assertEqual(self.board.robots_requests, 1)
+        self.assertEqual(sum(w.stats["shared_hits"] for w in workers), 2)
+
+    def test_prefetch_loads_every_platform(self):
+        boards = [StubJobBoard(lambda start: "", robots="User-agent: *\nAllow: /\n", robots_delay=0.2) for _ in range(3)]
+        for board in boards:
+            self.addCleanup(board.close)
+        agent = JobScraperAgent(robots_cache=RobotsTxtCache())
+        for scraper, board in zip(agent.scrapers.values(), boards):
+            scraper.BASE_URL = f"{board.url}/jobs"
+        started = time.perf_counter()
+        asyncio.run(agent.prefetch_robots())
+        self.assertLess(time.perf_counter() - started, 0.5)  # concurrently
+        self.assertEqual([board.robots_requests for board in boards], [1, 1, 1])
+        self.assertTrue(all(agent.robots_cache.can_fetch(f"{board.url}/jobs") for board in boards))
+        self.assertEqual(agent.robots_cache.stats["fetches"], 3)
+
+
+class TestCardParser(unittest.TestCase):
+    def test_result_pages_parse_like_beautifulsoup(self):
+        platforms = {"indeed": IndeedScraper, "linkedin": LinkedInScraper, "glassdoor": GlassdoorScraper, "google_jobs": GoogleJobsScraper}
+        for name, content in result_pages().items():
+            scraper, cards = platforms[name], CARD_COUNTS[name]
+            jobs = scraper.PARSER.parse(content)
+            self.assertEqual(len(jobs), cards, name)
+            self.assertEqual(jobs, scraper.PARSER._parse_soup(content.decode("utf-8"), None), name)
+            self.assertTrue(all(job["title"] and job["company"] and job["url"].startswith("http") for job in jobs), name)
+
+    def test_bytes_are_decoded_with_the_declared_charset(self):
+        parser = CardParser(CardLayout(cards=".card", title="h2", company=".co", location=".loc", link="a", url_prefix="https://jobs.example"))
+        page = '<div class="card"><h2> Développeur </h2><span class="co">Zürich AG</span><a href="/j/1">x</a></div>'
+        self.assertEqual(parser.parse(page.encode("utf-8")), [{
+            "title": "Développeur", "company": "Zürich AG", "location": None, "summary": None, "url": "https://jobs.example/j/1",
+        }])
+        self.assertEqual(parser.parse(page.encode("latin-1"), "ISO-8859-1")[0]["company"], "Zürich AG")
+        self.assertEqual(parser.parse(page)[0]["title"], "Développeur")
+        self.assertEqual(parser.parse(b"  "), [])
+
+    def test_selector_translation(self):
+        self.assertEqual(css_to_xpath("a.x", scoped=True), "descendant::a[contains(concat(' ', normalize-space(@class), ' '), ' x ')]")
+        self.assertTrue(css_to_xpath(".a span, b").startswith("descendant-or-self::*["))
+        for unsupported in ("a > b", "a[href]", "#id", ""):
+            with self.assertRaises(ValueError):
+                css_to_xpath(unsupported)
+        self.assertEqual(response_charset({"Content-Type": "text/html; charset=UTF-8"}), "UTF-8")
+        self.assertIsNone(response_charset({"content-type": "text/html"}))
+
+
+class TestDomainRateLimiter(unittest.TestCase):
+    def test_burst_then_steady_rate(self):
+        limiter = DomainRateLimiter(rate=10, burst=3)
+        waits = [limiter.reserve("jobs.example") for _ in range(6)]
+        for actual, expected in zip(waits, [0, 0, 0, 0.1, 0.2, 0.3]):
+            self.assertAlmostEqual(actual, expected, places=2)
+        self.assertEqual(limiter.reserve("other.example"), 0)  # domains have separate buckets
+
+    def test_workers_share_one_budget(self):
+        shared = MemoryTokenBuckets()  # stands in for the Redis buckets of several workers
+        workers = [DomainRateLimiter(rate=10, burst=1) for _ in range(3)]
+        for worker in workers:
+            worker.buckets = shared
+        waits = sorted(worker.reserve("jobs.example") for worker in workers for _ in range(2))
+        self.assertAlmostEqual(waits[-1], 0.5, places=2)
+
+    def test_domain_limits_override_default(self):
+        limiter = DomainRateLimiter(rate=1, burst=1, domain_limits={"fast.example": (100, 5)})
+        self.assertEqual(max(limiter.reserve("fast.example") for _ in range(5)), 0)
+        limiter.reserve("slow.example")
+        self.assertAlmostEqual(limiter.reserve("slow.example"), 1.0, places=2)
+
+    def test_retry_after_pauses_domain(self):
+        limiter = DomainRateLimiter(rate=100, burst=5, max_retry_after=30)
+        self.assertEqual(limiter.retry_after("jobs.example", "2"), 2)
+        self.assertAlmostEqual(limiter.reserve("jobs.example"), 2, places=2)
+        self.assertEqual(limiter.retry_after("jobs.example", "3600"), 30)
+        self.assertEqual(limiter.reserve("other.example"), 0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+        self.assertAlmostEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480), 30)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_backoff_is_jittered_and_capped(self):
+        limiter = DomainRateLimiter(backoff_base=1, backoff_cap=8)
+        delays = [limiter.backoff(attempt) for attempt in range(6) for _ in range(20)]
+        self.assertTrue(all(0.5 <= d <= 8 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+        self.assertTrue(all(4 <= limiter.backoff(10) <= 8 for _ in range(20)))
+
+    def test_redis_failure_falls_back_to_local_buckets(self):
+        class BrokenRedis:
+            def register_script(self, script):
+                def run(keys, args):
+                    raise ConnectionError("redis down")
+                return run
+
+        limiter = DomainRateLimiter(rate=10, burst=1, redis_client=BrokenRedis())
+        self.assertEqual(limiter.reserve("jobs.example"), 0)
+        self.assertAlmostEqual(limiter.reserve("jobs.example"), 0.1, places=2)
+        self.assertEqual(limiter.stats["redis_errors"], 1)  # not retried until REDIS_RETRY_INTERVAL passes
+
+    def test_async_acquire_spaces_requests(self):
+        limiter = DomainRateLimiter(rate=20, burst=1)
+
+        async def run():
+            started = time.perf_counter()
+            await asyncio.gather(*(limiter.acquire_async("jobs.example") for _ in range(5)))
+            return time.perf_counter() - started
+
+        self.assertAlmostEqual(asyncio.run(run()), 0.2, delta=0.05)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,252 @@
+"""
+Content-addressed cache of parsed resumes.
+
+Entries are keyed by sha256 of the raw upload bytes (or resume text) and versioned with
+RESUME_PARSER_VERSION, so repeat uploads and re-scoring skip text extraction and NLP entirely.
+Lookups go memory -> local disk -> Redis; values are stored compactly with orjson when it is
+installed. Bulk invalidation and statistics are available from the command line:
+
+    python -m packages.agents.resume_parser.resume_cache stats
+    python -m packages.agents.resume_parser.resume_cache invalidate [--version V | --stale]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Union
+
+from packages.agents.resume_parser.resume_utils import ResumeData
+from packages.utilities.cache_utils import TwoTierCache, get_redis_client
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Bump whenever extraction, section splitting, NER or any extractor changes what is parsed;
+# older cached resumes become unreachable and are purged from Redis on the next startup.
+RESUME_PARSER_VERSION = "2026.10-1"
+
+RESUME_CACHE_NAMESPACE = "resume"
+RESUME_CACHE_MAXSIZE = 1024
+RESUME_CACHE_TTL = 7 * 24 * 3600  # seconds; applies to the memory and Redis tiers
+# Local disk tier; set RESUME_CACHE_DIR to an empty string to disable it
+RESUME_CACHE_DIR = os.getenv(
+    "RESUME_CACHE_DIR", os.path.join(tempfile.gettempdir(), "job_applier_resume_cache")
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Dict[str, Any]) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _loads(raw: Union[bytes, str]) -> Dict[str, Any]:
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def resume_content_digest(content: Union[bytes, str]) -> str:
+    """Returns the sha256 hex digest of raw resume bytes or text (text is hashed as UTF-8)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class ResumeParseCache(TwoTierCache):
+    """
+    Parsed-resume cache with a local disk tier between the in-process LRU and Redis.
+
+    The memory tier holds serialized entries, so every lookup returns a fresh ResumeData that
+    callers may modify freely. Disk entries live under ``<cache_dir>/<version>/<aa>/<digest>``
+    and do not expire; remove them with ``invalidate``.
+
+    Args:
+        cache_dir: Directory of the disk tier (None or "" disables it).
+        version: Parser version the cached results were produced by.
+        maxsize: Maximum entries held in memory.
+        ttl: Time-to-live in seconds for the memory and Redis tiers.
+        redis_client: Optional synchronous ``redis.Redis`` client for the shared tier.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, version: str = RESUME_PARSER_VERSION,
+                 maxsize: int = RESUME_CACHE_MAXSIZE, ttl: int = RESUME_CACHE_TTL, redis_client=None):
+        super().__init__(RESUME_CACHE_NAMESPACE, version, maxsize=maxsize, ttl=ttl,
+                         redis_client=redis_client, dumps=_dumps, loads=_loads)
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+
+    def key_for(self, content: Union[bytes, str]) -> str:
+        return f"{self.namespace}:{self.version}:{resume_content_digest(content)}"
+
+    def get_resume(self, content: Union[bytes, str]) -> Optional[ResumeData]:
+        """Returns the cached ResumeData for these raw bytes or text, or None."""
+        value = self.get(self.key_for(content))
+        return ResumeData(**value) if value is not None else None
+
+    def put_resume(self, content: Union[bytes, str], resume: ResumeData) -> None:
+        self.set(self.key_for(content), asdict(resume))
+
+    def get(self, key):
+        raw = self.memory.get(key)
+        tier = "memory"
+        if raw is None:
+            raw, tier = self._disk_get(key), "disk"
+        if raw is None:
+            raw, tier = self._redis_get(key), "redis"
+            if raw is not None:
+                self._disk_set(key, raw)
+        if raw is None:
+            self._record_miss()
+            return None
+        try:
+            value = self.loads(raw)
+        except ValueError as e:
+            logger.warning(f"Discarding corrupt resume cache entry {key}: {e}")
+            self._record_miss()
+            return None
+        if tier != "memory":
+            self.memory.set(key, raw)
+        self._record_hit(tier)
+        return value
+
+    def set(self, key, value):
+        raw = self.dumps(value)
+        self.memory.set(key, raw)
+        self._disk_set(key, raw)
+        self._redis_set(key, raw)
+
+    def invalidate(self, version: str = None) -> int:
+        """
+        Drops cached resumes from every tier: only ``version``'s entries if given, otherwise all
+        versions. Returns the number of Redis keys and disk files deleted.
+        """
+        deleted = super().invalidate(version)
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            versions = [version] if version else os.listdir(self.cache_dir)
+            for name in versions:
+                deleted += self._remove_disk_version(name)
+        return deleted
+
+    def invalidate_stale(self, keep=()) -> int:
+        """Removes entries of every parser version except the current one (and ``keep``) from disk and Redis."""
+        deleted = super().invalidate_stale(keep)
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name != self.version and name not in keep:
+                    deleted += self._remove_disk_version(name)
+        return deleted
+
+    def disk_usage(self) -> Dict[str, Dict[str, int]]:
+        """Returns the number of entries and bytes on disk per parser version."""
+        usage = {}
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in sorted(os.listdir(self.cache_dir)):
+                entries = size = 0
+                for root, _, files in os.walk(os.path.join(self.cache_dir, name)):
+                    for f in files:
+                        entries += 1
+                        size += os.path.getsize(os.path.join(root, f))
+                usage[name] = {"entries": entries, "bytes": size}
+        return usage
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        digest = key.rsplit(":", 1)[-1]
+        return os.path.join(self.cache_dir, self.version, digest[:2], f"{digest}.json")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read resume cache entry {path}: {e}")
+            return None
+
+    def _disk_set(self, key: str, raw: Union[bytes, str]) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename, so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write resume cache entry {path}: {e}")
+
+    def _remove_disk_version(self, version: str) -> int:
+        path = os.path.join(self.cache_dir, version)
+        if not os.path.isdir(path):
+            return 0
+        count = sum(len(files) for _, _, files in os.walk(path))
+        shutil.rmtree(path, ignore_errors=True)
+        return count
+
+
+_resume_parse_cache: Optional[ResumeParseCache] = None
+
+
+def configure_resume_parse_cache(redis_client=None, cache_dir: Optional[str] = RESUME_CACHE_DIR,
+                                 maxsize: int = RESUME_CACHE_MAXSIZE, ttl: int = RESUME_CACHE_TTL) -> ResumeParseCache:
+    """
+    Replaces the process-wide parsed-resume cache, e.g. to attach the Redis client a service
+    already configures. Stale Redis entries from older parser versions are invalidated.
+    """
+    global _resume_parse_cache
+    _resume_parse_cache = ResumeParseCache(cache_dir, maxsize=maxsize, ttl=ttl, redis_client=redis_client)
+    if _resume_parse_cache.ensure_version():
+        logger.info(f"Resume parser version changed to {RESUME_PARSER_VERSION}; cached resumes invalidated.")
+    return _resume_parse_cache
+
+
+def get_resume_parse_cache() -> ResumeParseCache:
+    """Returns the process-wide parsed-resume cache, creating it from the environment on first use."""
+    if _resume_parse_cache is None:
+        return configure_resume_parse_cache(redis_client=get_redis_client())
+    return _resume_parse_cache
+
+
+def invalidate_resume_parse_cache(version: Optional[str] = None, stale_only: bool = False) -> Dict[str, Any]:
+    """Drops cached resumes: all versions, one ``version``, or with ``stale_only`` all but the current one."""
+    cache = get_resume_parse_cache()
+    deleted = cache.invalidate_stale() if stale_only else cache.invalidate(version)
+    return {"namespace": RESUME_CACHE_NAMESPACE, "version": RESUME_PARSER_VERSION, "deleted": deleted}
+
+
+def main(argv=None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Inspect or invalidate the parsed-resume cache.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="show disk usage per parser version and this process's hit rate")
+    invalidate = commands.add_parser("invalidate", help="delete cached resumes from disk and Redis")
+    scope = invalidate.add_mutually_exclusive_group()
+    scope.add_argument("--version", help="only delete entries of this parser version")
+    scope.add_argument("--stale", action="store_true", help="delete every version except the current one")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "invalidate":
+        print(json.dumps(invalidate_resume_parse_cache(args.version, stale_only=args.stale)))
+    else:
+        cache = get_resume_parse_cache()
+        print(json.dumps({**cache.stats(), "cache_dir": cache.cache_dir, "disk": cache.disk_usage()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Parallel resume ingestion: PDF/DOCX/TXT text extraction in a process pool, followed by
+batched parsing with ResumeParserAgent.parse_resumes.
+
+Text extraction (PyPDF2 / python-docx) is pure-Python and CPU-bound, so it runs in worker
+processes; async request handlers await it through ``extract_resume_text_async`` instead of
+blocking the event loop. Run as a module to bulk-parse a directory or manifest:
+
+    python -m packages.agents.resume_parser.resume_ingestion resumes/ --workers 8 --output parsed.jsonl
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, List, Optional, Union
+
+from packages.agents.resume_parser.resume_utils import (
+    MAX_RESUME_BYTES,
+    MAX_RESUME_CHARS,
+    MAX_RESUME_PAGES,
+    check_resume_size,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+INGESTION_WORKERS = int(os.getenv("RESUME_INGESTION_WORKERS", "0")) or None  # None: one per CPU
+
+
+@dataclass
+class ExtractedResume:
+    """Text extracted from one resume file (``error`` is set instead when extraction failed)."""
+    source: str
+    text: str = ""
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def extract_resume_text(
+    source: Union[str, bytes],
+    filename: Optional[str] = None,
+    max_bytes: int = MAX_RESUME_BYTES,
+    max_pages: int = MAX_RESUME_PAGES,
+    max_chars: int = MAX_RESUME_CHARS,
+) -> str:
+    """
+    Extracts the text of a resume given as a path or as raw bytes (then ``filename`` selects the
+    format). Raises ResumeTooLargeError when a limit is exceeded and ValueError for unsupported formats.
+    """
+    name = filename or (source if isinstance(source, str) else "")
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported resume format: {extension or name!r}")
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    check_resume_size(stream, max_bytes)
+    if extension == ".pdf":
+        return extract_text_from_pdf(stream, max_pages=max_pages, max_chars=max_chars)
+    if extension in (".docx", ".doc"):
+        return extract_text_from_docx(stream, max_chars=max_chars)
+    if isinstance(stream, str):
+        with open(stream, "r", encoding="utf-8", errors="replace") as f:
+            return f.read(max_chars).strip()
+    return stream.read(max_chars * 4).decode("utf-8", errors="replace")[:max_chars].strip()
+
+
+def _extract_file(path: str) -> ExtractedResume:
+    """Worker-process entry point: never raises, so one bad file does not stop a batch."""
+    started = time.perf_counter()
+    try:
+        text = extract_resume_text(path)
+        return ExtractedResume(path, text=text, error=None if text else "no text extracted",
+                               seconds=time.perf_counter() - started)
+    except Exception as e:
+        return ExtractedResume(path, error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - started)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_ingestion_pool(max_workers: Optional[int] = INGESTION_WORKERS) -> ProcessPoolExecutor:
+    """
+    Returns the process-wide extraction pool, creating it on first use. Asking for a different
+    ``max_workers`` replaces the pool; work already submitted to the old one still completes.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != max_workers:
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_workers = max_workers
+        return _pool
+
+
+def shutdown_ingestion_pool() -> None:
+    """Stops the shared pool (call from application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def run_in_ingestion_pool(func, *args):
+    """Runs a picklable CPU-bound ``func(*args)`` in the shared process pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(get_ingestion_pool(), func, *args)
+
+
+async def extract_resume_text_async(data: bytes, filename: str) -> str:
+    """Async variant of extract_resume_text for uploaded bytes, executed in the shared process pool."""
+    return await run_in_ingestion_pool(extract_resume_text, data, filename)
+
+
+def extract_many(paths: Iterable[str], max_workers: Optional[int] = INGESTION_WORKERS, chunksize: int = 4) -> Iterator[ExtractedResume]:
+    """Extracts many files in parallel, yielding results in input order as they complete."""
+    paths = list(paths)
+    if not paths:
+        return iter(())
+    if max_workers == 1:
+        return map(_extract_file, paths)
+    return get_ingestion_pool(max_workers).map(_extract_file, paths, chunksize=chunksize)
+
+
+def collect_resume_paths(directory_or_manifest: str) -> List[str]:
+    """
+    Returns resume paths from a directory (searched recursively) or a manifest file: a JSON list
+    of paths or a text file with one path per line (relative paths resolve against the manifest).
+    """
+    if os.path.isdir(directory_or_manifest):
+        paths = []
+        for root, _, files in os.walk(directory_or_manifest):
+            paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(SUPPORTED_EXTENSIONS))
+        return sorted(paths)
+    base = os.path.dirname(os.path.abspath(directory_or_manifest))
+    with open(directory_or_manifest, "r", encoding="utf-8") as f:
+        content = f.read()
+    entries = json.loads(content) if content.lstrip().startswith("[") else content.splitlines()
+    return [os.path.join(base, e.strip()) for e in entries if e.strip()]
+
+
+def bulk_parse(
+    directory_or_manifest: str,
+    output_path: Optional[str] = None,
+    max_workers: Optional[int] = INGESTION_WORKERS,
+    batch_size: int = 64,
+    n_process: int = 1,
+) -> dict:
+    """
+    Extracts and parses every resume in a directory or manifest. Text extraction runs in the
+    process pool and overlaps with batched NER parsing in this process. Parsed resumes are
+    written as JSON lines to ``output_path`` if given. Returns throughput statistics.
+    """
+    from packages.agents.resume_parser.resume_parser_agent import ResumeParserAgent
+
+    paths = collect_resume_paths(directory_or_manifest)
+    parser = ResumeParserAgent(None)
+    stats = {"documents": len(paths), "parsed": 0, "failed": 0, "extract_seconds": 0.0}
+    started = time.perf_counter()
+    out = open(output_path, "w", encoding="utf-8") if output_path else None
+    try:
+        batch: List[ExtractedResume] = []
+
+        def flush():
+            results = parser.parse_resumes([item.text for item in batch], n_process=n_process, batch_size=batch_size)
+            for item, parsed in zip(batch, results):
+                stats["parsed" if parsed else "failed"] += 1
+                if out is not None:
+                    record = {"source": item.source, "resume": asdict(parsed) if parsed else None}
+                    out.write(json.dumps(record, default=str) + "\n")
+            batch.clear()
+
+        for item in extract_many(paths, max_workers=max_workers):
+            stats["extract_seconds"] += item.seconds
+            if item.error:
+                stats["failed"] += 1
+                logger.warning(f"Skipping {item.source}: {item.error}")
+                if out is not None:
+                    out.write(json.dumps({"source": item.source, "error": item.error}) + "\n")
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["extract_seconds"] = round(stats["extract_seconds"], 3)
+    stats["docs_per_second"] = round(len(paths) / elapsed, 2) if elapsed > 0 else 0.0
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Bulk-parse resumes and report throughput.")
+    arg_parser.add_argument("source", help="directory of resumes, or a manifest (JSON list or one path per line)")
+    arg_parser.add_argument("--output", help="write parsed resumes as JSON lines to this file")
+    arg_parser.add_argument("--workers", type=int, default=INGESTION_WORKERS, help="extraction processes (default: CPUs)")
+    arg_parser.add_argument("--batch-size", type=int, default=64, help="resumes per NER batch")
+    arg_parser.add_argument("--n-process", type=int, default=1, help="spaCy processes for NER")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        stats = bulk_parse(args.source, args.output, args.workers, args.batch_size, args.n_process)
+    finally:
+        shutdown_ingestion_pool()
+    print(
+        f"{stats['documents']} documents in {stats['seconds']:.2f}s "
+        f"({stats['docs_per_second']:.1f} docs/sec): {stats['parsed']} parsed, {stats['failed']} failed; "
+        f"{stats['extract_seconds']:.2f}s of text extraction across workers"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
+import io
 import logging
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence
 from types import TracebackType
 from packages.agents.resume_parser.resume_utils import (
     extract_personal_details,
@@ -14,8 +15,12 @@ from packages.agents.resume_parser.resume_utils import (
     extract_certifications,
     extract_awards,
     extract_achievements,
-    ResumeData
+    ResumeData,
+    SectionedResume,
+    resume_header,
 )
+from packages.agents.resume_parser.resume_cache import ResumeParseCache
+from packages.utilities.nlp_models import get_spacy_ner_model
 
 class ResumeParserAgent:
     """
@@ -24,10 +29,14 @@ class ResumeParserAgent:
     Args:
         db: Database/session dependency (optional, for future extensibility).
         logger: Logger instance for dependency injection and testability.
+        cache: Optional parsed-resume cache (e.g. ``get_resume_parse_cache()``); resumes whose bytes
+            or text were parsed before by the same parser version are then served without NLP.
     """
-    def __init__(self, db: Optional[Any], logger: Optional[logging.Logger] = None) -> None:
+    def __init__(self, db: Optional[Any], logger: Optional[logging.Logger] = None,
+                 cache: Optional[ResumeParseCache] = None) -> None:
         self.db = db
         self.logger = logger or logging.getLogger(__name__)
+        self.cache = cache
         self.logger.info("ResumeParserAgent initialized with NLP capabilities.")
 
     def parse_resume_file(self, file_path: str) -> Optional[ResumeData]:
@@ -45,20 +54,32 @@ class ResumeParserAgent:
             return None
 
         try:
+            if not file_path.lower().endswith(('.pdf', '.docx', '.doc')):
+                self.logger.error(f"Unsupported file format: {file_path}")
+                return None
+
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            if self.cache is not None:
+                cached = self.cache.get_resume(content)
+                if cached is not None:
+                    self.logger.info("Parsed resume served from cache.")
+                    return cached
+
             # Extract text based on file type
             if file_path.lower().endswith('.pdf'):
-                resume_text = extract_text_from_pdf(file_path)
-            elif file_path.lower().endswith(('.docx', '.doc')):
-                resume_text = extract_text_from_docx(file_path)
+                resume_text = extract_text_from_pdf(io.BytesIO(content))
             else:
-                self.logger.error(f"Unsupported file format: {file_path}")
-                return None
+                resume_text = extract_text_from_docx(io.BytesIO(content))
 
             if not resume_text:
                 self.logger.error("Failed to extract text from resume file")
                 return None
 
-            return self.parse_resume(resume_text)
+            resume_data = self.parse_resume(resume_text)
+            if resume_data is not None and self.cache is not None:
+                self.cache.put_resume(content, resume_data)
+            return resume_data
 
         except Exception as e:
             self.logger.exception(f"Error parsing resume file: {e}")
@@ -77,17 +98,58 @@ class ResumeParserAgent:
         if not resume_text:
             self.logger.warning("Empty resume text provided.")
             return None
+        return self.parse_resumes([resume_text])[0]
+
+    def parse_resumes(self, resume_texts: Sequence[str], n_process: int = 1, batch_size: int = 64) -> List[Optional[ResumeData]]:
+        """
+        Parse many resumes in one pass. Named-entity recognition runs through ``nlp.pipe`` on the
+        header region of each resume only, with a pipeline that has every non-NER component removed.
+
+        Args:
+            resume_texts: Raw texts of the resumes.
+            n_process: Worker processes used by spaCy for NER.
+            batch_size: Documents per spaCy batch.
+
+        Returns:
+            One ResumeData (or None if parsing or validation failed) per input text, in order.
+            With a cache, previously parsed texts are served from it and only the rest are parsed.
+        """
+        results: List[Optional[ResumeData]] = [None] * len(resume_texts)
+        indices = [i for i, text in enumerate(resume_texts) if text]
+        if len(indices) < len(resume_texts):
+            self.logger.warning(f"{len(resume_texts) - len(indices)} empty resume texts skipped.")
+        if self.cache is not None:
+            for i in indices:
+                results[i] = self.cache.get_resume(resume_texts[i])
+            indices = [i for i in indices if results[i] is None]
+        if not indices:
+            return results
+
+        try:
+            sections = [SectionedResume.from_text(resume_texts[i]) for i in indices]
+            docs = get_spacy_ner_model().pipe(
+                (resume_header(s) for s in sections), n_process=n_process, batch_size=batch_size
+            )
+            for i, sectioned, doc in zip(indices, sections, docs):
+                results[i] = self._structure_resume_data(resume_texts[i], sectioned, doc)
+                if results[i] is not None and self.cache is not None:
+                    self.cache.put_resume(resume_texts[i], results[i])
+        except Exception as e:
+            self.logger.exception(f"Error running NER over {len(indices)} resumes: {e}")
+        return results
 
+    def _structure_resume_data(self, resume_text: str, sections: SectionedResume, doc: Any) -> Optional[ResumeData]:
+        """Builds and validates the ResumeData of one resume from its sections and header NER doc."""
         try:
-            # Extract all components
-            personal_details = extract_personal_details(resume_text)
-            education = extract_education(resume_text)
-            experience = extract_experience(resume_text)
-            skills = extract_skills(resume_text)
-            projects = extract_projects(resume_text)
-            certifications = extract_certifications(resume_text)
-            awards = extract_awards(resume_text)
-            achievements = extract_achievements(resume_text)
+            # Extract all components; every section extractor reuses the same split
+            personal_details = extract_personal_details(resume_text, doc=doc)
+            education = extract_education(sections)
+            experience = extract_experience(sections)
+            skills = extract_skills(sections)
+            projects = extract_projects(sections)
+            certifications = extract_certifications(sections)
+            awards = extract_awards(sections)
+            achievements = extract_achievements(sections)
 
             # Create structured resume data
             resume_data = ResumeData(
@@ -1,99 +1,186 @@
 import re
-import spacy
-from typing import Dict, List, Optional, Any
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
 import logging
 from PyPDF2 import PdfReader
 from docx import Document
 import os
-from nltk import ne_chunk, pos_tag, word_tokenize
-from nltk.tree import Tree
 from dataclasses import dataclass, field
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logging.warning("Downloading spaCy model...")
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+from packages.utilities.nlp_models import get_spacy_ner_model
 
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Per-document ingestion limits; larger files are rejected instead of tying up a worker
+MAX_RESUME_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_RESUME_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+MAX_RESUME_CHARS = int(os.getenv("RESUME_MAX_CHARS", "200000"))
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when a resume exceeds the configured size or page limits."""
+
+
+def _source_size(source: Union[str, BinaryIO]) -> int:
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def check_resume_size(source: Union[str, BinaryIO], max_bytes: int = MAX_RESUME_BYTES) -> None:
+    """Raises ResumeTooLargeError if the file (path or binary stream) is larger than ``max_bytes``."""
+    size = _source_size(source)
+    if size > max_bytes:
+        raise ResumeTooLargeError(f"Resume is {size} bytes; the limit is {max_bytes} bytes")
+
+
+def iter_pdf_pages(source: Union[str, BinaryIO], max_pages: int = MAX_RESUME_PAGES) -> Iterator[str]:
+    """Yields the text of each PDF page (path or binary stream), one page at a time."""
+    pdf = PdfReader(source)
+    if len(pdf.pages) > max_pages:
+        raise ResumeTooLargeError(f"Resume has {len(pdf.pages)} pages; the limit is {max_pages}")
+    for page in pdf.pages:
+        page_text = page.extract_text()
+        if page_text:
+            yield page_text
+
+
+def iter_docx_paragraphs(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """Yields the text of each DOCX paragraph (path or binary stream)."""
+    for paragraph in Document(source).paragraphs:
+        yield paragraph.text
+
+
+def _join_limited(parts: Iterable[str], separator: str, max_chars: int) -> str:
+    """Joins ``parts`` once, stopping after ``max_chars`` characters."""
+    kept, total = [], 0
+    for part in parts:
+        kept.append(part)
+        total += len(part) + len(separator)
+        if total >= max_chars:
+            logger.warning(f"Resume text truncated to {max_chars} characters")
+            break
+    return separator.join(kept)[:max_chars]
+
+
+def extract_text_from_pdf(file_path: Union[str, BinaryIO], max_pages: int = MAX_RESUME_PAGES, max_chars: int = MAX_RESUME_CHARS) -> str:
     """Extract text from PDF file."""
     try:
-        with open(file_path, 'rb') as file:
-            # Create a PDF reader object
-            pdf = PdfReader(file)
-
-            # Check if the file is empty
-            if len(pdf.pages) == 0:
-                logger.warning("PDF file is empty")
-                return ""
-
-            # Extract text from all pages
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text.strip()
+        text = _join_limited(iter_pdf_pages(file_path, max_pages), "\n", max_chars)
+        if not text:
+            logger.warning("PDF file is empty")
+        return text.strip()
+    except ResumeTooLargeError:
+        raise
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {e}")
         return ""
 
-def extract_text_from_docx(file_path: str) -> str:
+def extract_text_from_docx(file_path: Union[str, BinaryIO], max_chars: int = MAX_RESUME_CHARS) -> str:
     """Extract text from DOCX file."""
     try:
-        # Create a Document object
-        doc = Document(file_path)
-
-        # Extract text from all paragraphs
-        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
-        return text.strip()
+        return _join_limited(iter_docx_paragraphs(file_path), "\n", max_chars).strip()
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {e}")
         return ""
 
-def extract_certifications(text: str) -> list:
-    """Extract certifications from resume text."""
-    certs = []
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
-    for section in sections:
-        if re.search(r'CERTIFICATION|CERTIFICATIONS|LICENSE|LICENSES', section.upper()):
-            lines = [line.strip() for line in section.split('\n')[1:] if line.strip()]
-            for line in lines:
-                if not re.match(r'^[A-Z][A-Z\s]+:?$', line):
-                    certs.append(line)
-    return certs
-
-def extract_awards(text: str) -> list:
-    """Extract awards from resume text."""
-    awards = []
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
-    for section in sections:
-        if re.search(r'AWARD|HONOR|ACHIEVEMENT', section.upper()):
-            lines = [line.strip() for line in section.split('\n')[1:] if line.strip()]
-            for line in lines:
-                if not re.match(r'^[A-Z][A-Z\s]+:?$', line):
-                    awards.append(line)
-    return awards
-
-def extract_achievements(text: str) -> list:
-    """Extract achievements from resume text."""
-    achievements = []
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
+# A section starts at a line that is an all-caps header, e.g. "EXPERIENCE" or "SKILLS:"
+SECTION_SPLIT_PATTERN = re.compile(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))')
+HEADER_LINE_PATTERN = re.compile(r'^[A-Z][A-Z\s]+:?$')
+
+# Canonical section types and the keywords that identify them in a section's (uppercased) text
+SECTION_TYPE_PATTERNS = {
+    "education": re.compile(r'EDUCATION|ACADEMIC|QUALIFICATION'),
+    "experience": re.compile(r'EXPERIENCE|EMPLOYMENT|WORK'),
+    "skills": re.compile(r'SKILLS|TECHNOLOGIES|TECHNICAL'),
+    "projects": re.compile(r'PROJECT|PORTFOLIO'),
+    "certifications": re.compile(r'CERTIFICATION|CERTIFICATIONS|LICENSE|LICENSES'),
+    "awards": re.compile(r'AWARD|HONOR|ACHIEVEMENT'),
+    "achievements": re.compile(r'ACHIEVEMENT|ACHIEVEMENTS'),
+}
+
+
+@dataclass
+class SectionedResume:
+    """
+    A resume split into sections once, with sections indexed by canonical type.
+
+    Build it with ``SectionedResume.from_text`` and pass it to the ``extract_*`` functions
+    so a document is split and uppercased a single time instead of once per extractor.
+    A section can belong to several types (its whole text is matched, as before).
+    """
+    text: str
+    sections: List[str]
+    by_type: Dict[str, List[int]]
+
+    @classmethod
+    def from_text(cls, text: str) -> "SectionedResume":
+        # Leading blank lines are skipped: otherwise an all-caps name on the first non-blank
+        # line is split off as a section and the header region before it is empty.
+        sections = SECTION_SPLIT_PATTERN.split(text.lstrip())
+        by_type: Dict[str, List[int]] = {section_type: [] for section_type in SECTION_TYPE_PATTERNS}
+        for index, section in enumerate(sections):
+            upper = section.upper()
+            for section_type, pattern in SECTION_TYPE_PATTERNS.items():
+                if pattern.search(upper):
+                    by_type[section_type].append(index)
+        return cls(text=text, sections=sections, by_type=by_type)
+
+    def first(self, section_type: str) -> Optional[str]:
+        """Returns the first section of the given type, or None."""
+        indices = self.by_type.get(section_type)
+        return self.sections[indices[0]] if indices else None
+
+    def all(self, section_type: str) -> List[str]:
+        """Returns every section of the given type, in document order."""
+        return [self.sections[i] for i in self.by_type.get(section_type, [])]
+
+
+def _sectioned(resume: Union[str, SectionedResume]) -> SectionedResume:
+    return resume if isinstance(resume, SectionedResume) else SectionedResume.from_text(resume)
+
+
+def _section_body_lines(sections: List[str]) -> List[str]:
+    """Non-empty, non-header lines following the header line of each section."""
+    lines = []
     for section in sections:
-        if re.search(r'ACHIEVEMENT|ACHIEVEMENTS', section.upper()):
-            lines = [line.strip() for line in section.split('\n')[1:] if line.strip()]
-            for line in lines:
-                if not re.match(r'^[A-Z][A-Z\s]+:?$', line):
-                    achievements.append(line)
-    return achievements
-
-def extract_personal_details(text: str) -> Dict[str, Optional[str]]:
+        for line in section.split('\n')[1:]:
+            line = line.strip()
+            if line and not HEADER_LINE_PATTERN.match(line):
+                lines.append(line)
+    return lines
+
+
+def extract_certifications(resume: Union[str, SectionedResume]) -> list:
+    """Extract certifications from resume text (or a pre-split SectionedResume)."""
+    return _section_body_lines(_sectioned(resume).all("certifications"))
+
+def extract_awards(resume: Union[str, SectionedResume]) -> list:
+    """Extract awards from resume text (or a pre-split SectionedResume)."""
+    return _section_body_lines(_sectioned(resume).all("awards"))
+
+def extract_achievements(resume: Union[str, SectionedResume]) -> list:
+    """Extract achievements from resume text (or a pre-split SectionedResume)."""
+    return _section_body_lines(_sectioned(resume).all("achievements"))
+
+# Names and locations live in the header region: the text before the first section header,
+# capped so resumes without recognizable headers do not send the whole document through NER.
+HEADER_REGION_MAX_CHARS = 1000
+# The NLTK name fallback re-tokenizes and tags the text; it is off unless explicitly enabled.
+NLTK_NAME_FALLBACK = os.getenv("RESUME_NLTK_NAME_FALLBACK", "false").lower() in ("1", "true", "yes")
+
+def resume_header(resume: Union[str, SectionedResume], max_chars: int = HEADER_REGION_MAX_CHARS) -> str:
+    """Returns the header region of a resume (contact block before the first section)."""
+    return _sectioned(resume).sections[0][:max_chars]
+
+def extract_personal_details(text: str, doc: Any = None, nltk_fallback: bool = NLTK_NAME_FALLBACK) -> Dict[str, Optional[str]]:
     """
     Extract personal details using NLP and regex patterns.
+
+    ``doc`` is the spaCy Doc of the resume header (see ``resume_header``); it is computed
+    with the NER-only pipeline when omitted. Batch callers pass docs from ``nlp.pipe``.
     """
     # Initialize details
     details = {
@@ -149,15 +236,18 @@ def extract_personal_details(text: str) -> Dict[str, Optional[str]]:
         details["github"] = "https://www." + github_match.group()
 
     # Try spaCy first
-    doc = nlp(text)
+    if doc is None:
+        doc = get_spacy_ner_model()(resume_header(text))
     for ent in doc.ents:
         if ent.label_ == "PERSON" and not details["name"]:
             details["name"] = ent.text.strip()
             break
-    # Fallback to NLTK if spaCy fails
-    if not details["name"]:
+    # Optional fallback to NLTK if spaCy fails
+    if not details["name"] and nltk_fallback:
         try:
-            nltk_results = ne_chunk(pos_tag(word_tokenize(text)))
+            from nltk import ne_chunk, pos_tag, word_tokenize
+            from nltk.tree import Tree
+            nltk_results = ne_chunk(pos_tag(word_tokenize(doc.text)))
             for subtree in nltk_results:
                 if type(subtree) == Tree and subtree.label() == 'PERSON':
                     name = ' '.join([leaf[0] for leaf in subtree.leaves()])
@@ -173,26 +263,26 @@ def extract_personal_details(text: str) -> Dict[str, Optional[str]]:
 
     return details
 
-def extract_education(text: str) -> List[Dict[str, str]]:
+# Common degree patterns
+DEGREE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r"(?:Bachelor|Master|PhD|B\.?S\.?|M\.?S\.?|B\.?A\.?|M\.?A\.?|B\.?E\.?|M\.?E\.?|B\.?Tech\.?|M\.?Tech\.?)",
+        r"(?:Bachelor's|Master's|Doctorate)",
+        r"(?:Computer Science|Engineering|Business Administration|Mathematics|Physics)",
+    )
+]
+GPA_PATTERN = re.compile(r'GPA:?\s*(\d+\.?\d*)', re.IGNORECASE)
+YEAR_PATTERN = re.compile(r'20\d{2}|19\d{2}')
+YEAR_RANGE_PATTERN = re.compile(r'(20\d{2}|19\d{2})\s*(?:-|–|to)\s*(20\d{2}|19\d{2}|Present)')
+
+def extract_education(resume: Union[str, SectionedResume]) -> List[Dict[str, str]]:
     """
     Extract education details using NLP and pattern matching.
     """
     education = []
 
-    # Common degree patterns
-    degree_patterns = [
-        r"(?:Bachelor|Master|PhD|B\.?S\.?|M\.?S\.?|B\.?A\.?|M\.?A\.?|B\.?E\.?|M\.?E\.?|B\.?Tech\.?|M\.?Tech\.?)",
-        r"(?:Bachelor's|Master's|Doctorate)",
-        r"(?:Computer Science|Engineering|Business Administration|Mathematics|Physics)"
-    ]
-
     # Find education section
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
-    education_section = None
-    for section in sections:
-        if re.search(r'EDUCATION|ACADEMIC|QUALIFICATION', section.upper()):
-            education_section = section
-            break
+    education_section = _sectioned(resume).first("education")
 
     if not education_section:
         return []
@@ -205,8 +295,8 @@ def extract_education(text: str) -> List[Dict[str, str]]:
     for i, line in enumerate(lines[1:], 1):
         # Look for degree information
         is_degree_line = False
-        for pattern in degree_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+        for pattern in DEGREE_PATTERNS:
+            if pattern.search(line):
                 is_degree_line = True
                 # If we have a current degree and we're seeing a new one, save the current one
                 if current_degree:
@@ -216,12 +306,12 @@ def extract_education(text: str) -> List[Dict[str, str]]:
                 current_degree = {"degree": line}
 
                 # Extract year if present
-                year_match = re.search(r'20\d{2}|19\d{2}', line)
+                year_match = YEAR_PATTERN.search(line)
                 if year_match:
                     current_degree["year"] = year_match.group()
 
                 # Extract GPA if present
-                gpa_match = re.search(r'GPA:?\s*(\d+\.?\d*)', line, re.IGNORECASE)
+                gpa_match = GPA_PATTERN.search(line)
                 if gpa_match:
                     current_degree["gpa"] = gpa_match.group(1)
                 break
@@ -229,12 +319,12 @@ def extract_education(text: str) -> List[Dict[str, str]]:
         # If not a degree line and we have a current degree, it might be additional info
         if not is_degree_line and current_degree:
             # Check if it's a GPA line
-            gpa_match = re.search(r'GPA:?\s*(\d+\.?\d*)', line, re.IGNORECASE)
+            gpa_match = GPA_PATTERN.search(line)
             if gpa_match and "gpa" not in current_degree:
                 current_degree["gpa"] = gpa_match.group(1)
 
             # Check if it's a year range line
-            year_range_match = re.search(r'(20\d{2}|19\d{2})\s*(?:-|–|to)\s*(20\d{2}|19\d{2}|Present)', line)
+            year_range_match = YEAR_RANGE_PATTERN.search(line)
             if year_range_match:
                 # Use the end year (or start year if no end year)
                 end_year = year_range_match.group(2)
@@ -244,12 +334,12 @@ def extract_education(text: str) -> List[Dict[str, str]]:
                     current_degree["year"] = end_year
             # If no year range but there's a single year
             elif "year" not in current_degree:
-                year_match = re.search(r'20\d{2}|19\d{2}', line)
+                year_match = YEAR_PATTERN.search(line)
                 if year_match:
                     current_degree["year"] = year_match.group()
 
             # If we see a line that looks like the start of a new section, break
-            if i < len(lines) - 1 and re.match(r'^[A-Z][A-Z\s]+:?$', lines[i+1]):
+            if i < len(lines) - 1 and HEADER_LINE_PATTERN.match(lines[i+1]):
                 break
 
     # Don't forget to add the last degree
@@ -261,19 +351,19 @@ def extract_education(text: str) -> List[Dict[str, str]]:
 
     return education
 
-def extract_experience(text: str) -> List[Dict[str, str]]:
+_MONTH = r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+DATE_RANGE_PATTERN = re.compile(
+    _MONTH + r'\s*\d{4}\s*(?:-|–|to)\s*(?:Present|Current|' + _MONTH + r'\s*\d{4})', re.IGNORECASE
+)
+
+def extract_experience(resume: Union[str, SectionedResume]) -> List[Dict[str, str]]:
     """
     Extract work experience details using NLP.
     """
     experience = []
 
     # Find experience section
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
-    experience_section = None
-    for section in sections:
-        if re.search(r'EXPERIENCE|EMPLOYMENT|WORK', section.upper()):
-            experience_section = section
-            break
+    experience_section = _sectioned(resume).first("experience")
 
     if not experience_section:
         return []
@@ -320,8 +410,7 @@ def extract_experience(text: str) -> List[Dict[str, str]]:
 
         # Extract date range from the second line
         if len(lines) > 1:
-            date_pattern = r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s*\d{4}\s*(?:-|–|to)\s*(?:Present|Current|(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s*\d{4})'
-            date_match = re.search(date_pattern, lines[1], re.IGNORECASE)
+            date_match = DATE_RANGE_PATTERN.search(lines[1])
             if date_match:
                 job_entry["date_range"] = date_match.group()
 
@@ -336,48 +425,52 @@ def extract_experience(text: str) -> List[Dict[str, str]]:
 
     return experience
 
-def extract_skills(text: str) -> List[str]:
-    """
-    Extract skills using NLP and custom skill patterns.
-    """
-    skills = set()
-
-    # Common technical skills patterns
-    skill_patterns = [
+# Common technical skills patterns
+SKILL_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
         r'Python|Java|C\+\+|JavaScript|TypeScript|React|Node\.js|SQL|AWS|Docker|Kubernetes|Git',
         r'Machine Learning|Deep Learning|AI|Artificial Intelligence|Data Science|NLP|Computer Vision',
         r'HTML|CSS|REST|API|MongoDB|PostgreSQL|MySQL|Redis|Linux|Unix|Windows|MacOS',
         r'Agile|Scrum|Project Management|Team Leadership|Problem Solving|Communication',
-        r'Django|Flask|Express'  # Additional frameworks
-    ]
+        r'Django|Flask|Express',  # Additional frameworks
+    )
+]
+SKILL_LABEL_PATTERN = re.compile(r'(?:Languages|Frameworks|Tools|Technologies):\s*(.*?)(?:\n|$)')
+# Case-sensitive twins of SKILL_PATTERNS matched against lowercased text, which is several
+# times faster than IGNORECASE alternation (the patterns contain no uppercase escapes).
+_LOWERCASE_SKILL_PATTERNS = [re.compile(p.pattern.lower()) for p in SKILL_PATTERNS]
+
+def _find_skill_mentions(text: str) -> List[str]:
+    """All SKILL_PATTERNS matches in ``text``, as they are written in the text."""
+    lowered = text.lower()
+    if len(lowered) != len(text):  # non-ASCII case mapping shifted offsets
+        return [match for pattern in SKILL_PATTERNS for match in pattern.findall(text)]
+    return [text[m.start():m.end()] for pattern in _LOWERCASE_SKILL_PATTERNS for m in pattern.finditer(lowered)]
+
+def extract_skills(resume: Union[str, SectionedResume]) -> List[str]:
+    """
+    Extract skills using NLP and custom skill patterns.
+    """
+    skills = set()
+    sectioned = _sectioned(resume)
 
     # Find skills section
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
-    skills_section = None
-    for section in sections:
-        if re.search(r'SKILLS|TECHNOLOGIES|TECHNICAL', section.upper()):
-            skills_section = section
-            break
+    skills_section = sectioned.first("skills")
 
     if skills_section:
         # Extract skills using patterns
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, skills_section, re.IGNORECASE)
-            skills.update(matches)
+        skills.update(_find_skill_mentions(skills_section))
 
         # Extract additional skills using labels and colons
-        label_matches = re.findall(r'(?:Languages|Frameworks|Tools|Technologies):\s*(.*?)(?:\n|$)', skills_section)
+        label_matches = SKILL_LABEL_PATTERN.findall(skills_section)
         for match in label_matches:
             # Split by commas and clean up
             additional_skills = [s.strip() for s in match.split(',')]
             skills.update(additional_skills)
 
     # Also look for skills mentioned in experience sections
-    for section in sections:
-        if re.search(r'EXPERIENCE|EMPLOYMENT|WORK', section.upper()):
-            for pattern in skill_patterns:
-                matches = re.findall(pattern, section, re.IGNORECASE)
-                skills.update(matches)
+    for section in sectioned.all("experience"):
+        skills.update(_find_skill_mentions(section))
 
     # Clean up skills
     cleaned_skills = set()
@@ -394,19 +487,14 @@ def extract_skills(text: str) -> List[str]:
 
     return sorted(list(cleaned_skills))
 
-def extract_projects(text: str) -> List[Dict[str, Any]]:
+def extract_projects(resume: Union[str, SectionedResume]) -> List[Dict[str, Any]]:
     """
     Extract project details using NLP.
     """
     projects = []
 
     # Find projects section
-    sections = re.split(r'\n(?=[A-Z][A-Z\s]+:?(?:\n|$))', text)
-    projects_section = None
-    for section in sections:
-        if re.search(r'PROJECT|PORTFOLIO', section.upper()):
-            projects_section = section
-            break
+    projects_section = _sectioned(resume).first("projects")
 
     if not projects_section:
         return []
@@ -428,7 +516,7 @@ def extract_projects(text: str) -> List[Dict[str, Any]]:
         # First line should be the project name
         if not lines[0].startswith(('-', '•')) and not lines[0].strip().startswith('-'):
             # Skip section headers and special lines
-            if (re.match(r'^[A-Z][A-Z\s]+:?$', lines[0]) or
+            if (HEADER_LINE_PATTERN.match(lines[0]) or
                 re.match(r'^(?:Languages|Frameworks|Tools|Technologies):', lines[0]) or
                 re.match(r'^(?:using|with|in)\s+', lines[0], re.IGNORECASE) or
                 re.match(r'^[A-Z][a-z]+\s+[A-Z][a-z]+\s*\|', lines[0]) or
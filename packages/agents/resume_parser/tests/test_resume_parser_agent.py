@@ -2,8 +2,16 @@ import unittest
 import os
 from unittest.mock import MagicMock, patch
 import tempfile
+import pytest
 
 from packages.agents.resume_parser.resume_parser_agent import ResumeParserAgent
+from packages.utilities import nlp_models
+from packages.agents.resume_parser import resume_utils
+from packages.agents.resume_parser.resume_utils import SectionedResume, ResumeTooLargeError
+from packages.agents.resume_parser import resume_ingestion
+from packages.agents.resume_parser.resume_cache import ResumeParseCache
+from docx import Document
+import json
 
 class TestResumeParserAgent(unittest.TestCase):
     def setUp(self):
@@ -136,5 +144,252 @@ class TestResumeParserAgent(unittest.TestCase):
         result = self.parser.parse_resume_file('nonexistent.pdf')
         self.assertIsNone(result)
 
+class TestSectionedResume(unittest.TestCase):
+    TEXT = (
+        "Jane Roe\njane@example.com\n"
+        "EDUCATION\nB.S. Computer Science, 2019\nGPA: 3.9\n"
+        "EXPERIENCE\nBackend Engineer | Acme\nJan 2020 - Present\n- Built APIs in Python and PostgreSQL\n"
+        "TECHNICAL SKILLS\nLanguages: Python, Go\n"
+        "CERTIFICATIONS\nAWS Solutions Architect\n"
+        "AWARDS\nHackathon winner\n"
+    )
+
+    def test_sections_are_indexed_by_type(self):
+        sections = SectionedResume.from_text(self.TEXT)
+        self.assertTrue(sections.first("education").startswith("EDUCATION"))
+        self.assertTrue(sections.first("skills").startswith("TECHNICAL SKILLS"))
+        self.assertEqual(sections.all("certifications"), ["CERTIFICATIONS\nAWS Solutions Architect"])
+        self.assertIsNone(sections.first("projects"))
+
+    def test_extractors_accept_text_or_sections_with_same_result(self):
+        sections = SectionedResume.from_text(self.TEXT)
+        for extractor in (resume_utils.extract_education, resume_utils.extract_experience,
+                          resume_utils.extract_skills, resume_utils.extract_projects,
+                          resume_utils.extract_certifications, resume_utils.extract_awards,
+                          resume_utils.extract_achievements):
+            self.assertEqual(extractor(self.TEXT), extractor(sections), extractor.__name__)
+        self.assertEqual(resume_utils.extract_skills(sections), ["API", "Go", "PostgreSQL", "Python", "SQL"])
+        self.assertEqual(resume_utils.extract_certifications(sections), ["AWS Solutions Architect"])
+
+    def test_parse_resume_splits_sections_once(self):
+        parser = ResumeParserAgent(None)
+        with patch("packages.agents.resume_parser.resume_parser_agent.SectionedResume.from_text",
+                   wraps=SectionedResume.from_text) as from_text, \
+                patch("packages.agents.resume_parser.resume_parser_agent.get_spacy_ner_model",
+                      return_value=FakeNER()):
+            result = parser.parse_resume(self.TEXT)
+        from_text.assert_called_once_with(self.TEXT)
+        self.assertEqual(result.certifications, ["AWS Solutions Architect"])
+
+
+class FakeEntity:
+    def __init__(self, text, label_):
+        self.text = text
+        self.label_ = label_
+
+
+class FakeDoc:
+    def __init__(self, text):
+        self.text = text
+        first_line = text.strip().split("\n")[0]
+        self.ents = [FakeEntity(first_line, "PERSON")] if first_line else []
+
+
+class FakeNER:
+    """Stands in for the NER-only spaCy pipeline: tags the first header line as a PERSON."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        return FakeDoc(text)
+
+    def pipe(self, texts, n_process=1, batch_size=64):
+        texts = list(texts)
+        self.calls.append((texts, n_process, batch_size))
+        return (FakeDoc(text) for text in texts)
+
+
+class TestParseResumes(unittest.TestCase):
+    def test_batch_runs_ner_once_over_header_regions(self):
+        ner = FakeNER()
+        texts = [TestSectionedResume.TEXT, "", TestSectionedResume.TEXT.replace("Jane Roe", "John Poe")]
+        with patch("packages.agents.resume_parser.resume_parser_agent.get_spacy_ner_model", return_value=ner):
+            results = ResumeParserAgent(None).parse_resumes(texts, n_process=2, batch_size=16)
+        self.assertEqual(len(ner.calls), 1)
+        headers, n_process, batch_size = ner.calls[0]
+        self.assertEqual(headers, ["Jane Roe\njane@example.com", "John Poe\njane@example.com"])
+        self.assertEqual((n_process, batch_size), (2, 16))
+        self.assertIsNone(results[1])
+        self.assertEqual(results[0].personal_details["name"], "Jane Roe")
+        self.assertEqual(results[2].personal_details["name"], "John Poe")
+        self.assertEqual(results[0].skills, results[2].skills)
+
+    def test_leading_blank_lines_are_skipped_before_the_header(self):
+        text = "\n\n" + TestSectionedResume.TEXT.replace("Jane Roe", "JANE ROE")
+        self.assertEqual(resume_utils.resume_header(text), "JANE ROE\njane@example.com")
+        with patch("packages.agents.resume_parser.resume_parser_agent.get_spacy_ner_model", return_value=FakeNER()):
+            result = ResumeParserAgent(None).parse_resume(text)
+        self.assertEqual(result.personal_details["name"], "JANE ROE")
+
+    def test_nltk_fallback_is_opt_in(self):
+        doc = FakeDoc("")
+        with patch("nltk.ne_chunk") as ne_chunk:
+            details = resume_utils.extract_personal_details("jane@example.com", doc=doc)
+        ne_chunk.assert_not_called()
+        self.assertIsNone(details["name"])
+        self.assertEqual(details["email"], "jane@example.com")
+
+
+class TestResumeIngestion(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        doc = Document()
+        for line in TestSectionedResume.TEXT.split("\n"):
+            doc.add_paragraph(line)
+        self.docx_path = os.path.join(self.tmp.name, "jane.docx")
+        doc.save(self.docx_path)
+        self.txt_path = os.path.join(self.tmp.name, "nested", "john.txt")
+        os.makedirs(os.path.dirname(self.txt_path))
+        with open(self.txt_path, "w", encoding="utf-8") as f:
+            f.write(TestSectionedResume.TEXT.replace("Jane Roe", "John Poe"))
+        with open(os.path.join(self.tmp.name, "notes.md"), "w") as f:
+            f.write("ignored")
+
+    def test_extracts_docx_from_path_and_bytes(self):
+        from_path = resume_ingestion.extract_resume_text(self.docx_path)
+        with open(self.docx_path, "rb") as f:
+            from_bytes = resume_ingestion.extract_resume_text(f.read(), filename="upload.docx")
+        self.assertEqual(from_path, TestSectionedResume.TEXT.strip())
+        self.assertEqual(from_bytes, from_path)
+
+    def test_limits_and_formats_are_enforced(self):
+        with self.assertRaises(ResumeTooLargeError):
+            resume_ingestion.extract_resume_text(self.txt_path, max_bytes=10)
+        with self.assertRaises(ValueError):
+            resume_ingestion.extract_resume_text(b"data", filename="resume.odt")
+        self.assertEqual(len(resume_ingestion.extract_resume_text(self.txt_path, max_chars=8)), 8)
+
+    def test_collects_paths_from_directory_and_manifest(self):
+        self.assertEqual(resume_ingestion.collect_resume_paths(self.tmp.name), [self.docx_path, self.txt_path])
+        manifest = os.path.join(self.tmp.name, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("jane.docx\nnested/john.txt\n")
+        self.assertEqual(resume_ingestion.collect_resume_paths(manifest), [self.docx_path, self.txt_path])
+
+    def test_bulk_parse_reports_throughput(self):
+        output = os.path.join(self.tmp.name, "parsed.jsonl")
+        with patch("packages.agents.resume_parser.resume_parser_agent.get_spacy_ner_model", return_value=FakeNER()):
+            stats = resume_ingestion.bulk_parse(self.tmp.name, output, max_workers=1, batch_size=1)
+        self.assertEqual((stats["documents"], stats["parsed"], stats["failed"]), (2, 2, 0))
+        self.assertGreater(stats["docs_per_second"], 0)
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["resume"]["personal_details"]["name"] for r in records], ["Jane Roe", "John Poe"])
+
+    def test_pool_is_rebuilt_for_a_different_worker_count(self):
+        self.addCleanup(resume_ingestion.shutdown_ingestion_pool)
+        two = resume_ingestion.get_ingestion_pool(2)
+        self.assertIs(resume_ingestion.get_ingestion_pool(2), two)
+        three = resume_ingestion.get_ingestion_pool(3)
+        self.assertIsNot(three, two)
+        self.assertEqual(three._max_workers, 3)
+
+
+@pytest.mark.usefixtures("fake_redis")
+class TestResumeParseCache(unittest.TestCase):
+    TEXT = TestSectionedResume.TEXT
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ner = FakeNER()
+        patcher = patch("packages.agents.resume_parser.resume_parser_agent.get_spacy_ner_model", return_value=self.ner)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeat_parse_skips_nlp_and_returns_copies(self):
+        cache = ResumeParseCache(self.tmp.name, version="1")
+        parser = ResumeParserAgent(None, cache=cache)
+        first = parser.parse_resume(self.TEXT)
+        first.skills.append("mutated")
+        second = parser.parse_resume(self.TEXT)
+        self.assertEqual(len(self.ner.calls), 1)
+        self.assertNotIn("mutated", second.skills)
+        self.assertEqual(second.personal_details["name"], "Jane Roe")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), ({"memory": 1}, 1, 0.5))
+
+    def test_disk_tier_survives_restart_and_version_bump_misses(self):
+        ResumeParserAgent(None, cache=ResumeParseCache(self.tmp.name, version="1")).parse_resume(self.TEXT)
+        restarted = ResumeParseCache(self.tmp.name, version="1")
+        self.assertEqual(restarted.get_resume(self.TEXT).skills, ["API", "Go", "PostgreSQL", "Python", "SQL"])
+        self.assertEqual(restarted.stats()["hits"], {"disk": 1})
+        self.assertIsNone(ResumeParseCache(self.tmp.name, version="2").get_resume(self.TEXT))
+
+    def test_redis_tier_is_shared_and_backfills_disk(self):
+        redis = self.fake_redis
+        ResumeParserAgent(None, cache=ResumeParseCache(None, version="1", redis_client=redis)).parse_resume(self.TEXT)
+        other = ResumeParseCache(self.tmp.name, version="1", redis_client=redis)
+        self.assertIsNotNone(other.get_resume(self.TEXT))
+        self.assertEqual(other.stats()["hits"], {"redis": 1})
+        self.assertEqual(other.disk_usage()["1"]["entries"], 1)
+
+    def test_file_parse_is_keyed_by_content(self):
+        doc = Document()
+        for line in self.TEXT.split("\n"):
+            doc.add_paragraph(line)
+        path = os.path.join(self.tmp.name, "jane.docx")
+        doc.save(path)
+        parser = ResumeParserAgent(None, cache=ResumeParseCache(None, version="1"))
+        first = parser.parse_resume_file(path)
+        with patch("packages.agents.resume_parser.resume_parser_agent.extract_text_from_docx") as extract:
+            second = parser.parse_resume_file(path)
+        extract.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_bulk_invalidation(self):
+        redis = self.fake_redis
+        old = ResumeParseCache(self.tmp.name, version="1", redis_client=redis)
+        current = ResumeParseCache(self.tmp.name, version="2", redis_client=redis)
+        for cache in (old, current):
+            ResumeParserAgent(None, cache=cache).parse_resumes([self.TEXT, self.TEXT.replace("Jane", "Joan")])
+        self.assertEqual(current.invalidate_stale(), 4)
+        self.assertEqual(list(current.disk_usage()), ["2"])
+        self.assertIsNotNone(ResumeParseCache(self.tmp.name, version="2", redis_client=redis).get_resume(self.TEXT))
+        self.assertEqual(current.invalidate(), 4)
+        self.assertEqual((current.disk_usage(), redis.data), ({}, {}))
+
+    def test_ensure_version_keeps_current_and_previous_disk_entries(self):
+        redis = self.fake_redis
+        for version in ("1", "2", "3"):
+            cache = ResumeParseCache(self.tmp.name, version=version, redis_client=redis)
+            ResumeParserAgent(None, cache=cache).parse_resume(self.TEXT)
+            cache.ensure_version()
+        self.assertEqual(list(cache.disk_usage()), ["2", "3"])
+        self.assertFalse(ResumeParseCache(self.tmp.name, version="3", redis_client=redis).ensure_version())
+        self.assertEqual(list(cache.disk_usage()), ["2", "3"])
+        self.assertIsNotNone(ResumeParseCache(self.tmp.name, version="3").get_resume(self.TEXT))
+
+
+class TestNLPModelRegistry(unittest.TestCase):
+    def test_resources_load_once_on_first_use(self):
+        loader = MagicMock(return_value=object())
+        nlp_models.register_resource("test:lazy", loader, replace=True)
+        self.assertFalse(nlp_models.is_loaded("test:lazy"))
+        loader.assert_not_called()
+        first = nlp_models.get_resource("test:lazy")
+        self.assertIs(nlp_models.get_resource("test:lazy"), first)
+        loader.assert_called_once()
+
+    def test_warmup_reports_timings_and_survives_failures(self):
+        nlp_models.register_resource("test:ok", lambda: "model", replace=True)
+        nlp_models.register_resource("test:broken", MagicMock(side_effect=OSError("not installed")), replace=True)
+        timings = nlp_models.warmup(["test:broken", "test:ok"])
+        self.assertEqual(list(timings), ["test:ok"])
+        self.assertFalse(nlp_models.is_loaded("test:broken"))
+        with self.assertRaises(OSError):
+            nlp_models.get_resource("test:broken")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,151 @@
+# packages/common_types/records.py
+
+# Compact, immutable records for holding large numbers of jobs in
+# memory (e.g. 500k jobs per matching worker). Records are slotted frozen
+# dataclasses: lists become tuples, nested dicts become tuples of (key, value)
+# pairs, and skills and other low-cardinality strings are interned so every
+# record shares one copy. Convert with ``from_dict``/``to_dict`` at API
+# boundaries; in between, records support read-only mapping access (``get``,
+# ``[]``, ``in``) so dict-based helpers such as the scoring functions accept them.
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+Pairs = Tuple[Tuple[str, Any], ...]
+
+
+def intern_strings(values: Optional[Iterable[Any]]) -> Tuple[str, ...]:
+    """Returns the values as a tuple of interned strings (order and duplicates kept, None dropped)."""
+    if not values:
+        return ()
+    if isinstance(values, str):
+        values = [values]
+    return tuple([sys.intern(str(v)) for v in values if v is not None])
+
+
+def _intern(value: Optional[Any]) -> Optional[str]:
+    return sys.intern(str(value)) if value is not None else None
+
+
+def _pairs(mapping: Optional[Mapping[str, Any]]) -> Pairs:
+    return tuple((sys.intern(str(k)), v) for k, v in mapping.items()) if mapping else ()
+
+
+class _RecordMapping:
+    """Read-only mapping access over a record's fields; None and empty values count as absent."""
+
+    __slots__ = ()
+    _MAPPING_FIELDS: Tuple[str, ...] = ()
+    _INTERNAL_FIELDS: Tuple[str, ...] = ()  # readable with get(), left out of to_dict()
+
+    def _field_value(self, key: str) -> Any:
+        if key in self._MAPPING_FIELDS:
+            return dict(getattr(self, key))
+        value = getattr(self, key)
+        return list(value) if isinstance(value, tuple) else value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_names():
+            value = getattr(self, key)
+            return default if value is None or value == () else self._field_value(key)
+        for extra_key, value in self.extra:
+            if extra_key == key:
+                return value
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key, _ABSENT) is not _ABSENT
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a plain dict (lists and dicts restored); None and empty values are omitted."""
+        data = {}
+        for name in self._field_names():
+            if name != "extra" and name not in self._INTERNAL_FIELDS and getattr(self, name) not in (None, ()):
+                data[name] = self._field_value(name)
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def _field_names(cls) -> Tuple[str, ...]:
+        names = cls.__dict__.get("_names")
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            setattr(cls, "_names", names)
+        return names
+
+
+_ABSENT = object()
+
+
+@dataclass(frozen=True, slots=True)
+class JobRecord(_RecordMapping):
+    """
+    [CONTEXT] Compact in-memory form of a processed job listing.
+    [PURPOSE] Lets matching workers hold hundreds of thousands of jobs; keys other than the
+              fields below are kept in ``extra`` so ``to_dict`` round-trips the listing.
+              ``skill_bits`` (SkillVocabulary bitset of ``required_skills``) and ``location_id``
+              (LocationIndex id of ``location``) are derived at ingest and left out of ``to_dict``.
+    """
+    id: Optional[Any] = None
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    requirements: Optional[str] = None
+    application_url: Optional[str] = None
+    job_type: Optional[str] = None
+    remote: Optional[bool] = None
+    salary: Optional[float] = None
+    growth_potential: Optional[float] = None
+    company_reputation: Optional[float] = None
+    benefits: Optional[float] = None
+    required_skills: Tuple[str, ...] = ()
+    required_experience: Optional[int] = None
+    required_education: Tuple[str, ...] = ()
+    extracted_skills: Tuple[str, ...] = ()
+    experience_level: Optional[str] = None
+    culture: Pairs = ()
+    skill_bits: Optional[int] = None
+    location_id: Optional[int] = None
+    extra: Pairs = ()
+
+    _MAPPING_FIELDS = ("culture",)
+    _INTERNAL_FIELDS = ("skill_bits", "location_id")
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], **overrides: Any) -> "JobRecord":
+        """Builds a record from a job dict; ``overrides`` replace (already cleaned) values of ``data``."""
+        if overrides:
+            data = {**data, **overrides}
+        known = cls._field_names()
+        return cls(
+            id=data.get("id"),
+            title=data.get("title"),
+            company=_intern(data.get("company")),
+            location=_intern(data.get("location")),
+            description=data.get("description"),
+            requirements=data.get("requirements"),
+            application_url=data.get("application_url"),
+            job_type=_intern(data.get("job_type")),
+            remote=data.get("remote"),
+            salary=data.get("salary"),
+            growth_potential=data.get("growth_potential"),
+            company_reputation=data.get("company_reputation"),
+            benefits=data.get("benefits"),
+            required_skills=intern_strings(data.get("required_skills")),
+            required_experience=data.get("required_experience"),
+            required_education=intern_strings(data.get("required_education")),
+            extracted_skills=intern_strings(data.get("extracted_skills")),
+            experience_level=_intern(data.get("experience_level")),
+            culture=_pairs(data.get("culture")),
+            skill_bits=data.get("skill_bits"),
+            location_id=data.get("location_id"),
+            extra=tuple((sys.intern(k), v) for k, v in data.items() if k not in known),
+        )
@@ -0,0 +1,27 @@
+import copy
+import unittest
+
+from packages.common_types.records import JobRecord
+
+
+class TestJobRecord(unittest.TestCase):
+    JOBS = [
+        {"id": 1, "title": "Low Salary", "company": "A", "location": "Remote", "required_skills": ["Python"], "required_experience": 3, "required_education": ["B.S. Computer Science"], "salary": 0.3, "url": "https://a.example"},
+        {"id": 2, "title": "In Range", "company": "B", "location": "Remote USA", "job_type": "Full-time", "required_skills": ["Python", " Java"], "required_experience": 3, "required_education": ["B.S. Computer Science"], "salary": 0.5, "culture": {"work_life_balance": 0.9, "innovation": 0.6}},
+    ]
+
+    def test_record_round_trips_and_interns_skills(self):
+        record = JobRecord.from_dict(self.JOBS[1])
+        other = JobRecord.from_dict(copy.deepcopy(self.JOBS[1]))
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertIs(record.required_skills[1], other.required_skills[1])
+        self.assertEqual(record.required_skills, ("Python", " Java"))
+        self.assertEqual(record.get("culture"), {"work_life_balance": 0.9, "innovation": 0.6})
+        self.assertNotIn("growth_potential", record)
+        self.assertEqual(JobRecord.from_dict(self.JOBS[0]).to_dict(), self.JOBS[0])
+        with self.assertRaises(AttributeError):
+            record.title = "changed"
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import pytest
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the synchronous ``redis.Redis`` commands the caches and stores use.
+    Like a real client without ``decode_responses``, values and members come back as bytes.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    # Strings ------------------------------------------------------------
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def scan_iter(self, match="*", count=None):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.data) if key.startswith(prefix)]
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    # Lists, sorted sets, hashes and sets --------------------------------
+
+    def rpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        items.extend(v.encode() if isinstance(v, str) else v for v in values)
+        return len(items)
+
+    def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        end = len(items) + end if end < 0 else end
+        return items[start:end + 1]
+
+    def ltrim(self, key, start, end):
+        self.data[key] = self.lrange(key, start, end)
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def zrange(self, key, start, end):
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+        end = len(members) + end if end < 0 else end
+        return [m.encode() for m, _ in members[start:end + 1]]
+
+    def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value.encode()
+
+    def hgetall(self, key):
+        return {f.encode(): v for f, v in self.data.get(key, {}).items()}
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return {m.encode() for m in self.data.get(key, set())}
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.data.get(key, {}).pop(member, None)
+        if not self.data.get(key, True):
+            del self.data[key]
+
+    hdel = zrem
+
+    def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+        if not self.data.get(key, True):
+            del self.data[key]
+
+
+class FakePipeline:
+    """
+    Queues commands and runs them on ``execute``, like a MULTI/EXEC pipeline. After ``watch``
+    commands run immediately until ``multi``, as in redis-py.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+        self.watching = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.calls = []
+        self.watching = False
+
+    def __getattr__(self, name):
+        if self.watching:
+            return getattr(self.redis, name)
+        return lambda *args, **kwargs: self.calls.append((getattr(self.redis, name), args, kwargs))
+
+    def watch(self, *keys):
+        self.watching = True
+
+    def multi(self):
+        self.watching = False
+
+    def execute(self):
+        results = [method(*args, **kwargs) for method, args, kwargs in self.calls]
+        self.calls = []
+        return results
+
+
+@pytest.fixture
+def fake_redis(request):
+    """A fresh FakeRedis; unittest test cases marked with ``usefixtures`` get it as ``self.fake_redis``."""
+    redis = FakeRedis()
+    if request.instance is not None:
+        request.instance.fake_redis = redis
+    return redis
@@ -227,6 +227,17 @@ class Skill(Base):
         return f"<Skill(id={self.id}, user_id={self.user_id}, name='{self.name}')>"
 
 
+class SkillVocabularyEntry(Base):
+    __tablename__ = "skill_vocabulary"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # public, bit position in skill bitsets
+    name = Column(String(100), unique=True, nullable=False)  # public, normalized skill name
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<SkillVocabularyEntry(id={self.id}, name='{self.name}')>"
+
+
 class InAppNotification(Base):
     __tablename__ = "in_app_notifications"
 
@@ -0,0 +1,132 @@
+# packages/utilities/ats_benchmarks/score_distribution.py
+
+# Precomputed per-industry ATS score distributions used to turn a raw ATS score
+# into a benchmark percentile. The distributions are built offline from
+# benchmark_data.py and stored as sorted arrays in score_distributions.json;
+# lookups are an O(log n) bisect, so percentiles are a pure function of
+# (score, industry).
+
+import json
+import os
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from packages.utilities.ats_benchmarks.benchmark_data import (
+    EXPECTED_ATS_SCORES,
+    SAMPLE_JOB_DESCRIPTIONS,
+)
+
+DISTRIBUTIONS_PATH = os.path.join(os.path.dirname(__file__), "score_distributions.json")
+DEFAULT_INDUSTRY = "default"
+
+# Below this many samples a distribution is too coarse to rank against, and
+# lookups fall back to the fixed score bands.
+MIN_DISTRIBUTION_SIZE = 20
+
+# (upper bound on the fraction of benchmark scores above ours, label)
+PERCENTILE_BUCKETS: Tuple[Tuple[float, str], ...] = (
+    (0.02, "Top 2%"),
+    (0.05, "Top 5%"),
+    (0.10, "Top 10%"),
+    (0.20, "Top 20%"),
+    (0.30, "Top 30%"),
+    (0.40, "Top 40%"),
+)
+BELOW_LABEL = "Below 40%"
+
+# Fallback score bands (score >= threshold -> label) when no usable distribution exists.
+SCORE_BANDS: Tuple[Tuple[float, str], ...] = (
+    (95, "Top 2%"),
+    (90, "Top 5%"),
+    (80, "Top 10%"),
+    (70, "Top 20%"),
+    (60, "Top 30%"),
+    (50, "Top 40%"),
+)
+
+
+def build_score_distributions() -> Dict[str, List[float]]:
+    """Builds sorted per-industry score arrays from the benchmark data.
+
+    Every benchmark score is added to the default distribution and, when the job
+    description it was assessed against declares an ``industry``, to that
+    industry's distribution as well.
+    """
+    job_industries = {
+        job.get("id"): (job.get("industry") or "").lower()
+        for job in SAMPLE_JOB_DESCRIPTIONS
+        if isinstance(job, dict)
+    }
+    distributions: Dict[str, List[float]] = {DEFAULT_INDUSTRY: []}
+    for (_, job_id), expected in EXPECTED_ATS_SCORES.items():
+        score = float(expected["score"])
+        distributions[DEFAULT_INDUSTRY].append(score)
+        industry = job_industries.get(job_id)
+        if industry:
+            distributions.setdefault(industry, []).append(score)
+    return {industry: sorted(scores) for industry, scores in distributions.items()}
+
+
+def write_score_distributions(path: str = DISTRIBUTIONS_PATH) -> Dict[str, List[float]]:
+    """Builds the distributions and writes them to ``path`` as JSON."""
+    distributions = build_score_distributions()
+    with open(path, "w") as f:
+        json.dump(distributions, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return distributions
+
+
+@lru_cache(maxsize=1)
+def load_score_distributions(path: str = DISTRIBUTIONS_PATH) -> Dict[str, Tuple[float, ...]]:
+    """Loads the precomputed distributions once per process.
+
+    Falls back to building them in memory if the JSON file is missing.
+    """
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        raw = build_score_distributions()
+    return {industry.lower(): tuple(sorted(scores)) for industry, scores in raw.items()}
+
+
+def get_distribution(industry: Optional[str] = None) -> Tuple[float, ...]:
+    """Returns the sorted score array for ``industry``, or the default one."""
+    distributions = load_score_distributions()
+    scores = distributions.get((industry or "").lower(), ())
+    if len(scores) < MIN_DISTRIBUTION_SIZE:
+        scores = distributions.get(DEFAULT_INDUSTRY, ())
+    return scores
+
+
+def fraction_above(score: float, industry: Optional[str] = None) -> Optional[float]:
+    """Fraction of benchmark scores strictly above ``score``.
+
+    Returns None when no distribution has enough samples to rank against.
+    """
+    scores = get_distribution(industry)
+    if len(scores) < MIN_DISTRIBUTION_SIZE:
+        return None
+    return (len(scores) - bisect_right(scores, score)) / len(scores)
+
+
+def percentile_label(score: float, industry: Optional[str] = None) -> str:
+    """Maps an ATS score (0-100) to a benchmark percentile label, deterministically."""
+    above = fraction_above(score, industry)
+    if above is None:
+        for threshold, label in SCORE_BANDS:
+            if score >= threshold:
+                return label
+        return BELOW_LABEL
+    for bound, label in PERCENTILE_BUCKETS:
+        if above <= bound:
+            return label
+    return BELOW_LABEL
+
+
+if __name__ == "__main__":
+    written = write_score_distributions()
+    for name, values in sorted(written.items()):
+        print(f"{name}: {len(values)} scores")
+    print(f"Wrote {DISTRIBUTIONS_PATH}")
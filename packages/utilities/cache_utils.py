@@ -0,0 +1,303 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+__all__ = ["LRUCache", "TwoTierCache", "content_hash", "get_redis_client"]
+
+logger = logging.getLogger(__name__)
+
+if PROMETHEUS_AVAILABLE:
+    cache_hit_counter = Counter(
+        'result_cache_hits_total', 'Result cache hits', ['namespace', 'tier']
+    )
+    cache_miss_counter = Counter(
+        'result_cache_misses_total', 'Result cache misses', ['namespace']
+    )
+    cache_invalidation_counter = Counter(
+        'result_cache_invalidations_total', 'Result cache invalidations', ['namespace']
+    )
+
+_MISSING = object()
+
+
+def content_hash(*parts) -> str:
+    """
+    Returns a sha256 hex digest over the JSON-canonical form of ``parts``.
+    Dicts are serialized with sorted keys, so equal content always hashes equally.
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded LRU cache with per-entry TTLs.
+
+    Args:
+        maxsize (int): Maximum number of entries kept; the least recently used entry is evicted first.
+        ttl (float): Default time-to-live in seconds (None means entries never expire).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class TwoTierCache:
+    """
+    A content-addressed result cache: a bounded in-process LRU in front of an optional Redis client.
+
+    Keys are namespaced and versioned (``<namespace>:<version>:<digest>``), so bumping ``version``
+    makes every older entry unreachable. ``ensure_version`` additionally deletes stale Redis
+    entries the first time a new version is seen, keeping the previous version's entries so old
+    and new workers can share Redis during a rolling deploy. Redis failures are logged and
+    treated as misses.
+    Values are stored in Redis as JSON unless ``dumps``/``loads`` are given. Hits per tier and misses
+    are counted in-process (see ``stats``) and, when prometheus_client is installed, exported.
+
+    Args:
+        namespace (str): Key prefix and metrics label, e.g. "ats".
+        version (str): Version of the code that produces the cached values.
+        maxsize (int): Maximum entries held in the in-process tier.
+        ttl (int): Time-to-live in seconds for both tiers.
+        redis_client: Optional synchronous ``redis.Redis`` client for the shared tier.
+        dumps: Serializer for the Redis tier (value -> str or bytes); defaults to JSON.
+        loads: Deserializer matching ``dumps``.
+    """
+
+    KEPT_VERSIONS = 2  # the current version and the one deployed before it
+
+    def __init__(self, namespace: str, version: str, maxsize: int = 1024, ttl: int = 3600, redis_client=None,
+                 dumps=None, loads=None):
+        self.namespace = namespace
+        self.version = str(version)
+        self.ttl = ttl
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.redis = redis_client
+        self.dumps = dumps or (lambda value: json.dumps(value, default=str))
+        self.loads = loads or json.loads
+        self._hits = {}
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+    def make_key(self, *parts) -> str:
+        return f"{self.namespace}:{self.version}:{content_hash(*parts)}"
+
+    def get(self, key):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._record_hit("memory")
+            return value
+        raw = self._redis_get(key)
+        if raw is not None:
+            value = self.loads(raw)
+            self.memory.set(key, value)
+            self._record_hit("redis")
+            return value
+        self._record_miss()
+        return None
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self._redis_set(key, self.dumps(value))
+
+    def _redis_get(self, key):
+        if self.redis is None:
+            return None
+        try:
+            return self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Redis get failed for cache '{self.namespace}': {e}")
+            return None
+
+    def _redis_set(self, key, raw):
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(key, raw, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Redis set failed for cache '{self.namespace}': {e}")
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, version: str = None) -> int:
+        """
+        Drops cached entries of this namespace. With ``version`` only that version's entries are
+        removed from Redis; otherwise all versions are. Internal keys such as the list of deployed
+        versions are kept. Returns the number of Redis keys deleted.
+        """
+        self.memory.clear()
+        deleted = 0
+        if self.redis is not None:
+            pattern = f"{self.namespace}:{version}:*" if version else f"{self.namespace}:*"
+            internal = f"{self.namespace}:__"
+            try:
+                batch = []
+                for key in self.redis.scan_iter(match=pattern, count=500):
+                    name = key.decode("utf-8") if isinstance(key, bytes) else key
+                    if name.startswith(internal):
+                        continue
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        deleted += self.redis.delete(*batch)
+                        batch = []
+                if batch:
+                    deleted += self.redis.delete(*batch)
+            except Exception as e:
+                logger.warning(f"Redis invalidation failed for cache '{self.namespace}': {e}")
+        if PROMETHEUS_AVAILABLE:
+            cache_invalidation_counter.labels(namespace=self.namespace).inc()
+        logger.info(f"Invalidated cache '{self.namespace}' ({deleted} shared entries removed).")
+        return deleted
+
+    def invalidate_stale(self, keep=()) -> int:
+        """
+        Deletes the Redis entries of every version except the current one and those in ``keep``.
+        Returns the number of Redis keys deleted.
+        """
+        if self.redis is None:
+            return 0
+        live = tuple(f"{self.namespace}:{version}:" for version in (self.version, *keep))
+        internal = f"{self.namespace}:__"
+        deleted = 0
+        try:
+            stale = []
+            for key in self.redis.scan_iter(match=f"{self.namespace}:*", count=500):
+                name = key.decode("utf-8") if isinstance(key, bytes) else key
+                if not name.startswith(live) and not name.startswith(internal):
+                    stale.append(key)
+                if len(stale) >= 500:
+                    deleted += self.redis.delete(*stale)
+                    stale = []
+            if stale:
+                deleted += self.redis.delete(*stale)
+        except Exception as e:
+            logger.warning(f"Redis invalidation failed for cache '{self.namespace}': {e}")
+        return deleted
+
+    def ensure_version(self) -> bool:
+        """
+        Registers ``self.version`` in the namespace's list of deployed versions the first time it
+        is seen, and deletes the Redis entries of all but the last KEPT_VERSIONS of them. Workers
+        of the previous version keep their entries during a rolling deploy, and an old worker
+        restarting mid-deploy changes nothing, since its version is already registered.
+        Returns True if a new version replaced a previously registered one.
+        """
+        if self.redis is None:
+            return False
+        versions_key = f"{self.namespace}:__versions__"
+        try:
+            versions = [v.decode("utf-8") if isinstance(v, bytes) else v for v in self.redis.lrange(versions_key, 0, -1)]
+            if self.version in versions:
+                return False
+            self.redis.rpush(versions_key, self.version)
+        except Exception as e:
+            logger.warning(f"Redis version check failed for cache '{self.namespace}': {e}")
+            return False
+        kept = list(dict.fromkeys(versions))[-(self.KEPT_VERSIONS - 1):] if self.KEPT_VERSIONS > 1 else []
+        if self.invalidate_stale(keep=kept) and PROMETHEUS_AVAILABLE:
+            cache_invalidation_counter.labels(namespace=self.namespace).inc()
+        try:
+            self.redis.ltrim(versions_key, -self.KEPT_VERSIONS, -1)
+        except Exception as e:
+            logger.warning(f"Redis version update failed for cache '{self.namespace}': {e}")
+        return bool(versions)
+
+    def stats(self) -> dict:
+        """Returns this process's hit counts per tier, miss count and overall hit rate."""
+        with self._stats_lock:
+            hits = dict(self._hits)
+            misses = self._misses
+        lookups = sum(hits.values()) + misses
+        return {
+            "namespace": self.namespace,
+            "version": self.version,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(sum(hits.values()) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+    def _record_hit(self, tier: str):
+        with self._stats_lock:
+            self._hits[tier] = self._hits.get(tier, 0) + 1
+        if PROMETHEUS_AVAILABLE:
+            cache_hit_counter.labels(namespace=self.namespace, tier=tier).inc()
+
+    def _record_miss(self):
+        with self._stats_lock:
+            self._misses += 1
+        if PROMETHEUS_AVAILABLE:
+            cache_miss_counter.labels(namespace=self.namespace).inc()
+
+
+def get_redis_client(url: str = None):
+    """
+    Returns a synchronous Redis client for ``url`` (default: the REDIS_URL environment
+    variable), or None if Redis is unavailable. UPSTASH_REDIS_REST_URL is not a fallback: it
+    is an HTTPS REST endpoint, not a Redis protocol URL.
+    """
+    url = url or os.getenv("REDIS_URL")
+    if not url or not REDIS_AVAILABLE:
+        return None
+    try:
+        return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    except Exception as e:
+        logger.warning(f"Could not create Redis client for {url}: {e}")
+        return None
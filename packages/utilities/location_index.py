@@ -0,0 +1,272 @@
+# packages/utilities/location_index.py
+
+# Location normalization index for preference matching.
+#
+# Free-text locations ("San Francisco, CA", "NYC", "Greater Boston Area",
+# "Munchen, Germany") are resolved to canonical place ids from a local
+# gazetteer (data/gazetteer.json: countries, regions and cities with
+# coordinates). Resolution tries, in order:
+#   1. the longest known name or alias at the start of the text
+#      ("new york city", "sf", "bengaluru"), disambiguated by the remaining
+#      parts ("Portland, OR" vs "Portland, ME"; "Cambridge, UK");
+#   2. a trigram index over all names and aliases for misspellings
+#      ("San Fransisco").
+# Results are memoized per text, so each distinct location string is
+# resolved once. Matching two places is then an integer comparison, a
+# containment check against the city's region/country ids, or a lookup in
+# the precomputed set of cities within NEARBY_KM of each other.
+
+import functools
+import json
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+
+__all__ = [
+    "EXACT",
+    "NEARBY",
+    "NO_MATCH",
+    "REGION",
+    "LocationIndex",
+    "Place",
+    "get_location_index",
+    "normalize_location",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER_PATH = os.getenv(
+    "LOCATION_GAZETTEER_PATH", os.path.join(os.path.dirname(__file__), "data", "gazetteer.json")
+)
+NEARBY_KM = 50.0
+FUZZY_THRESHOLD = 0.6
+MAX_MEMOIZED = 65536
+
+# Match levels returned by LocationIndex.match_level, from best to worst.
+EXACT = "exact"  # same place, or the place lies inside the wanted region/country
+NEARBY = "nearby"  # different cities within NEARBY_KM
+REGION = "region"  # same region (state/province), or only the region of a wanted city is known
+NO_MATCH = "none"
+
+# Words that qualify a location without changing the place it refers to.
+_NOISE_WORDS = {"remote", "hybrid", "onsite", "office", "greater", "area", "metro", "metropolitan"}
+_SEPARATORS = re.compile(r"\s*(?:,|/|\||\(|\)|;|\s-\s)\s*")
+
+
+def normalize_location(text: str) -> str:
+    """Lowercases, strips accents and punctuation (keeping commas as separators) and collapses spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace(".", "").replace("'", "").replace("on-site", "onsite")
+    text = _SEPARATORS.sub(",", text)
+    text = re.sub(r"[^\w\s,]", " ", text)
+    parts = [" ".join(w for w in part.split() if w not in _NOISE_WORDS) for part in text.split(",")]
+    return ",".join(p for p in parts if p)
+
+
+def _trigrams(text: str) -> Counter:
+    padded = f"  {text} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _haversine_km(a: "Place", b: "Place") -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.lat, a.lon, b.lat, b.lon))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    id: int
+    name: str
+    kind: str  # "country", "region" or "city"
+    region_id: Optional[int] = None
+    country_id: Optional[int] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+
+
+class LocationIndex:
+    """
+    Gazetteer-backed resolver from location text to place ids.
+
+    Args:
+        gazetteer: {"countries": [...], "regions": [...], "cities": [...]}, see data/gazetteer.json.
+        nearby_km: Cities closer than this are a NEARBY match.
+    """
+
+    def __init__(self, gazetteer: Dict[str, List[Dict]], nearby_km: float = NEARBY_KM):
+        self.places: List[Place] = []
+        self._names: Dict[str, List[int]] = {}  # normalized name or alias -> place ids, in priority order
+        self._qualifiers: Dict[int, FrozenSet[str]] = {}  # place id -> names its region/country go by
+        self.resolve = functools.lru_cache(maxsize=MAX_MEMOIZED)(self._resolve_text)
+
+        countries, regions = {}, {}
+        for entry in gazetteer.get("countries", []):
+            place = self._add(entry["name"], "country", entry.get("aliases", []))
+            countries[entry["code"]] = place
+            self._qualifiers[place.id] = frozenset(self._aliases(entry) | {entry["code"].lower()})
+        for entry in gazetteer.get("regions", []):
+            country = countries.get(entry.get("country"))
+            place = self._add(entry["name"], "region", entry.get("aliases", []), country_id=country.id if country else None)
+            regions[entry["code"]] = place
+            self._qualifiers[place.id] = frozenset(self._aliases(entry)) | (self._qualifiers[country.id] if country else frozenset())
+        for entry in gazetteer.get("cities", []):
+            region, country = regions.get(entry.get("region")), countries.get(entry.get("country"))
+            place = self._add(
+                entry["name"], "city", entry.get("aliases", []),
+                region_id=region.id if region else None, country_id=country.id if country else None,
+                lat=entry.get("lat"), lon=entry.get("lon"),
+            )
+            self._qualifiers[place.id] = (self._qualifiers[region.id] if region else frozenset()) | (
+                self._qualifiers[country.id] if country else frozenset())
+
+        # Cities before regions before countries ("New York" is the city; "CA" alone is California).
+        kind_order = {"city": 0, "region": 1, "country": 2}
+        for ids in self._names.values():
+            ids.sort(key=lambda place_id: kind_order[self.places[place_id].kind])
+        self._nearby = self._nearby_cities(nearby_km)
+        self._trigram_keys = list(self._names)
+        self._trigram_counts = [_trigrams(key) for key in self._trigram_keys]
+        self._trigram_index: Dict[str, List[int]] = {}
+        for i, grams in enumerate(self._trigram_counts):
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(i)
+        self._max_words = max((len(key.split()) for key in self._names), default=1)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_GAZETTEER_PATH, **kwargs) -> "LocationIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    @staticmethod
+    def _aliases(entry: Dict) -> set:
+        return {normalize_location(name) for name in [entry["name"], *entry.get("aliases", [])]}
+
+    def _add(self, name: str, kind: str, aliases: List[str], **fields) -> Place:
+        place = Place(id=len(self.places), name=name, kind=kind, **fields)
+        self.places.append(place)
+        for key in self._aliases({"name": name, "aliases": aliases}):
+            self._names.setdefault(key, []).append(place.id)
+        return place
+
+    def _nearby_cities(self, nearby_km: float) -> Dict[int, FrozenSet[int]]:
+        cities = [p for p in self.places if p.kind == "city" and p.lat is not None and p.lon is not None]
+        nearby: Dict[int, set] = {p.id: set() for p in cities}
+        for i, a in enumerate(cities):
+            for b in cities[i + 1:]:
+                if _haversine_km(a, b) <= nearby_km:
+                    nearby[a.id].add(b.id)
+                    nearby[b.id].add(a.id)
+        return {place_id: frozenset(ids) for place_id, ids in nearby.items()}
+
+    # Resolution ---------------------------------------------------------
+
+    def _resolve_text(self, text: Optional[str]) -> Optional[int]:
+        """Place id for a location text (None if unknown); memoized per instance as ``resolve``."""
+        return self._resolve(normalize_location(text)) if text else None
+
+    def _resolve(self, normalized: str) -> Optional[int]:
+        if not normalized:
+            return None
+        parts = normalized.split(",")
+        words = parts[0].split()
+        candidates, qualifiers = None, parts[1:]
+        for n in range(min(len(words), self._max_words), 0, -1):
+            candidates = self._names.get(" ".join(words[:n]))
+            if candidates:
+                if n < len(words):
+                    qualifiers = [" ".join(words[n:])] + qualifiers
+                break
+        else:
+            fuzzy = self._fuzzy_key(parts[0])
+            candidates = self._names[fuzzy] if fuzzy else None
+        qualifiers = [q for q in qualifiers if q]
+        if candidates:
+            picked = self._pick(candidates, qualifiers)
+            if picked is not None:
+                return picked
+        # Unknown city or a qualifier naming another region ("Portland, ME", "London, ON"):
+        # fall back to the place the qualifiers name.
+        fallback = self._resolve(",".join(qualifiers)) if qualifiers else None
+        if fallback is None and candidates:
+            return candidates[0]
+        return fallback
+
+    def _pick(self, candidates: List[int], qualifiers: List[str]) -> Optional[int]:
+        """First candidate whose region/country goes by every qualifier; None if none does."""
+        if not qualifiers:
+            return candidates[0]
+        for place_id in candidates:
+            known = self._qualifiers.get(place_id, frozenset())
+            if all(q in known or all(w in known for w in q.split()) for q in qualifiers):
+                return place_id
+        return None
+
+    def _fuzzy_key(self, text: str) -> Optional[str]:
+        """Best name/alias by trigram Dice similarity, if it reaches FUZZY_THRESHOLD."""
+        query = _trigrams(text)
+        shared: Counter = Counter()
+        for gram, count in query.items():
+            for i in self._trigram_index.get(gram, ()):
+                shared[i] += min(count, self._trigram_counts[i][gram])
+        total = sum(query.values())
+        best, best_score = None, FUZZY_THRESHOLD
+        for i, common in shared.items():
+            score = 2 * common / (total + sum(self._trigram_counts[i].values()))
+            if score >= best_score:
+                best, best_score = self._trigram_keys[i], score
+        return best
+
+    # Matching -----------------------------------------------------------
+
+    def contains(self, outer: int, inner: int) -> bool:
+        place = self.places[inner]
+        return outer in (place.region_id, place.country_id)
+
+    def nearby(self, place_id: int) -> FrozenSet[int]:
+        """Cities within ``nearby_km`` of a city (empty for regions and countries)."""
+        return self._nearby.get(place_id, frozenset())
+
+    def distance_km(self, a: int, b: int) -> Optional[float]:
+        pa, pb = self.places[a], self.places[b]
+        if None in (pa.lat, pa.lon, pb.lat, pb.lon):
+            return None
+        return _haversine_km(pa, pb)
+
+    def match_level(self, wanted: Optional[int], place: Optional[int]) -> str:
+        """How well ``place`` (a job's location) satisfies ``wanted`` (a preferred location)."""
+        if wanted is None or place is None:
+            return NO_MATCH
+        if wanted == place or self.contains(wanted, place):
+            return EXACT
+        if place in self._nearby.get(wanted, ()):
+            return NEARBY
+        wanted_region = self.places[wanted].region_id
+        if self.contains(place, wanted) or (wanted_region is not None and wanted_region == self.places[place].region_id):
+            return REGION
+        return NO_MATCH
+
+
+_index: Optional[LocationIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_location_index() -> LocationIndex:
+    """Returns the process-wide index, loading the gazetteer on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocationIndex.from_file()
+                logger.info(f"Loaded location gazetteer with {len(_index)} places.")
+    return _index
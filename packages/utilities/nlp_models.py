@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+__all__ = [
+    "register_resource", "get_resource", "is_loaded", "warmup", "get_spacy_model", "get_spacy_ner_model", "SPACY_MODEL",
+]
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# Set NLP_WARMUP=false to skip eager loading in FastAPI lifespans (e.g. in tests)
+WARMUP_ENABLED = os.getenv("NLP_WARMUP", "true").lower() in ("1", "true", "yes")
+
+# Pipeline components not needed for named-entity recognition; excluded from NER-only pipelines
+NON_NER_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer"]
+
+_loaders: Dict[str, Callable[[], Any]] = {}
+_resources: Dict[str, Any] = {}
+_lock = threading.RLock()  # re-entrant: a loader may itself call get_resource
+
+
+def register_resource(name: str, loader: Callable[[], Any], replace: bool = False) -> None:
+    """
+    Registers a zero-argument ``loader`` for the resource ``name``. Nothing is loaded until
+    ``get_resource(name)`` or ``warmup`` is called.
+    """
+    with _lock:
+        if name in _loaders and not replace:
+            return
+        _loaders[name] = loader
+        _resources.pop(name, None)
+
+
+def get_resource(name: str) -> Any:
+    """Returns the process-wide instance of ``name``, loading it on first use."""
+    resource = _resources.get(name)
+    if resource is not None:
+        return resource
+    with _lock:
+        if name not in _resources:
+            if name not in _loaders:
+                raise KeyError(f"Unknown NLP resource: {name}")
+            started = time.perf_counter()
+            _resources[name] = _loaders[name]()
+            logger.info(f"Loaded NLP resource '{name}' in {time.perf_counter() - started:.2f}s.")
+        return _resources[name]
+
+
+def is_loaded(name: str) -> bool:
+    return name in _resources
+
+
+def warmup(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Loads the given resources (default: all registered ones) ahead of the first request and
+    returns the load time of each in seconds. Failures are logged, not raised: the service
+    still starts and the resource is retried, and raises, on first use.
+    """
+    timings = {}
+    for name in list(names) if names is not None else list(_loaders):
+        started = time.perf_counter()
+        try:
+            get_resource(name)
+        except Exception as e:
+            logger.error(f"Warmup of NLP resource '{name}' failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def _load_spacy(model_name: str, exclude: Optional[List[str]] = None):
+    import spacy
+    try:
+        return spacy.load(model_name, exclude=exclude or [])
+    except OSError as e:
+        raise OSError(
+            f"spaCy model '{model_name}' is not installed; install it at build time "
+            f"with `python -m spacy download {model_name}`."
+        ) from e
+
+
+def get_spacy_model(model_name: str = SPACY_MODEL):
+    """Returns the shared spaCy pipeline ``model_name``, loading it on first use."""
+    name = f"spacy:{model_name}"
+    if name not in _loaders:
+        register_resource(name, lambda: _load_spacy(model_name))
+    return get_resource(name)
+
+
+def get_spacy_ner_model(model_name: str = SPACY_MODEL):
+    """
+    Returns a shared pipeline of ``model_name`` with only the components NER needs
+    (tokenizer, tok2vec, ner); much faster per document than the full pipeline.
+    """
+    name = f"spacy-ner:{model_name}"
+    if name not in _loaders:
+        register_resource(name, lambda: _load_spacy(model_name, exclude=NON_NER_COMPONENTS))
+    return get_resource(name)
+
+
+def _load_embedding_model():
+    from packages.utilities.vector_matching.embedding_generator import get_embedding_model
+    return get_embedding_model()
+
+
+register_resource(f"spacy:{SPACY_MODEL}", lambda: _load_spacy(SPACY_MODEL))
+register_resource(f"spacy-ner:{SPACY_MODEL}", lambda: _load_spacy(SPACY_MODEL, exclude=NON_NER_COMPONENTS))
+register_resource("embeddings", _load_embedding_model)
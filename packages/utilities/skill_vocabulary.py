@@ -0,0 +1,292 @@
+# packages/utilities/skill_vocabulary.py
+
+# Process-wide vocabulary of normalized skill names with integer ids.
+#
+# Every skill (and every taxonomy parent such as "devops" or "programming")
+# gets a stable id, so a set of skills becomes a bitset held in a Python int:
+# bit i is set when the skill with id i is present. Intersections, missing
+# skills and coverage are then single & / & ~ operations plus a popcount
+# (int.bit_count) instead of building and comparing string sets per call.
+#
+# Ids are append-only and never change within a process, so bitsets held in
+# JobRecords and matcher indexes stay valid. They are persisted in the
+# ``skill_vocabulary`` table: a process that loads the table at startup
+# (``load_skill_vocabulary``) before encoding anything uses the saved ids, so
+# API and matching workers agree on them. Names first seen locally are
+# "pending" until ``save`` writes them; ``refresh`` pulls names other
+# processes saved since. A name two processes first saw concurrently can
+# have a different local id in each until they restart.
+#
+# Only the taxonomy and job ``required_skills`` at ingest register names
+# (``add=True``). Query paths (user profiles, ATS requests) encode with the
+# default ``add=False``: unknown names get no bit, so request data cannot grow
+# the vocabulary, the table or the width of every bitset.
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+__all__ = [
+    "MAX_SKILL_LENGTH",
+    "SKILL_TAXONOMY",
+    "SkillVocabulary",
+    "get_skill_vocabulary",
+    "load_skill_vocabulary",
+    "normalize_skill",
+    "popcount",
+]
+
+logger = logging.getLogger(__name__)
+
+MAX_SKILL_LENGTH = 100  # skill_vocabulary.name is a String(100)
+
+# Skill -> broader categories, used for hierarchical matching (expand).
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "Python": ["Programming", "Scripting"],
+    "JavaScript": ["Programming", "Frontend"],
+    "Django": ["Python", "Web Framework"],
+    "React": ["JavaScript", "Frontend"],
+    "AWS": ["Cloud", "DevOps"],
+    "Docker": ["DevOps"],
+    "Kubernetes": ["DevOps"],
+    # ... add more as needed
+}
+
+
+def normalize_skill(skill: str) -> str:
+    """Lower-cased, stripped name, truncated to MAX_SKILL_LENGTH so it fits the table."""
+    return skill.strip().lower()[:MAX_SKILL_LENGTH].rstrip()
+
+
+def popcount(bits: int) -> int:
+    """Number of skills in a bitset."""
+    return bits.bit_count()
+
+
+class SkillVocabulary:
+    """
+    Thread-safe, append-only mapping of normalized skill names to bit positions.
+
+    Args:
+        taxonomy: Skill -> parent categories; every name in it is registered up front and
+            ``expand`` adds the parents' bits to a bitset.
+        db: Optional database session; the saved ids are loaded before the taxonomy is
+            registered, so taxonomy names get their saved ids too.
+    """
+
+    def __init__(self, taxonomy: Optional[Mapping[str, Sequence[str]]] = None, db=None):
+        self._lock = threading.RLock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._parent_bits: Dict[int, int] = {}
+        self._saved_rows = 0  # rows of the skill_vocabulary table loaded so far
+        self._unsaved: Dict[str, None] = {}  # local names not in the table, in id order
+        if db is not None:
+            self.refresh(db)
+        self._taxonomy = {
+            normalize_skill(skill): [normalize_skill(p) for p in parents]
+            for skill, parents in (taxonomy or {}).items()
+        }
+        for skill, parents in self._taxonomy.items():
+            self.add([skill, *parents])
+        self._rebuild_parents()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, skill: str) -> bool:
+        return normalize_skill(skill) in self._ids
+
+    @property
+    def pending(self) -> List[str]:
+        """Names added in this process that are not yet saved to the database."""
+        return list(self._unsaved)
+
+    def id_of(self, skill: str, add: bool = False) -> Optional[int]:
+        """Returns the id of a skill; an unknown skill is registered with ``add``, else None."""
+        name = normalize_skill(skill)
+        skill_id = self._ids.get(name)
+        if skill_id is None and add:
+            with self._lock:
+                skill_id = self._ids.get(name)
+                if skill_id is None:
+                    skill_id = self._append(name)
+                    self._unsaved[name] = None
+        return skill_id
+
+    def _append(self, name: str) -> int:
+        skill_id = len(self._names)
+        self._names.append(name)
+        self._ids[name] = skill_id
+        return skill_id
+
+    def add(self, skills: Iterable[str]) -> List[int]:
+        return [self.id_of(skill, add=True) for skill in skills]
+
+    def name_of(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def encode(self, skills: Iterable[str], expand: bool = False, add: bool = False) -> int:
+        """
+        Returns the bitset of ``skills``; with ``expand`` the taxonomy parents are included.
+        Unknown skills are registered with ``add`` (ingest only) and left out otherwise.
+        """
+        bits = 0
+        for skill in skills:
+            skill_id = self.id_of(skill, add)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return self.expand(bits) if expand else bits
+
+    def unknown(self, skills: Iterable[str]) -> Set[str]:
+        """Normalized names of the skills that have no id (and so no bit in ``encode``)."""
+        return {name for name in map(normalize_skill, skills) if name not in self._ids}
+
+    def expand(self, bits: int) -> int:
+        """Adds the bits of every taxonomy parent of the skills in ``bits``."""
+        expanded = bits
+        for skill_id, parents in self._parent_bits.items():
+            if bits >> skill_id & 1:
+                expanded |= parents
+        return expanded
+
+    def decode(self, bits: int) -> List[str]:
+        """Returns the normalized names in a bitset, in id order."""
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self._names[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def select(self, skills: Iterable[str], bits: int) -> List[str]:
+        """Returns the skills (original spelling, first occurrence per name) whose bit is set in ``bits``."""
+        selected = []
+        for skill in skills:
+            skill_id = self.id_of(skill)
+            if skill_id is None:
+                continue
+            bit = 1 << skill_id
+            if bits & bit:
+                selected.append(skill)
+                bits &= ~bit
+        return selected
+
+    def match(self, required: Iterable[str], available: Iterable[str]) -> Tuple[float, List[str]]:
+        """
+        Coverage of the ``required`` skills by the ``available`` ones and the missing required
+        skills (original spelling, first occurrence per name), for skill lists that must not be
+        registered (requests, profiles). A name without an id only matches the same name.
+        """
+        available_bits, available_unknown = self.encode(available), self.unknown(available)
+        missing: List[str] = []
+        seen: Set[str] = set()
+        for skill in required:
+            name = normalize_skill(skill)
+            if name in seen:
+                continue
+            seen.add(name)
+            skill_id = self._ids.get(name)
+            if not (available_bits >> skill_id & 1 if skill_id is not None else name in available_unknown):
+                missing.append(skill)
+        return ((len(seen) - len(missing)) / len(seen) if seen else 0.0), missing
+
+    @staticmethod
+    def coverage(required: int, available: int) -> float:
+        """Fraction of the required skills present in ``available`` (0.0 when nothing is required)."""
+        total = required.bit_count()
+        return (required & available).bit_count() / total if total else 0.0
+
+    @staticmethod
+    def missing(required: int, available: int) -> int:
+        return required & ~available
+
+    def _rebuild_parents(self) -> None:
+        self._parent_bits = {
+            self._ids[skill]: self.encode(parents) for skill, parents in self._taxonomy.items()
+        }
+
+    # Persistence --------------------------------------------------------
+
+    def refresh(self, db) -> int:
+        """
+        Loads names other processes saved since the last refresh. Existing ids never change:
+        unknown names are appended, and names this process already knows keep their id.
+        Returns the number of rows loaded.
+        """
+        from packages.database.models import SkillVocabularyEntry
+
+        rows = (
+            db.query(SkillVocabularyEntry.id, SkillVocabularyEntry.name)
+            .filter(SkillVocabularyEntry.id >= self._saved_rows)
+            .order_by(SkillVocabularyEntry.id)
+            .all()
+        )
+        with self._lock:
+            for row_id, name in rows:
+                if row_id != self._saved_rows:
+                    raise ValueError(f"skill_vocabulary ids are not contiguous at {row_id}")
+                if name not in self._ids:
+                    self._append(name)
+                self._unsaved.pop(name, None)
+                self._saved_rows += 1
+        return len(rows)
+
+    def save(self, db) -> int:
+        """Refreshes, then writes pending names to the database. Returns the number saved."""
+        from sqlalchemy.exc import IntegrityError
+        from packages.database.models import SkillVocabularyEntry
+
+        for attempt in range(3):
+            self.refresh(db)
+            with self._lock:
+                start, pending = self._saved_rows, self.pending
+                if not pending:
+                    return 0
+                db.add_all(SkillVocabularyEntry(id=start + i, name=name) for i, name in enumerate(pending))
+                try:
+                    db.commit()
+                except IntegrityError:  # another process saved rows first
+                    db.rollback()
+                    logger.info("Skill vocabulary changed concurrently; retrying save.")
+                    continue
+                self._saved_rows = start + len(pending)
+                for name in pending:
+                    self._unsaved.pop(name, None)
+            return len(pending)
+        raise RuntimeError("Could not save the skill vocabulary after 3 attempts")
+
+
+_vocabulary: Optional[SkillVocabulary] = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary() -> SkillVocabulary:
+    """Returns the process-wide vocabulary (seeded with SKILL_TAXONOMY)."""
+    global _vocabulary
+    if _vocabulary is None:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                _vocabulary = SkillVocabulary(SKILL_TAXONOMY)
+    return _vocabulary
+
+
+def load_skill_vocabulary(db) -> SkillVocabulary:
+    """
+    Loads the saved ids into the process-wide vocabulary and saves the names the table lacks.
+    Call at startup, before anything is encoded, so this process uses the shared ids; a
+    vocabulary already in use is refreshed instead. Database errors are logged and the
+    vocabulary keeps working with local ids.
+    """
+    from sqlalchemy.exc import SQLAlchemyError
+
+    global _vocabulary
+    try:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                _vocabulary = SkillVocabulary(SKILL_TAXONOMY, db=db)
+        _vocabulary.save(db)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning(f"Could not load the skill vocabulary, using local ids: {e}")
+    return get_skill_vocabulary()
@@ -0,0 +1,39 @@
+import unittest
+
+from packages.utilities.location_index import EXACT, NEARBY, NO_MATCH, REGION, get_location_index
+
+
+class TestLocationIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = get_location_index()
+
+    def name(self, text):
+        place_id = self.index.resolve(text)
+        return None if place_id is None else self.index.places[place_id].name
+
+    def test_resolves_aliases_qualifiers_and_misspellings(self):
+        self.assertEqual(self.name("NYC"), "New York")
+        self.assertEqual(self.name("New York, NY"), "New York")
+        self.assertEqual(self.name("NY"), "New York")  # the state
+        self.assertEqual(self.index.places[self.index.resolve("NY")].kind, "region")
+        self.assertEqual(self.name("Hybrid - Austin"), "Austin")
+        self.assertEqual(self.name("Chicago, IL USA"), "Chicago")
+        self.assertEqual(self.name("München, Germany"), "Munich")
+        self.assertEqual(self.name("San Fransisco"), "San Francisco")
+        self.assertEqual(self.index.places[self.index.resolve("Cambridge, UK")].country_id, self.index.resolve("UK"))
+        self.assertEqual(self.name("Portland, ME"), "Maine")  # unknown city falls back to its region
+        self.assertIsNone(self.index.resolve("Remote"))
+        self.assertIsNone(self.index.resolve(""))
+
+    def test_match_levels(self):
+        r = self.index.resolve
+        self.assertEqual(self.index.match_level(r("San Francisco"), r("SF, CA")), EXACT)
+        self.assertEqual(self.index.match_level(r("California"), r("San Jose, CA")), EXACT)
+        self.assertEqual(self.index.match_level(r("San Francisco"), r("Oakland, CA")), NEARBY)
+        self.assertEqual(self.index.match_level(r("San Jose"), r("Los Angeles")), REGION)
+        self.assertEqual(self.index.match_level(r("Austin"), r("Berlin")), NO_MATCH)
+        self.assertEqual(self.index.match_level(None, r("Berlin")), NO_MATCH)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from packages.database.config import Base
+from packages.database.models import SkillVocabularyEntry
+from packages.utilities import skill_vocabulary
+from packages.utilities.skill_vocabulary import SKILL_TAXONOMY, SkillVocabulary, get_skill_vocabulary, popcount
+
+
+class TestSkillVocabulary(unittest.TestCase):
+    def setUp(self):
+        self.vocabulary = SkillVocabulary(SKILL_TAXONOMY)
+
+    def session_factory(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[SkillVocabularyEntry.__table__])
+        return sessionmaker(bind=engine)
+
+    def test_bitset_operations_match_set_semantics(self):
+        job = self.vocabulary.encode(["Python", " SQL", "Go"], add=True)
+        user = self.vocabulary.encode(["python", "Go", "Rust"])
+        self.assertEqual(popcount(job), 3)
+        self.assertEqual(self.vocabulary.decode(job & user), ["python", "go"])
+        self.assertAlmostEqual(SkillVocabulary.coverage(job, user), 2 / 3)
+        self.assertEqual(self.vocabulary.select(["Python", " SQL", "Go"], SkillVocabulary.missing(job, user)), [" SQL"])
+        self.assertEqual(SkillVocabulary.coverage(0, user), 0.0)
+
+    def test_only_ingest_registers_names(self):
+        pending = self.vocabulary.pending
+        self.assertEqual(self.vocabulary.encode(["Terraform", "Python"]), self.vocabulary.encode(["Python"]))
+        self.assertIsNone(self.vocabulary.id_of("Terraform"))
+        self.assertEqual(self.vocabulary.pending, pending)
+        self.assertEqual(self.vocabulary.unknown(["Terraform ", "python"]), {"terraform"})
+        self.assertEqual(self.vocabulary.id_of("x" * 500, add=True), self.vocabulary.id_of("X" * 100))
+        self.assertEqual(self.vocabulary.pending, pending + ["x" * 100])  # fits skill_vocabulary.name
+
+    def test_match_counts_unknown_required_skills(self):
+        coverage, missing = self.vocabulary.match(["Python", "Terraform", "Ansible", "python"], ["python", "terraform", "Rust"])
+        self.assertAlmostEqual(coverage, 2 / 3)
+        self.assertEqual(missing, ["Ansible"])
+        self.assertEqual(self.vocabulary.match([], ["Python"]), (0.0, []))
+        self.assertNotIn("ansible", self.vocabulary)
+
+    def test_expand_adds_taxonomy_parents(self):
+        bits = self.vocabulary.encode(["Django", "Docker"], expand=True)
+        self.assertEqual(set(self.vocabulary.decode(bits)), {"django", "python", "web framework", "docker", "devops"})
+
+    def test_save_and_refresh_share_ids_across_processes(self):
+        Session = self.session_factory()
+        first, second = SkillVocabulary(SKILL_TAXONOMY), SkillVocabulary(SKILL_TAXONOMY)
+        first.add(["Rust", "Kafka"])
+        second.add(["Terraform", "Kafka"])
+        bits = second.encode(["Terraform", "Kafka"])
+        with Session() as session:
+            self.assertEqual(first.save(session), len(first))
+            self.assertEqual(first.pending, [])
+            self.assertEqual(second.save(session), 1)  # only terraform is new
+            self.assertEqual(first.refresh(session), 1)
+            restarted = SkillVocabulary(SKILL_TAXONOMY, db=session)
+        self.assertEqual(second.encode(["terraform", "kafka"]), bits)  # pending ids are kept
+        self.assertEqual([first.name_of(i) for i in range(len(first))], [restarted.name_of(i) for i in range(len(restarted))])
+        self.assertEqual(restarted.pending, [])
+        self.assertEqual(second.expand(second.encode(["AWS"])), second.encode(["AWS", "Cloud", "DevOps"]))
+
+    def test_load_skill_vocabulary_uses_saved_ids(self):
+        Session = self.session_factory()
+        with Session() as session:
+            session.add(SkillVocabularyEntry(id=0, name="kafka"))
+            session.commit()
+            with mock.patch.object(skill_vocabulary, "_vocabulary", None):
+                vocabulary = skill_vocabulary.load_skill_vocabulary(session)
+                self.assertIs(get_skill_vocabulary(), vocabulary)
+            self.assertEqual(vocabulary.id_of("Kafka"), 0)
+            self.assertEqual(vocabulary.pending, [])
+            self.assertEqual(session.query(SkillVocabularyEntry).count(), len(vocabulary))
+
+
+if __name__ == '__main__':
+    unittest.main()
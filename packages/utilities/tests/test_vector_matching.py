@@ -0,0 +1,184 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from packages.utilities.vector_matching import embedding_generator
+from packages.utilities.vector_matching.embedding_store import EmbeddingStore
+from packages.utilities.vector_matching.micro_batcher import MicroBatchEncoder
+from packages.utilities.vector_matching.vector_matcher import JobVectorIndex
+
+
+class TestEmbeddingStore(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def test_round_trip_through_disk(self):
+        writer = EmbeddingStore("test-model", "1", root=self.root, max_memory_items=2)
+        vectors = np.random.rand(1500, 8).astype(np.float32)
+        texts = [f"job {i}" for i in range(1500)]
+        writer.put_many(texts, vectors)
+        reader = EmbeddingStore("test-model", "1", root=self.root, read_only=True)
+        self.assertEqual(len(reader), 1500)
+        np.testing.assert_allclose(reader.get("job 1499"), vectors[1499])
+        self.assertIsNone(reader.get("unknown job"))
+
+    def test_reader_follows_arena_grown_by_writer(self):
+        writer = EmbeddingStore("test-model", "1", root=self.root)
+        vectors = np.random.rand(1050, 8).astype(np.float32)
+        writer.put_many([f"n{i}" for i in range(1000)], vectors[:1000])
+        reader = EmbeddingStore("test-model", "1", root=self.root, read_only=True)
+        np.testing.assert_allclose(reader.get("n0"), vectors[0])
+        writer.put_many([f"n{i}" for i in range(1000, 1050)], vectors[1000:])
+        np.testing.assert_allclose(reader.get("n1010"), vectors[1010])
+        other_writer = EmbeddingStore("test-model", "1", root=self.root)
+        other_writer.put_many(["late"], np.ones((1, 8)))
+        np.testing.assert_allclose(reader.get("late"), np.ones(8))
+
+    def test_memory_tier_is_bounded(self):
+        store = EmbeddingStore("test-model", "1", root=None, max_memory_items=2)
+        store.put_many(["a", "b", "c"], np.ones((3, 4)))
+        self.assertEqual(len(store.memory), 2)
+        self.assertIsNone(store.get("a"))
+
+    def test_model_version_isolates_vectors(self):
+        EmbeddingStore("test-model", "1", root=self.root).put("text", np.ones(4))
+        newer = EmbeddingStore("test-model", "2", root=self.root)
+        self.assertIsNone(newer.get("text"))
+
+
+class TestMicroBatchEncoder(unittest.TestCase):
+
+    def test_concurrent_requests_share_one_encode_call(self):
+        calls = []
+
+        def encode(texts):
+            calls.append(list(texts))
+            return np.array([[len(t), i] for i, t in enumerate(texts)], dtype=np.float32)
+
+        async def run():
+            encoder = MicroBatchEncoder(encode, max_batch_size=100, max_wait=0.05)
+            results = await asyncio.gather(
+                encoder.encode_many(["a", "bb"]),
+                encoder.encode_many(["ccc"]),
+                encoder.encode_many(["dddd", "eeeee"]),
+            )
+            await encoder.close()
+            return results
+
+        first, second, third = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first[:, 0].tolist(), [1, 2])
+        self.assertEqual(second[:, 0].tolist(), [3])
+        self.assertEqual(third[:, 0].tolist(), [4, 5])
+
+    def test_batches_are_capped(self):
+        calls = []
+
+        def encode(texts):
+            calls.append(len(texts))
+            return np.zeros((len(texts), 2), dtype=np.float32)
+
+        async def run():
+            encoder = MicroBatchEncoder(encode, max_batch_size=3, max_wait=0.01)
+            result = await encoder.encode_many([str(i) for i in range(7)])
+            await encoder.close()
+            return result
+
+        self.assertEqual(asyncio.run(run()).shape, (7, 2))
+        self.assertEqual(calls, [3, 3, 1])
+
+    def test_close_fails_waiting_callers(self):
+        started = threading.Event()
+
+        def encode(texts):
+            started.set()
+            time.sleep(0.1)
+            return np.zeros((len(texts), 2), dtype=np.float32)
+
+        async def run():
+            encoder = MicroBatchEncoder(encode, max_batch_size=2, max_wait=0)
+            pending = asyncio.ensure_future(encoder.encode_many([str(i) for i in range(5)]))
+            await asyncio.to_thread(started.wait)
+            await encoder.close()
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(pending, 1)
+            return await encoder.encode_many(["after"])
+
+        self.assertEqual(asyncio.run(run()).shape, (1, 2))
+
+
+class TestJobVectorIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.vectors = rng.normal(size=(500, 16)).astype(np.float32)
+        self.ids = [f"job-{i}" for i in range(500)]
+        self.query = rng.normal(size=16).astype(np.float32)
+        self.index = JobVectorIndex(16, initial_capacity=8)
+        self.index.upsert(self.ids, self.vectors)
+
+    def brute_force(self, ids, vectors, k):
+        normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = normed @ (self.query / np.linalg.norm(self.query))
+        return [ids[i] for i in np.argsort(-scores)[:k]]
+
+    def test_search_matches_brute_force(self):
+        result = self.index.search(self.query, k=10)
+        self.assertEqual([job_id for job_id, _ in result], self.brute_force(self.ids, self.vectors, 10))
+        self.assertEqual(len(self.index.search(self.query, k=1000)), 500)
+
+    def test_incremental_remove_and_upsert(self):
+        top = self.brute_force(self.ids, self.vectors, 3)
+        self.assertEqual(self.index.remove(top[:2] + ["unknown"]), 2)
+        self.assertEqual(len(self.index), 498)
+        self.assertEqual(self.index.search(self.query, k=1)[0][0], top[2])
+        self.index.upsert(["job-new"], [self.query])
+        job_id, score = self.index.search(self.query, k=1)[0]
+        self.assertEqual(job_id, "job-new")
+        self.assertAlmostEqual(score, 1.0, places=5)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            self.index.save(path)
+            with np.load(path, allow_pickle=False) as data:
+                self.assertEqual(data["ids"].dtype.kind, "U")
+            loaded = JobVectorIndex.load(path)
+        self.assertEqual(loaded.search(self.query, k=5), self.index.search(self.query, k=5))
+
+
+class TestEmbeddingGenerator(unittest.TestCase):
+
+    class FakeModel:
+        def encode(self, texts, batch_size, convert_to_numpy, show_progress_bar):
+            return np.arange(len(texts) * 4, dtype=np.float64).reshape(len(texts), 4)[:, ::-1]
+
+    def test_generators_share_one_lazily_loaded_model(self):
+        loads = []
+
+        def load(*args):
+            loads.append(args)
+            return self.FakeModel()
+
+        with mock.patch.object(embedding_generator, "_load_model", side_effect=load), \
+                mock.patch.dict(embedding_generator._models, clear=True):
+            first = embedding_generator.EmbeddingGenerator("fake-model")
+            second = embedding_generator.EmbeddingGenerator("fake-model", batch_size=8)
+            self.assertEqual(loads, [])
+            vectors = first.generate_embeddings_batch(["a", "b", "c"])
+            second.generate_embedding("d")
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(vectors.shape, (3, 4))
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertTrue(vectors.flags["C_CONTIGUOUS"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,32 +1,151 @@
 # packages/utilities/vector_matching/embedding_generator.py
 
-# This file would contain functions to generate embeddings for text (e.g., resume content, job descriptions)
-# using pre-trained models like Sentence-BERT, Word2Vec, or custom transformers.
+# Generates embeddings for text (e.g., resume content, job descriptions) with a
+# Sentence-BERT model. Models are loaded lazily, once per process, through a
+# shared registry: every EmbeddingGenerator (and every module using one) with
+# the same settings encodes through the same in-memory copy of the weights.
+
+import importlib.util
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from typing import List
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# Model shared by every embedding consumer; the version tags persisted vectors
+# (see embedding_store.py) and must be bumped when weights or preprocessing change.
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_EMBEDDING_MODEL_VERSION = "1"
+
+# Inference settings, overridable per process through the environment.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch" or "onnx"
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "false").lower() in ("1", "true", "yes")
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0")) or None  # None keeps the library default
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# Quantized ONNX export used when backend="onnx" and quantize=True
+EMBEDDING_ONNX_QUANTIZED_FILE = os.getenv("EMBEDDING_ONNX_QUANTIZED_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+
+# Checked without importing: importing sentence_transformers pulls in torch and takes seconds.
+EMBEDDINGS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+ModelKey = Tuple[str, str, bool, Optional[int]]
+
+_models: Dict[ModelKey, Any] = {}
+_models_lock = threading.Lock()
+
+
+def _load_model(model_name: str, backend: str, quantize: bool, num_threads: Optional[int]):
+    """Loads a SentenceTransformer on CPU with the requested backend and precision."""
+    if not EMBEDDINGS_AVAILABLE:
+        raise ImportError("sentence-transformers is required for embeddings (pip install sentence-transformers)")
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        model_kwargs = {}
+        if quantize:
+            model_kwargs["file_name"] = EMBEDDING_ONNX_QUANTIZED_FILE
+        if num_threads:
+            import onnxruntime
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = num_threads
+            model_kwargs["session_options"] = session_options
+        return SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    import torch
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    model = SentenceTransformer(model_name, device="cpu")
+    if quantize:
+        # Dynamic int8 quantization of the Linear layers: smaller and faster on CPU
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    model.eval()
+    return model
+
+
+def get_embedding_model(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    backend: str = EMBEDDING_BACKEND,
+    quantize: bool = EMBEDDING_QUANTIZE,
+    num_threads: Optional[int] = EMBEDDING_THREADS,
+):
+    """Returns the process-wide model for these settings, loading it on first use."""
+    key = (model_name, backend, quantize, num_threads)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _models_lock:
+        if key not in _models:
+            logger.info(f"Loading embedding model {model_name} (backend={backend}, quantize={quantize}).")
+            _models[key] = _load_model(model_name, backend, quantize, num_threads)
+        return _models[key]
+
+
+def loaded_models() -> List[ModelKey]:
+    """Returns the keys of the models loaded in this process."""
+    return list(_models)
+
 
 class EmbeddingGenerator:
-    """Generates numerical embeddings for text using a pre-trained model."""
+    """Generates numerical embeddings for text using a shared, lazily loaded pre-trained model.
 
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        print(f"Initializing EmbeddingGenerator with model: {model_name}")
-        # Placeholder for loading an actual embedding model
-        # from sentence_transformers import SentenceTransformer
-        # self.model = SentenceTransformer(model_name)
+    Args:
+        model_name: Sentence-Transformers model name.
+        batch_size: Texts per forward pass in ``generate_embeddings_batch``.
+        num_threads: CPU threads used for inference (None keeps the library default).
+        backend: "torch" or "onnx".
+        quantize: Use int8 weights (dynamic quantization for torch, a quantized export for ONNX).
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        num_threads: Optional[int] = EMBEDDING_THREADS,
+        backend: str = EMBEDDING_BACKEND,
+        quantize: bool = EMBEDDING_QUANTIZE,
+    ):
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.backend = backend
+        self.quantize = quantize
+
+    @property
+    def model(self):
+        return get_embedding_model(self.model_name, self.backend, self.quantize, self.num_threads)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def generate_embedding(self, text: str) -> np.ndarray:
+        """Generates a single float32 embedding vector for the given text."""
+        return self.generate_embeddings_batch([text])[0]
+
+    def generate_embeddings_batch(self, texts: Sequence[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Generates a contiguous (len(texts), dim) float32 matrix of embeddings."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=batch_size or self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+_default_generator: Optional[EmbeddingGenerator] = None
+
 
-    def generate_embedding(self, text: str) -> List[float]:
-        """Generates a single embedding vector for the given text."""
-        print(f"Generating embedding for text (first 50 chars): {text[:50]}...")
-        # Placeholder for actual embedding generation
-        # return self.model.encode(text).tolist()
-        return np.random.rand(384).tolist()  # Simulate a 384-dim embedding
-
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generates embedding vectors for a list of texts."""
-        print(f"Generating embeddings for {len(texts)} texts.")
-        # Placeholder for actual batch embedding generation
-        # return self.model.encode(texts).tolist()
-        return [np.random.rand(384).tolist() for _ in texts]  # Simulate batch
+def get_embedding_generator() -> EmbeddingGenerator:
+    """Returns the process-wide generator for the default model and environment settings."""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = EmbeddingGenerator()
+    return _default_generator
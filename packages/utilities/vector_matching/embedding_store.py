@@ -0,0 +1,299 @@
+# packages/utilities/vector_matching/embedding_store.py
+
+# Persistent, bounded store for text embeddings.
+#
+# Embeddings are keyed by sha256(text) and kept in two tiers:
+#   * an LRU-bounded in-memory tier (per process), and
+#   * an on-disk tier per model tag: float32 vectors in a memory-mapped .npy
+#     arena plus an append-only key -> row index.
+#
+# Layout of the on-disk tier (one directory per model name + version, so
+# vectors from a different model can never be served):
+#
+#   <root>/<model_tag>/meta.json    {"model_name", "model_version", "dim", "dtype"}
+#   <root>/<model_tag>/vectors.npy  (capacity, dim) float32 arena
+#   <root>/<model_tag>/index.tsv    "<sha256>\t<row>\n" per stored vector
+#   <root>/<model_tag>/.lock        writer lock (fcntl.flock)
+#
+# Rows are written and flushed before their index line is appended, so
+# readers in other processes never see an index entry for an unwritten row.
+# Any number of worker processes can open the store with read_only=True and
+# share the page cache; a single writer (or several, serialized by the lock)
+# appends new vectors.
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from packages.utilities.cache_utils import LRUCache
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: writers are only serialized within a process
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.getenv(
+    "EMBEDDING_STORE_DIR",
+    os.path.join(tempfile.gettempdir(), "job_applier_embeddings"),
+)
+DEFAULT_MEMORY_ITEMS = 10000
+INITIAL_CAPACITY = 1024
+
+
+def text_key(text: str) -> str:
+    """Returns the store key (sha256 hex digest) for a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def model_tag(model_name: str, model_version: str = "") -> str:
+    """Returns a filesystem-safe directory name for a model name and version."""
+    tag = f"{model_name}@{model_version}" if model_version else model_name
+    return re.sub(r"[^A-Za-z0-9_.@-]+", "_", tag)
+
+
+class EmbeddingStore:
+    """Two-tier (LRU memory + memory-mapped disk) embedding store for one model.
+
+    Args:
+        model_name: Name of the embedding model, e.g. "all-MiniLM-L6-v2".
+        model_version: Version tag of the model; vectors are never shared across tags.
+        root: Directory holding one sub-directory per model tag (None disables the disk tier).
+        max_memory_items: Bound on the in-memory LRU tier.
+        read_only: Open the disk tier read-only (for worker processes sharing it).
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_version: str = "",
+        root: Optional[str] = DEFAULT_STORE_DIR,
+        max_memory_items: int = DEFAULT_MEMORY_ITEMS,
+        read_only: bool = False,
+    ):
+        self.model_name = model_name
+        self.model_version = model_version
+        self.read_only = read_only
+        self.memory = LRUCache(maxsize=max_memory_items)
+        self.directory = os.path.join(root, model_tag(model_name, model_version)) if root else None
+        self._index: Dict[str, int] = {}
+        self._index_pos = 0
+        self._arena = None
+        self._arena_id = None  # (inode, mtime) of the mapped file
+        self._arena_rows = 0  # indexed rows known to be in the mapped file
+        self._dim: Optional[int] = None
+        self._lock = threading.RLock()
+        if self.directory and not read_only:
+            os.makedirs(self.directory, exist_ok=True)
+
+    # ------------------------------------------------------------------ paths
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # ----------------------------------------------------------------- reads
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._index)
+
+    def __contains__(self, text: str) -> bool:
+        return self.get(text) is not None
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Returns the stored float32 vector for ``text``, or None."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Looks up many texts at once; misses are returned as None (order preserved)."""
+        keys = [text_key(t) for t in texts]
+        results: List[Optional[np.ndarray]] = [self.memory.get(k) for k in keys]
+        missing = [i for i, v in enumerate(results) if v is None]
+        if not missing or not self.directory:
+            return results
+        with self._lock:
+            self._refresh_index()
+            for i in missing:
+                row = self._index.get(keys[i])
+                if row is None:
+                    continue
+                arena = self._open_arena(min_rows=row + 1)
+                if arena is None:
+                    continue
+                vector = np.array(arena[row], dtype=np.float32)
+                vector.setflags(write=False)
+                self.memory.set(keys[i], vector)
+                results[i] = vector
+        return results
+
+    # ---------------------------------------------------------------- writes
+
+    def put(self, text: str, vector) -> None:
+        """Stores one vector for ``text``."""
+        self.put_many([text], [vector])
+
+    def put_many(self, texts: Sequence[str], vectors) -> None:
+        """Stores vectors for many texts; ``vectors`` is a (n, dim) array or a list of vectors."""
+        matrix = np.array(vectors, dtype=np.float32)  # own copy; cached rows are read-only views
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        matrix.setflags(write=False)
+        if len(texts) != matrix.shape[0]:
+            raise ValueError("texts and vectors must have the same length")
+        keys = [text_key(t) for t in texts]
+        for key, vector in zip(keys, matrix):
+            self.memory.set(key, vector)
+        if not self.directory or self.read_only or not keys:
+            return
+        with self._lock, self._file_lock():
+            self._refresh_index()
+            self._ensure_meta(matrix.shape[1])
+            new_rows = {}
+            for key, vector in zip(keys, matrix):
+                if key not in self._index and key not in new_rows:
+                    new_rows[key] = vector
+            if not new_rows:
+                return
+            start = len(self._index)
+            arena = self._reserve(start + len(new_rows))
+            for offset, vector in enumerate(new_rows.values()):
+                arena[start + offset] = vector
+            arena.flush()
+            with open(self._path("index.tsv"), "a", encoding="utf-8") as f:
+                for offset, key in enumerate(new_rows):
+                    f.write(f"{key}\t{start + offset}\n")
+            self._refresh_index()
+
+    # --------------------------------------------------------------- helpers
+
+    def _refresh_index(self) -> None:
+        """Reads index lines appended since the last refresh (possibly by other processes)."""
+        path = self._path("index.tsv") if self.directory else None
+        if not path or not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            f.seek(self._index_pos)
+            while True:
+                line = f.readline()
+                if not line or not line.endswith("\n"):
+                    break  # partial line still being written
+                key, row = line.rstrip("\n").split("\t")
+                self._index[key] = int(row)
+                self._index_pos = f.tell()
+
+    def _read_meta(self) -> Optional[dict]:
+        path = self._path("meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _ensure_meta(self, dim: int) -> None:
+        meta = self._read_meta()
+        if meta is None:
+            meta = {
+                "model_name": self.model_name,
+                "model_version": self.model_version,
+                "dim": int(dim),
+                "dtype": "float32",
+            }
+            with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        if meta["model_name"] != self.model_name or meta["model_version"] != self.model_version:
+            raise ValueError(f"Embedding store at {self.directory} belongs to another model: {meta}")
+        if meta["dim"] != dim:
+            raise ValueError(f"Embedding dimension {dim} does not match store dimension {meta['dim']}")
+        self._dim = meta["dim"]
+
+    def _open_arena(self, min_rows: int = 0, revalidate: bool = False):
+        """
+        Maps the arena. Rows beyond those indexed when it was mapped are only served after
+        checking the file: another process may have grown it by replacing it, leaving this
+        mapping on the old file, so it is re-mapped when its inode or mtime changed.
+        """
+        if self._arena is not None and min_rows <= self._arena_rows and not revalidate:
+            return self._arena
+        path = self._path("vectors.npy")
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        if self._arena is None or identity != self._arena_id:
+            mode = "r" if self.read_only else "r+"
+            self._arena = np.load(path, mmap_mode=mode)
+            self._arena_id = identity
+        self._arena_rows = min(len(self._index), self._arena.shape[0])
+        if self._arena.shape[0] < min_rows:
+            return None
+        return self._arena
+
+    def _reserve(self, rows: int):
+        """Returns a writable arena with capacity for at least ``rows`` rows, growing it if needed."""
+        arena = self._open_arena(revalidate=True)  # another writer may have grown it
+        if arena is not None and arena.shape[0] >= rows:
+            return arena
+        capacity = max(INITIAL_CAPACITY, rows, 2 * (arena.shape[0] if arena is not None else 0))
+        tmp_path = self._path("vectors.npy.tmp")
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(capacity, self._dim))
+        used = len(self._index)
+        if arena is not None and used:
+            grown[:used] = arena[:used]
+        grown.flush()
+        del grown
+        self._arena = None
+        os.replace(tmp_path, self._path("vectors.npy"))
+        logger.info(f"Embedding arena {self.directory} grown to {capacity} rows.")
+        return self._open_arena(min_rows=rows)
+
+    def _file_lock(self):
+        return _FileLock(self._path(".lock"))
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, serializing writers across processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = None
+
+    def __enter__(self):
+        self._f = open(self.path, "a")
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+        self._f.close()
+        self._f = None
+
+
+_stores: Dict[tuple, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model_name: str, model_version: str = "", **kwargs) -> EmbeddingStore:
+    """Returns the process-wide store for a model name/version, creating it on first use."""
+    key = (model_name, model_version)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = EmbeddingStore(model_name, model_version, **kwargs)
+        return _stores[key]
+
+
+def missing_texts(texts: Iterable[str], store: EmbeddingStore) -> List[str]:
+    """Returns the distinct texts from ``texts`` that are not in ``store`` yet."""
+    unique = list(dict.fromkeys(texts))
+    return [t for t, v in zip(unique, store.get_many(unique)) if v is None]
@@ -0,0 +1,113 @@
+# packages/utilities/vector_matching/micro_batcher.py
+
+# Coalesces concurrent embedding requests into batched encode calls.
+#
+# Each caller awaits `encode_many(texts)`. Pending texts from all callers are
+# collected until either `max_batch_size` texts are queued or `max_wait`
+# seconds have passed since the first one arrived, then encoded with a single
+# call to the wrapped batch function in a worker thread (so CPU inference does
+# not block the event loop). Every caller receives exactly its own rows.
+# If the worker stops (cancelled by `close`, or crashed), every text still
+# queued or in its batch fails instead of leaving its caller waiting.
+
+import asyncio
+import functools
+import logging
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchEncoder:
+    """Micro-batching front end for a synchronous ``encode(list_of_texts) -> (n, dim) array`` function.
+
+    Args:
+        encode_batch: Function encoding a list of texts in one call, returning a 2-D array.
+        max_batch_size: Maximum texts per encode call.
+        max_wait: Maximum seconds the first queued text waits for others to join its batch.
+    """
+
+    def __init__(self, encode_batch: Callable[[List[str]], np.ndarray], max_batch_size: int = 256, max_wait: float = 0.01):
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def encode_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Encodes ``texts`` (possibly together with other callers' texts) and returns their rows in order."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            futures.append(future)
+            await self._queue.put((text, future))
+        rows = await asyncio.gather(*futures)
+        return np.vstack(rows).astype(np.float32, copy=False)
+
+    async def encode(self, text: str) -> np.ndarray:
+        return (await self.encode_many([text]))[0]
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run(self._queue))
+            self._worker.add_done_callback(functools.partial(self._fail_queued, self._queue))
+
+    @staticmethod
+    def _fail_queued(queue: asyncio.Queue, worker: asyncio.Task) -> None:
+        """Fails the futures still queued when ``worker`` stopped; a new worker gets a new queue."""
+        error = None if worker.cancelled() else worker.exception()
+        error = error or RuntimeError("Embedding worker stopped")
+        while not queue.empty():
+            _, future = queue.get_nowait()
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                texts = [text for text, _ in batch]
+                try:
+                    vectors = await loop.run_in_executor(None, self.encode_batch, texts)
+                    vectors = np.asarray(vectors, dtype=np.float32)
+                except Exception as e:
+                    logger.error(f"Batch encode of {len(texts)} texts failed: {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), vector in zip(batch, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Embedding worker stopped"))
@@ -3,9 +3,23 @@
 # This file would contain functions to perform vector similarity matching
 # using libraries like scikit-learn or faiss.
 
-from typing import List, Tuple
+import logging
+import os
+from typing import Dict, Iterable, List, Sequence, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
 
 
 class VectorMatcher:
@@ -21,23 +35,205 @@ class VectorMatcher:
 
         Returns a list of tuples (index, similarity_score) sorted by similarity.
         """
-        if not candidate_vectors:
+        if len(candidate_vectors) == 0:
             return []
 
-        query_np = np.array(query_vector).reshape(1, -1)
-        candidates_np = np.array(candidate_vectors)
+        query_np = _normalize_rows(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))[0]
+        candidates_np = _normalize_rows(np.asarray(candidate_vectors, dtype=np.float32))
 
-        similarities = cosine_similarity(query_np, candidates_np)[0]
+        similarities = candidates_np @ query_np
 
-        # Pair similarities with their original indices and sort
-        indexed_similarities = sorted(
-            enumerate(similarities), key=lambda x: x[1], reverse=True
-        )
-
-        return indexed_similarities
+        # Pair similarities with their original indices, most similar first
+        order = np.argsort(-similarities, kind="stable")
+        return [(int(i), float(similarities[i])) for i in order]
 
     def calculate_similarity(self, vector1: List[float], vector2: List[float]) -> float:
         """Calculates the cosine similarity between two vectors."""
-        vec1_np = np.array(vector1).reshape(1, -1)
-        vec2_np = np.array(vector2).reshape(1, -1)
-        return cosine_similarity(vec1_np, vec2_np)[0][0]
+        vec1_np = np.asarray(vector1, dtype=np.float32)
+        vec2_np = np.asarray(vector2, dtype=np.float32)
+        denominator = max(float(np.linalg.norm(vec1_np) * np.linalg.norm(vec2_np)), 1e-12)
+        return float(vec1_np @ vec2_np) / denominator
+
+
+class JobVectorIndex:
+    """Persistent top-k cosine index over job embeddings.
+
+    Vectors are L2-normalized on insert and kept in one contiguous float32 matrix
+    (rows ``[0, len(self))``), so an exact query is a single matmul plus ``argpartition``.
+    Adds, updates and deletes are incremental: deletes move the last row into the
+    freed slot. For very large collections an approximate backend can be enabled with
+    ``backend="hnsw"`` (requires ``hnswlib``); the exact matrix stays the source of truth
+    for persistence and is used to rebuild the approximate index on load.
+
+    Args:
+        dim: Embedding dimension.
+        backend: "exact" (default) or "hnsw".
+        initial_capacity: Rows pre-allocated before the matrix first grows.
+    """
+
+    def __init__(self, dim: int, backend: str = "exact", initial_capacity: int = 1024,
+                 hnsw_m: int = 16, hnsw_ef_construction: int = 200, hnsw_ef_search: int = 64):
+        if backend not in ("exact", "hnsw"):
+            raise ValueError(f"Unknown JobVectorIndex backend: {backend}")
+        if backend == "hnsw" and not HNSWLIB_AVAILABLE:
+            raise ImportError("hnswlib is required for the 'hnsw' backend (pip install hnswlib)")
+        self.dim = dim
+        self.backend = backend
+        self._vectors = np.zeros((max(1, initial_capacity), dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._hnsw_params = (hnsw_m, hnsw_ef_construction, hnsw_ef_search)
+        self._hnsw = None
+        self._hnsw_labels: Dict[str, int] = {}
+        self._hnsw_ids: Dict[int, str] = {}
+        self._next_label = 0
+        if backend == "hnsw":
+            self._init_hnsw(self._vectors.shape[0])
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Read-only view of the normalized job vectors, row i belonging to ``ids[i]``."""
+        view = self._vectors[:len(self._ids)]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    # ----------------------------------------------------------------- updates
+
+    def upsert(self, job_ids: Sequence[str], vectors) -> None:
+        """Adds new jobs or replaces the vectors of existing ones."""
+        matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(job_ids), self.dim))
+        new_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id not in self._rows]
+        self._reserve(len(self._ids) + len(new_ids))
+        for job_id, vector in zip(job_ids, matrix):
+            row = self._rows.get(job_id)
+            if row is None:
+                row = len(self._ids)
+                self._ids.append(job_id)
+                self._rows[job_id] = row
+            self._vectors[row] = vector
+        if self._hnsw is not None:
+            self._hnsw_upsert(job_ids, matrix)
+
+    def remove(self, job_ids: Iterable[str]) -> int:
+        """Deletes jobs from the index; unknown ids are ignored. Returns the number removed."""
+        removed = 0
+        for job_id in job_ids:
+            row = self._rows.pop(job_id, None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            removed += 1
+            if self._hnsw is not None:
+                label = self._hnsw_labels.pop(job_id)
+                self._hnsw_ids.pop(label, None)
+                self._hnsw.mark_deleted(label)
+        return removed
+
+    # ----------------------------------------------------------------- queries
+
+    def search(self, query_vector, k: int = 10) -> List[Tuple[str, float]]:
+        """Returns up to ``k`` (job_id, cosine similarity) pairs, most similar first."""
+        size = len(self._ids)
+        if size == 0 or k <= 0:
+            return []
+        query = _normalize_rows(np.asarray(query_vector, dtype=np.float32).reshape(1, self.dim))[0]
+        if self._hnsw is not None:
+            return self._hnsw_search(query, min(k, size))
+        scores = self._vectors[:size] @ query
+        if k < size:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    def search_batch(self, query_vectors, k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Top-k search for several queries with one matmul (exact backend)."""
+        size = len(self._ids)
+        queries = _normalize_rows(np.asarray(query_vectors, dtype=np.float32).reshape(-1, self.dim))
+        if size == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+        if self._hnsw is not None:
+            return [self._hnsw_search(q, min(k, size)) for q in queries]
+        scores = queries @ self._vectors[:size].T
+        k = min(k, size)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < size else np.tile(np.arange(size), (len(queries), 1))
+        results = []
+        for q, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[q, candidates], kind="stable")]
+            results.append([(self._ids[i], float(scores[q, i])) for i in ordered])
+        return results
+
+    # ------------------------------------------------------------- persistence
+
+    def save(self, path: str) -> None:
+        """Writes ids (as a fixed-width unicode array, no pickling) and vectors to ``path`` (.npz) atomically."""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, ids=np.array(self._ids, dtype=str), vectors=self._vectors[:len(self._ids)], dim=self.dim)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, backend: str = "exact", **kwargs) -> "JobVectorIndex":
+        """Loads an index written by ``save``; approximate backends are rebuilt from the vectors."""
+        with np.load(path, allow_pickle=False) as data:
+            ids = data["ids"].tolist()
+            vectors = data["vectors"]
+            dim = int(data["dim"])
+        index = cls(dim, backend=backend, initial_capacity=max(len(ids), 1), **kwargs)
+        if ids:
+            index.upsert(ids, vectors)
+        return index
+
+    # ----------------------------------------------------------------- helpers
+
+    def _reserve(self, rows: int) -> None:
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        grown = np.zeros((max(rows, capacity * 2), self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._vectors[:len(self._ids)]
+        self._vectors = grown
+        if self._hnsw is not None and self._hnsw.get_max_elements() < grown.shape[0]:
+            self._hnsw.resize_index(grown.shape[0])
+
+    def _init_hnsw(self, capacity: int) -> None:
+        m, ef_construction, ef_search = self._hnsw_params
+        self._hnsw = hnswlib.Index(space="ip", dim=self.dim)
+        self._hnsw.init_index(max_elements=capacity, M=m, ef_construction=ef_construction, allow_replace_deleted=True)
+        self._hnsw.set_ef(ef_search)
+
+    def _hnsw_upsert(self, job_ids: Sequence[str], matrix: np.ndarray) -> None:
+        labels = []
+        for job_id in job_ids:
+            label = self._hnsw_labels.get(job_id)
+            if label is None:
+                label = self._next_label
+                self._next_label += 1
+                self._hnsw_labels[job_id] = label
+                self._hnsw_ids[label] = job_id
+            labels.append(label)
+        if self._hnsw.get_current_count() + len(labels) > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(self._hnsw.get_current_count() + len(labels) + self._vectors.shape[0])
+        self._hnsw.add_items(matrix, np.asarray(labels), replace_deleted=True)
+
+    def _hnsw_search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        labels, distances = self._hnsw.knn_query(query, k=k)
+        # hnswlib's "ip" space returns 1 - inner product
+        return [(self._hnsw_ids[int(label)], float(1.0 - distance))
+                for label, distance in zip(labels[0], distances[0]) if int(label) in self._hnsw_ids]
@@ -0,0 +1,112 @@
+"""
+Microbenchmark for ATS keyword extraction and scoring.
+
+Compares the original per-keyword regex implementation ("before") against the
+shared ``KeywordMatcher`` in ``packages.agents.ats_scorer.ats_utils`` ("after")
+over synthetic resume/job-description pairs and reports per-request latency.
+
+Usage:
+    python tools/benchmarks/ats_keyword_benchmark.py [--pairs 1000] [--seed 7]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from packages.agents.ats_scorer.ats_utils import (  # noqa: E402
+    COMMON_TECH_KEYWORDS,
+    calculate_keyword_score,
+    calculate_keyword_score_and_density,
+    extract_keywords,
+)
+
+FILLER = (
+    "designed built shipped owned team product customers platform services "
+    "reliable scalable improved reduced latency cost delivered stakeholders "
+    "mentored engineers roadmap features quality testing release"
+).split()
+
+
+def legacy_extract_keywords(text):
+    text_lower = text.lower()
+    patterns = [re.compile(r"\b" + re.escape(k) + r"\b") for k in COMMON_TECH_KEYWORDS]
+    return list({k for k, p in zip(COMMON_TECH_KEYWORDS, patterns) if p.search(text_lower)})
+
+
+def legacy_keyword_score(resume_text, job_keywords):
+    if not job_keywords:
+        return 0.0, []
+    text_lower = resume_text.lower()
+    patterns = [re.compile(r"\b" + re.escape(k) + r"\b") for k in job_keywords]
+    missing = [k for k, p in zip(job_keywords, patterns) if not p.search(text_lower)]
+    return (len(job_keywords) - len(missing)) / len(job_keywords), missing
+
+
+def legacy_density(resume_data, job_keywords):
+    skills_text = " ".join(resume_data.get("skills", []))
+    experience_text = " ".join(
+        exp.get("title", "") + " " + exp.get("description", "")
+        for exp in resume_data.get("experience", [])
+    )
+    summary_text = resume_data.get("summary", "")
+    full = f"{skills_text} {experience_text} {summary_text} {resume_data.get('raw_text', '')}".lower()
+    density = {k: full.count(k.lower()) for k in job_keywords}
+    for section in (skills_text, experience_text, summary_text):
+        sum(section.lower().count(k.lower()) for k in job_keywords)
+    return density
+
+
+def make_text(rng, words, keyword_count):
+    tokens = rng.choices(FILLER, k=words)
+    for keyword in rng.sample(COMMON_TECH_KEYWORDS, keyword_count):
+        tokens.insert(rng.randrange(len(tokens) + 1), keyword)
+    return " ".join(tokens)
+
+
+def make_pairs(n, seed):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(n):
+        resume = {
+            "skills": rng.sample(COMMON_TECH_KEYWORDS, 8),
+            "experience": [
+                {"title": "Engineer", "description": make_text(rng, 80, 6)} for _ in range(3)
+            ],
+            "summary": make_text(rng, 40, 3),
+            "raw_text": make_text(rng, 450, 15),
+        }
+        pairs.append((resume, make_text(rng, 250, 12)))
+    return pairs
+
+
+def run(label, pairs, extract, score, density):
+    start = time.perf_counter()
+    for resume, job_description in pairs:
+        keywords = extract(job_description)
+        score(resume["raw_text"], keywords)
+        density(resume, keywords)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {elapsed * 1e3 / len(pairs):8.3f} ms/request  ({elapsed:.2f}s total)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pairs = make_pairs(args.pairs, args.seed)
+    before = run("before", pairs, legacy_extract_keywords, legacy_keyword_score, legacy_density)
+    after = run(
+        "after", pairs, extract_keywords, calculate_keyword_score, calculate_keyword_score_and_density
+    )
+    print(f"speedup  {before / after:8.2f}x over {len(pairs)} resume/JD pairs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Cold-start benchmark for the app entry points.
+
+Imports each entry point in a fresh interpreter with ``python -X importtime``
+and reports the total import time plus the slowest imported modules, so
+regressions such as loading NLP models at import time show up immediately.
+Imports that fail (e.g. a missing optional dependency or environment variable)
+are reported with their last error line instead of a time.
+
+Usage:
+    python tools/benchmarks/import_time_benchmark.py [--repeat 3] [--top 8] [--only ats_service]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# name -> (module to import, extra sys.path entry for apps that import their siblings directly)
+ENTRY_POINTS = {
+    "ats_service": ("apps.ats_service.src.main", None),
+    "job_matcher": ("apps.job_matcher.src.main", None),
+    "job_applier_agent": ("apps.job_applier_agent.src.main", None),
+    "job_applier_celery": ("apps.job_applier_agent.src.celery_app", None),
+    "job_applier_service": ("apps.job_applier_service.src.main", None),
+    "job_scraper": ("apps.job_scraper.src.main", None),
+    "user_service": ("apps.user_service.src.main", None),
+    "agent_orchestration_service": ("apps.agent_orchestration_service.src.main", None),
+    "agent_orchestra_service": ("apps.agent_orchestra_service.src.main", None),
+    "resume_service": ("main", os.path.join(ROOT, "apps", "resume_service", "src")),
+    "resume_utils": ("packages.agents.resume_parser.resume_utils", None),
+    "job_matcher_utils": ("packages.agents.job_matcher.job_matcher_utils", None),
+}
+
+
+def parse_importtime(stderr):
+    """Returns [(module, self_us, cumulative_us)] from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module, extra_path):
+    env = dict(os.environ)
+    paths = [ROOT] + ([extra_path] if extra_path else []) + [env.get("PYTHONPATH", "")]
+    env["PYTHONPATH"] = os.pathsep.join(p for p in paths if p)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=extra_path or ROOT, env=env, capture_output=True, text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if line and not line.startswith("import time:")]
+        return None, rows, errors[-1] if errors else f"exit code {proc.returncode}"
+    return sum(self_us for _, self_us, _ in rows), rows, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point (the fastest is reported)")
+    parser.add_argument("--top", type=int, default=8, help="slowest modules listed per entry point")
+    parser.add_argument("--only", nargs="*", choices=sorted(ENTRY_POINTS), help="entry points to measure")
+    args = parser.parse_args()
+
+    print(f"{'entry point':<30} {'import time':>12}")
+    print("-" * 43)
+    details = []
+    for name in args.only or ENTRY_POINTS:
+        module, extra_path = ENTRY_POINTS[name]
+        best = None
+        for _ in range(args.repeat):
+            total_us, rows, error = measure(module, extra_path)
+            if error:
+                break
+            if best is None or total_us < best[0]:
+                best = (total_us, rows)
+        if error:
+            print(f"{name:<30} {'failed':>12}  ({error[:80]})")
+            continue
+        print(f"{name:<30} {best[0] / 1e6:>10.3f} s")
+        details.append((name, best[1]))
+
+    for name, rows in details:
+        print(f"\n{name}: slowest modules by self time")
+        for module, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[:args.top]:
+            print(f"  {self_us / 1e3:>9.1f} ms self  {cumulative_us / 1e3:>9.1f} ms cumulative  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark for incremental (per-job fan-out) matching in the orchestration service.
+
+Builds an IncrementalMatcher over synthetic users and jobs, then compares one
+day of new postings handled two ways:
+  * full re-match: every user scored against every job (the previous daily run);
+  * fan-out: each new job scored only against the users it can match
+    (IncrementalMatcher.add_job), updating per-user top-k heaps in place.
+Reports scored pairs and wall time, and checks that both give the same top-k.
+
+Usage:
+    python tools/benchmarks/incremental_matching_benchmark.py [--users 500] [--jobs 2000] [--new-jobs 200]
+"""
+import argparse
+import heapq
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from packages.agents.job_matcher.incremental_matcher import IncrementalMatcher  # noqa: E402
+from packages.agents.job_matcher.job_matcher_agent import score_job, user_match_context  # noqa: E402
+
+SKILLS = [f"{name} {level}" for name in ["Python", "Java", "Go", "Rust", "SQL", "AWS", "GCP", "Azure", "Docker",
+                                         "Kubernetes", "React", "Vue", "Spark", "Kafka", "Terraform", "Scala",
+                                         "Swift", "Kotlin", "Ruby", "PHP"] for level in ("Core", "Advanced", "Platform", "Tooling", "Data")]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA", "Chicago, IL", "Denver, CO",
+             "London, UK", "Berlin, Germany", "Munich, Germany", "Toronto, ON", "Bangalore, India", "Sydney", "Paris",
+             "Amsterdam", "Dublin", "Singapore", "Tokyo", "Remote", "Los Angeles, CA"]
+DEGREES = ["B.S. Computer Science", "M.S. Computer Science", "B.S. Mathematics"]
+
+
+def make_job(rng, i):
+    return {
+        "id": i,
+        "title": f"Job {i}",
+        "location": rng.choice(LOCATIONS),
+        "remote": rng.random() < 0.2,
+        "job_type": rng.choice(["Full-time", "Contract"]),
+        "required_skills": rng.sample(SKILLS, rng.randint(2, 6)),
+        "required_experience": rng.randint(0, 8),
+        "required_education": [rng.choice(DEGREES)],
+        "salary": round(rng.uniform(0.3, 1.0), 2),
+        "growth_potential": round(rng.random(), 2),
+    }
+
+
+def make_profile(rng):
+    return {
+        "skills": rng.sample(SKILLS, rng.randint(3, 10)),
+        "experience": [{"years": rng.randint(0, 10)}],
+        "education": [{"degree": rng.choice(DEGREES)}],
+        "preferences": {"job_locations": rng.sample(LOCATIONS[:-2], rng.randint(1, 2)),
+                        "salary_range": "$90,000 - $150,000", "job_types": ["Full-time"]},
+    }
+
+
+def full_rematch(profiles, jobs, top_k=5):
+    """The daily run without incremental state: every user against every job."""
+    results = {}
+    for user_id, profile in profiles.items():
+        user = user_match_context(profile)
+        scored = []
+        for seq, job in enumerate(jobs):
+            details = {"missing_skills": [], "missing_qualifications": [], "opportunity_score": 0, "culture_score": 0}
+            score = score_job(job, user, details)
+            if score >= 50:
+                scored.append((-score, -details["opportunity_score"], seq, job["id"]))
+        results[user_id] = [(job_id, -neg) for neg, _, _, job_id in heapq.nsmallest(top_k, scored)]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=2000, help="jobs already indexed")
+    parser.add_argument("--new-jobs", type=int, default=200, help="postings arriving during the day")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(args.seed)
+    profiles = {f"user{i}": make_profile(rng) for i in range(args.users)}
+    jobs = [make_job(rng, i) for i in range(args.jobs + args.new_jobs)]
+    existing, new = jobs[:args.jobs], jobs[args.jobs:]
+
+    matcher = IncrementalMatcher()
+    started = time.perf_counter()
+    for job in existing:
+        matcher.add_job(job)
+    matcher.apply_delta(profiles)
+    build_seconds = time.perf_counter() - started
+
+    before = matcher.stats["pairs_scored"]
+    started = time.perf_counter()
+    for job in new:
+        matcher.add_job(job)
+    fanout_seconds = time.perf_counter() - started
+    fanout_pairs = matcher.stats["pairs_scored"] - before
+
+    started = time.perf_counter()
+    expected = full_rematch(profiles, jobs)
+    full_seconds = time.perf_counter() - started
+    actual = {user_id: [(m["id"], m["compatibility_score"]) for m in matcher.top_matches(user_id)] for user_id in profiles}
+
+    print(f"{args.users} users, {args.jobs} indexed jobs, {args.new_jobs} new jobs")
+    print(f"initial index build         {build_seconds:8.2f} s")
+    print(f"full re-match   {args.users * len(jobs):>10} pairs {full_seconds:8.2f} s")
+    print(f"fan-out         {fanout_pairs:>10} pairs {fanout_seconds:8.2f} s  ({full_seconds / fanout_seconds:.0f}x)")
+    print(f"identical top-k: {'yes' if actual == expected else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
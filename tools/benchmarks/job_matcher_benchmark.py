@@ -0,0 +1,89 @@
+"""
+Throughput benchmark for JobMatcherAgent scoring.
+
+Scores one user profile against 10k and 100k synthetic processed jobs with the
+per-job Python loop (match_jobs) and with the vectorized engine
+(JobBatch + match_job_batch), checks that both return the same top matches
+and that every vectorized score equals the scalar one, and reports timings.
+Encoding a JobBatch is a one-off cost per job set and is reported separately.
+
+Usage:
+    python tools/benchmarks/job_matcher_benchmark.py [--sizes 10000 100000] [--repeat 3]
+"""
+import argparse
+import copy
+import logging
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from job_record_memory_benchmark import generate_jobs  # noqa: E402
+from packages.agents.job_matcher.job_matcher_agent import JobMatcherAgent  # noqa: E402
+from packages.agents.job_matcher.vectorized_matcher import JobBatch, score_job_batch  # noqa: E402
+
+PROFILE = {
+    "skills": ["Python", "SQL", "AWS", "Docker", "Kafka"],
+    "experience": [{"years": 3}, {"years": 2}],
+    "education": [{"degree": "B.S. Computer Science"}],
+    "preferences": {
+        "job_locations": ["Remote", "New York, NY"],
+        "salary_range": "$90,000 - $150,000",
+        "job_types": ["Full-time"],
+        "remote": True,
+    },
+    "culture": {"work_life_balance": 0.8, "innovation": 0.6},
+}
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def summary(matches):
+    return [(m["id"], m["compatibility_score"], m["match_details"]["opportunity_score"]) for m in matches]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (the fastest is reported)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with mock.patch("packages.agents.job_matcher.job_matcher_agent.load_user_profile_data", return_value=PROFILE):
+        agent = JobMatcherAgent(None)
+
+    print(f"{'jobs':>8} {'match_jobs':>11} {'encode':>9} {'vectorized':>11} {'speedup':>8}  identical")
+    print("-" * 62)
+    for size in args.sizes:
+        jobs = list(generate_jobs(size, seed=size))
+
+        def loop():
+            return agent.match_jobs(copy.copy(jobs))
+
+        loop_seconds, expected = best_of(args.repeat, loop)
+        encode_seconds, batch = best_of(1, lambda: JobBatch.from_jobs(jobs))
+        vector_seconds, actual = best_of(args.repeat, lambda: agent.match_job_batch(batch))
+
+        scores, opportunity, valid = score_job_batch(batch, PROFILE)
+        user = agent._user_match_context()
+        details = {"missing_skills": [], "missing_qualifications": [], "opportunity_score": 0, "culture_score": 0}
+        all_equal = all(
+            agent._score_job(job, user, details) == scores[i] and details["opportunity_score"] == opportunity[i]
+            for i, job in enumerate(jobs)
+        )
+        identical = all_equal and summary(expected) == summary(actual)
+        print(f"{size:>8} {loop_seconds * 1e3:>9.1f}ms {encode_seconds * 1e3:>7.1f}ms {vector_seconds * 1e3:>9.1f}ms "
+              f"{loop_seconds / vector_seconds:>7.1f}x  {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Memory benchmark for holding processed jobs in a matching worker.
+
+Builds the same synthetic scraped jobs twice, as processed dicts
+(JobProcessorAgent.process) and as JobRecords (JobProcessorAgent.process_records),
+and reports the memory retained per job, measured with tracemalloc, plus the
+projected footprint of a 500k-job worker. Job fields are generated the way a
+scraper's JSON decoding produces them: every job has its own string objects.
+
+Usage:
+    python tools/benchmarks/job_record_memory_benchmark.py [--jobs 100000] [--seed 7]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from packages.agents.job_processor.job_processor_agent import JobProcessorAgent  # noqa: E402
+
+SKILLS = ["Python", "Java", "SQL", "AWS", "Docker", "Kubernetes", "React", "Go", "Terraform", "Spark",
+          "Machine Learning", "PostgreSQL", "Redis", "TypeScript", "GraphQL", "Kafka"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Engineer", "Backend Developer",
+          "Machine Learning Engineer", "DevOps Engineer", "Full Stack Developer", "Platform Engineer"]
+COMPANIES = [f"Company {i}" for i in range(2000)]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "London, UK",
+             "Berlin, Germany", "Toronto, ON", "Boston, MA", "Chicago, IL USA"]
+DEGREES = ["B.S. Computer Science", "M.S. Computer Science", "B.S. Mathematics", "Ph.D. Statistics"]
+
+
+def copy_str(value):
+    """Returns an equal string that is a distinct object, as JSON decoding would produce."""
+    return "".join(list(value))
+
+
+def generate_jobs(count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        skills = rng.sample(SKILLS, rng.randint(3, 7))
+        yield {
+            "id": str(100000 + i),
+            "title": copy_str(rng.choice(TITLES)),
+            "company": copy_str(rng.choice(COMPANIES)),
+            "location": copy_str(rng.choice(LOCATIONS)),
+            "description": f"We are hiring to build {' and '.join(skills).lower()} systems. Job {i}.",
+            "application_url": f"https://jobs.example.com/{i}",
+            "job_type": copy_str(rng.choice(["Full-time", "Contract", "Part-time"])),
+            "remote": rng.random() < 0.4,
+            "required_skills": [copy_str(s) for s in skills],
+            "required_experience": rng.randint(0, 8),
+            "required_education": [copy_str(rng.choice(DEGREES))],
+            "salary": round(rng.uniform(0.3, 1.0), 2),
+            "growth_potential": round(rng.random(), 2),
+            "company_reputation": round(rng.random(), 2),
+            "benefits": round(rng.random(), 2),
+            "culture": {"work_life_balance": round(rng.random(), 2), "innovation": round(rng.random(), 2)},
+        }
+
+
+def measure(build, count, seed):
+    """Returns (retained bytes, seconds) for the structure returned by ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    data = build(generate_jobs(count, seed))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(data) == count
+    del data
+    return retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000, help="number of synthetic jobs")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    processor = JobProcessorAgent()
+    results = {
+        "dicts (process)": measure(lambda jobs: processor.process(list(jobs)), args.jobs, args.seed),
+        "JobRecord (process_records)": measure(processor.process_records, args.jobs, args.seed),
+    }
+
+    baseline = results["dicts (process)"][0]
+    print(f"{args.jobs} jobs")
+    print(f"{'representation':<30} {'bytes/job':>10} {'500k jobs':>11} {'build':>9} {'vs dicts':>9}")
+    print("-" * 73)
+    for name, (retained, elapsed) in results.items():
+        per_job = retained / args.jobs
+        print(f"{name:<30} {per_job:>10.0f} {per_job * 500_000 / 2**20:>8.0f} MB {elapsed:>8.2f}s "
+              f"{(retained / baseline - 1) * 100:>+8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark for the location part of the preference score.
+
+Compares the previous per-pair difflib.SequenceMatcher matching with the
+gazetteer-backed LocationIndex used by location_preference_score, for a user
+with several preferred locations against many jobs. Locations are resolved
+once at ingest (JobRecord.location_id); matching is then integer comparisons.
+
+Usage:
+    python tools/benchmarks/location_matcher_benchmark.py [--jobs 100000] [--preferred 5]
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from packages.agents.job_matcher.job_matcher_utils import MAX_PREFERENCE_SCORE, location_preference_score  # noqa: E402
+from packages.utilities.location_index import LocationIndex  # noqa: E402
+
+LOCATIONS = ["San Francisco, CA", "Oakland, CA", "New York, NY", "Brooklyn, NY", "Austin, TX", "Seattle, WA",
+             "Bellevue, WA", "London, UK", "Berlin, Germany", "Toronto, ON", "Chicago, IL USA", "Boston, MA",
+             "Cambridge, MA", "Denver, CO", "Remote", "Hybrid - Austin", "Bengaluru, India", "Munich, Germany",
+             "Los Angeles, CA", "Portland, OR"]
+PREFERRED = ["San Francisco", "New York City", "Austin, TX", "Seattle", "Berlin", "Boston", "London"]
+
+
+def difflib_location_score(user_preferences, job_location, job_remote):
+    """The previous implementation: difflib ratio for every (job, preferred location) pair."""
+    user_job_locations = user_preferences.get("job_locations", [])
+    location_score = 0
+    for user_loc in user_job_locations:
+        if job_location == user_loc:
+            location_score = MAX_PREFERENCE_SCORE * 0.4
+            break
+        similarity = difflib.SequenceMatcher(None, job_location.lower(), user_loc.lower()).ratio()
+        if similarity > 0.8:
+            location_score = MAX_PREFERENCE_SCORE * 0.3
+            break
+        elif similarity > 0.6:
+            location_score = MAX_PREFERENCE_SCORE * 0.2
+    if (job_remote or "remote" in job_location.lower() or "hybrid" in job_location.lower()) and (
+            user_preferences.get("remote") or "remote" in [l.lower() for l in user_job_locations]):
+        location_score = max(location_score, MAX_PREFERENCE_SCORE * 0.4)
+    return location_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--preferred", type=int, default=5, help="number of preferred locations")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Distinct string objects per job, as decoded from scraped JSON.
+    jobs = [("".join(rng.choice(LOCATIONS)), rng.random() < 0.2) for _ in range(args.jobs)]
+    preferences = {"job_locations": PREFERRED[:args.preferred], "remote": False}
+
+    started = time.perf_counter()
+    index = LocationIndex.from_file()
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resolved = [(location, remote, index.resolve(location)) for location, remote in jobs]
+    ingest_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    before = [difflib_location_score(preferences, location, remote) for location, remote in jobs]
+    difflib_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    after = [location_preference_score(preferences, location, remote, location_id) for location, remote, location_id in resolved]
+    index_seconds = time.perf_counter() - started
+
+    changed = sum(a != b for a, b in zip(before, after))
+    print(f"{args.jobs} jobs x {args.preferred} preferred locations")
+    print(f"gazetteer load          {load_seconds * 1e3:8.1f} ms ({len(index)} places)")
+    print(f"resolve at ingest       {ingest_seconds * 1e3:8.1f} ms")
+    print(f"difflib per pair        {difflib_seconds * 1e3:8.1f} ms")
+    print(f"location index          {index_seconds * 1e3:8.1f} ms  ({difflib_seconds / index_seconds:.1f}x)")
+    print(f"scores changed          {changed} of {args.jobs} (gazetteer matches differ from string similarity)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark for parsing job board result pages.
+
+Compares the previous parsing (decode the response to str, BeautifulSoup with
+html.parser, CSS select per card) with the compiled lxml/XPath CardParser that
+parses the response bytes, over a synthetic result page per platform generated by
+packages/agents/job_scraper/tests/result_pages.py (not pages saved from the job
+boards). Checks that both extract the same jobs.
+
+Usage:
+    python tools/benchmarks/scraper_parse_benchmark.py [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from packages.agents.job_scraper.job_scraper_utils import (  # noqa: E402
+    GlassdoorScraper, GoogleJobsScraper, IndeedScraper, LinkedInScraper,
+)
+from packages.agents.job_scraper.page_parser import LXML_AVAILABLE  # noqa: E402
+from packages.agents.job_scraper.tests.result_pages import result_pages  # noqa: E402
+
+PLATFORMS = {
+    "indeed": IndeedScraper,
+    "linkedin": LinkedInScraper,
+    "glassdoor": GlassdoorScraper,
+    "google_jobs": GoogleJobsScraper,
+}
+
+
+def timed(parse, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        jobs = parse()
+    return (time.perf_counter() - started) / repeat, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="parses per page and parser")
+    args = parser.parse_args()
+    if not LXML_AVAILABLE:
+        sys.exit("lxml is not installed; CardParser would fall back to BeautifulSoup.")
+
+    print(f"{'platform':<12} {'KiB':>6} {'cards':>6} {'bs4 ms':>8} {'lxml ms':>8} {'speedup':>8} {'lxml MB/s':>10}")
+    total_before = total_after = total_bytes = 0.0
+    pages = result_pages()
+    for name, scraper in PLATFORMS.items():
+        content = pages[name]
+        card_parser = scraper.PARSER
+        before, old_jobs = timed(lambda: card_parser._parse_soup(content.decode("utf-8"), None), args.repeat)
+        after, new_jobs = timed(lambda: card_parser.parse(content), args.repeat)
+        if old_jobs != new_jobs:
+            sys.exit(f"{name}: lxml and BeautifulSoup extracted different jobs")
+        total_before, total_after, total_bytes = total_before + before, total_after + after, total_bytes + len(content)
+        print(f"{name:<12} {len(content) / 1024:>6.0f} {len(new_jobs):>6} {before * 1000:>8.2f} {after * 1000:>8.2f} "
+              f"{before / after:>7.1f}x {len(content) / after / 1e6:>10.1f}")
+    print(f"{'all':<12} {total_bytes / 1024:>6.0f} {'':>6} {total_before * 1000:>8.2f} {total_after * 1000:>8.2f} "
+          f"{total_before / total_after:>7.1f}x {total_bytes / total_after / 1e6:>10.1f}")
+    print(f"Pages per second per core: {len(PLATFORMS) / total_before:.0f} before, {len(PLATFORMS) / total_after:.0f} after")
+    print("Extracted jobs are identical.")
+
+
+if __name__ == "__main__":
+    main()